@@ -1,7 +1,9 @@
 import os
 import time
 import shutil
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
@@ -9,6 +11,17 @@ class InboxHandler(FileSystemEventHandler):
     def __init__(self, inbox_dir, needs_action_dir):
         self.inbox_dir = inbox_dir
         self.needs_action_dir = needs_action_dir
+        # Paths already handled, so the startup scan and live events never process a file twice
+        self.claimed = set()
+        self.lock = threading.Lock()
+
+    def claim(self, file_path):
+        """Return True the first time a path is seen"""
+        with self.lock:
+            if file_path in self.claimed:
+                return False
+            self.claimed.add(file_path)
+            return True
 
     def on_created(self, event):
         if not event.is_directory:
@@ -20,10 +33,16 @@ class InboxHandler(FileSystemEventHandler):
 
     def process_new_file(self, file_path):
         """Process a new file by moving it to Needs_Action and creating metadata."""
+        if not self.claim(file_path):
+            return
         try:
             # Wait a moment to ensure file is completely written
             time.sleep(0.5)
             
+            # Already moved by the startup scan or an earlier event
+            if not os.path.exists(file_path):
+                return
+            
             # Get the filename
             filename = os.path.basename(file_path)
             
@@ -40,6 +59,10 @@ class InboxHandler(FileSystemEventHandler):
             
         except Exception as e:
             print(f"Error processing file {file_path}: {str(e)}")
+        finally:
+            # The path is free again once the file has left the inbox
+            with self.lock:
+                self.claimed.discard(file_path)
 
     def create_metadata_file(self, file_path, original_filename):
         """Create a metadata file for the moved file."""
@@ -69,6 +92,18 @@ class InboxHandler(FileSystemEventHandler):
             f.write(metadata_content)
 
 
+def reconcile_inbox(event_handler, inbox_dir, workers=4):
+    """Process files that were dropped into the inbox while the watcher was down."""
+    with os.scandir(inbox_dir) as entries:
+        existing = [entry.path for entry in entries if entry.is_file(follow_symlinks=False)]
+    
+    if existing:
+        print(f"Found {len(existing)} file(s) already in {inbox_dir}")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(event_handler.process_new_file, existing))
+    return len(existing)
+
+
 def start_watching(inbox_dir, needs_action_dir):
     """Start watching the inbox directory for new files."""
     event_handler = InboxHandler(inbox_dir, needs_action_dir)
@@ -79,6 +114,9 @@ def start_watching(inbox_dir, needs_action_dir):
     print(f"Started watching {inbox_dir}")
     print(f"Files will be moved to {needs_action_dir}")
     
+    # Scan after the observer starts so files dropped during the scan are not missed
+    reconcile_inbox(event_handler, inbox_dir)
+    
     try:
         while True:
             time.sleep(1)
@@ -0,0 +1,240 @@
+"""
+Briefing Trends
+Per-week history of CEO briefing metrics with trend calculations
+
+Each briefing records its key metrics under the ISO week it was generated
+in (re-running during the same week overwrites that week). Trends are
+computed from the stored history only, so comparing against earlier weeks
+never re-queries Odoo, the social servers or the vault:
+- Week-over-week change (absolute and percent)
+- Moving average over the last 4 weeks
+- Anomalies: values more than 2 standard deviations away from the previous
+  4 weeks (or any change after a flat period)
+
+Calculations are vectorized with NumPy when it is installed; a pure-Python
+fallback gives the same results without it.
+
+Usage:
+    store = WeeklyMetricsStore()
+    store.record(iso_week(date.today()), metrics)
+    weeks, values = store.series()
+    trends = compute_trends(values)
+"""
+
+import json
+import math
+from pathlib import Path
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Configuration
+METRICS_HISTORY_FILE = Path("Briefings") / "Metrics_History.json"
+TREND_METRICS = ['tasks_completed', 'revenue', 'receivables', 'social_posts', 'efficiency_score']
+MOVING_AVERAGE_WEEKS = 4
+ANOMALY_Z = 2.0
+HISTORY_WEEKS = 8  # weeks shown in the briefing history table
+
+
+def iso_week(day: date) -> str:
+    """'YYYY-Www' label of the ISO week containing day"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class WeeklyMetricsStore:
+    """Briefing metrics keyed by ISO week, persisted as JSON"""
+
+    def __init__(self, path: Path = METRICS_HISTORY_FILE):
+        self.path = Path(path)
+        self.weeks: Dict[str, Dict[str, float]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.weeks = json.load(f).get('weeks', {})
+            except (json.JSONDecodeError, OSError):
+                self.weeks = {}
+
+    def record(self, week: str, metrics: Dict[str, Any]):
+        """Store the numeric metrics for week (replacing an earlier run that week)"""
+        self.weeks[week] = {
+            name: float(value) for name, value in metrics.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'weeks': dict(sorted(self.weeks.items()))}, f, indent=2)
+
+    def series(
+        self,
+        metrics: Sequence[str] = TREND_METRICS,
+        last: Optional[int] = None
+    ) -> Tuple[List[str], Any]:
+        """
+        (week labels, weeks x metrics values), oldest week first
+
+        Values are a float ndarray with NaN for missing metrics when NumPy is
+        available, otherwise a list of rows with None.
+        """
+        weeks = sorted(self.weeks)
+        if last:
+            weeks = weeks[-last:]
+        rows = [[self.weeks[week].get(name) for name in metrics] for week in weeks]
+        if NUMPY_AVAILABLE:
+            values = np.array(
+                [[np.nan if value is None else value for value in row] for row in rows],
+                dtype=float
+            ).reshape(len(weeks), len(metrics))
+            return weeks, values
+        return weeks, rows
+
+
+def _trends_numpy(values, window: int, z: float) -> Dict[str, Any]:
+    values = np.asarray(values, dtype=float)
+    count, _ = values.shape
+    previous = np.full_like(values, np.nan)
+    previous[1:] = values[:-1]
+
+    wow = values - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wow_pct = np.where(previous != 0, wow / np.abs(previous) * 100, np.nan)
+
+    # Running sums over non-missing values give every trailing window at once
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    csum = np.vstack([zeros, np.cumsum(filled, axis=0)])
+    csq = np.vstack([zeros, np.cumsum(filled ** 2, axis=0)])
+    ccount = np.vstack([zeros, np.cumsum(present, axis=0)])
+    end = np.arange(1, count + 1)
+    start = np.maximum(end - window, 0)
+
+    n = ccount[end] - ccount[start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moving_avg = np.where(n > 0, (csum[end] - csum[start]) / n, np.nan)
+
+        # Baseline: the `window` weeks before each week
+        base_end = end - 1
+        base_start = np.maximum(base_end - window, 0)
+        bn = ccount[base_end] - ccount[base_start]
+        mean = (csum[base_end] - csum[base_start]) / bn
+        var = np.maximum((csq[base_end] - csq[base_start]) / bn - mean ** 2, 0.0)
+        std = np.sqrt(var)
+        deviation = values - mean
+        zscore = np.where(std > 1e-9, deviation / std, np.where(np.abs(deviation) > 1e-9, np.inf, 0.0))
+
+    enough = (bn >= window) & present
+    anomaly = enough & (np.abs(zscore) >= z)
+    zscore = np.where(enough, zscore, np.nan)
+    return {
+        'wow': wow.tolist(),
+        'wow_pct': wow_pct.tolist(),
+        'moving_avg': moving_avg.tolist(),
+        'zscore': zscore.tolist(),
+        'anomaly': anomaly.tolist()
+    }
+
+
+def _trends_python(rows, window: int, z: float) -> Dict[str, Any]:
+    nan = float('nan')
+    result = {key: [] for key in ('wow', 'wow_pct', 'moving_avg', 'zscore', 'anomaly')}
+    columns = len(rows[0]) if rows else 0
+    for i, row in enumerate(rows):
+        wow, wow_pct, moving_avg, zscore, anomaly = [], [], [], [], []
+        for m in range(columns):
+            value = row[m]
+            prev = rows[i - 1][m] if i > 0 else None
+            if value is not None and prev is not None:
+                wow.append(value - prev)
+                wow_pct.append((value - prev) / abs(prev) * 100 if prev != 0 else nan)
+            else:
+                wow.append(nan)
+                wow_pct.append(nan)
+
+            recent = [r[m] for r in rows[max(0, i + 1 - window):i + 1] if r[m] is not None]
+            moving_avg.append(sum(recent) / len(recent) if recent else nan)
+
+            base = [r[m] for r in rows[max(0, i - window):i] if r[m] is not None]
+            if value is None or len(base) < window:
+                zscore.append(nan)
+                anomaly.append(False)
+                continue
+            mean = sum(base) / len(base)
+            std = math.sqrt(max(sum(b * b for b in base) / len(base) - mean ** 2, 0.0))
+            deviation = value - mean
+            if std > 1e-9:
+                score = deviation / std
+            else:
+                score = math.inf if abs(deviation) > 1e-9 else 0.0
+            zscore.append(score)
+            anomaly.append(abs(score) >= z)
+        result['wow'].append(wow)
+        result['wow_pct'].append(wow_pct)
+        result['moving_avg'].append(moving_avg)
+        result['zscore'].append(zscore)
+        result['anomaly'].append(anomaly)
+    return result
+
+
+def compute_trends(values, window: int = MOVING_AVERAGE_WEEKS, z: float = ANOMALY_Z) -> Dict[str, Any]:
+    """
+    Week-over-week change, moving average and anomaly flags per week and metric
+
+    Args:
+        values: weeks x metrics, oldest first (ndarray or list of rows, missing = NaN/None)
+
+    Returns:
+        Dict of weeks x metrics lists: wow, wow_pct, moving_avg, zscore, anomaly
+    """
+    if NUMPY_AVAILABLE and len(values):
+        return _trends_numpy(values, window, z)
+    rows = [[None if v is None or (isinstance(v, float) and math.isnan(v)) else v for v in row] for row in values]
+    return _trends_python(rows, window, z)
+
+
+def build_trend_summary(
+    store: WeeklyMetricsStore,
+    metrics: Sequence[str] = TREND_METRICS,
+    history_weeks: int = HISTORY_WEEKS
+) -> Dict[str, Any]:
+    """Latest-week trend per metric plus the recent history, ready for rendering"""
+    # The anomaly baseline needs `window` weeks before the oldest one shown
+    weeks, values = store.series(metrics, last=history_weeks + MOVING_AVERAGE_WEEKS)
+    if not weeks:
+        return {'weeks': [], 'latest': {}, 'history': []}
+    trends = compute_trends(values)
+    rows = values.tolist() if NUMPY_AVAILABLE else values
+
+    def clean(value):
+        return None if value is None or (isinstance(value, float) and (math.isnan(value))) else value
+
+    last = len(weeks) - 1
+    latest = {
+        name: {
+            'value': clean(rows[last][m]),
+            'previous': clean(rows[last - 1][m]) if last > 0 else None,
+            'wow': clean(trends['wow'][last][m]),
+            'wow_pct': clean(trends['wow_pct'][last][m]),
+            'moving_avg': clean(trends['moving_avg'][last][m]),
+            'anomaly': bool(trends['anomaly'][last][m])
+        }
+        for m, name in enumerate(metrics)
+    }
+    shown = range(max(0, len(weeks) - history_weeks), len(weeks))
+    history = [
+        {
+            'week': weeks[i],
+            'values': {name: clean(rows[i][m]) for m, name in enumerate(metrics)},
+            'anomalies': [name for m, name in enumerate(metrics) if trends['anomaly'][i][m]]
+        }
+        for i in shown
+    ]
+    return {'weeks': [weeks[i] for i in shown], 'latest': latest, 'history': history}
@@ -0,0 +1,365 @@
+"""
+Step Graph Executor
+Runs multi-step skills as a dependency graph instead of a fixed sequence
+
+Steps use the same shape as the Ralph Wiggum reasoning loop:
+- name: Step identifier
+- action: Callable receiving dependency results (by step name) and data as kwargs
+- depends_on: Steps whose results this step needs
+- data: Extra keyword arguments for the action
+- timeout: Optional per-step limit in seconds (defaults to the graph timeout)
+- cache_key: Optional callable returning a fingerprint of the step's external
+  inputs (directory mtimes, content hashes, ETags, time window...). Steps that
+  define it are cached; '' means the step depends only on upstream results
+- cache_valid: Optional callable(result) -> bool rejecting stale cached results
+
+Independent steps run concurrently on a thread pool; a step starts as soon as
+everything it depends on has finished. Failed or timed-out steps record
+{'error': ...} as their result, like the sequential loop did, so downstream
+steps still run with whatever data is available.
+
+With a StepCache, a cacheable step is skipped when its fingerprint and the
+results of the steps it depends on are unchanged since the last run, so a
+re-run after a small change only recomputes the affected part of the graph.
+
+Usage:
+    graph = StepGraph(steps, max_workers=4, default_timeout=60, cache=StepCache("cache.json"))
+    results = graph.run()
+    print(graph.format_report())
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional, Callable
+
+# Configuration
+MAX_WORKERS = 4
+DEFAULT_TIMEOUT = None  # seconds per step; None waits indefinitely
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a JSON-serializable value"""
+    data = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def directory_fingerprint(*directories, suffix: Optional[str] = None) -> str:
+    """Hash of file names, sizes and mtimes in directories (no file contents are read)"""
+    entries = []
+    for directory in directories:
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if suffix and not entry.name.endswith(suffix):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((str(directory), entry.name, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            entries.append((str(directory), None))
+    return fingerprint(sorted(entries, key=str))
+
+
+class StepCache:
+    """
+    Step results persisted between runs, keyed by step inputs
+
+    Also keeps validators (ETag / Last-Modified) and bodies of upstream HTTP
+    responses so callers can make conditional requests.
+    """
+
+    def __init__(self, path, force: bool = False):
+        self.path = Path(path)
+        self.force = force
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._data = {'steps': {}, 'http': {}}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._data.update(json.load(f))
+            except (json.JSONDecodeError, OSError):
+                pass  # A corrupt cache only costs a full recompute
+
+    def get(self, name: str, key: str):
+        """(True, result) when name was last computed with key; force always misses"""
+        with self._lock:
+            entry = self._data['steps'].get(name)
+            if not self.force and entry and entry['key'] == key:
+                self.hits += 1
+                return True, entry['result']
+            self.misses += 1
+            return False, None
+
+    def put(self, name: str, key: str, result: Any):
+        with self._lock:
+            self._data['steps'][name] = {'key': key, 'result': result, 'saved_at': time.time()}
+
+    def get_http(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._data['http'].get(url)
+
+    def put_http(self, url: str, validators: Dict[str, str], body: Any):
+        with self._lock:
+            self._data['http'][url] = {'validators': validators, 'body': body}
+
+    def save(self):
+        with self._lock:
+            tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2, default=str)
+            os.replace(tmp, self.path)
+
+    def report(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+class StepGraph:
+    """Topologically scheduled, concurrent executor for skill steps"""
+
+    def __init__(
+        self,
+        steps: List[Dict[str, Any]],
+        max_workers: int = MAX_WORKERS,
+        default_timeout: Optional[float] = DEFAULT_TIMEOUT,
+        on_start: Optional[Callable[[str], None]] = None,
+        on_finish: Optional[Callable[[str, Any, Optional[str]], None]] = None,
+        on_cached: Optional[Callable[[str, Any], None]] = None,
+        cache: Optional[StepCache] = None
+    ):
+        self.steps = {step['name']: step for step in steps}
+        self.order = [step['name'] for step in steps]
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.on_cached = on_cached
+        self.cache = cache
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.missing: Dict[str, List[str]] = {}
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+        # Unknown dependencies are reported and ignored, as in the sequential loop
+        self.depends: Dict[str, List[str]] = {}
+        for name in self.order:
+            deps = list(self.steps[name].get('depends_on', []))
+            unknown = [dep for dep in deps if dep not in self.steps]
+            if unknown:
+                self.missing[name] = unknown
+            self.depends[name] = [dep for dep in deps if dep in self.steps]
+        self.topological_order()
+
+    def topological_order(self) -> List[str]:
+        """Steps in an order that respects depends_on; raises ValueError on cycles"""
+        indegree = {name: len(self.depends[name]) for name in self.order}
+        dependents = self._dependents()
+        ready = [name for name in self.order if indegree[name] == 0]
+        ordered = []
+        while ready:
+            name = ready.pop(0)
+            ordered.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(ordered) != len(self.order):
+            cycle = [name for name in self.order if name not in ordered]
+            raise ValueError(f"Dependency cycle between steps: {', '.join(cycle)}")
+        return ordered
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents = {name: [] for name in self.order}
+        for name in self.order:
+            for dep in self.depends[name]:
+                dependents[dep].append(name)
+        return dependents
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, name: str) -> Optional[str]:
+        step = self.steps[name]
+        if self.cache is None or 'cache_key' not in step:
+            return None
+        upstream = {dep: fingerprint(self.results[dep]) for dep in self.depends[name]}
+        return fingerprint([name, step['cache_key'](), step.get('data', {}), upstream])
+
+    def _execute(self, name: str, start: float):
+        """Run one step on a worker; returns (result, cache key, served from cache)"""
+        step = self.steps[name]
+        started = time.perf_counter()
+        with self._lock:
+            self.timings[name] = {'start': started - start, 'thread': threading.current_thread().name}
+
+        key = self._cache_key(name)
+        if key is not None:
+            hit, result = self.cache.get(name, key)
+            valid = step.get('cache_valid')
+            if hit and (valid is None or valid(result)):
+                return result, key, True
+
+        if self.on_start:
+            self.on_start(name)
+        kwargs = {dep: self.results[dep] for dep in self.depends[name]}
+        return step['action'](**kwargs, **step.get('data', {})), key, False
+
+    def _finish(self, name: str, result: Any, error: Optional[str], start: float,
+                key: Optional[str] = None, cached: bool = False):
+        now = time.perf_counter() - start
+        with self._lock:
+            timing = self.timings.setdefault(name, {'start': now})
+            timing['end'] = now
+            timing['duration'] = now - timing['start']
+            if cached:
+                timing['status'] = 'cached'
+            elif error:
+                timing['status'] = 'timeout' if error.startswith('Timed out') else 'error'
+            else:
+                timing['status'] = 'ok'
+            self.results[name] = {'error': error} if error else result
+        if error is None and key is not None and not cached:
+            # Failures are never cached, so the next run retries them
+            self.cache.put(name, key, result)
+        if cached:
+            if self.on_cached:
+                self.on_cached(name, result)
+        elif self.on_finish:
+            self.on_finish(name, result, error)
+
+    def run(self) -> Dict[str, Any]:
+        """Run every step; returns {step name: result} in declaration order"""
+        self.results, self.timings = {}, {}
+        remaining = {name: len(self.depends[name]) for name in self.order}
+        dependents = self._dependents()
+        start = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='step')
+        running = {}  # future -> (name, deadline)
+        abandoned = False
+
+        def submit_ready(names):
+            for name in names:
+                timeout = self.steps[name].get('timeout', self.default_timeout)
+                future = executor.submit(self._execute, name, start)
+                # The clock starts at submission; queued steps count against their limit
+                deadline = time.perf_counter() + timeout if timeout else None
+                running[future] = (name, deadline)
+
+        def release(name):
+            ready = []
+            for child in dependents[name]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+            submit_ready(ready)
+
+        try:
+            submit_ready([name for name in self.order if remaining[name] == 0])
+            while running:
+                deadlines = [deadline for _, deadline in running.values() if deadline]
+                wait_for = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, _ = running.pop(future)
+                    try:
+                        result, key, cached = future.result()
+                        self._finish(name, result, None, start, key=key, cached=cached)
+                    except Exception as e:
+                        self._finish(name, None, str(e), start)
+                    release(name)
+
+                now = time.perf_counter()
+                for future, (name, deadline) in list(running.items()):
+                    if deadline and now >= deadline and not future.done():
+                        # Threads cannot be killed: stop waiting and let it finish in the background
+                        future.cancel()
+                        del running[future]
+                        abandoned = True
+                        timeout = self.steps[name].get('timeout', self.default_timeout)
+                        self._finish(name, None, f"Timed out after {timeout}s", start)
+                        release(name)
+        finally:
+            executor.shutdown(wait=not abandoned)
+
+        self.elapsed = time.perf_counter() - start
+        if self.cache is not None:
+            self.cache.save()
+        return {name: self.results[name] for name in self.order if name in self.results}
+
+    # ------------------------------------------------------------------
+    # Timing report
+    # ------------------------------------------------------------------
+
+    def critical_path(self) -> List[str]:
+        """Chain of steps that determined the total run time"""
+        if not self.timings:
+            return []
+        finished = [name for name in self.order if 'end' in self.timings.get(name, {})]
+        if not finished:
+            return []
+        # Walk back from the last step to finish through its latest-finishing dependency
+        current = max(finished, key=lambda name: self.timings[name]['end'])
+        path = [current]
+        while True:
+            deps = [dep for dep in self.depends[current] if 'end' in self.timings.get(dep, {})]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: self.timings[name]['end'])
+            path.append(current)
+        return list(reversed(path))
+
+    def timing_report(self) -> Dict[str, Any]:
+        """Per-step timings, critical path and speedup over running sequentially"""
+        sequential = sum(t.get('duration', 0) for t in self.timings.values())
+        path = self.critical_path()
+        statuses = [t.get('status') for t in self.timings.values()]
+        return {
+            'cache_hits': statuses.count('cached'),
+            'total_seconds': round(self.elapsed, 3),
+            'sequential_seconds': round(sequential, 3),
+            'speedup': round(sequential / self.elapsed, 2) if self.elapsed else 0,
+            'critical_path': path,
+            'critical_path_seconds': round(sum(self.timings[name]['duration'] for name in path), 3),
+            'steps': {
+                name: {
+                    'start': round(t['start'], 3),
+                    'duration': round(t.get('duration', 0), 3),
+                    'status': t.get('status', 'pending')
+                }
+                for name, t in self.timings.items()
+            }
+        }
+
+    def format_report(self) -> str:
+        report = self.timing_report()
+        lines = [
+            f"{'Step':<30} {'Start':>8} {'Duration':>9}  Status",
+            "-" * 58
+        ]
+        for name in self.order:
+            step = report['steps'].get(name)
+            if not step:
+                continue
+            marker = '*' if name in report['critical_path'] else ' '
+            lines.append(f"{marker}{name:<29} {step['start']:>7.2f}s {step['duration']:>8.2f}s  {step['status']}")
+        lines.append("-" * 58)
+        lines.append(
+            f"Total: {report['total_seconds']:.2f}s "
+            f"(sequential {report['sequential_seconds']:.2f}s, {report['speedup']}x)"
+        )
+        lines.append(f"Critical path (*): {' -> '.join(report['critical_path'])}")
+        if self.cache is not None:
+            lines.append(f"Cache: {report['cache_hits']} of {len(report['steps'])} step(s) reused")
+        return '\n'.join(lines)
@@ -10,11 +10,22 @@ Output: /Briefings/YYYY-MM-DD_Monday_Briefing.md
 import os
 import sys
 import json
+import argparse
 import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-import re
+
+try:
+    from Skills.step_graph import StepGraph, StepCache
+    from Skills.briefing_trends import WeeklyMetricsStore, build_trend_summary, iso_week
+except ImportError:  # Run directly as Skills/weekly_ceo_briefing.py
+    from step_graph import StepGraph, StepCache
+    from briefing_trends import WeeklyMetricsStore, build_trend_summary, iso_week
+
+# The vault index lives next to the watchers in the Gold directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from vault_index import get_vault_index
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -26,20 +37,54 @@ COMPLETED_DIR = Path("Completed")
 PLANS_DIR = Path("Plans")
 NEEDS_ACTION_DIR = Path("Needs_Action")
 PENDING_APPROVAL_DIR = Path("Pending_Approval")
+INDEXED_DIRS = [COMPLETED_DIR, PENDING_APPROVAL_DIR, NEEDS_ACTION_DIR]
 
 # MCP Server URLs
 ODOO_MCP_URL = "http://localhost:8082"
 SOCIAL_MCP_URL = "http://localhost:8083"
 X_MCP_URL = "http://localhost:8084"
 
-# Create directories
-BRIEFINGS_DIR.mkdir(exist_ok=True)
+# Step execution
+STEP_WORKERS = 4  # data-gathering steps run concurrently
+STEP_TIMEOUT = 60  # seconds per step
+BRIEFING_CACHE_FILE = Path("Briefing_Cache.json")  # step results reused between runs
+
+# Where each cached step result lives in briefing_data
+STEP_DATA_KEYS = {
+    'read_business_goals': 'business_goals',
+    'read_completed_tasks': 'completed_tasks',
+    'get_odoo_financials': 'financial_summary',
+    'get_social_media_summary': 'social_media_summary',
+    'generate_suggestions': 'suggestions',
+    'calculate_key_metrics': 'key_metrics'
+}
+
+# Trend table rows: metric key -> (label, value format)
+TREND_LABELS = {
+    'tasks_completed': ('Tasks Completed', '{:,.0f}'),
+    'revenue': ('Revenue (PKR)', '{:,.2f}'),
+    'receivables': ('Receivables (PKR)', '{:,.2f}'),
+    'social_posts': ('Social Posts', '{:,.0f}'),
+    'efficiency_score': ('Efficiency Score', '{:,.0f}')
+}
 
 
 class WeeklyCEOBriefing:
     """Generate weekly CEO briefing using Ralph Wiggum reasoning loop"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int = STEP_WORKERS,
+        step_timeout: Optional[float] = STEP_TIMEOUT,
+        cache_file: Optional[Path] = BRIEFING_CACHE_FILE
+    ):
+        self.max_workers = max_workers
+        self.step_timeout = step_timeout
+        self.cache_file = cache_file
+        self.cache = None
+        self.vault = get_vault_index()
+        self.http_revalidated = 0
+        self.timing_report = {}
         self.briefing_data = {
             'period': '',
             'generated_at': datetime.now().isoformat(),
@@ -49,7 +94,8 @@ class WeeklyCEOBriefing:
             'social_media_summary': {},
             'bottlenecks': [],
             'suggestions': [],
-            'key_metrics': {}
+            'key_metrics': {},
+            'trends': {}
         }
     
     def ralph_wiggum_loop(self, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -61,47 +107,98 @@ class WeeklyCEOBriefing:
         - action: Function to execute
         - depends_on: Previous steps this depends on
         - data: Input data for the step
+        - timeout: Optional limit in seconds for the step
         
-        The loop processes steps sequentially, passing results between dependent steps.
+        Steps are scheduled from their depends_on lists: independent steps
+        (the data-gathering ones) run concurrently, and each step starts as
+        soon as the results it depends on are available.
         """
-        results = {}
-        
         print("\n" + "="*70)
         print("🔄 Ralph Wiggum Reasoning Loop - CEO Briefing Generation")
         print("="*70)
         
-        for step in steps:
-            step_name = step['name']
-            step_action = step['action']
-            step_depends = step.get('depends_on', [])
-            step_data = step.get('data', {})
-            
-            # Gather dependencies
-            dep_results = {}
-            for dep in step_depends:
-                if dep in results:
-                    dep_results[dep] = results[dep]
-                else:
-                    print(f"⚠️  Warning: Dependency '{dep}' not found for step '{step_name}'")
-            
+        def on_start(step_name):
             print(f"\n📌 Step: {step_name}")
-            print("-" * 50)
-            
-            try:
-                # Execute step action
-                result = step_action(**dep_results, **step_data)
-                results[step_name] = result
+        
+        def on_finish(step_name, result, error):
+            if error:
+                print(f"❌ Error in {step_name}: {error}")
+            else:
                 print(f"✅ Completed: {step_name}")
-            except Exception as e:
-                print(f"❌ Error in {step_name}: {str(e)}")
-                results[step_name] = {'error': str(e)}
+        
+        graph = StepGraph(
+            steps,
+            max_workers=self.max_workers,
+            default_timeout=self.step_timeout,
+            on_start=on_start,
+            on_finish=on_finish,
+            on_cached=self.restore_cached_step,
+            cache=self.cache
+        )
+        for step_name, deps in graph.missing.items():
+            for dep in deps:
+                print(f"⚠️  Warning: Dependency '{dep}' not found for step '{step_name}'")
+        
+        results = graph.run()
+        self.timing_report = graph.timing_report()
         
         print("\n" + "="*70)
         print("📋 Ralph Wiggum Loop Complete")
-        print("="*70 + "\n")
+        print("="*70)
+        print(graph.format_report())
+        if self.http_revalidated:
+            print(f"Upstream responses unchanged (304): {self.http_revalidated}")
+        print()
         
         return results
     
+    def restore_cached_step(self, step_name: str, result: Any):
+        """Put a cached step result back into briefing_data, as running the step would"""
+        print(f"\n💾 Cached: {step_name}")
+        if step_name in STEP_DATA_KEYS:
+            self.briefing_data[STEP_DATA_KEYS[step_name]] = result
+        elif step_name == 'identify_bottlenecks':
+            self.briefing_data['bottlenecks'] = result.get('bottlenecks', [])
+    
+    def week_window(self) -> str:
+        """Reporting window by day; part of the cache key of time-dependent steps"""
+        now = datetime.now()
+        return f"{(now - timedelta(days=7)).strftime('%Y-%m-%d')} to {now.strftime('%Y-%m-%d')}"
+    
+    @staticmethod
+    def file_fingerprint(path: Path) -> List[Any]:
+        try:
+            stat = path.stat()
+            return [str(path), stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            return [str(path), None]
+    
+    def get_json(self, url: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        GET an MCP endpoint, revalidating the last response with its ETag /
+        Last-Modified so an unchanged upstream answers 304 and is not re-sent
+        """
+        cached = self.cache.get_http(url) if self.cache else None
+        headers = {}
+        if cached:
+            if 'ETag' in cached['validators']:
+                headers['If-None-Match'] = cached['validators']['ETag']
+            if 'Last-Modified' in cached['validators']:
+                headers['If-Modified-Since'] = cached['validators']['Last-Modified']
+        
+        resp = requests.get(url, headers=headers, timeout=timeout)
+        if resp.status_code == 304 and cached:
+            self.http_revalidated += 1
+            return cached['body']
+        if resp.status_code != 200:
+            return None
+        
+        body = resp.json()
+        validators = {name: resp.headers[name] for name in ('ETag', 'Last-Modified') if name in resp.headers}
+        if validators and self.cache:
+            self.cache.put_http(url, validators, body)
+        return body
+    
     def read_business_goals(self, **kwargs) -> Dict[str, Any]:
         """Read and parse Business_Goals.md"""
         goals_file = Path("Business_Goals.md")
@@ -166,7 +263,7 @@ class WeeklyCEOBriefing:
         return goals
     
     def read_completed_tasks(self, **kwargs) -> Dict[str, Any]:
-        """Read completed tasks from last week"""
+        """Read completed tasks from last week (served by the vault index)"""
         completed = {
             'tasks': [],
             'total_count': 0,
@@ -176,44 +273,15 @@ class WeeklyCEOBriefing:
         # Calculate date range (last 7 days)
         week_ago = datetime.now() - timedelta(days=7)
         
-        # Read from Completed directory
-        if COMPLETED_DIR.exists():
-            for file in COMPLETED_DIR.iterdir():
-                if file.suffix == '.md':
-                    try:
-                        mtime = datetime.fromtimestamp(file.stat().st_mtime)
-                        if mtime > week_ago:
-                            with open(file, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                
-                                # Extract task info
-                                task = {
-                                    'file': file.name,
-                                    'completed_at': mtime.isoformat(),
-                                    'title': file.stem
-                                }
-                                
-                                # Try to extract category from content
-                                if 'Category:' in content:
-                                    match = re.search(r'Category:\s*(.+)', content)
-                                    if match:
-                                        task['category'] = match.group(1).strip()
-                                
-                                completed['tasks'].append(task)
-                    except Exception as e:
-                        print(f"   Warning: Could not read {file.name}: {e}")
-        
-        # Also check recent Plans that might be completed
-        if PLANS_DIR.exists():
-            for file in PLANS_DIR.iterdir():
-                if file.suffix == '.md':
-                    try:
-                        mtime = datetime.fromtimestamp(file.stat().st_mtime)
-                        if mtime > week_ago:
-                            # Count as potential activity
-                            pass
-                    except:
-                        pass
+        for row in self.vault.files(COMPLETED_DIR.name, since=week_ago.timestamp(), suffix='.md'):
+            task = {
+                'file': row['name'],
+                'completed_at': datetime.fromtimestamp(row['mtime']).isoformat(),
+                'title': Path(row['name']).stem
+            }
+            if row['category']:
+                task['category'] = row['category']
+            completed['tasks'].append(task)
         
         completed['total_count'] = len(completed['tasks'])
         
@@ -301,29 +369,31 @@ class WeeklyCEOBriefing:
             'instagram_posts': 0,
             'twitter_posts': 0,
             'total_engagement': 0,
-            'recent_posts': []
+            'recent_posts': [],
+            'meta_status': 'unavailable',
+            'x_status': 'unavailable'
         }
         
         # Get Meta (Facebook/Instagram) summary
         try:
-            meta_resp = requests.get(f"{SOCIAL_MCP_URL}/tools/generate_meta_summary")
-            if meta_resp.status_code == 200:
-                meta_data = meta_resp.json()
+            meta_data = self.get_json(f"{SOCIAL_MCP_URL}/tools/generate_meta_summary")
+            if meta_data:
                 if meta_data.get('success'):
                     summary = meta_data.get('summary', {})
                     social['facebook_posts'] = summary.get('facebook_posts', 0)
                     social['instagram_posts'] = summary.get('instagram_posts', 0)
+                    social['meta_status'] = 'connected'
         except Exception as e:
             print(f"   Warning: Could not fetch Meta summary: {e}")
         
         # Get X (Twitter) summary
         try:
-            x_resp = requests.get(f"{X_MCP_URL}/tools/generate_x_summary")
-            if x_resp.status_code == 200:
-                x_data = x_resp.json()
+            x_data = self.get_json(f"{X_MCP_URL}/tools/generate_x_summary")
+            if x_data:
                 if x_data.get('success'):
                     summary = x_data.get('summary', {})
                     social['twitter_posts'] = summary.get('total_posts', 0)
+                    social['x_status'] = 'connected'
         except Exception as e:
             print(f"   Warning: Could not fetch X summary: {e}")
         
@@ -367,26 +437,24 @@ class WeeklyCEOBriefing:
             })
         
         # Check pending approvals
-        if PENDING_APPROVAL_DIR.exists():
-            pending_count = len(list(PENDING_APPROVAL_DIR.iterdir()))
-            if pending_count > 5:
-                bottlenecks.append({
-                    'type': 'approval_bottleneck',
-                    'severity': 'medium',
-                    'description': f'{pending_count} items pending approval',
-                    'suggestion': 'Review and approve pending items to unblock workflows'
-                })
+        pending_count = self.vault.count(PENDING_APPROVAL_DIR.name)
+        if pending_count > 5:
+            bottlenecks.append({
+                'type': 'approval_bottleneck',
+                'severity': 'medium',
+                'description': f'{pending_count} items pending approval',
+                'suggestion': 'Review and approve pending items to unblock workflows'
+            })
         
         # Check needs_action directory
-        if NEEDS_ACTION_DIR.exists():
-            needs_action_count = len(list(NEEDS_ACTION_DIR.iterdir()))
-            if needs_action_count > 50:
-                bottlenecks.append({
-                    'type': 'backlog',
-                    'severity': 'low',
-                    'description': f'{needs_action_count} items in Needs_Action',
-                    'suggestion': 'Process backlog to prevent accumulation'
-                })
+        needs_action_count = self.vault.count(NEEDS_ACTION_DIR.name)
+        if needs_action_count > 50:
+            bottlenecks.append({
+                'type': 'backlog',
+                'severity': 'low',
+                'description': f'{needs_action_count} items in Needs_Action',
+                'suggestion': 'Process backlog to prevent accumulation'
+            })
         
         print(f"   Identified {len(bottlenecks)} bottlenecks")
         
@@ -482,6 +550,87 @@ class WeeklyCEOBriefing:
         self.briefing_data['key_metrics'] = metrics
         return metrics
     
+    def record_weekly_metrics(self, **kwargs) -> Dict[str, Any]:
+        """Store this week's metrics and compute trends against previous weeks"""
+        metrics = kwargs.get('calculate_key_metrics', {})
+        store = WeeklyMetricsStore()
+        if 'error' not in metrics:
+            recorded = self.recordable_metrics(
+                metrics, kwargs.get('get_odoo_financials', {}), kwargs.get('get_social_media_summary', {})
+            )
+            store.record(iso_week(datetime.now().date()), recorded)
+            store.save()
+        
+        trends = build_trend_summary(store)
+        anomalies = [name for name, trend in trends['latest'].items() if trend['anomaly']]
+        print(f"   Weeks of history: {len(store.weeks)}")
+        if anomalies:
+            print(f"   Anomalies: {', '.join(anomalies)}")
+        
+        self.briefing_data['trends'] = trends
+        return trends
+    
+    @staticmethod
+    def recordable_metrics(
+        metrics: Dict[str, Any],
+        financials: Dict[str, Any],
+        social: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Key metrics for the history, without the placeholder zeros of offline sources
+
+        Revenue and receivables are only real when Odoo answered, and the social
+        post count only when both social servers did; otherwise they are None,
+        which the store skips, so trends and anomaly baselines are not skewed.
+        """
+        recorded = dict(metrics)
+        if financials.get('odoo_status') != 'connected':
+            recorded['revenue'] = recorded['receivables'] = None
+        if social.get('meta_status') != 'connected' or social.get('x_status') != 'connected':
+            recorded['social_posts'] = None
+        return recorded
+    
+    @staticmethod
+    def format_trend_section(trends: Dict[str, Any]) -> str:
+        """Markdown trend tables for the briefing"""
+        content = "## 📈 Trends\n\n"
+        if len(trends.get('weeks', [])) < 2:
+            content += "*Trends appear once two or more weeks of briefings have been recorded.*\n"
+            return content
+        
+        def fmt(name, value):
+            return TREND_LABELS[name][1].format(value) if value is not None else 'N/A'
+        
+        # WoW compares with the previous recorded week (weeks without a briefing are skipped)
+        content += "| Metric | This Week | Previous | WoW | 4-Wk Avg | Signal |\n"
+        content += "|--------|-----------|----------|-----|----------|--------|\n"
+        for name, trend in trends['latest'].items():
+            if name not in TREND_LABELS:
+                continue
+            if trend['wow'] is None:
+                wow = 'N/A'
+            else:
+                arrow = '▲' if trend['wow'] > 0 else '▼' if trend['wow'] < 0 else '▶'
+                pct = f" ({trend['wow_pct']:+.0f}%)" if trend['wow_pct'] is not None else ''
+                wow = f"{arrow} {fmt(name, abs(trend['wow']))}{pct}"
+            signal = '⚠️ Anomaly' if trend['anomaly'] else '✅'
+            content += (
+                f"| {TREND_LABELS[name][0]} | {fmt(name, trend['value'])} | {fmt(name, trend['previous'])} "
+                f"| {wow} | {fmt(name, trend['moving_avg'])} | {signal} |\n"
+            )
+        
+        content += f"\n### Last {len(trends['history'])} Weeks\n\n"
+        names = [name for name in trends['latest'] if name in TREND_LABELS]
+        content += "| Week | " + " | ".join(TREND_LABELS[name][0] for name in names) + " |\n"
+        content += "|------|" + "|".join("-" * (len(TREND_LABELS[name][0]) + 2) for name in names) + "|\n"
+        for week in trends['history']:
+            cells = []
+            for name in names:
+                cell = fmt(name, week['values'].get(name))
+                cells.append(f"{cell} ⚠️" if name in week['anomalies'] else cell)
+            content += f"| {week['week']} | " + " | ".join(cells) + " |\n"
+        return content
+    
     def generate_briefing_document(self, **kwargs) -> str:
         """Generate the final briefing markdown document"""
         now = datetime.now()
@@ -492,6 +641,7 @@ class WeeklyCEOBriefing:
         # Generate filename
         filename = f"{now.strftime('%Y-%m-%d')}_Monday_Briefing.md"
         filepath = BRIEFINGS_DIR / filename
+        BRIEFINGS_DIR.mkdir(exist_ok=True)
         
         # Build document content
         content = f"""# Weekly CEO Briefing
@@ -514,10 +664,12 @@ class WeeklyCEOBriefing:
 
 ---
 
-## 🎯 Business Goals Progress
-
 """
         
+        # Add week-over-week trends from the metrics history
+        content += self.format_trend_section(self.briefing_data.get('trends', {}))
+        content += "\n---\n\n## 🎯 Business Goals Progress\n\n"
+        
         # Add business goals
         goals = self.briefing_data.get('business_goals', {})
         for goal in goals.get('strategic_goals', [])[:5]:
@@ -637,7 +789,8 @@ class WeeklyCEOBriefing:
 
 **Date:** {datetime.now().strftime('%Y-%m-%d')}  
 **File:** [{Path(briefing_path).name}]({briefing_path})  
-**Status:** Ready for Review
+**Status:** Ready for Review  
+**Queue:** {self.vault.count(NEEDS_ACTION_DIR.name)} in Needs_Action, {self.vault.count(PENDING_APPROVAL_DIR.name)} pending approval
 
 """
         
@@ -671,26 +824,42 @@ class WeeklyCEOBriefing:
         
         return {'status': 'success', 'path': str(dashboard_file)}
     
-    def generate(self) -> str:
-        """Main entry point - generate complete CEO briefing"""
+    def generate(self, force: bool = False) -> str:
+        """
+        Main entry point - generate complete CEO briefing
+        
+        Steps whose inputs (files, upstream results, reporting window) are
+        unchanged since the last run are reused from the cache; force=True
+        recomputes everything.
+        """
         print("\n" + "="*70)
         print("📊 Weekly CEO Briefing Generation")
         print("="*70)
         print(f"Period: {(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}")
         
-        # Define Ralph Wiggum Loop steps
+        self.briefing_data['period'] = self.week_window()
+        # Cheap stat-only sync, skipped while the supervisor keeps the index current
+        self.vault.ensure_fresh([d.name for d in INDEXED_DIRS])
+        if self.cache_file:
+            self.cache = StepCache(self.cache_file, force=force)
+        
+        # Define Ralph Wiggum Loop steps. Steps with a cache_key are reused
+        # while the key and their upstream results are unchanged; the
+        # network fetches always run and key everything downstream of them.
         steps = [
             {
                 'name': 'read_business_goals',
                 'action': self.read_business_goals,
                 'depends_on': [],
-                'data': {}
+                'data': {},
+                'cache_key': lambda: self.file_fingerprint(Path("Business_Goals.md"))
             },
             {
                 'name': 'read_completed_tasks',
                 'action': self.read_completed_tasks,
                 'depends_on': [],
-                'data': {}
+                'data': {},
+                'cache_key': lambda: [self.vault.version(COMPLETED_DIR.name), self.week_window()]
             },
             {
                 'name': 'get_odoo_financials',
@@ -708,18 +877,27 @@ class WeeklyCEOBriefing:
                 'name': 'identify_bottlenecks',
                 'action': self.identify_bottlenecks,
                 'depends_on': ['read_completed_tasks', 'get_odoo_financials'],
-                'data': {}
+                'data': {},
+                'cache_key': lambda: [self.vault.version(d.name) for d in (PENDING_APPROVAL_DIR, NEEDS_ACTION_DIR)]
             },
             {
                 'name': 'generate_suggestions',
                 'action': self.generate_suggestions,
                 'depends_on': ['identify_bottlenecks', 'get_odoo_financials'],
-                'data': {}
+                'data': {},
+                'cache_key': lambda: ''
             },
             {
                 'name': 'calculate_key_metrics',
                 'action': self.calculate_key_metrics,
                 'depends_on': ['read_completed_tasks', 'get_social_media_summary', 'get_odoo_financials'],
+                'data': {},
+                'cache_key': lambda: ''
+            },
+            {
+                'name': 'record_weekly_metrics',
+                'action': self.record_weekly_metrics,
+                'depends_on': ['calculate_key_metrics', 'get_odoo_financials', 'get_social_media_summary'],
                 'data': {}
             },
             {
@@ -732,9 +910,12 @@ class WeeklyCEOBriefing:
                     'get_social_media_summary',
                     'identify_bottlenecks',
                     'generate_suggestions',
-                    'calculate_key_metrics'
+                    'calculate_key_metrics',
+                    'record_weekly_metrics'
                 ],
-                'data': {}
+                'data': {},
+                'cache_key': self.week_window,
+                'cache_valid': lambda path: Path(path).exists()
             },
             {
                 'name': 'update_dashboard',
@@ -767,6 +948,10 @@ class WeeklyCEOBriefing:
 # ============================================================================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the weekly CEO briefing")
+    parser.add_argument('--force', action='store_true', help="Ignore cached step results and recompute every step")
+    args = parser.parse_args()
+    
     briefing = WeeklyCEOBriefing()
-    briefing_path = briefing.generate()
+    briefing_path = briefing.generate(force=args.force)
     print(f"\n📄 Briefing generated: {briefing_path}")
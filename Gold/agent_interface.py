@@ -26,6 +26,9 @@ class AgentInterface:
         
         # Initialize processors
         self.email_processor = ApprovalBasedEmailProcessor()
+        
+        # Track previously seen files to detect new ones
+        self.previous_approved_files = set()
 
     def scan_approved_files(self):
         """Scan the Approved directory for newly approved files"""
@@ -131,30 +134,33 @@ class AgentInterface:
 
         return processed_count
 
+    def check_new_approvals(self):
+        """Process approvals if new files appeared since the last check; returns the number processed"""
+        current_approved_files = {f.name for f in self.scan_approved_files()}
+        new_approved_files = current_approved_files - self.previous_approved_files
+        processed_count = 0
+        
+        if new_approved_files:
+            print(f"New approvals detected: {new_approved_files}")
+            processed_count = self.process_approvals()
+            print(f"Processed {processed_count} new approvals")
+            
+            # Update the list of seen files
+            self.previous_approved_files = {f.name for f in self.scan_approved_files()}
+        else:
+            # Update the list of seen files if no new ones
+            self.previous_approved_files = current_approved_files
+        
+        return processed_count
+
     def run_approval_monitoring(self, interval=5):
         """Run a continuous monitoring loop for approvals"""
         print("Starting Agent Interface - Approval Monitoring...")
         print(f"Monitoring: {self.approved_dir} for new approvals")
         
-        # Track previously seen files to detect new ones
-        previous_approved_files = set()
-        
         try:
             while True:
-                current_approved_files = {f.name for f in self.scan_approved_files()}
-                new_approved_files = current_approved_files - previous_approved_files
-                
-                if new_approved_files:
-                    print(f"New approvals detected: {new_approved_files}")
-                    processed_count = self.process_approvals()
-                    print(f"Processed {processed_count} new approvals")
-                    
-                    # Update the list of seen files
-                    previous_approved_files = {f.name for f in self.scan_approved_files()}
-                else:
-                    # Update the list of seen files if no new ones
-                    previous_approved_files = current_approved_files
-                
+                self.check_new_approvals()
                 time.sleep(interval)
                 
         except KeyboardInterrupt:
@@ -20,8 +20,7 @@ import threading
 import os
 
 # Configuration
-LOGS_DIR = Path("Logs")
-LOGS_DIR.mkdir(exist_ok=True)
+LOGS_DIR = Path("Logs")  # created on first write
 
 # Setup logging
 logger = logging.getLogger('audit_log')
@@ -69,6 +68,7 @@ class AuditLogger:
         
         # Initialize file if new
         if not self._current_file.exists():
+            self.logs_dir.mkdir(parents=True, exist_ok=True)
             self._init_log_file()
     
     def _init_log_file(self):
@@ -303,6 +303,7 @@ class AuditLogger:
         
         # Export
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
         
         if format == 'json':
             export_file = self.logs_dir / f"audit_export_{timestamp}.json"
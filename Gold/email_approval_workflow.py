@@ -203,6 +203,14 @@ class ApprovalBasedEmailProcessor:
         print(f"Processed {success_count}/{len(email_requests)} email requests successfully.")
         return True
     
+    def run_once(self):
+        """Process email requests if an approval is present; returns True if it ran"""
+        if self.email_sender.has_approval():
+            print("Approval detected. Processing email requests...")
+            self.process_email_requests()
+            return True
+        return False
+    
     def run_monitoring_loop(self, interval=10):
         """Run a continuous monitoring loop for email requests and approvals"""
         print("Starting email approval monitoring loop...")
@@ -213,10 +221,7 @@ class ApprovalBasedEmailProcessor:
         
         try:
             while True:
-                if self.email_sender.has_approval():
-                    print("Approval detected. Processing email requests...")
-                    self.process_email_requests()
-                
+                self.run_once()
                 time.sleep(interval)
         except KeyboardInterrupt:
             print("\nEmail monitoring loop stopped by user.")
@@ -27,8 +27,7 @@ EXPONENTIAL_BASE = 2
 logger = logging.getLogger('error_recovery')
 
 # Queue directory for offline operations
-QUEUE_DIR = Path("Offline_Queue")
-QUEUE_DIR.mkdir(exist_ok=True)
+QUEUE_DIR = Path("Offline_Queue")  # queue directories are created on first enqueue
 
 
 class CircuitBreaker:
@@ -180,7 +179,6 @@ class OfflineQueue:
     
     def __init__(self, queue_dir: Path = QUEUE_DIR):
         self.queue_dir = queue_dir
-        self.queue_dir.mkdir(exist_ok=True)
         self._lock = threading.Lock()
     
     def enqueue(self, operation: Dict[str, Any]) -> str:
@@ -189,6 +187,7 @@ class OfflineQueue:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
             filename = f"queue_{timestamp}.json"
             filepath = self.queue_dir / filename
+            self.queue_dir.mkdir(parents=True, exist_ok=True)
             
             queue_item = {
                 'id': filename.replace('queue_', '').replace('.json', ''),
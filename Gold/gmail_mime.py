@@ -0,0 +1,260 @@
+"""
+Gmail MIME Walker
+
+Extracts the readable body and the attachments from a Gmail API message
+resource (format='full'):
+- Recursive walk over nested multipart/* trees
+- text/plain preferred; HTML-only mail is converted to text
+- Charset taken from the part's Content-Type, with utf-8/cp1252 fallbacks
+- Attachments are base64-decoded in chunks straight to disk, hashed while
+  writing, capped at MAX_ATTACHMENT_BYTES and de-duplicated by SHA-256
+
+Attachments are spooled to Needs_Action/Attachments as <sha256[:16]>_<filename>.
+"""
+
+import os
+import re
+import base64
+import hashlib
+import logging
+import tempfile
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, List, Optional
+
+logger = logging.getLogger('gmail_mime')
+
+# Configuration
+ATTACHMENTS_DIR = Path("Needs_Action") / "Attachments"
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024  # Gmail's own per-message limit
+DECODE_CHUNK = 64 * 1024  # base64 characters per decode step (multiple of 4)
+FALLBACK_CHARSETS = ('utf-8', 'cp1252', 'latin-1')
+
+BLOCK_TAGS = {'p', 'div', 'br', 'tr', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'blockquote'}
+SKIP_TAGS = {'script', 'style', 'head', 'title'}
+
+
+class _HTMLTextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.chunks.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Convert an HTML body to plain text (block tags become line breaks)"""
+    parser = _HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    text = ''.join(parser.chunks)
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r' *\n *', '\n', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def iter_base64_chunks(data: str, chunk_size: int = DECODE_CHUNK) -> Iterator[bytes]:
+    """Decode base64url data a slice at a time"""
+    chunk_size -= chunk_size % 4
+    for start in range(0, len(data), chunk_size):
+        piece = data[start:start + chunk_size]
+        if len(piece) % 4:
+            piece += '=' * (-len(piece) % 4)
+        yield base64.urlsafe_b64decode(piece)
+
+
+def decode_base64(data: str) -> bytes:
+    return b''.join(iter_base64_chunks(data))
+
+
+def _header(part: Dict[str, Any], name: str) -> str:
+    for header in part.get('headers', []) or []:
+        if header.get('name', '').lower() == name:
+            return header.get('value', '')
+    return ''
+
+
+def part_charset(part: Dict[str, Any]) -> Optional[str]:
+    """Charset parameter of the part's Content-Type header"""
+    match = re.search(r'charset\s*=\s*"?([\w.:-]+)', _header(part, 'content-type'), re.I)
+    return match.group(1).lower() if match else None
+
+
+def decode_text(raw: bytes, charset: Optional[str] = None) -> str:
+    """Decode bytes with the declared charset, falling back to common encodings"""
+    for candidate in ((charset,) if charset else ()) + FALLBACK_CHARSETS:
+        try:
+            return raw.decode(candidate)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return raw.decode('utf-8', errors='replace')
+
+
+def iter_leaf_parts(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Depth-first walk yielding every non-multipart part"""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        children = part.get('parts') or []
+        if children:
+            stack.extend(reversed(children))
+        else:
+            yield part
+
+
+def _safe_filename(name: str) -> str:
+    name = "".join(c for c in Path(name).name if c.isalnum() or c in (' ', '-', '_', '.')).strip()
+    return name or 'attachment'
+
+
+class AttachmentSpooler:
+    """Writes attachments to disk in chunks with a size cap and content-hash dedup"""
+
+    def __init__(self, directory: Path = ATTACHMENTS_DIR, max_bytes: int = MAX_ATTACHMENT_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def find(self, sha256: str) -> Optional[Path]:
+        """Existing spooled file with this content hash"""
+        if not self.directory.exists():
+            return None
+        return next(self.directory.glob(f"{sha256[:16]}_*"), None)
+
+    def spool(self, filename: str, data: str) -> Dict[str, Any]:
+        """
+        Decode base64url data to disk
+
+        Returns:
+            Dict with filename, path, size, sha256 and deduplicated, or with
+            skipped set when the attachment exceeds max_bytes.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter_base64_chunks(data):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise OverflowError
+                    digest.update(chunk)
+                    f.write(chunk)
+        except OverflowError:
+            os.remove(tmp_name)
+            return {'filename': filename, 'size': size, 'skipped': f"exceeds {self.max_bytes} bytes"}
+        except Exception:
+            os.remove(tmp_name)
+            raise
+
+        sha256 = digest.hexdigest()
+        existing = self.find(sha256)
+        if existing:
+            os.remove(tmp_name)
+            return {'filename': filename, 'path': str(existing), 'size': size, 'sha256': sha256, 'deduplicated': True}
+
+        path = self.directory / f"{sha256[:16]}_{_safe_filename(filename)}"
+        os.replace(tmp_name, path)
+        return {'filename': filename, 'path': str(path), 'size': size, 'sha256': sha256, 'deduplicated': False}
+
+
+class MimeWalker:
+    """
+    Body and attachment extraction for Gmail message resources
+
+    Usage:
+        walker = MimeWalker(fetch_attachment=lambda msg_id, att_id: ...)
+        parsed = walker.parse(message)  # {'body', 'body_format', 'attachments'}
+
+    fetch_attachment returns the base64url data of a part stored by
+    attachmentId (users().messages().attachments().get(...)['data']). Without
+    it, or without a spooler, attachments are only listed.
+    """
+
+    def __init__(
+        self,
+        fetch_attachment: Optional[Callable[[str, str], str]] = None,
+        spooler: Optional[AttachmentSpooler] = None
+    ):
+        self.fetch_attachment = fetch_attachment
+        self.spooler = spooler
+
+    def _part_data(self, msg_id: str, part: Dict[str, Any]) -> Optional[str]:
+        body = part.get('body', {}) or {}
+        if body.get('data'):
+            return body['data']
+        if body.get('attachmentId') and self.fetch_attachment:
+            return self.fetch_attachment(msg_id, body['attachmentId'])
+        return None
+
+    def _attachment(self, msg_id: str, part: Dict[str, Any]) -> Dict[str, Any]:
+        body = part.get('body', {}) or {}
+        filename = part.get('filename') or 'attachment'
+        info = {'filename': filename, 'mime_type': part.get('mimeType', ''), 'size': body.get('size', 0)}
+
+        if not self.spooler:
+            return info
+        # The declared size lets oversized files be skipped without downloading them
+        if body.get('size', 0) > self.spooler.max_bytes:
+            info['skipped'] = f"exceeds {self.spooler.max_bytes} bytes"
+            return info
+
+        try:
+            data = self._part_data(msg_id, part)
+            if data is None:
+                info['skipped'] = 'no data'
+                return info
+            info.update(self.spooler.spool(filename, data))
+        except Exception as e:
+            logger.error(f"Failed to save attachment {filename} of {msg_id}: {e}")
+            info['skipped'] = str(e)
+        return info
+
+    def parse(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Walk the message payload and return its body text and attachments"""
+        msg_id = message.get('id', '')
+        plain = None
+        html = None
+        attachments = []
+
+        for part in iter_leaf_parts(message.get('payload', {}) or {}):
+            mime_type = (part.get('mimeType') or '').lower()
+            disposition = _header(part, 'content-disposition').lower()
+
+            if part.get('filename') or disposition.startswith('attachment'):
+                attachments.append(self._attachment(msg_id, part))
+                continue
+
+            if mime_type == 'text/plain' and plain is None:
+                data = self._part_data(msg_id, part)
+                if data:
+                    plain = decode_text(decode_base64(data), part_charset(part))
+            elif mime_type == 'text/html' and html is None:
+                data = self._part_data(msg_id, part)
+                if data:
+                    html = decode_text(decode_base64(data), part_charset(part))
+
+        if plain is not None:
+            body, body_format = plain, 'text'
+        elif html is not None:
+            body, body_format = html_to_text(html), 'html'
+        else:
+            body, body_format = '', 'empty'
+
+        return {'body': body, 'body_format': body_format, 'attachments': attachments}
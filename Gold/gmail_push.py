@@ -0,0 +1,246 @@
+"""
+Gmail Push Ingestion
+
+Replaces fixed-interval polling with change notifications:
+- Local webhook that accepts Gmail Pub/Sub push notifications
+  ({"message": {"data": base64({"emailAddress", "historyId"})}}) or a plain
+  {"historyId": ...} body from a local stand-in
+- Each notification wakes the ingestion loop for an immediate incremental sync;
+  notifications arriving during a sync are coalesced into one follow-up sync
+- Adaptive fallback polling: the interval halves while mail is arriving and
+  grows back towards the idle maximum when nothing is found
+- Optional users().watch() registration (renewed daily, Gmail expires it after 7 days)
+
+Configuration (environment):
+    GMAIL_PUSH_HOST     Webhook bind address (default localhost)
+    GMAIL_PUSH_PORT     Webhook port (default 8090)
+    GMAIL_PUSH_TOKEN    Shared secret expected as ?token= on the push URL
+    GMAIL_PUBSUB_TOPIC  projects/<project>/topics/<topic> to register with users().watch()
+"""
+
+import os
+import json
+import hmac
+import time
+import base64
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger('gmail_push')
+
+# Configuration
+PUSH_HOST = os.getenv('GMAIL_PUSH_HOST', 'localhost')
+PUSH_PORT = int(os.getenv('GMAIL_PUSH_PORT', '8090'))
+PUSH_PATH = '/gmail/push'
+MIN_POLL_INTERVAL = 30  # seconds, while mail keeps arriving
+MAX_POLL_INTERVAL = 300  # seconds, when idle
+WATCH_RENEW_SECONDS = 24 * 3600
+
+
+def decode_notification(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode a push notification body
+
+    Accepts the Pub/Sub push envelope or a bare {"emailAddress", "historyId"}
+    dict. Raises ValueError for anything else.
+    """
+    message = payload.get('message')
+    if isinstance(message, dict):
+        try:
+            data = json.loads(base64.b64decode(message.get('data', '')).decode('utf-8'))
+        except Exception as e:
+            raise ValueError(f"Invalid Pub/Sub message data: {e}")
+    else:
+        data = payload
+
+    if not isinstance(data, dict) or 'historyId' not in data:
+        raise ValueError("Notification has no historyId")
+
+    return {'email_address': data.get('emailAddress'), 'history_id': str(data['historyId'])}
+
+
+class AdaptivePollInterval:
+    """Poll interval that shrinks while busy and grows while idle"""
+
+    def __init__(
+        self,
+        minimum: float = MIN_POLL_INTERVAL,
+        maximum: float = MAX_POLL_INTERVAL,
+        shrink: float = 0.5,
+        grow: float = 1.5
+    ):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.shrink = shrink
+        self.grow = grow
+        self.current = self.maximum
+
+    def update(self, new_messages: int) -> float:
+        """Adjust after a sync that found new_messages; returns the next interval"""
+        if new_messages:
+            self.current = max(self.minimum, self.current * self.shrink)
+        else:
+            self.current = min(self.maximum, self.current * self.grow)
+        return self.current
+
+
+class PushNotificationServer:
+    """
+    Webhook receiving push notifications on a background thread
+
+    Usage:
+        server = PushNotificationServer(loop.notify, port=8090, token='secret')
+        server.start()
+    """
+
+    def __init__(
+        self,
+        on_notification: Callable[[Dict[str, Any]], None],
+        host: str = PUSH_HOST,
+        port: int = PUSH_PORT,
+        path: str = PUSH_PATH,
+        token: Optional[str] = None
+    ):
+        self.on_notification = on_notification
+        self.path = path
+        self.token = token
+        self.received = 0
+        self.rejected = 0
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    def _handler_class(self):
+        push_server = self
+
+        class PushRequestHandler(BaseHTTPRequestHandler):
+            def _respond(self, status, body=None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                if body is not None:
+                    self.wfile.write(json.dumps(body).encode())
+
+            def do_GET(self):
+                if urlparse(self.path).path == '/health':
+                    self._respond(200, {'status': 'healthy', 'received': push_server.received})
+                else:
+                    self._respond(404, {'error': 'Not found'})
+
+            def do_POST(self):
+                parsed = urlparse(self.path)
+                if parsed.path != push_server.path:
+                    self._respond(404, {'error': 'Not found'})
+                    return
+
+                if push_server.token:
+                    supplied = parse_qs(parsed.query).get('token', [''])[0]
+                    if not hmac.compare_digest(supplied, push_server.token):
+                        push_server.rejected += 1
+                        self._respond(403, {'error': 'Invalid token'})
+                        return
+
+                content_length = int(self.headers.get('Content-Length', 0))
+                try:
+                    notification = decode_notification(json.loads(self.rfile.read(content_length) or b'{}'))
+                except ValueError as e:
+                    # Acknowledge anyway so Pub/Sub does not redeliver a malformed message forever
+                    push_server.rejected += 1
+                    logger.warning(f"Ignoring push notification: {e}")
+                    self._respond(204)
+                    return
+
+                push_server.received += 1
+                push_server.on_notification(notification)
+                self._respond(204)
+
+            def log_message(self, format, *args):
+                logger.debug(f"[Gmail Push] {args[0]}")
+
+        return PushRequestHandler
+
+    def start(self):
+        """Serve on a daemon thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='gmail-push', daemon=True)
+        self._thread.start()
+        logger.info(f"Gmail push webhook listening on port {self.port}{self.path}")
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+class PushIngestionLoop:
+    """
+    Runs sync_fn on every notification, or when the adaptive poll interval elapses
+
+    sync_fn takes no arguments and returns the number of new messages ingested.
+    """
+
+    def __init__(
+        self,
+        sync_fn: Callable[[], int],
+        poll: Optional[AdaptivePollInterval] = None,
+        watch_fn: Optional[Callable[[], Any]] = None
+    ):
+        self.sync_fn = sync_fn
+        self.poll = poll or AdaptivePollInterval()
+        self.watch_fn = watch_fn
+        self.syncs = 0
+        self.push_syncs = 0
+        self.last_notification = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._watched_at = 0.0
+
+    def notify(self, notification: Optional[Dict[str, Any]] = None):
+        """Request an immediate sync (called from the webhook thread)"""
+        self.last_notification = notification
+        self._wake.set()
+
+    def _renew_watch(self):
+        if self.watch_fn and time.time() - self._watched_at >= WATCH_RENEW_SECONDS:
+            try:
+                self.watch_fn()
+                self._watched_at = time.time()
+            except Exception as e:
+                logger.error(f"Gmail watch registration failed, relying on polling: {e}")
+
+    def run_once(self) -> int:
+        """Wait for a notification or the poll interval, then sync once"""
+        self._renew_watch()
+        pushed = self._wake.wait(timeout=self.poll.current)
+        # Clear before syncing: notifications during the sync trigger one more pass
+        self._wake.clear()
+        if self._stop.is_set():
+            return 0
+
+        try:
+            new_messages = self.sync_fn() or 0
+        except Exception as e:
+            logger.error(f"Sync failed: {e}")
+            new_messages = 0
+
+        self.syncs += 1
+        if pushed:
+            self.push_syncs += 1
+        self.poll.update(new_messages)
+        return new_messages
+
+    def run(self):
+        """Loop until stop() is called"""
+        while not self._stop.is_set():
+            self.run_once()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
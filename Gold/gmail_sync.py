@@ -0,0 +1,231 @@
+"""
+Gmail Incremental Sync
+
+Finds new Gmail messages using the History API instead of re-listing the inbox:
+- First run (or expired history): full sync of `query` with pagination,
+  recording the mailbox historyId as a checkpoint
+- Later runs: history().list(startHistoryId=checkpoint) with pagination,
+  returning only messages added since the checkpoint. Added messages must
+  carry `required_labels` (UNREAD, matching the default "is:unread" query),
+  so both paths ingest the same set: mail already read elsewhere is skipped.
+- Seen-message ledger so a message is handed out exactly once, even across
+  a full resync
+- Per-message failure counts: a message that keeps failing is given up on
+  after MAX_MESSAGE_RETRIES so it cannot hold the checkpoint back forever
+
+State is persisted to Gmail_Sync_State.json:
+{
+    "history_id": "123456",
+    "last_full_sync": "2026-02-24T10:00:00",
+    "last_sync": "2026-02-24T10:05:00",
+    "seen": ["18d...", ...],
+    "failures": {"18e...": 2}
+}
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable
+
+logger = logging.getLogger('gmail_sync')
+
+# Configuration
+SYNC_STATE_FILE = Path("Gmail_Sync_State.json")
+MAX_SEEN_IDS = 5000  # Ledger size; oldest ids are dropped first
+PAGE_SIZE = 100
+MAX_MESSAGE_RETRIES = 3  # Failed fetches before a message is skipped for good
+
+
+def _is_history_expired(error: Exception) -> bool:
+    """History ids expire after about a week; Gmail answers 404 for them"""
+    resp = getattr(error, 'resp', None)
+    return getattr(resp, 'status', None) == 404
+
+
+class GmailIncrementalSync:
+    """
+    History-based incremental sync for a Gmail service
+
+    Usage:
+        sync = GmailIncrementalSync(service)
+        for msg_id in sync.fetch_new_ids():
+            process(msg_id)
+            sync.mark_seen(msg_id)
+        sync.save()
+    """
+
+    def __init__(
+        self,
+        service,
+        state_file: Path = SYNC_STATE_FILE,
+        query: str = "is:unread",
+        label_ids: Iterable[str] = ('INBOX',),
+        required_labels: Iterable[str] = ('UNREAD',)
+    ):
+        self.service = service
+        self.state_file = Path(state_file)
+        self.query = query
+        self.label_ids = set(label_ids)  # history entries need one of these
+        self.required_labels = set(required_labels)  # ...and all of these (keep in line with query)
+        self.api_calls = 0
+        self.state = {'history_id': None, 'last_full_sync': None, 'last_sync': None, 'seen': [], 'failures': {}}
+        self._seen = set()
+        self._pending_history_id = None
+        self._load()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load the checkpoint and seen ledger"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.state.update(json.load(f))
+            except Exception as e:
+                logger.error(f"Could not load Gmail sync state: {e}")
+        self._seen = set(self.state['seen'])
+
+    def save(self, advance_checkpoint: bool = True):
+        """
+        Persist the checkpoint and seen ledger atomically
+
+        Args:
+            advance_checkpoint: Move the checkpoint to the last sync. Pass False
+                when some messages failed so they are listed again next time.
+        """
+        if self._pending_history_id and advance_checkpoint:
+            self.state['history_id'] = self._pending_history_id
+        self._pending_history_id = None
+        self.state['seen'] = self.state['seen'][-MAX_SEEN_IDS:]
+        self._seen = set(self.state['seen'])
+
+        tmp_path = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def is_seen(self, msg_id: str) -> bool:
+        return msg_id in self._seen
+
+    def mark_seen(self, msg_id: str):
+        """Record a message as ingested"""
+        self.state['failures'].pop(msg_id, None)
+        if msg_id not in self._seen:
+            self._seen.add(msg_id)
+            self.state['seen'].append(msg_id)
+
+    def record_failure(self, msg_id: str) -> bool:
+        """
+        Count a failed fetch of a message
+
+        Returns:
+            True once the message has failed MAX_MESSAGE_RETRIES times; it is
+            then marked seen so the checkpoint can move past it
+        """
+        failures = self.state['failures'].get(msg_id, 0) + 1
+        if failures >= MAX_MESSAGE_RETRIES:
+            logger.warning(f"Giving up on message {msg_id} after {failures} failed fetches")
+            self.mark_seen(msg_id)
+            return True
+        self.state['failures'][msg_id] = failures
+        return False
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _execute(self, request) -> Dict[str, Any]:
+        self.api_calls += 1
+        return request.execute()
+
+    def full_sync(self) -> List[str]:
+        """List every message matching the query (all pages) and checkpoint the mailbox"""
+        # Take the checkpoint first so nothing arriving during the listing is missed
+        profile = self._execute(self.service.users().getProfile(userId='me'))
+        ids = []
+        page_token = None
+
+        while True:
+            results = self._execute(self.service.users().messages().list(
+                userId='me',
+                q=self.query,
+                maxResults=PAGE_SIZE,
+                pageToken=page_token
+            ))
+            ids.extend(m['id'] for m in results.get('messages', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        # Oldest first (messages.list returns newest first)
+        ids.reverse()
+        self._pending_history_id = profile['historyId']
+        self.state['last_full_sync'] = datetime.now().isoformat()
+        logger.info(f"Full sync listed {len(ids)} messages (historyId {profile['historyId']})")
+        return ids
+
+    def incremental_sync(self) -> List[str]:
+        """List messages added since the checkpoint (all pages)"""
+        ids = []
+        page_token = None
+        history_id = self.state['history_id']
+
+        while True:
+            results = self._execute(self.service.users().history().list(
+                userId='me',
+                startHistoryId=self.state['history_id'],
+                historyTypes=['messageAdded'],
+                maxResults=PAGE_SIZE,
+                pageToken=page_token
+            ))
+            for record in results.get('history', []):
+                for added in record.get('messagesAdded', []):
+                    message = added.get('message', {})
+                    labels = set(message.get('labelIds', []))
+                    if self.label_ids and not (labels & self.label_ids):
+                        continue
+                    if not self.required_labels <= labels:
+                        continue
+                    ids.append(message['id'])
+            history_id = results.get('historyId', history_id)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        self._pending_history_id = history_id
+        return ids
+
+    def fetch_new_ids(self) -> List[str]:
+        """
+        Get ids of messages not ingested yet, oldest first
+
+        Falls back to a full sync when there is no checkpoint or the
+        checkpoint has expired. The new checkpoint is stored on save().
+        """
+        ids: Optional[List[str]] = None
+
+        if self.state['history_id']:
+            try:
+                ids = self.incremental_sync()
+            except Exception as e:
+                if not _is_history_expired(e):
+                    raise
+                logger.warning("Gmail history checkpoint expired - running full resync")
+
+        if ids is None:
+            ids = self.full_sync()
+
+        self.state['last_sync'] = datetime.now().isoformat()
+
+        new_ids = []
+        queued = set()
+        for msg_id in ids:
+            if msg_id not in self._seen and msg_id not in queued:
+                queued.add(msg_id)
+                new_ids.append(msg_id)
+        return new_ids
@@ -6,13 +6,21 @@ Monitors Gmail for important unread emails and saves them as .md files in /Needs
 import os
 import json
 import pickle
-import base64
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-import time
+
+from gmail_sync import GmailIncrementalSync, MAX_MESSAGE_RETRIES
+from gmail_batch import GmailBatchFetcher, BATCH_SIZE
+from gmail_mime import MimeWalker, AttachmentSpooler
+from ingestion_ledger import get_ledger
+from gmail_push import (
+    PushNotificationServer, PushIngestionLoop, AdaptivePollInterval,
+    PUSH_HOST, PUSH_PORT, MIN_POLL_INTERVAL
+)
 
 
 class GmailWatcher:
@@ -24,7 +32,14 @@ class GmailWatcher:
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.service = None
+        self.sync = None
+        self.fetcher = None
         self.needs_action_path = Path("Needs_Action")
+        self.ledger = get_ledger()
+        self.mime = MimeWalker(
+            fetch_attachment=self.fetch_attachment,
+            spooler=AttachmentSpooler(self.needs_action_path / "Attachments")
+        )
         
         # Create Needs_Action directory if it doesn't exist
         self.needs_action_path.mkdir(exist_ok=True)
@@ -57,6 +72,8 @@ class GmailWatcher:
                 pickle.dump(creds, token)
         
         self.service = build('gmail', 'v1', credentials=creds)
+        self.sync = GmailIncrementalSync(self.service)
+        self.fetcher = GmailBatchFetcher(self.service)
         return True
     
     def get_unread_emails(self, query="is:unread"):
@@ -82,53 +99,59 @@ class GmailWatcher:
                 id=msg_id,
                 format='full'
             ).execute()
-            
-            # Extract headers and payload
-            headers = message['payload'].get('headers', [])
-            subject = ''
-            sender = ''
-            
-            for header in headers:
-                if header['name'].lower() == 'subject':
-                    subject = header['value']
-                elif header['name'].lower() == 'from':
-                    sender = header['value']
-            
-            # Extract body
-            body = self.extract_body(message)
-            
-            return {
-                'id': msg_id,
-                'subject': subject,
-                'sender': sender,
-                'body': body,
-                'timestamp': datetime.now().isoformat(),
-                'raw_message': message
-            }
+            return self.parse_message(message)
         except Exception as e:
             print(f"Error getting email details: {e}")
             return None
     
-    def extract_body(self, message):
-        """Extract the body of the email"""
-        body = ""
-        payload = message.get('payload', {})
-        parts = payload.get('parts', [])
+    def get_emails_details(self, msg_ids):
+        """Get details for many emails using batched requests with field masks"""
+        messages = self.fetcher.fetch(msg_ids)
+        details = {}
+        for msg_id, message in messages.items():
+            try:
+                details[msg_id] = self.parse_message(message)
+            except Exception as e:
+                print(f"Error parsing email {msg_id}: {e}")
+        return details
+    
+    def parse_message(self, message):
+        """Extract subject, sender, body and attachments from a Gmail message resource"""
+        # Extract headers and payload
+        headers = message['payload'].get('headers', [])
+        subject = ''
+        sender = ''
         
-        if parts:
-            for part in parts:
-                if part.get('mimeType') == 'text/plain':
-                    body_data = part.get('body', {}).get('data', '')
-                    if body_data:
-                        body = base64.urlsafe_b64decode(body_data).decode('utf-8')
-                        break
-        else:
-            # For simple messages without parts
-            body_data = payload.get('body', {}).get('data', '')
-            if body_data:
-                body = base64.urlsafe_b64decode(body_data).decode('utf-8')
+        for header in headers:
+            if header['name'].lower() == 'subject':
+                subject = header['value']
+            elif header['name'].lower() == 'from':
+                sender = header['value']
+        
+        # Walk the MIME tree for the body and spool attachments to disk
+        parsed = self.mime.parse(message)
         
-        return body
+        return {
+            'id': message['id'],
+            'subject': subject,
+            'sender': sender,
+            'body': parsed['body'],
+            'attachments': parsed['attachments'],
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def fetch_attachment(self, msg_id, attachment_id):
+        """Get the base64url data of an attachment stored separately from the message"""
+        attachment = self.service.users().messages().attachments().get(
+            userId='me',
+            messageId=msg_id,
+            id=attachment_id
+        ).execute()
+        return attachment.get('data', '')
+    
+    def extract_body(self, message):
+        """Extract the body of the email (HTML-only mail is converted to text)"""
+        return MimeWalker().parse(message)['body']
     
     def save_email_as_md(self, email_data):
         """Save email data as a markdown file in Needs_Action folder"""
@@ -145,6 +168,17 @@ class GmailWatcher:
         filename = f"email_{safe_subject}_{timestamp}.md"
         filepath = self.needs_action_path / filename
         
+        attachments_md = ""
+        for attachment in email_data.get('attachments', []):
+            if attachment.get('path'):
+                # Link relative to the note, which lives next to the Attachments folder
+                link = quote(Path(os.path.relpath(attachment['path'], filepath.parent)).as_posix())
+                attachments_md += f"- [{attachment['filename']}]({link}) ({attachment['size']} bytes)\n"
+            else:
+                attachments_md += f"- {attachment['filename']} (not saved: {attachment.get('skipped', 'unknown')})\n"
+        if attachments_md:
+            attachments_md = f"## Attachments:\n\n{attachments_md}\n---\n\n"
+        
         # Create markdown content
         md_content = f"""# Email from {email_data['sender']}
 
@@ -162,12 +196,21 @@ class GmailWatcher:
 
 ---
 
-*This email was automatically saved by the Gmail Watcher*
+{attachments_md}*This email was automatically saved by the Gmail Watcher*
 """
         
+        # Skip emails another run (or a resync) already wrote to Needs_Action
+        if not self.ledger.claim('gmail', email_data['id'], target=str(filepath)):
+            print(f"Skipping already ingested email '{email_data['subject']}'")
+            return
+        
         # Write the markdown file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        try:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(md_content)
+        except Exception:
+            self.ledger.release('gmail', email_data['id'])
+            raise
         
         print(f"Saved email '{email_data['subject']}' to {filepath}")
         
@@ -199,42 +242,98 @@ class GmailWatcher:
             print(f"Error marking email as read: {e}")
     
     def process_new_emails(self):
-        """Process all new unread emails"""
+        """Process emails that arrived since the last sync checkpoint; returns the number saved"""
         if not self.service:
             print("Not authenticated. Please authenticate first.")
             self.log_action("Gmail Watcher failed to authenticate")
-            return
+            return 0
+
+        try:
+            msg_ids = self.sync.fetch_new_ids()
+        except Exception as e:
+            print(f"Error syncing emails: {e}")
+            return 0
 
-        messages = self.get_unread_emails()
-        print(f"Found {len(messages)} unread emails")
+        print(f"Found {len(msg_ids)} new emails")
         
-        if messages:
-            self.log_action(f"Gmail Watcher found {len(messages)} unread emails")
+        if msg_ids:
+            self.log_action(f"Gmail Watcher found {len(msg_ids)} new emails")
         else:
             self.log_action("Gmail Watcher found no new emails")
 
-        for msg in messages:
-            email_data = self.get_email_details(msg['id'])
-            if email_data:
-                self.save_email_as_md(email_data)
-                # Optionally mark as read after processing
-                # self.mark_as_read(msg['id'])
+        failed = 0
+        # Fetch in batch-sized chunks so only one chunk of messages is held in memory
+        for start in range(0, len(msg_ids), BATCH_SIZE):
+            chunk = msg_ids[start:start + BATCH_SIZE]
+            details = self.get_emails_details(chunk)
+            
+            for msg_id in chunk:
+                email_data = details.get(msg_id)
+                if email_data:
+                    self.save_email_as_md(email_data)
+                    # Each email is ingested exactly once
+                    self.sync.mark_seen(msg_id)
+                elif self.sync.record_failure(msg_id):
+                    # Malformed or deleted message: record it and let the checkpoint move on
+                    self.ledger.claim('gmail', msg_id, target='failed')
+                    self.log_action(f"Gmail Watcher gave up on email {msg_id} after {MAX_MESSAGE_RETRIES} failed fetches")
+                else:
+                    failed += 1
+
+        # Keep the old checkpoint if anything failed so it is retried next cycle
+        self.sync.save(advance_checkpoint=failed == 0)
+        return len(msg_ids) - failed
+    
+    def watch_mailbox(self, topic):
+        """Register the inbox for Pub/Sub push notifications (expires after 7 days)"""
+        response = self.service.users().watch(
+            userId='me',
+            body={'topicName': topic, 'labelIds': ['INBOX']}
+        ).execute()
+        self.log_action(f"Gmail Watcher registered push notifications on {topic}")
+        return response
     
-    def start_monitoring(self, interval=300):  # Default to checking every 5 minutes
-        """Start monitoring for new emails at regular intervals"""
-        print(f"Starting Gmail monitoring (checking every {interval} seconds)")
+    def start_monitoring(self, interval=300, push=False, host=PUSH_HOST, port=PUSH_PORT,
+                         token=None, topic=None):
+        """
+        Start monitoring for new emails
         
+        Polls adaptively: every `interval` seconds when idle, down to
+        MIN_POLL_INTERVAL while mail keeps arriving. With push=True a webhook
+        on host:port triggers an immediate sync for each notification and
+        polling only acts as a fallback.
+        """
         if not self.authenticate():
             print("Authentication failed. Cannot start monitoring.")
             return
         
+        token = token or os.getenv('GMAIL_PUSH_TOKEN')
+        topic = topic or os.getenv('GMAIL_PUBSUB_TOPIC')
+        loop = PushIngestionLoop(
+            self.process_new_emails,
+            poll=AdaptivePollInterval(minimum=min(MIN_POLL_INTERVAL, interval), maximum=interval),
+            watch_fn=(lambda: self.watch_mailbox(topic)) if push and topic else None
+        )
+        
+        server = None
+        if push:
+            server = PushNotificationServer(loop.notify, host=host, port=port, token=token)
+            server.start()
+            print(f"Starting Gmail push monitoring on http://{host}:{server.port}{server.path} "
+                  f"(fallback polling up to every {interval} seconds)")
+        else:
+            print(f"Starting Gmail monitoring (adaptive polling, up to every {interval} seconds)")
+        
+        # Catch up on anything that arrived while the watcher was down
+        loop.notify()
         try:
-            while True:
-                self.process_new_emails()
-                print(f"Waiting {interval} seconds before next check...")
-                time.sleep(interval)
+            loop.run()
         except KeyboardInterrupt:
             print("\nStopping Gmail monitoring...")
+        finally:
+            loop.stop()
+            if server:
+                server.stop()
 
 
 def main():
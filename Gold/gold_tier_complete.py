@@ -15,6 +15,8 @@ Gold Tier Features:
 
 import os
 import sys
+import importlib
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
@@ -23,40 +25,40 @@ from typing import Dict, Any, List
 GOLD_DIR = Path(__file__).parent
 sys.path.insert(0, str(GOLD_DIR))
 
-# Import Gold Tier modules
-try:
-    from audit_logger import audit_logger, log_action, get_daily_summary
-    AUDIT_AVAILABLE = True
-except ImportError:
-    AUDIT_AVAILABLE = False
-    print("Warning: audit_logger not available")
+from status_aggregator import StatusAggregator, MCP_SERVERS
 
-try:
-    from error_recovery import (
-        retry_with_backoff,
-        resilient_api_call,
-        get_recovery_status,
-        circuit_breakers,
-        offline_queues
-    )
-    ERROR_RECOVERY_AVAILABLE = True
-except ImportError:
-    ERROR_RECOVERY_AVAILABLE = False
-    print("Warning: error_recovery not available")
+# Gold Tier modules are imported on first use: the briefing skill pulls in
+# requests/numpy, and audit logging and error recovery are only needed once a
+# command actually logs or reports. find_spec checks they exist without
+# importing them.
+FEATURE_MODULES = {
+    'audit_logging': 'audit_logger',
+    'error_recovery': 'error_recovery',
+    'ralph_wiggum': 'ralph_orchestrator',
+    'ceo_briefing': 'Skills.weekly_ceo_briefing'
+}
+_feature_modules: Dict[str, Any] = {}
 
-try:
-    from ralph_orchestrator import RalphWiggumLoop
-    RALPH_AVAILABLE = True
-except ImportError:
-    RALPH_AVAILABLE = False
-    print("Warning: ralph_orchestrator not available")
 
-try:
-    from Skills.weekly_ceo_briefing import WeeklyCEOBriefing
-    BRIEFING_AVAILABLE = True
-except ImportError as e:
-    BRIEFING_AVAILABLE = False
-    print(f"Warning: weekly_ceo_briefing not available - {e}")
+def feature_available(feature: str) -> bool:
+    """True if the feature's module can be found (or was loaded) without importing it"""
+    if feature in _feature_modules:
+        return _feature_modules[feature] is not None
+    try:
+        return importlib.util.find_spec(FEATURE_MODULES[feature]) is not None
+    except ImportError:
+        return False
+
+
+def load_feature(feature: str):
+    """Import a feature's module on first use; None (with a warning) if it cannot be imported"""
+    if feature not in _feature_modules:
+        try:
+            _feature_modules[feature] = importlib.import_module(FEATURE_MODULES[feature])
+        except ImportError as e:
+            _feature_modules[feature] = None
+            print(f"Warning: {FEATURE_MODULES[feature]} not available - {e}")
+    return _feature_modules[feature]
 
 
 class GoldTierComplete:
@@ -80,20 +82,22 @@ class GoldTierComplete:
         }
         
         # Check feature availability
-        self.status['features']['audit_logging'] = AUDIT_AVAILABLE
-        self.status['features']['error_recovery'] = ERROR_RECOVERY_AVAILABLE
-        self.status['features']['ralph_wiggum'] = RALPH_AVAILABLE
-        self.status['features']['ceo_briefing'] = BRIEFING_AVAILABLE
+        for feature in FEATURE_MODULES:
+            self.status['features'][feature] = feature_available(feature)
         
         # MCP Servers
         self.mcp_servers = {
-            'email': {'port': 8080, 'status': 'unknown'},
-            'browser': {'port': 8081, 'status': 'unknown'},
-            'odoo': {'port': 8082, 'status': 'unknown'},
-            'social': {'port': 8083, 'status': 'unknown'},
-            'x': {'port': 8084, 'status': 'unknown'}
+            name: {'port': port, 'status': 'unknown'} for name, port in MCP_SERVERS.items()
         }
         
+        # Server probes, audit and recovery data are gathered in parallel and cached
+        sources = {}
+        if self.status['features']['audit_logging']:
+            sources['audit_summary'] = self.get_audit_summary
+        if self.status['features']['error_recovery']:
+            sources['recovery_status'] = self.get_recovery_status
+        self.status_cache = StatusAggregator(servers=MCP_SERVERS, sources=sources)
+        
         print("="*70)
         print("Gold Tier Complete - Master Skill")
         print("="*70)
@@ -103,31 +107,28 @@ class GoldTierComplete:
     
     def log_action(self, action: str, actor: str = 'system', **kwargs):
         """Log action with audit trail"""
-        if AUDIT_AVAILABLE:
-            log_action(action=action, actor=actor, **kwargs)
+        audit = load_feature('audit_logging') if self.status['features']['audit_logging'] else None
+        if audit:
+            audit.log_action(action=action, actor=actor, **kwargs)
     
-    def get_mcp_status(self) -> Dict[str, Any]:
-        """Get status of all MCP servers"""
-        import requests
-        
-        for name, config in self.mcp_servers.items():
-            try:
-                response = requests.get(f"http://localhost:{config['port']}/health", timeout=5)
-                if response.status_code == 200:
-                    config['status'] = 'healthy'
-                else:
-                    config['status'] = 'unhealthy'
-            except:
-                config['status'] = 'offline'
+    def get_mcp_status(self, max_age: float = None) -> Dict[str, Any]:
+        """
+        Get status of all MCP servers
         
+        Served from the status cache; pass max_age=0 to probe right now.
+        """
+        snapshot = self.status_cache.get(max_age=max_age)
+        for name, probe in snapshot['mcp_servers'].items():
+            self.mcp_servers[name].update(probe)
         return self.mcp_servers
     
     def run_ceo_briefing(self) -> str:
         """Generate weekly CEO briefing"""
-        if not BRIEFING_AVAILABLE:
+        skill = load_feature('ceo_briefing')
+        if not skill:
             return "Error: Weekly CEO Briefing not available"
         
-        briefing = WeeklyCEOBriefing()
+        briefing = skill.WeeklyCEOBriefing()
         briefing_path = briefing.generate()
         
         self.log_action(
@@ -140,10 +141,11 @@ class GoldTierComplete:
     
     def run_ralph_loop(self, task: str, max_iterations: int = 20) -> Dict[str, Any]:
         """Run Ralph Wiggum autonomous loop"""
-        if not RALPH_AVAILABLE:
+        ralph = load_feature('ralph_wiggum')
+        if not ralph:
             return {'error': 'Ralph Wiggum Loop not available'}
         
-        loop = RalphWiggumLoop(task=task, max_iterations=max_iterations)
+        loop = ralph.RalphWiggumLoop(task=task, max_iterations=max_iterations)
         final_state = loop.run()
         
         self.log_action(
@@ -160,31 +162,33 @@ class GoldTierComplete:
     
     def get_recovery_status(self) -> Dict[str, Any]:
         """Get error recovery system status"""
-        if not ERROR_RECOVERY_AVAILABLE:
+        recovery = load_feature('error_recovery')
+        if not recovery:
             return {'error': 'Error recovery not available'}
         
-        return get_recovery_status()
+        return recovery.get_recovery_status()
     
     def get_audit_summary(self, date: str = None) -> Dict[str, Any]:
         """Get audit log summary"""
-        if not AUDIT_AVAILABLE:
+        audit = load_feature('audit_logging')
+        if not audit:
             return {'error': 'Audit logging not available'}
         
-        return get_daily_summary(date)
+        return audit.get_daily_summary(date)
     
-    def get_full_status(self) -> Dict[str, Any]:
-        """Get complete Gold Tier status"""
+    def get_full_status(self, max_age: float = None) -> Dict[str, Any]:
+        """Get complete Gold Tier status (from the status cache)"""
+        snapshot = self.status_cache.get(max_age=max_age)
         status = {
             'tier_status': self.status,
             'mcp_servers': self.get_mcp_status(),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            'checked_at': snapshot['checked_at']
         }
         
-        if AUDIT_AVAILABLE:
-            status['audit_summary'] = self.get_audit_summary()
-        
-        if ERROR_RECOVERY_AVAILABLE:
-            status['recovery_status'] = self.get_recovery_status()
+        for source in ('audit_summary', 'recovery_status'):
+            if source in snapshot:
+                status[source] = snapshot[source]
         
         return status
     
@@ -195,12 +199,14 @@ class GoldTierComplete:
         print("\n" + "="*70)
         print("Gold Tier Complete - Status Report")
         print("="*70)
+        print(f"Checked: {status['checked_at']}")
         
         # MCP Servers
         print("\nMCP Servers:")
         for name, config in status['mcp_servers'].items():
             icon = "✅" if config['status'] == 'healthy' else "❌"
-            print(f"  {icon} {name.upper()}: Port {config['port']} - {config['status']}")
+            latency = f" ({config['latency_ms']} ms)" if config.get('latency_ms') is not None else ''
+            print(f"  {icon} {name.upper()}: Port {config['port']} - {config['status']}{latency}")
         
         # Features
         print("\nFeatures:")
@@ -0,0 +1,50 @@
+"""
+Shared HTTP Connection Pool
+
+One requests.Session per process for outbound API calls (Odoo JSON-RPC,
+Graph API, X API):
+- Keep-alive connections are reused instead of a new TCP/TLS handshake
+  per request
+- When the MCP servers run together in one process (mcp_host.py) they
+  all share this pool
+- requests is imported on first use, so importing this module is free
+
+Usage:
+    from http_pool import get_session
+    response = get_session().post(url, json=payload, timeout=30)
+"""
+
+import threading
+
+# Configuration
+POOL_CONNECTIONS = 10  # distinct hosts kept in the pool
+POOL_MAXSIZE = 20  # connections per host (one per concurrent request thread)
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide pooled requests.Session (created on first use)"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def close_session():
+    """Close pooled connections (the next get_session() starts a new pool)"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
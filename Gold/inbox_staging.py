@@ -0,0 +1,317 @@
+"""
+Inbox Staging Pipeline
+
+Moves files dropped into Inbox to Needs_Action only once they are fully
+written, in batches:
+- File system events just record the path (O(1), safe for thousands of
+  events per second); nothing is moved from the event thread
+- A file is ready when a close-after-write event arrived, or when its size
+  and mtime have not changed for `stable_seconds`
+- A background thread drains ready files in batches, de-duplicates them
+  against the ingestion ledger and moves them with os.replace (a rename on
+  the same filesystem; shutil.move is used across filesystems)
+- watcher_log.txt is written through a buffered logger flushed once per batch
+- reconcile() stages files left in the inbox while the watcher was down
+"""
+
+import os
+import time
+import shutil
+import logging
+import threading
+from logging.handlers import MemoryHandler
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ingestion_ledger import get_ledger, file_key
+
+# Configuration
+STABLE_SECONDS = 1.0  # unchanged size/mtime for this long means the copy finished
+FLUSH_INTERVAL = 0.5  # seconds between staging passes
+MAX_BATCH = 500
+WORKERS = 4  # parallel hashing/moving within a batch
+LOG_FILE = "watcher_log.txt"
+LOG_BUFFER = 1000  # records buffered before a forced write
+
+
+def get_move_logger(log_file: str = LOG_FILE) -> logging.Logger:
+    """Logger writing to log_file through a memory buffer (one write per batch)"""
+    logger = logging.getLogger(f'inbox_staging.{os.path.abspath(log_file)}')
+    if not logger.handlers:
+        target = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+        target.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(MemoryHandler(LOG_BUFFER, flushLevel=logging.ERROR, target=target))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def flush_logger(logger: logging.Logger):
+    for handler in logger.handlers:
+        handler.flush()
+
+
+class StagingQueue:
+    """Pending paths and the last size/mtime seen for each"""
+
+    def __init__(self, stable_seconds: float = STABLE_SECONDS):
+        self.stable_seconds = stable_seconds
+        # path -> (size, mtime_ns, stable since (monotonic), close-after-write seen)
+        self._pending: Dict[str, Tuple[int, int, float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, path: str, closed: bool = False):
+        """Record an event for path; closed=True for close-after-write events"""
+        with self._lock:
+            state = self._pending.get(path)
+            if state is None:
+                self._pending[path] = (-1, -1, time.monotonic(), closed)
+            elif closed and not state[3]:
+                self._pending[path] = state[:3] + (True,)
+
+    def take_ready(self, force: bool = False, limit: int = MAX_BATCH) -> List[str]:
+        """Remove and return up to limit paths whose writes have finished"""
+        now = time.monotonic()
+        with self._lock:
+            items = list(self._pending.items())
+
+        ready, gone, updates = [], [], {}
+        for path, (size, mtime, stable_since, closed) in items:
+            if len(ready) >= limit:
+                break
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                gone.append(path)
+                continue
+
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != (size, mtime):
+                # Changed since the last look: restart the stability clock
+                updates[path] = current + (now, closed)
+                stable = False
+            else:
+                stable = now - stable_since >= self.stable_seconds
+
+            if force or closed or stable:
+                ready.append(path)
+
+        with self._lock:
+            for path in gone:
+                self._pending.pop(path, None)
+            # Another thread may have taken the same path since the snapshot
+            ready = [path for path in ready if self._pending.pop(path, None) is not None]
+            for path, state in updates.items():
+                if path in self._pending:
+                    # Keep a close flag set by an event that arrived meanwhile
+                    self._pending[path] = state[:3] + (state[3] or self._pending[path][3],)
+        return ready
+
+
+class InboxStagingPipeline:
+    """
+    Staged, batched Inbox -> Needs_Action mover
+
+    Usage:
+        pipeline = InboxStagingPipeline("Inbox", "Needs_Action")
+        pipeline.start()
+        pipeline.enqueue(path)            # from event handlers
+        pipeline.stop()                   # drains what is ready
+    """
+
+    def __init__(
+        self,
+        watch_dir: str = "Inbox",
+        dest_dir: str = "Needs_Action",
+        duplicates_dir: str = "Duplicates",
+        ledger=None,
+        stable_seconds: float = STABLE_SECONDS,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_batch: int = MAX_BATCH,
+        log_file: str = LOG_FILE,
+        workers: int = WORKERS
+    ):
+        self.watch_dir = watch_dir
+        self.dest_dir = dest_dir
+        self.duplicates_dir = duplicates_dir
+        self.ledger = ledger or get_ledger()
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.workers = workers
+        self.queue = StagingQueue(stable_seconds)
+        self.log = get_move_logger(log_file)
+        self.moved = 0
+        self.duplicates = 0
+        self.failed = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._same_device = None
+        self._move_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def enqueue(self, path: str, closed: bool = False):
+        self.queue.add(path, closed=closed)
+        if closed:
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Moving
+    # ------------------------------------------------------------------
+
+    def _move(self, src: str, dest: str):
+        """Rename when source and destination share a filesystem, copy+delete otherwise"""
+        if self._same_device is None:
+            self._same_device = os.stat(os.path.dirname(os.path.abspath(src))).st_dev == os.stat(self.dest_dir).st_dev
+        if self._same_device:
+            os.replace(src, dest)
+        else:
+            shutil.move(src, dest)
+
+    @staticmethod
+    def _free_name(directory: str, filename: str) -> str:
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            return path
+        name, ext = os.path.splitext(filename)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"{name}_{timestamp}{ext}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(directory, f"{name}_{timestamp}_{counter}{ext}")
+            counter += 1
+        return path
+
+    def process_file(self, file_path: str) -> Optional[str]:
+        """Move one file (or set it aside as a duplicate); returns the new path"""
+        filename = os.path.basename(file_path)
+        key = file_key(file_path)
+
+        # Identical content was already ingested: set it aside instead of creating another request
+        if not self.ledger.claim('inbox', key, target=os.path.join(self.dest_dir, filename)):
+            os.makedirs(self.duplicates_dir, exist_ok=True)
+            # Picking a free name and renaming must not interleave between workers
+            with self._move_lock:
+                duplicate_path = self._free_name(self.duplicates_dir, filename)
+                shutil.move(file_path, duplicate_path)
+                self.duplicates += 1
+            self.log_action(file_path, duplicate_path, action="DUPLICATE_SKIPPED")
+            return None
+
+        try:
+            with self._move_lock:
+                dest_path = self._free_name(self.dest_dir, filename)
+                self._move(file_path, dest_path)
+                self.moved += 1
+        except Exception:
+            self.ledger.release('inbox', key)
+            raise
+        self.log_action(file_path, dest_path)
+        return dest_path
+
+    def _process_one(self, path: str) -> bool:
+        try:
+            return self.process_file(path) is not None
+        except FileNotFoundError:
+            return False  # Removed or picked up elsewhere in the meantime
+        except Exception as e:
+            with self._move_lock:
+                self.failed += 1
+            self.log.error(f"[{datetime.now()}] MOVE_FAILED: {path}: {e}")
+            return False
+
+    def process_batch(self, paths: List[str]) -> int:
+        """Move a batch of ready files; returns how many reached Needs_Action"""
+        if self.workers > 1 and len(paths) > 1:
+            # Hashing dominates; renames are serialized inside process_file
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                moved = sum(executor.map(self._process_one, paths))
+        else:
+            moved = sum(self._process_one(path) for path in paths)
+        self.flush_log()
+        if paths:
+            print(f"[{datetime.now()}] Moved {moved} of {len(paths)} file(s) from {self.watch_dir} to {self.dest_dir}")
+        return moved
+
+    def flush(self, force: bool = False) -> int:
+        """Process every file that is ready now (all pending files with force=True)"""
+        total = 0
+        while True:
+            batch = self.queue.take_ready(force=force, limit=self.max_batch)
+            if not batch:
+                return total
+            total += self.process_batch(batch)
+
+    def reconcile(self) -> int:
+        """
+        Stage files already in the inbox (dropped while the watcher was down)
+
+        Call after the file system observer has started: files arriving
+        during the scan are staged twice but processed once, because the
+        staging queue holds each path a single time. Files whose mtime is
+        older than stable_seconds are moved right away.
+
+        Returns:
+            Number of files staged
+        """
+        staged = 0
+        now = time.time()
+        with os.scandir(self.watch_dir) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    settled = now - entry.stat().st_mtime >= self.queue.stable_seconds
+                except FileNotFoundError:
+                    continue
+                self.queue.add(entry.path, closed=settled)
+                staged += 1
+
+        if staged:
+            print(f"[{datetime.now()}] Reconciling {staged} file(s) already in {self.watch_dir}")
+            self.flush()
+        return staged
+
+    def log_action(self, source_path: str, dest_path: str, action: str = "FILE_MOVED"):
+        self.log.info(f"[{datetime.now()}] {action}: {source_path} -> {dest_path}")
+
+    def flush_log(self):
+        flush_logger(self.log)
+
+    # ------------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.log.error(f"[{datetime.now()}] STAGING_ERROR: {e}")
+
+    def start(self):
+        os.makedirs(self.dest_dir, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='inbox-staging', daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def stop(self):
+        """Stop the thread; files that are ready are still moved"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        self.flush()
+        self.flush_log()
@@ -0,0 +1,209 @@
+"""
+Ingestion Ledger
+
+Durable record of everything the watchers have written to Needs_Action, so
+restarts and re-polls do not create duplicates:
+- SQLite table keyed by (source, key), where key is a message id or a
+  content hash; safe to share between watcher processes (WAL mode)
+- In-memory Bloom filter in front of the table: seen() answers keys that
+  were never ingested without touching the database, and claim() only
+  writes for them; likely duplicates (re-polls, resyncs) are confirmed with
+  a read instead of taking the database write lock
+- TTL-based pruning so the ledger does not grow without bound
+
+Usage:
+    ledger = get_ledger()
+    if ledger.claim('gmail', msg_id, target=str(filepath)):
+        write_file()
+"""
+
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger('ingestion_ledger')
+
+# Configuration
+LEDGER_DB = Path("Ingestion_Ledger.db")
+DEFAULT_TTL_DAYS = 30
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 0.01
+HASH_CHUNK = 1024 * 1024
+
+
+def content_key(data: Union[bytes, str]) -> str:
+    """SHA-256 of text or bytes, for sources without a stable message id"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_key(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one SHA-256 digest"""
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class IngestionLedger:
+    """
+    Shared (source, key) ledger backed by SQLite with a Bloom filter front
+
+    claim() is atomic across threads and processes: exactly one caller gets
+    True for a given key until it expires or is released.
+    """
+
+    def __init__(self, path: Path = LEDGER_DB, ttl_days: float = DEFAULT_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = ttl_days * 86400
+        self.bloom_hits = 0
+        self.db_lookups = 0
+        self.db_writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingested (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                ingested_at REAL NOT NULL,
+                target TEXT,
+                PRIMARY KEY (source, key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ingested_at ON ingested (ingested_at)")
+        self.prune()
+
+    @staticmethod
+    def _item(source: str, key: str) -> str:
+        return f"{source}\x00{key}"
+
+    def _rebuild_bloom(self):
+        """Load every live key into a freshly sized Bloom filter"""
+        rows = self._conn.execute("SELECT source, key FROM ingested").fetchall()
+        self._bloom = BloomFilter(capacity=max(BLOOM_CAPACITY, len(rows) * 2))
+        for source, key in rows:
+            self._bloom.add(self._item(source, key))
+
+    def _add_to_bloom(self, item: str):
+        if self._bloom.count >= self._bloom.capacity:
+            self._rebuild_bloom()
+        self._bloom.add(item)
+
+    def seen(self, source: str, key: str) -> bool:
+        """True if (source, key) was ingested and has not expired"""
+        item = self._item(source, key)
+        with self._lock:
+            if item not in self._bloom:
+                self.bloom_hits += 1
+                return False
+            # Possible hit (or a key another process added): confirm in SQLite
+            self.db_lookups += 1
+            row = self._conn.execute(
+                "SELECT 1 FROM ingested WHERE source = ? AND key = ? AND ingested_at >= ?",
+                (source, key, time.time() - self.ttl)
+            ).fetchone()
+            return row is not None
+
+    def claim(self, source: str, key: str, target: Optional[str] = None) -> bool:
+        """
+        Record (source, key) as ingested
+
+        Returns:
+            True if the caller should write the item, False if it is a duplicate
+        """
+        item = self._item(source, key)
+        now = time.time()
+        with self._lock:
+            if item in self._bloom:
+                # Probably a duplicate: confirm with a read before writing
+                self.db_lookups += 1
+                row = self._conn.execute(
+                    "SELECT 1 FROM ingested WHERE source = ? AND key = ? AND ingested_at >= ?",
+                    (source, key, now - self.ttl)
+                ).fetchone()
+                if row is not None:
+                    return False
+            else:
+                self.bloom_hits += 1
+            self.db_writes += 1
+            # Replace expired rows; keep live ones (another process may have claimed it)
+            cursor = self._conn.execute(
+                """INSERT INTO ingested (source, key, ingested_at, target) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (source, key) DO UPDATE
+                   SET ingested_at = excluded.ingested_at, target = excluded.target
+                   WHERE ingested.ingested_at < ?""",
+                (source, key, now, target, now - self.ttl)
+            )
+            self._add_to_bloom(item)
+            return cursor.rowcount == 1
+
+    def release(self, source: str, key: str):
+        """Forget a claim, e.g. when writing the item failed"""
+        with self._lock:
+            self._conn.execute("DELETE FROM ingested WHERE source = ? AND key = ?", (source, key))
+
+    def prune(self) -> int:
+        """Delete expired entries and rebuild the Bloom filter; returns rows removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM ingested WHERE ingested_at < ?", (time.time() - self.ttl,))
+            self._rebuild_bloom()
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} expired ledger entries")
+        return cursor.rowcount
+
+    def count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            if source:
+                return self._conn.execute("SELECT COUNT(*) FROM ingested WHERE source = ?", (source,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM ingested").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_ledger: Optional[IngestionLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger(path: Path = LEDGER_DB) -> IngestionLedger:
+    """Process-wide ledger shared by all watchers"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = IngestionLedger(path)
+        return _ledger
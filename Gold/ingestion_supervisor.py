@@ -0,0 +1,476 @@
+"""
+Ingestion Supervisor
+
+Runs every ingestion watcher in one process as asyncio tasks, instead of one
+process per script each with its own `while True: sleep` loop:
+- Blocking steps (Gmail API calls, file moves, plan generation) run on one
+  shared thread pool; WhatsApp's Playwright coroutine runs on the event loop
+- Per-task restart policy with exponential backoff; a task that keeps
+  failing inside the window is retried every max_backoff seconds (an outage
+  can last longer than a few restarts) instead of spinning
+- Wake-ups on demand (e.g. a Gmail push notification) on top of the interval
+- One shutdown path (Ctrl+C / SIGTERM) that stops every task and its resources
+- Per-watcher metrics (runs, items, throughput, lag, errors, restarts) written
+  to Supervisor_Status.json
+
+Usage:
+    python ingestion_supervisor.py                   # all watchers
+    python ingestion_supervisor.py --only inbox gmail
+    python ingestion_supervisor.py --gmail-push      # Gmail webhook + adaptive polling
+"""
+
+import json
+import time
+import signal
+import asyncio
+import inspect
+import logging
+import argparse
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger('ingestion_supervisor')
+
+# Configuration
+STATUS_FILE = Path("Supervisor_Status.json")
+STATUS_INTERVAL = 30  # seconds between status file writes
+MAX_WORKERS = 8
+SHUTDOWN_GRACE = 10  # seconds to let in-flight blocking steps finish
+VAULT_RESYNC_INTERVAL = 3600  # seconds between full vault index reconciliations
+
+
+class RestartPolicy:
+    """
+    Exponential backoff with a cap on fast restarts inside a sliding window
+
+    Past max_restarts inside the window the task is retried every max_backoff
+    seconds until it recovers (give_up=True marks it failed instead). A quiet
+    window without failures resets the backoff.
+    """
+
+    def __init__(
+        self,
+        max_restarts: int = 5,
+        window: float = 600,
+        backoff: float = 2.0,
+        max_backoff: float = 120,
+        give_up: bool = False
+    ):
+        self.max_restarts = max_restarts
+        self.window = window
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.give_up = give_up
+        self._restarts: List[float] = []
+
+    def next_delay(self) -> Optional[float]:
+        """Delay before the next restart, or None when the task should give up"""
+        now = time.monotonic()
+        self._restarts = [t for t in self._restarts if now - t < self.window]
+        if len(self._restarts) >= self.max_restarts:
+            if self.give_up:
+                return None
+            # Keep the newest failures so the window only clears after a quiet period
+            self._restarts = self._restarts[1:] + [now]
+            return self.max_backoff
+        self._restarts.append(now)
+        return min(self.backoff * (2 ** (len(self._restarts) - 1)), self.max_backoff)
+
+
+class SupervisedTask:
+    """
+    One watcher hosted by the supervisor
+
+    Periodic tasks call `step` (sync steps run on the thread pool) every
+    `interval` seconds, or sooner when woken; `step` returns the number of
+    items it ingested. Coroutine tasks run `coroutine()` until shutdown; a
+    coroutine that returns on its own counts as a failure and is restarted.
+    `setup` runs before the first step and after every restart; returning
+    False counts as a failure. `teardown` runs on restart and shutdown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        step: Optional[Callable[[], Any]] = None,
+        interval: float = 10,
+        coroutine: Optional[Callable[[], Any]] = None,
+        setup: Optional[Callable[[], Any]] = None,
+        teardown: Optional[Callable[[], Any]] = None,
+        poll=None,
+        policy: Optional[RestartPolicy] = None
+    ):
+        if (step is None) == (coroutine is None):
+            raise ValueError("Provide exactly one of step or coroutine")
+        self.name = name
+        self.step = step
+        self.interval = interval
+        self.coroutine = coroutine
+        self.setup = setup
+        self.teardown = teardown
+        self.poll = poll  # optional AdaptivePollInterval
+        self.policy = policy or RestartPolicy()
+        self.wake: Optional[asyncio.Event] = None
+
+        self.state = 'pending'
+        self.runs = 0
+        self.items = 0
+        self.errors = 0
+        self.restarts = 0
+        self.last_error = None
+        self.last_run = None
+        self.last_duration = 0.0
+        self.lag = 0.0
+        self.started_at = None
+
+    def metrics(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            'state': self.state,
+            'runs': self.runs,
+            'items': self.items,
+            'throughput_per_min': round(self.items / uptime * 60, 2) if uptime else 0,
+            'last_run': self.last_run,
+            'last_duration': round(self.last_duration, 3),
+            'lag': round(self.lag, 3),
+            'interval': round(self.poll.current if self.poll else self.interval, 1) if self.step else None,
+            'errors': self.errors,
+            'restarts': self.restarts,
+            'last_error': self.last_error
+        }
+
+
+class IngestionSupervisor:
+    """Hosts SupervisedTasks on one event loop and one shared thread pool"""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        status_file: Optional[Path] = STATUS_FILE,
+        shutdown_grace: float = SHUTDOWN_GRACE
+    ):
+        self.tasks: Dict[str, SupervisedTask] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ingest')
+        self.status_file = Path(status_file) if status_file else None
+        self.shutdown_grace = shutdown_grace
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._started = time.monotonic()
+
+    def add(self, task: SupervisedTask) -> SupervisedTask:
+        self.tasks[task.name] = task
+        return task
+
+    async def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn on the shared thread pool (or await it if it is a coroutine function)"""
+        if inspect.iscoroutinefunction(fn):
+            return await fn()
+        return await self.loop.run_in_executor(self.executor, fn)
+
+    def notify(self, name: str):
+        """Wake a periodic task now; safe to call from any thread"""
+        task = self.tasks.get(name)
+        if task and task.wake and self.loop:
+            self.loop.call_soon_threadsafe(task.wake.set)
+
+    async def _sleep(self, task: SupervisedTask, delay: float):
+        """Sleep until the delay passes, the task is woken or shutdown starts"""
+        waiters = [asyncio.ensure_future(self._stopping.wait())]
+        if task.wake:
+            waiters.append(asyncio.ensure_future(task.wake.wait()))
+        try:
+            await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if task.wake:
+            task.wake.clear()
+
+    async def _run_periodic(self, task: SupervisedTask):
+        next_run = self.loop.time()
+        while not self._stopping.is_set():
+            start = self.loop.time()
+            task.lag = max(0.0, start - next_run)
+            items = await self.call(task.step)
+            task.last_duration = self.loop.time() - start
+            task.last_run = datetime.now().isoformat()
+            task.runs += 1
+            task.items += int(items or 0)
+
+            interval = task.poll.update(int(items or 0)) if task.poll else task.interval
+            next_run = self.loop.time() + interval
+            await self._sleep(task, interval)
+
+    async def _teardown(self, task: SupervisedTask):
+        if task.teardown:
+            try:
+                await self.call(task.teardown)
+            except Exception as e:
+                logger.error(f"[{task.name}] teardown failed: {e}")
+
+    async def _supervise(self, task: SupervisedTask):
+        task.wake = asyncio.Event()
+        task.started_at = time.monotonic()
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    task.state = 'starting'
+                    if task.setup and await self.call(task.setup) is False:
+                        raise RuntimeError("setup failed")
+                    task.state = 'running'
+                    if task.coroutine:
+                        await task.coroutine()
+                        if not self._stopping.is_set():
+                            raise RuntimeError("watcher exited unexpectedly")
+                    else:
+                        await self._run_periodic(task)
+                    task.state = 'stopped'
+                    break
+                except asyncio.CancelledError:
+                    task.state = 'stopped'
+                    raise
+                except Exception as e:
+                    task.errors += 1
+                    task.last_error = f"{type(e).__name__}: {e}"
+                    await self._teardown(task)
+                    delay = task.policy.next_delay()
+                    if delay is None:
+                        task.state = 'failed'
+                        logger.error(f"[{task.name}] giving up after repeated failures: {task.last_error}")
+                        return
+                    task.state = 'restarting'
+                    task.restarts += 1
+                    logger.warning(f"[{task.name}] failed ({task.last_error}); restarting in {delay:.0f}s")
+                    await self._sleep(task, delay)
+        finally:
+            if task.state != 'failed':
+                await self._teardown(task)
+
+    async def _write_status_periodically(self):
+        while not self._stopping.is_set():
+            self.write_status()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=STATUS_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'uptime_seconds': round(time.monotonic() - self._started),
+            'watchers': {name: task.metrics() for name, task in self.tasks.items()}
+        }
+
+    def write_status(self):
+        if not self.status_file:
+            return
+        try:
+            with open(self.status_file, 'w', encoding='utf-8') as f:
+                json.dump(self.get_status(), f, indent=2)
+        except Exception as e:
+            logger.error(f"Could not write supervisor status: {e}")
+
+    def stop(self):
+        """Begin shutdown; safe to call from signal handlers and other threads"""
+        if self.loop and self._stopping:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+
+    async def run(self):
+        """Run all tasks until stop() is called"""
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._started = time.monotonic()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: KeyboardInterrupt is handled by main()
+
+        running = [asyncio.create_task(self._supervise(task), name=name) for name, task in self.tasks.items()]
+        status_writer = asyncio.create_task(self._write_status_periodically())
+
+        try:
+            await self._stopping.wait()
+        finally:
+            self._stopping.set()
+            # Periodic tasks exit after their current step; coroutine tasks are cancelled
+            done, pending = await asyncio.wait(running, timeout=self.shutdown_grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            status_writer.cancel()
+            self.write_status()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ----------------------------------------------------------------------
+# Default watcher set
+# ----------------------------------------------------------------------
+
+def build_default_supervisor(only: Optional[List[str]] = None, gmail_push: bool = False) -> IngestionSupervisor:
+    """
+    Register the Gold tier watchers
+
+    Watchers whose dependencies are missing (Google API client, Playwright,
+    watchdog) are skipped with a message instead of stopping the others.
+    """
+    supervisor = IngestionSupervisor()
+    wanted = set(only) if only else None
+
+    def enabled(name):
+        return wanted is None or name in wanted
+
+    if enabled('inbox'):
+        try:
+            from watchdog.observers import Observer
+            from watcher import InboxWatcher, InboxHandler
+
+            inbox = InboxWatcher(watch_dir="Inbox", dest_dir="Needs_Action")
+            observer_holder = {}
+
+            def start_inbox():
+                inbox.start()
+                observer = Observer()
+                observer.schedule(InboxHandler(inbox), path=inbox.watch_dir, recursive=False)
+                observer.start()
+                observer_holder['observer'] = observer
+                inbox.reconcile()
+
+            def check_inbox():
+                # watchdog delivers events on its own thread; restart it if it died
+                if not observer_holder['observer'].is_alive() or not inbox.pipeline.is_alive():
+                    raise RuntimeError("inbox observer or staging thread stopped")
+                moved = inbox.pipeline.moved - observer_holder.get('reported', 0)
+                observer_holder['reported'] = inbox.pipeline.moved
+                return moved
+
+            def stop_inbox():
+                observer = observer_holder.pop('observer', None)
+                if observer:
+                    observer.stop()
+                    observer.join(timeout=5)
+                inbox.stop()
+
+            supervisor.add(SupervisedTask('inbox', step=check_inbox, interval=5, setup=start_inbox, teardown=stop_inbox))
+        except ImportError as e:
+            print(f"Skipping inbox watcher: {e}")
+
+    if enabled('gmail'):
+        try:
+            from gmail_watcher import GmailWatcher
+            from gmail_push import AdaptivePollInterval, PushNotificationServer
+
+            gmail = GmailWatcher()
+            push_holder = {}
+
+            def start_gmail():
+                if not gmail.authenticate():
+                    return False
+                if gmail_push and 'server' not in push_holder:
+                    server = PushNotificationServer(lambda notification: supervisor.notify('gmail'))
+                    server.start()
+                    push_holder['server'] = server
+
+            def stop_gmail():
+                server = push_holder.pop('server', None)
+                if server:
+                    server.stop()
+
+            supervisor.add(SupervisedTask(
+                'gmail', step=gmail.process_new_emails, setup=start_gmail, teardown=stop_gmail,
+                poll=AdaptivePollInterval()
+            ))
+        except ImportError as e:
+            print(f"Skipping Gmail watcher: {e}")
+
+    if enabled('whatsapp'):
+        try:
+            from whatsapp_watcher import WhatsAppWatcher
+
+            whatsapp = WhatsAppWatcher()
+            supervisor.add(SupervisedTask('whatsapp', coroutine=whatsapp.run))
+        except ImportError as e:
+            print(f"Skipping WhatsApp watcher: {e}")
+
+    if enabled('email_approval'):
+        try:
+            from email_approval_workflow import ApprovalBasedEmailProcessor
+
+            processor = ApprovalBasedEmailProcessor()
+            supervisor.add(SupervisedTask(
+                'email_approval', step=lambda: int(processor.run_once()), interval=10,
+                setup=processor.authenticate
+            ))
+        except ImportError as e:
+            print(f"Skipping email approval workflow: {e}")
+
+    if enabled('agent_interface'):
+        try:
+            from agent_interface import AgentInterface
+
+            agent = AgentInterface()
+            supervisor.add(SupervisedTask('agent_interface', step=agent.check_new_approvals, interval=5))
+        except ImportError as e:
+            print(f"Skipping agent interface: {e}")
+
+    if enabled('vault_index'):
+        from vault_index import get_vault_index, WATCHDOG_AVAILABLE
+
+        if WATCHDOG_AVAILABLE:
+            vault = get_vault_index()
+            vault_holder = {'synced_at': time.monotonic()}
+
+            def check_vault_index():
+                if not vault.is_watching():
+                    raise RuntimeError("vault index observer stopped")
+                vault.heartbeat()
+                # Events can be dropped under load; reconcile once in a while
+                if time.monotonic() - vault_holder['synced_at'] >= VAULT_RESYNC_INTERVAL:
+                    vault_holder['synced_at'] = time.monotonic()
+                    counts = vault.sync()
+                    return counts['added'] + counts['updated'] + counts['removed']
+                return 0
+
+            supervisor.add(SupervisedTask(
+                'vault_index', step=check_vault_index, interval=30,
+                setup=vault.start_watching, teardown=vault.stop_watching
+            ))
+        else:
+            print("Skipping vault index watcher: watchdog is not installed")
+
+    if enabled('reasoning'):
+        from reasoning_loop import ReasoningLoop
+
+        reasoning = ReasoningLoop()
+        supervisor.add(SupervisedTask('reasoning', step=reasoning.run_once, interval=10))
+
+    return supervisor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run all ingestion watchers in one process')
+    parser.add_argument('--only', nargs='+',
+                        choices=['inbox', 'gmail', 'whatsapp', 'email_approval', 'agent_interface', 'vault_index', 'reasoning'],
+                        help='Run only these watchers')
+    parser.add_argument('--gmail-push', action='store_true', help='Accept Gmail push notifications on a local webhook')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    supervisor = build_default_supervisor(only=args.only, gmail_push=args.gmail_push)
+    print(f"Starting ingestion supervisor with: {', '.join(supervisor.tasks) or 'no watchers'}")
+    print(f"Status: {STATUS_FILE}  |  Press Ctrl+C to stop")
+
+    try:
+        asyncio.run(supervisor.run())
+    except KeyboardInterrupt:
+        pass
+    print("Ingestion supervisor stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,13 +11,12 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime
 import re
+import importlib.util
 
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
+# Playwright itself is imported when the browser is initialized
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec('playwright') is not None
+if not PLAYWRIGHT_AVAILABLE:
     print("Playwright not installed. Run: pip install playwright && playwright install chromium")
-    PLAYWRIGHT_AVAILABLE = False
 
 
 class MCPBrowserServer:
@@ -43,6 +42,7 @@ class MCPBrowserServer:
             return False
 
         try:
+            from playwright.async_api import async_playwright
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(headless=self.headless)
             self.context = await self.browser.new_context(
@@ -415,8 +415,13 @@ class MCPBrowserRequestHandler(BaseHTTPRequestHandler):
         print(f"[MCP Browser Server] {args[0]}")
 
 
-def run_mcp_browser_server(host='localhost', port=8081, headless=True):
-    """Run the MCP Browser Server"""
+def create_mcp_browser_server(host='localhost', port=8081, headless=True, handler_class=None):
+    """
+    Create the MCP Browser Server's HTTP server without starting it
+
+    The browser's event loop is created here, so call this from the thread
+    that will run serve_forever().
+    """
     server = MCPBrowserServer(host=host, port=port, headless=headless)
     MCPBrowserRequestHandler.server_instance = server
 
@@ -427,7 +432,14 @@ def run_mcp_browser_server(host='localhost', port=8081, headless=True):
         loop.run_until_complete(server.initialize())
         MCPBrowserRequestHandler.event_loop = loop
 
-    httpd = HTTPServer((host, port), MCPBrowserRequestHandler)
+    return HTTPServer((host, port), handler_class or MCPBrowserRequestHandler)
+
+
+def run_mcp_browser_server(host='localhost', port=8081, headless=True):
+    """Run the MCP Browser Server"""
+    httpd = create_mcp_browser_server(host, port, headless)
+    server = MCPBrowserRequestHandler.server_instance
+    loop = MCPBrowserRequestHandler.event_loop
     print(f"MCP Browser Server running on http://{host}:{port}")
     print(f"Capabilities: browse-web, scrape-content, automate-browser, social-media-post, web-interaction")
     print(f"Headless Mode: {headless}")
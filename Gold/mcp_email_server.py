@@ -14,12 +14,7 @@ from urllib.parse import urlparse, parse_qs
 import threading
 from datetime import datetime
 
-try:
-    from google.auth.transport.requests import Request
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-except ImportError:
-    print("Google API libraries not installed. Run: pip install google-auth google-auth-oauthlib google-api-python-client")
+from gmail_batch import GmailBatchFetcher, METADATA_FIELDS
 
 
 class MCPEmailServer:
@@ -46,6 +41,21 @@ class MCPEmailServer:
 
     def _authenticate(self):
         """Authenticate with Google API"""
+        if not os.path.exists(self.token_file) and not os.path.exists(self.credentials_file):
+            print(f"Credentials file not found: {self.credentials_file}")
+            print("Email sending will be simulated (not actually sent)")
+            return
+
+        # The Google client libraries take seconds to import; only load them when they can be used
+        try:
+            from google.auth.transport.requests import Request
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            from googleapiclient.discovery import build
+        except ImportError:
+            print("Google API libraries not installed. Run: pip install google-auth google-auth-oauthlib google-api-python-client")
+            print("Email sending will be simulated (not actually sent)")
+            return
+
         creds = None
 
         if os.path.exists(self.token_file):
@@ -235,17 +245,18 @@ class MCPEmailServer:
             messages = results.get('messages', [])
             email_list = []
 
-            for msg in messages:
-                msg_detail = self.service.users().messages().get(
-                    userId='me',
-                    id=msg['id'],
-                    format='metadata',
-                    metadataHeaders=['from', 'to', 'subject', 'date']
-                ).execute()
+            # One batched request with only the four headers we need
+            details = GmailBatchFetcher(self.service).fetch(
+                [msg['id'] for msg in messages],
+                format='metadata',
+                metadata_headers=['from', 'to', 'subject', 'date'],
+                fields=METADATA_FIELDS
+            )
 
+            for msg_id, msg_detail in details.items():
                 headers = msg_detail['payload']['headers']
                 email_list.append({
-                    "id": msg['id'],
+                    "id": msg_id,
                     "from": next((h['value'] for h in headers if h['name'] == 'From'), ''),
                     "to": next((h['value'] for h in headers if h['name'] == 'To'), ''),
                     "subject": next((h['value'] for h in headers if h['name'] == 'Subject'), ''),
@@ -405,12 +416,16 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         print(f"[MCP Email Server] {args[0]}")
 
 
-def run_mcp_email_server(host='localhost', port=8080):
-    """Run the MCP Email Server"""
+def create_mcp_email_server(host='localhost', port=8080, handler_class=None):
+    """Create the MCP Email Server's HTTP server without starting it"""
     server = MCPEmailServer(host=host, port=port)
     MCPRequestHandler.server_instance = server
+    return HTTPServer((host, port), handler_class or MCPRequestHandler)
+
 
-    httpd = HTTPServer((host, port), MCPRequestHandler)
+def run_mcp_email_server(host='localhost', port=8080):
+    """Run the MCP Email Server"""
+    httpd = create_mcp_email_server(host, port)
     print(f"MCP Email Server running on http://{host}:{port}")
     print(f"Capabilities: send-email, receive-email, process-email, gmail-watch, email-approval")
     print(f"Approval Workflow: Enabled (HITL required)")
@@ -0,0 +1,462 @@
+"""
+MCP Host - all MCP servers in one process
+
+Optional alternative to start_all_mcp_servers.py. Instead of five Python
+interpreters, each importing Flask/requests/google libraries on its own,
+one process imports the five tool sets once and serves them:
+- Several ports (default): every server keeps its usual port, so clients
+  and mcp.json need no changes
+- One port (--single-port PORT): the Flask apps (odoo, social, x) are
+  mounted under /odoo, /social and /x of a single threaded HTTP server.
+  Email and browser are plain http.server handlers, not WSGI apps, so
+  they keep their own ports.
+- Outbound API calls share one connection pool (http_pool.py)
+- Request count, errors and latency of every app are recorded in one
+  shared HostMetrics, served at /metrics on the admin port (or the single
+  port) next to an aggregate /health
+
+The per-server entry points (python mcp_x_server.py, ...) still work.
+
+Usage:
+    python mcp_host.py                       # every server on its own port
+    python mcp_host.py --single-port 8095    # Flask apps on one port
+    python mcp_host.py --admin-port 9000     # host /health and /metrics elsewhere
+    python mcp_host.py --only odoo x         # a subset
+    python mcp_host.py --benchmark           # compare with 5 processes
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import threading
+from datetime import datetime
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, make_server as wsgiref_make_server
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from werkzeug.serving import make_server as werkzeug_make_server
+    WERKZEUG_AVAILABLE = True
+except ImportError:
+    WERKZEUG_AVAILABLE = False
+
+from http_pool import close_session
+
+# Configuration
+# /health and /metrics of the host itself (8090 is the Gmail push webhook)
+HOST_ADMIN_PORT = int(os.getenv('MCP_HOST_ADMIN_PORT', '8095'))
+BIND_TIMEOUT = 60.0  # seconds for every server to be listening
+
+# kind 'http': module.<factory>(host, port, handler_class=...) returns an
+#              unstarted http.server.HTTPServer; <handler> is its handler class
+# kind 'wsgi': module.<app> is a WSGI application (Flask)
+# background:  module attributes with start()/stop() run alongside the app
+APPS = {
+    'email': {'module': 'mcp_email_server', 'kind': 'http', 'port': 8080,
+              'factory': 'create_mcp_email_server', 'handler': 'MCPRequestHandler'},
+    'browser': {'module': 'mcp_browser_server', 'kind': 'http', 'port': 8081,
+                'factory': 'create_mcp_browser_server', 'handler': 'MCPBrowserRequestHandler'},
+    'odoo': {'module': 'mcp_odoo_server', 'kind': 'wsgi', 'port': 8082, 'app': 'app'},
+    'social': {'module': 'mcp_social_server', 'kind': 'wsgi', 'port': 8083, 'app': 'app',
+               'background': ['scheduler']},
+    'x': {'module': 'mcp_x_server', 'kind': 'wsgi', 'port': 8084, 'app': 'app',
+          'background': ['scheduler']}
+}
+
+
+class HostMetrics:
+    """Per-app request counters and latency, shared by every server in the host"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._apps: Dict[str, Dict[str, Any]] = {}
+        self.started_at = datetime.now().isoformat()
+
+    def record(self, app: str, status: int, seconds: float):
+        with self._lock:
+            entry = self._apps.setdefault(app, {
+                'requests': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'status': {}
+            })
+            ms = seconds * 1000
+            entry['requests'] += 1
+            entry['errors'] += status >= 500
+            entry['total_ms'] += ms
+            entry['max_ms'] = max(entry['max_ms'], ms)
+            entry['status'][str(status)] = entry['status'].get(str(status), 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            apps = {}
+            for name, entry in self._apps.items():
+                apps[name] = {
+                    'requests': entry['requests'],
+                    'errors': entry['errors'],
+                    'avg_ms': round(entry['total_ms'] / entry['requests'], 2),
+                    'max_ms': round(entry['max_ms'], 2),
+                    'status': dict(entry['status'])
+                }
+        return {'started_at': self.started_at, 'apps': apps}
+
+
+def instrument_wsgi(name: str, app: Callable, metrics: HostMetrics) -> Callable:
+    """Wrap a WSGI app so every request is recorded in metrics"""
+    def wrapped(environ, start_response):
+        started = time.perf_counter()
+        status = [500]
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status[0] = int(status_line.split(' ', 1)[0])
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            return app(environ, recording_start_response)
+        finally:
+            metrics.record(name, status[0], time.perf_counter() - started)
+    return wrapped
+
+
+def instrument_handler(name: str, handler_class: type, metrics: HostMetrics) -> type:
+    """Subclass an http.server handler so every request is recorded in metrics"""
+    class InstrumentedHandler(handler_class):
+        def handle_one_request(self):
+            started = time.perf_counter()
+            self._metrics_status = None
+            super().handle_one_request()
+            if self._metrics_status is not None:
+                metrics.record(name, self._metrics_status, time.perf_counter() - started)
+
+        def send_response(self, code, message=None):
+            self._metrics_status = code
+            super().send_response(code, message)
+
+    InstrumentedHandler.__name__ = handler_class.__name__
+    return InstrumentedHandler
+
+
+class PathDispatcher:
+    """WSGI app that routes /<prefix>/... to mounted apps (prefix moves to SCRIPT_NAME)"""
+
+    def __init__(self, mounts: Dict[str, Callable], fallback: Callable):
+        self.mounts = {'/' + prefix.strip('/'): app for prefix, app in mounts.items()}
+        self.fallback = fallback
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '') or '/'
+        for prefix, app in self.mounts.items():
+            if path == prefix or path.startswith(prefix + '/'):
+                environ = dict(environ)
+                environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + prefix
+                environ['PATH_INFO'] = path[len(prefix):] or '/'
+                return app(environ, start_response)
+        return self.fallback(environ, start_response)
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def make_wsgi_server(host: str, port: int, app: Callable):
+    """Threaded WSGI server (werkzeug's, as used by app.run, when installed)"""
+    if WERKZEUG_AVAILABLE:
+        return werkzeug_make_server(host, port, app, threaded=True)
+    return wsgiref_make_server(host, port, app, server_class=_ThreadingWSGIServer,
+                               handler_class=_QuietWSGIRequestHandler)
+
+
+class MCPHost:
+    """Loads the MCP apps into this process and serves them"""
+
+    def __init__(
+        self,
+        apps: Optional[Dict[str, Dict[str, Any]]] = None,
+        host: str = 'localhost',
+        single_port: Optional[int] = None,
+        admin_port: Optional[int] = HOST_ADMIN_PORT,
+        bind_timeout: float = BIND_TIMEOUT
+    ):
+        self.apps = {name: dict(config) for name, config in (apps or APPS).items()}
+        self.host = host
+        self.single_port = single_port
+        self.admin_port = admin_port
+        self.bind_timeout = bind_timeout
+        self.metrics = HostMetrics()
+        self.modules: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.import_seconds: Dict[str, float] = {}
+        self.startup_seconds: Optional[float] = None
+        self._servers: List[Any] = []
+        self._background: List[Any] = []
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Import every app module once; an app that fails to import is skipped"""
+        for name, config in self.apps.items():
+            started = time.perf_counter()
+            try:
+                self.modules[name] = importlib.import_module(config['module'])
+            except Exception as e:
+                self.errors[name] = f"import failed: {e}"
+                print(f"[MCP Host] {name}: {self.errors[name]}")
+            self.import_seconds[name] = time.perf_counter() - started
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def _wsgi_app(self, name: str) -> Callable:
+        module = self.modules[name]
+        return instrument_wsgi(name, getattr(module, self.apps[name].get('app', 'app')), self.metrics)
+
+    def _serve(self, label: str, create: Callable[[], Any], ready: threading.Event):
+        """Create a server on this thread (the browser's event loop is bound to it) and serve"""
+        try:
+            server = create()
+        except Exception as e:
+            self.errors[label] = f"start failed: {e}"
+            print(f"[MCP Host] {label}: {self.errors[label]}")
+            ready.set()
+            return
+        with self._lock:
+            self._servers.append(server)
+        ready.set()
+        server.serve_forever()
+
+    def _spawn(self, label: str, create: Callable[[], Any]) -> threading.Event:
+        ready = threading.Event()
+        thread = threading.Thread(target=self._serve, args=(label, create, ready),
+                                  name=f'mcp-host-{label}', daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return ready
+
+    def _http_factory(self, name: str) -> Callable[[], Any]:
+        config = self.apps[name]
+        module = self.modules[name]
+        handler = instrument_handler(name, getattr(module, config['handler']), self.metrics)
+        factory = getattr(module, config['factory'])
+        return lambda: factory(self.host, config['port'], handler_class=handler)
+
+    def admin_app(self, environ, start_response):
+        """WSGI app for GET /health (aggregate) and GET /metrics"""
+        path = environ.get('PATH_INFO', '/')
+        if path == '/health':
+            body = {
+                'status': 'healthy' if not self.errors else 'degraded',
+                'server': 'MCP Host',
+                'apps': {name: self.errors.get(name, 'running') for name in self.apps},
+                'timestamp': datetime.now().isoformat()
+            }
+            status = '200 OK'
+        elif path == '/metrics':
+            body, status = self.metrics.snapshot(), '200 OK'
+        else:
+            body, status = {'error': 'Not found'}, '404 Not Found'
+        data = json.dumps(body).encode()
+        start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(data)))])
+        return [data]
+
+    def start(self) -> float:
+        """
+        Load the apps, start every server and background worker
+
+        Returns:
+            Seconds until every server was listening
+        """
+        started = time.perf_counter()
+        if not self.modules:
+            self.load()
+
+        waiting = []
+        wsgi_names = [n for n in self.modules if self.apps[n]['kind'] == 'wsgi']
+        for name in self.modules:
+            if self.apps[name]['kind'] == 'http':
+                waiting.append(self._spawn(name, self._http_factory(name)))
+            elif self.single_port is None:
+                app = self._wsgi_app(name)
+                port = self.apps[name]['port']
+                waiting.append(self._spawn(name, lambda app=app, port=port: make_wsgi_server(self.host, port, app)))
+
+        if self.single_port is not None:
+            dispatcher = PathDispatcher({name: self._wsgi_app(name) for name in wsgi_names}, self.admin_app)
+            waiting.append(self._spawn('host', lambda: make_wsgi_server(self.host, self.single_port, dispatcher)))
+
+        for ready in waiting:
+            ready.wait(self.bind_timeout)
+
+        for name, module in self.modules.items():
+            for attr in self.apps[name].get('background', []):
+                worker = getattr(module, attr)
+                worker.start()
+                self._background.append(worker)
+
+        # The admin port answers /health last, so a health check means everything is up
+        if self.single_port is None and self.admin_port is not None:
+            self._spawn('admin', lambda: make_wsgi_server(self.host, self.admin_port, self.admin_app)).wait(self.bind_timeout)
+
+        self.startup_seconds = time.perf_counter() - started
+        return self.startup_seconds
+
+    def stop(self):
+        """Stop every server and background worker"""
+        for worker in self._background:
+            worker.stop()
+        self._background = []
+        with self._lock:
+            servers, self._servers = self._servers, []
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        close_session()
+
+    def print_report(self):
+        single = self.single_port is not None
+        print(f"\n{'App':<10} {'Address':<28} {'Import':>8}  Status")
+        print("-" * 60)
+        for name, config in self.apps.items():
+            if single and config['kind'] == 'wsgi':
+                address = f"http://{self.host}:{self.single_port}/{name}"
+            else:
+                address = f"http://{self.host}:{config['port']}"
+            seconds = self.import_seconds.get(name)
+            imported = f"{seconds:.2f}s" if seconds is not None else '-'
+            print(f"{name:<10} {address:<28} {imported:>8}  {self.errors.get(name, 'running')}")
+        admin = self.single_port if single else self.admin_port
+        if admin is not None:
+            print(f"\nHost health/metrics: http://{self.host}:{admin}/health, /metrics")
+        if self.startup_seconds is not None:
+            print(f"All servers listening in {self.startup_seconds:.2f}s")
+        print()
+
+    def run_forever(self):
+        """Block until Ctrl+C, then stop"""
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("\nShutting down MCP host...")
+            self.stop()
+            print("MCP host stopped.")
+
+
+# ----------------------------------------------------------------------
+# Benchmark: one host process vs one process per server
+# ----------------------------------------------------------------------
+
+def process_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process in MB (psutil, or /proc on Linux; None if unknown)"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _measure(configs: List[Dict[str, Any]], cwd: str, ready_timeout: float) -> Dict[str, Any]:
+    from mcp_process_supervisor import MCPProcessSupervisor
+
+    supervisor = MCPProcessSupervisor(configs, cwd=cwd, log_file=None, echo=False, ready_timeout=ready_timeout)
+    started = time.monotonic()
+    report = supervisor.start()
+    elapsed = time.monotonic() - started
+    try:
+        rss = [process_rss_mb(info['pid']) for info in supervisor.status().values() if info['pid']]
+    finally:
+        supervisor.stop()
+    return {
+        'processes': len(configs),
+        'ready': sum(1 for seconds in report.values() if seconds is not None),
+        'startup_seconds': elapsed,
+        'rss_mb': sum(rss) if rss and None not in rss else None
+    }
+
+
+def run_benchmark(
+    names: Optional[List[str]] = None,
+    ready_timeout: float = 60.0,
+    admin_port: int = HOST_ADMIN_PORT
+) -> Dict[str, Dict[str, Any]]:
+    """Start the servers both ways and compare time-to-ready and total resident memory"""
+    names = names or list(APPS)
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    separate = [
+        {'name': name, 'file': f"{APPS[name]['module']}.py", 'port': APPS[name]['port']}
+        for name in names
+    ]
+    hosted = [{'name': 'mcp_host', 'file': 'mcp_host.py', 'port': admin_port,
+               'args': ['--only', *names, '--admin-port', str(admin_port)]}]
+
+    results = {
+        'separate': _measure(separate, cwd, ready_timeout),
+        'host': _measure(hosted, cwd, ready_timeout)
+    }
+
+    print(f"\n{'Mode':<10} {'Processes':>9} {'Ready':>6} {'Startup':>9} {'Memory':>10}")
+    print("-" * 50)
+    for mode, result in results.items():
+        memory = f"{result['rss_mb']:.0f} MB" if result['rss_mb'] is not None else 'n/a'
+        ready = 'yes' if result['ready'] == result['processes'] else 'no'
+        print(f"{mode:<10} {result['processes']:>9} {ready:>6} {result['startup_seconds']:>8.2f}s {memory:>10}")
+    if results['separate']['rss_mb'] is None:
+        print("\n(memory needs psutil or /proc: pip install psutil)")
+    print()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve all MCP servers from one process')
+    parser.add_argument('--single-port', type=int, metavar='PORT',
+                        help='Mount the Flask apps under /odoo, /social, /x on this port')
+    parser.add_argument('--only', nargs='+', choices=list(APPS), help='Host only these apps')
+    parser.add_argument('--host', default='localhost', help='Interface to bind')
+    parser.add_argument('--admin-port', type=int, default=HOST_ADMIN_PORT,
+                        help='Port for the host /health and /metrics (env MCP_HOST_ADMIN_PORT)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare startup time and memory with one process per server')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.only, admin_port=args.admin_port)
+        return
+
+    apps = {name: config for name, config in APPS.items() if not args.only or name in args.only}
+    host = MCPHost(apps, host=args.host, single_port=args.single_port, admin_port=args.admin_port)
+
+    print("\n" + "=" * 60)
+    print("MCP Host - all MCP servers in one process")
+    print("=" * 60)
+    host.start()
+    host.print_report()
+    sys.stdout.flush()
+    host.run_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -15,10 +15,11 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-import requests
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+from http_pool import get_session
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -76,7 +77,7 @@ class OdooJSONRPC:
                 "id": 1
             }
             
-            response = requests.post(endpoint, json=payload, timeout=30)
+            response = get_session().post(endpoint, json=payload, timeout=30)
             result = response.json()
             
             if 'result' in result and result['result']:
@@ -122,7 +123,7 @@ class OdooJSONRPC:
         headers = {"Content-Type": "application/json"}
         
         try:
-            response = requests.post(endpoint, json=payload, headers=headers, timeout=30)
+            response = get_session().post(endpoint, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
             result = response.json()
             
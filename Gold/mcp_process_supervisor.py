@@ -0,0 +1,320 @@
+"""
+MCP Process Supervisor
+
+Runs the MCP servers as child processes and keeps them up:
+- All servers are launched at once; each is "ready" when GET /health
+  answers 200 (polled with backoff), and its startup time is recorded
+- Crashed servers are restarted with exponential delay (RestartPolicy from
+  the ingestion supervisor); a server that keeps crashing is marked failed
+- A ready server that stops answering /health several times in a row is
+  killed and restarted
+- stdout/stderr of every server is merged into one stream with a
+  "[name]" prefix and appended to mcp_servers.log
+- Shutdown terminates every server, killing those that do not exit in time
+
+Usage:
+    supervisor = MCPProcessSupervisor(SERVERS)
+    supervisor.start()                # returns when all are ready or timed out
+    supervisor.run_forever()          # monitor until Ctrl+C, then stop()
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from status_aggregator import probe_health
+from ingestion_supervisor import RestartPolicy
+
+# Configuration
+LOG_FILE = "mcp_servers.log"
+READY_TIMEOUT = 30.0  # seconds for a server to answer /health after launch
+READY_POLL_START = 0.05  # first readiness poll delay, grows x1.5 per attempt
+READY_POLL_MAX = 1.0
+MONITOR_INTERVAL = 0.5
+HEALTH_INTERVAL = 10.0  # seconds between liveness probes of ready servers
+HEALTH_FAILURES = 3  # consecutive failed probes before a restart
+STOP_GRACE = 5.0  # seconds between terminate and kill
+
+
+class LogAggregator:
+    """Prefixes and merges child process output into stdout and one log file"""
+
+    def __init__(self, log_file: Optional[str] = LOG_FILE, echo: bool = True):
+        self.log_file = log_file
+        self.echo = echo
+        self.width = 0
+        self._lock = threading.Lock()
+        self._file = open(log_file, 'a', encoding='utf-8') if log_file else None
+
+    def write(self, name: str, line: str):
+        text = f"[{name:<{self.width}}] {line.rstrip()}"
+        with self._lock:
+            if self.echo:
+                print(text, flush=True)
+            if self._file:
+                self._file.write(f"{datetime.now().isoformat(timespec='seconds')} {text}\n")
+                self._file.flush()
+
+    def pump(self, name: str, stream):
+        """Copy a child's output line by line until it closes (runs on its own thread)"""
+        for line in iter(stream.readline, ''):
+            self.write(name, line)
+        stream.close()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class ManagedServer:
+    """One MCP server process and its lifecycle state"""
+
+    def __init__(self, config: Dict[str, Any], policy: Optional[RestartPolicy] = None):
+        self.name = config['name']
+        self.file = config['file']
+        self.port = config['port']
+        self.args = config.get('args', [])
+        self.policy = policy or RestartPolicy(max_restarts=5, window=600, backoff=1.0, max_backoff=30, give_up=True)
+        self.process: Optional[subprocess.Popen] = None
+        self.state = 'stopped'
+        self.restarts = 0
+        self.launched_at = None
+        self.startup_seconds: Optional[float] = None
+        self.last_exit_code: Optional[int] = None
+        self.health_failures = 0
+        self.last_health_check = 0.0
+        self.restart_at: Optional[float] = None
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'port': self.port,
+            'state': self.state,
+            'pid': self.process.pid if self.process and self.process.poll() is None else None,
+            'restarts': self.restarts,
+            'startup_seconds': round(self.startup_seconds, 2) if self.startup_seconds is not None else None,
+            'last_exit_code': self.last_exit_code
+        }
+
+
+class MCPProcessSupervisor:
+    """Launches, readiness-gates, restarts and stops the MCP server processes"""
+
+    def __init__(
+        self,
+        servers: List[Dict[str, Any]],
+        cwd: Optional[str] = None,
+        python: str = sys.executable,
+        log_file: Optional[str] = LOG_FILE,
+        ready_timeout: float = READY_TIMEOUT,
+        health_interval: float = HEALTH_INTERVAL,
+        echo: bool = True,
+        policy_factory=None
+    ):
+        self.cwd = cwd or os.getcwd()
+        self.python = python
+        self.ready_timeout = ready_timeout
+        self.health_interval = health_interval
+        self.logs = LogAggregator(log_file, echo=echo)
+        self.servers = {
+            config['name']: ManagedServer(config, policy_factory() if policy_factory else None)
+            for config in servers
+        }
+        self.logs.width = max((len(name) for name in self.servers), default=0)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._monitor = None
+
+    # ------------------------------------------------------------------
+    # Launch and readiness
+    # ------------------------------------------------------------------
+
+    def _launch(self, server: ManagedServer):
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        server.process = subprocess.Popen(
+            [self.python, server.file, *server.args],
+            cwd=self.cwd, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding='utf-8', errors='replace', bufsize=1
+        )
+        server.state = 'starting'
+        server.launched_at = time.monotonic()
+        server.startup_seconds = None
+        server.health_failures = 0
+        threading.Thread(
+            target=self.logs.pump, args=(server.name, server.process.stdout),
+            name=f'log-{server.name}', daemon=True
+        ).start()
+
+    def _wait_ready(self, server: ManagedServer) -> bool:
+        """Poll /health with backoff until it answers, the process exits or the timeout passes"""
+        delay = READY_POLL_START
+        deadline = server.launched_at + self.ready_timeout
+        process = server.process
+        while not self._stopping.is_set() and time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False  # crashed during startup; the monitor restarts it
+            if probe_health(server.port, timeout=min(1.0, max(0.1, deadline - time.monotonic())))['status'] == 'healthy':
+                with self._lock:
+                    if server.process is process:
+                        server.startup_seconds = time.monotonic() - server.launched_at
+                        server.state = 'ready'
+                        server.last_health_check = time.monotonic()
+                self.logs.write(server.name, f"ready on port {server.port} in {server.startup_seconds:.2f}s")
+                return True
+            self._stopping.wait(delay)
+            delay = min(delay * 1.5, READY_POLL_MAX)
+        if not self._stopping.is_set() and process.poll() is None:
+            with self._lock:
+                if server.process is process:
+                    server.state = 'unready'
+            self.logs.write(server.name, f"not ready after {self.ready_timeout:.0f}s")
+        return False
+
+    def start(self, wait: bool = True) -> Dict[str, Optional[float]]:
+        """
+        Launch every server at once and wait for them to become ready
+
+        Returns:
+            {name: startup seconds, or None if the server was not ready in time}
+        """
+        self._stopping.clear()
+        started = time.monotonic()
+        for server in self.servers.values():
+            self._launch(server)
+
+        waiters = [
+            threading.Thread(target=self._wait_ready, args=(server,), name=f'ready-{server.name}', daemon=True)
+            for server in self.servers.values()
+        ]
+        for waiter in waiters:
+            waiter.start()
+        if wait:
+            for waiter in waiters:
+                waiter.join()
+
+        self._monitor = threading.Thread(target=self._monitor_loop, name='mcp-monitor', daemon=True)
+        self._monitor.start()
+
+        report = {name: server.startup_seconds for name, server in self.servers.items()}
+        if wait:
+            ready = sum(1 for seconds in report.values() if seconds is not None)
+            print(f"[{datetime.now()}] {ready}/{len(report)} MCP servers ready in {time.monotonic() - started:.2f}s")
+        return report
+
+    # ------------------------------------------------------------------
+    # Monitoring and restarts
+    # ------------------------------------------------------------------
+
+    def _schedule_restart(self, server: ManagedServer, reason: str):
+        delay = server.policy.next_delay()
+        if delay is None:
+            server.state = 'failed'
+            self.logs.write(server.name, f"{reason}; too many restarts, giving up")
+            return
+        server.state = 'restarting'
+        server.restart_at = time.monotonic() + delay
+        self.logs.write(server.name, f"{reason}; restarting in {delay:.1f}s")
+
+    def _check(self, server: ManagedServer):
+        now = time.monotonic()
+        with self._lock:
+            if server.state in ('failed', 'stopped'):
+                return
+            if server.state == 'restarting':
+                if now >= server.restart_at:
+                    server.restarts += 1
+                    self._launch(server)
+                    threading.Thread(target=self._wait_ready, args=(server,), daemon=True).start()
+                return
+
+            code = server.process.poll() if server.process else None
+            if code is not None:
+                server.last_exit_code = code
+                self._schedule_restart(server, f"exited with code {code}")
+                return
+
+            if server.state != 'ready' or now - server.last_health_check < self.health_interval:
+                return
+            server.last_health_check = now
+
+        # Liveness probe outside the lock
+        if probe_health(server.port)['status'] == 'healthy':
+            server.health_failures = 0
+            return
+        server.health_failures += 1
+        if server.health_failures >= HEALTH_FAILURES:
+            with self._lock:
+                self._terminate(server.process)
+                server.last_exit_code = server.process.poll()
+                self._schedule_restart(server, f"/health failed {server.health_failures} times")
+
+    def _monitor_loop(self):
+        while not self._stopping.wait(MONITOR_INTERVAL):
+            for server in self.servers.values():
+                try:
+                    self._check(server)
+                except Exception as e:
+                    self.logs.write(server.name, f"monitor error: {e}")
+
+    # ------------------------------------------------------------------
+    # Shutdown and status
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _terminate(process: Optional[subprocess.Popen]):
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=STOP_GRACE)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait(timeout=STOP_GRACE)
+
+    def stop(self):
+        """Stop monitoring and terminate every server (in parallel)"""
+        self._stopping.set()
+        if self._monitor:
+            self._monitor.join(timeout=5)
+        with self._lock:
+            stoppers = [
+                threading.Thread(target=self._terminate, args=(server.process,))
+                for server in self.servers.values()
+            ]
+            for thread in stoppers:
+                thread.start()
+            for thread in stoppers:
+                thread.join()
+            for server in self.servers.values():
+                server.state = 'stopped'
+        self.logs.close()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: server.info() for name, server in self.servers.items()}
+
+    def print_report(self):
+        print(f"\n{'Server':<22} {'Port':>5}  {'State':<10} {'Startup':>8}  Restarts")
+        print("-" * 60)
+        for info in self.status().values():
+            startup = f"{info['startup_seconds']:.2f}s" if info['startup_seconds'] is not None else '-'
+            print(f"{info['name']:<22} {info['port']:>5}  {info['state']:<10} {startup:>8}  {info['restarts']}")
+        print()
+
+    def run_forever(self):
+        """Block until Ctrl+C, then stop every server"""
+        try:
+            while not self._stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("\nShutting down all MCP servers...")
+            self.stop()
+            print("All servers stopped.")
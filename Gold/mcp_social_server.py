@@ -6,16 +6,22 @@ Uses Meta Graph API for posting
 """
 
 import os
-import json
 import logging
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+from http_pool import get_session
+from post_log_store import PostLogStore
+from post_analytics import PostAnalytics, window_from_args
+from post_job_queue import PostJobQueue
+from post_scheduler import PostScheduler
+from media_pipeline import MediaPipeline, GraphResumableUploader, GRAPH_API_URL, VIDEO_EXTENSIONS
+
 # Load environment variables
 load_dotenv()
 
@@ -37,71 +43,63 @@ SOCIAL_CONFIG = {
     'instagram_account_id': os.getenv('INSTAGRAM_ACCOUNT_ID', ''),
     'instagram_access_token': os.getenv('INSTAGRAM_ACCESS_TOKEN', ''),
     'dry_run': os.getenv('SOCIAL_DRY_RUN', 'true').lower() == 'true',
+    'job_workers': int(os.getenv('SOCIAL_JOB_WORKERS', '4')),
+    'meta_app_id': os.getenv('META_APP_ID', ''),
+    'graph_api_url': os.getenv('GRAPH_API_URL', GRAPH_API_URL),
 }
 
 # Posts storage (for summary generation)
-POSTS_LOG = Path('Posts_Log.json')
+POSTS_LOG = Path('Posts_Log.jsonl')
+LEGACY_POSTS_LOG = Path('Posts_Log.json')
+SCHEDULED_POSTS = Path('Scheduled_Posts.json')
 BRIEFINGS_DIR = Path('Briefings')
 
-# Create directories
-BRIEFINGS_DIR.mkdir(exist_ok=True)
+# Append-only post log (imports legacy Posts_Log.json on first use)
+post_store = PostLogStore(POSTS_LOG, legacy_path=LEGACY_POSTS_LOG)
+
+# Per-day aggregates, updated on every logged post
+post_analytics = PostAnalytics(post_store)
 
 
 def log_post(platform, content, result):
-    """Log post to JSON file for summary generation"""
-    posts = []
-    if POSTS_LOG.exists():
-        try:
-            with open(POSTS_LOG, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
-        except:
-            posts = []
-    
-    posts.append({
+    """Log post to the post log store for summary generation"""
+    post_store.append({
         'timestamp': datetime.now().isoformat(),
         'platform': platform,
         'content': content,
         'result': result
     })
-    
-    with open(POSTS_LOG, 'w', encoding='utf-8') as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
-
-
-def generate_summary_data():
-    """Generate summary from posts log"""
-    posts = []
-    if POSTS_LOG.exists():
-        try:
-            with open(POSTS_LOG, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
-        except:
-            posts = []
-    
-    # Filter last 7 days
-    week_ago = datetime.now() - timedelta(days=7)
-    recent_posts = [
-        p for p in posts 
-        if datetime.fromisoformat(p['timestamp']) > week_ago
-    ]
-    
-    # Count by platform
-    facebook_posts = len([p for p in recent_posts if p['platform'] == 'facebook'])
-    instagram_posts = len([p for p in recent_posts if p['platform'] == 'instagram'])
-    
-    # Success rate
-    successful = len([p for p in recent_posts if p['result'].get('success')])
-    total = len(recent_posts)
+
+
+def generate_summary_data(days=7, start=None, end=None):
+    """
+    Generate summary from post aggregates
+
+    Args:
+        days: Trailing window length (default: 7)
+        start: First day of a custom window (date)
+        end: Last day of a custom window (date, default: today)
+    """
+    key = ('summary', days, start, end, datetime.now().date())
+    return post_analytics.cached(key, lambda: _build_summary(days, start, end))
+
+
+def _build_summary(days, start, end):
+    """Build a summary from the daily buckets (uncached)"""
+    stats = post_analytics.window(days=days, start=start, end=end)
+    by_platform = stats['by_platform']
     
     return {
-        'period': f"{(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}",
-        'total_posts': total,
-        'facebook_posts': facebook_posts,
-        'instagram_posts': instagram_posts,
-        'successful_posts': successful,
-        'failed_posts': total - successful,
-        'success_rate': f"{(successful/total*100) if total > 0 else 0:.1f}%",
-        'posts': recent_posts
+        'period': f"{stats['start']} to {stats['end']}",
+        'total_posts': stats['total_posts'],
+        'facebook_posts': by_platform.get('facebook', {}).get('posts', 0),
+        'instagram_posts': by_platform.get('instagram', {}).get('posts', 0),
+        'successful_posts': stats['successful_posts'],
+        'failed_posts': stats['failed_posts'],
+        'success_rate': stats['success_rate'],
+        'engagement': stats['engagement'],
+        'by_day': stats['by_day'],
+        'posts': post_analytics.posts_in_window(stats)
     }
 
 
@@ -122,24 +120,32 @@ def health_check():
     })
 
 
-@app.route('/tools/post_to_facebook', methods=['POST'])
-def post_to_facebook():
-    """Post to Facebook page"""
+def execute_facebook_post(data):
+    """
+    Post to Facebook page; returns (result, http_status)
+    
+    With media_id (a handle from /tools/upload_media) or media_path (a local
+    video, uploaded through the cached media pipeline) the post is published
+    as a Page video with the message as its description.
+    """
     try:
-        data = request.get_json()
-        
         if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
+            return {'success': False, 'error': 'No data provided'}, 400
         
         page_id = data.get('page_id', SOCIAL_CONFIG.get('facebook_page_id'))
         message = data.get('message', '')
         dry_run = data.get('dry_run', SOCIAL_CONFIG.get('dry_run', True))
+        media_id = data.get('media_id')
+        media_path = data.get('media_path')
         
         if not page_id:
-            return jsonify({'success': False, 'error': 'page_id is required'}), 400
+            return {'success': False, 'error': 'page_id is required'}, 400
         
         if not message:
-            return jsonify({'success': False, 'error': 'message is required'}), 400
+            return {'success': False, 'error': 'message is required'}, 400
+        
+        if media_path and not media_id and Path(media_path).suffix.lower() not in VIDEO_EXTENSIONS:
+            return {'success': False, 'error': 'media_path must be a video file for Facebook posts'}, 400
         
         # Dry run mode
         if dry_run:
@@ -151,57 +157,78 @@ def post_to_facebook():
                 'page_id': page_id
             }
             log_post('facebook', {'message': message, 'page_id': page_id}, result)
-            return jsonify(result)
+            return result, 200
         
         # Real posting - Direct Graph API call
         access_token = SOCIAL_CONFIG.get('facebook_access_token', '')
         if access_token:
-            import requests as req
-            url = f"https://graph.facebook.com/v18.0/{page_id}/feed"
-            params = {
-                'message': message,
-                'access_token': access_token
-            }
+            if media_path and not media_id:
+                # Same content uploaded before -> cached handle, no second upload
+                upload_result, upload_status = execute_media_upload({'media_path': media_path})
+                if not upload_result.get('success'):
+                    return upload_result, upload_status
+                media_id = upload_result['media_id']
+            
+            if media_id:
+                url = f"https://graph-video.facebook.com/v18.0/{page_id}/videos"
+                params = {
+                    'description': message,
+                    'fbuploader_video_file_chunk': media_id,
+                    'access_token': access_token
+                }
+            else:
+                url = f"https://graph.facebook.com/v18.0/{page_id}/feed"
+                params = {
+                    'message': message,
+                    'access_token': access_token
+                }
             
-            resp = req.post(url, params=params, timeout=30)
+            resp = get_session().post(url, params=params, timeout=30)
             api_result = resp.json()
             
             if 'id' in api_result:
                 result = {'success': True, 'post_id': api_result['id'], 'message': 'Posted via Graph API'}
                 log_post('facebook', {'message': message, 'page_id': page_id}, result)
-                return jsonify(result)
+                return result, 200
             else:
                 error_msg = api_result.get('error', {}).get('message', 'Unknown API error')
-                return jsonify({'success': False, 'error': error_msg})
+                return {'success': False, 'error': error_msg}, 200
         else:
-            return jsonify({'success': False, 'error': 'No Facebook access token configured'})
+            return {'success': False, 'error': 'No Facebook access token configured'}, 200
         
     except Exception as e:
         logger.error(f"Error posting to Facebook: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return {'success': False, 'error': str(e)}, 500
 
 
-@app.route('/tools/post_to_instagram', methods=['POST'])
-def post_to_instagram():
-    """Post to Instagram account"""
+@app.route('/tools/post_to_facebook', methods=['POST'])
+def post_to_facebook():
+    """Post to Facebook page (send "async": true to queue as a job)"""
+    data = request.get_json()
+    if data and data.get('async'):
+        return queue_post('facebook', data)
+    result, status = execute_facebook_post(data)
+    return jsonify(result), status
+
+
+def execute_instagram_post(data):
+    """Post to Instagram account; returns (result, http_status)"""
     try:
-        data = request.get_json()
-        
         if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
+            return {'success': False, 'error': 'No data provided'}, 400
         
         account_id = data.get('account_id', SOCIAL_CONFIG.get('instagram_account_id'))
         caption = data.get('caption', '')
         
         if not account_id:
-            return jsonify({'success': False, 'error': 'account_id is required'}), 400
+            return {'success': False, 'error': 'account_id is required'}, 400
         
         if not caption:
-            return jsonify({'success': False, 'error': 'caption is required'}), 400
+            return {'success': False, 'error': 'caption is required'}, 400
         
         # Instagram requires either image_url or media_path
         if not data.get('image_url') and not data.get('media_path'):
-            return jsonify({'success': False, 'error': 'image_url or media_path is required for Instagram'}), 400
+            return {'success': False, 'error': 'image_url or media_path is required for Instagram'}, 400
         
         # Dry run mode
         dry_run = data.get('dry_run', SOCIAL_CONFIG.get('dry_run', True))
@@ -214,19 +241,27 @@ def post_to_instagram():
                 'account_id': account_id
             }
             log_post('instagram', {'caption': caption, 'account_id': account_id}, result)
-            return jsonify(result)
+            return result, 200
         
         # Use API for Instagram
         if SOCIAL_CONFIG.get('instagram_access_token'):
-            import requests as req
             access_token = SOCIAL_CONFIG.get('instagram_access_token')
             
             # Get image URL or media path
             image_url = data.get('image_url')
             media_path = data.get('media_path')
             
-            # Use image_url if provided, otherwise use media_path
-            media_url = image_url if image_url else f'file://{media_path}'
+            # Use image_url if provided, otherwise a media_path that is already a URL
+            if image_url:
+                media_url = image_url
+            elif media_path.startswith(('http://', 'https://')):
+                media_url = media_path
+            else:
+                # The Graph API fetches images itself, so a local file can't be used directly
+                return {
+                    'success': False,
+                    'error': 'Instagram needs a public image_url; local files cannot be posted directly'
+                }, 400
             
             # Step 1: Create media container
             container_url = f"https://graph.facebook.com/v18.0/{account_id}/media"
@@ -237,12 +272,12 @@ def post_to_instagram():
             }
             
             try:
-                container_resp = req.post(container_url, params=container_params, timeout=30)
+                container_resp = get_session().post(container_url, params=container_params, timeout=30)
                 container_result = container_resp.json()
                 
                 if 'id' not in container_result:
                     error_msg = container_result.get('error', {}).get('message', 'Failed to create media container')
-                    return jsonify({'success': False, 'error': error_msg})
+                    return {'success': False, 'error': error_msg}, 200
                 
                 creation_id = container_result['id']
                 
@@ -253,37 +288,58 @@ def post_to_instagram():
                     'access_token': access_token
                 }
                 
-                publish_resp = req.post(publish_url, params=publish_params, timeout=30)
+                publish_resp = get_session().post(publish_url, params=publish_params, timeout=30)
                 publish_result = publish_resp.json()
                 
                 if 'id' in publish_result:
                     result = {'success': True, 'post_id': publish_result['id'], 'message': 'Posted to Instagram'}
                     log_post('instagram', {'caption': caption, 'account_id': account_id}, result)
-                    return jsonify(result)
+                    return result, 200
                 else:
                     error_msg = publish_result.get('error', {}).get('message', 'Failed to publish')
-                    return jsonify({'success': False, 'error': error_msg})
+                    return {'success': False, 'error': error_msg}, 200
                     
             except Exception as e:
-                return jsonify({'success': False, 'error': f'Instagram API Error: {str(e)}'})
+                return {'success': False, 'error': f'Instagram API Error: {str(e)}'}, 200
         else:
-            return jsonify({
+            return {
                 'success': False,
                 'error': 'Instagram API not configured'
-            }), 400
+            }, 400
         
     except Exception as e:
         logger.error(f"Error posting to Instagram: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return {'success': False, 'error': str(e)}, 500
+
+
+@app.route('/tools/post_to_instagram', methods=['POST'])
+def post_to_instagram():
+    """Post to Instagram account (send "async": true to queue as a job)"""
+    data = request.get_json()
+    if data and data.get('async'):
+        return queue_post('instagram', data)
+    result, status = execute_instagram_post(data)
+    return jsonify(result), status
 
 
 @app.route('/tools/generate_summary', methods=['GET'])
+@app.route('/tools/generate_meta_summary', methods=['GET'])  # name used by the weekly briefing and README
 def generate_summary():
-    """Generate weekly summary of social media activity"""
+    """
+    Generate summary of social media activity
+    
+    The response carries an ETag, so the weekly briefing can revalidate it
+    (If-None-Match -> 304) instead of downloading it again.
+    
+    Query Parameters:
+    - days: Trailing window in days (default: 7)
+    - start, end: Custom window as YYYY-MM-DD (inclusive)
+    """
     try:
-        summary = generate_summary_data()
+        summary = generate_summary_data(**window_from_args(request.args))
         
         # Save to Briefings folder
+        BRIEFINGS_DIR.mkdir(exist_ok=True)
         summary_file = BRIEFINGS_DIR / 'meta_summary.md'
         summary_content = f"""# Meta Social Media Summary
 
@@ -318,11 +374,14 @@ def generate_summary():
         with open(summary_file, 'w', encoding='utf-8') as f:
             f.write(summary_content)
         
-        return jsonify({
+        # ETag lets the weekly briefing revalidate instead of re-downloading
+        response = jsonify({
             'success': True,
             'summary': summary,
             'saved_to': str(summary_file)
         })
+        response.add_etag()
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
@@ -336,17 +395,249 @@ def list_posts():
         platform = request.args.get('platform', 'all')
         limit = int(request.args.get('limit', 20))
         
-        posts = []
-        if POSTS_LOG.exists():
-            with open(POSTS_LOG, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
+        # Most recent posts, filtered by platform
+        posts = post_store.tail(limit, platform=None if platform == 'all' else platform)
+        
+        return jsonify({
+            'success': True,
+            'count': len(posts),
+            'posts': posts
+        })
+        
+    except Exception as e:
+        logger.error(f"Error listing posts: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============================================================================
+# Media Uploads
+# ============================================================================
+
+_media_pipeline = None
+
+
+def get_media_pipeline():
+    """Create the media pipeline on first use"""
+    global _media_pipeline
+    if _media_pipeline is None:
+        uploader = GraphResumableUploader(
+            SOCIAL_CONFIG.get('meta_app_id', ''),
+            SOCIAL_CONFIG.get('facebook_access_token', ''),
+            base_url=SOCIAL_CONFIG.get('graph_api_url', GRAPH_API_URL),
+            session=get_session()
+        )
+        _media_pipeline = MediaPipeline(uploader)
+    return _media_pipeline
+
+
+def execute_media_upload(data):
+    """Upload a local media file (reusing cached uploads); returns (result, http_status)"""
+    try:
+        if not data:
+            return {'success': False, 'error': 'No data provided'}, 400
+        
+        media_path = Path(data.get('media_path', ''))
         
-        # Filter by platform
-        if platform != 'all':
-            posts = [p for p in posts if p['platform'] == platform]
+        if not data.get('media_path') or not media_path.is_file():
+            return {'success': False, 'error': f'media_path not found: {media_path}'}, 400
         
-        # Limit results
-        posts = posts[-limit:]
+        if not SOCIAL_CONFIG.get('meta_app_id'):
+            return {'success': False, 'error': 'META_APP_ID not configured'}, 400
+        
+        record = get_media_pipeline().upload(media_path)
+        return {'success': True, **record}, 200
+        
+    except Exception as e:
+        logger.error(f"Error uploading media: {e}")
+        return {'success': False, 'error': str(e)}, 500
+
+
+@app.route('/tools/upload_media', methods=['POST'])
+def upload_media():
+    """
+    Upload a local video for later posts
+    
+    The returned media_id can be passed to /tools/post_to_facebook; uploading
+    the same content again returns the cached handle.
+    
+    Request JSON:
+    {
+        "media_path": "Media/clip.mp4",
+        "async": true  # Optional - resize and upload on the job queue
+    }
+    
+    Response:
+    {
+        "success": true,
+        "media_id": "<upload handle>",
+        "reused": false,
+        "bytes": 1048576,
+        "throughput_mbps": 3.2
+    }
+    """
+    data = request.get_json()
+    if data and data.get('async'):
+        return queue_post('media', data)
+    result, status = execute_media_upload(data)
+    return jsonify(result), status
+
+
+# ============================================================================
+# Job Queue (async posting)
+# ============================================================================
+
+job_queue = PostJobQueue(
+    {
+        'facebook': execute_facebook_post,
+        'instagram': execute_instagram_post,
+        'media': execute_media_upload,
+    },
+    workers=SOCIAL_CONFIG['job_workers']
+)
+
+
+def queue_post(platform, data):
+    """Queue a post on the job queue and return its job id (HTTP 202)"""
+    payload = {k: v for k, v in data.items() if k not in ('async', 'platform')}
+    job_id = job_queue.submit(platform, payload)
+    return jsonify({'success': True, 'queued': True, 'job_id': job_id, 'platform': platform}), 202
+
+
+@app.route('/tools/job_status', methods=['GET'])
+def job_status():
+    """
+    Get status of a queued post
+    
+    Query Parameters:
+    - job_id: Job id returned by an async post or post_batch
+      (omit for overall queue status)
+    """
+    try:
+        job_id = request.args.get('job_id')
+        
+        if not job_id:
+            return jsonify({'success': True, 'queue': job_queue.get_status()})
+        
+        job = job_queue.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': f'Unknown job_id: {job_id}'}), 404
+        
+        return jsonify({'success': True, 'job': job})
+        
+    except Exception as e:
+        logger.error(f"Error getting job status: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/tools/post_batch', methods=['POST'])
+def post_batch():
+    """
+    Queue many posts at once
+    
+    Request JSON:
+    {
+        "posts": [
+            {"platform": "facebook", "message": "...", "dry_run": false},
+            {"platform": "instagram", "caption": "...", "image_url": "..."}
+        ]
+    }
+    
+    Response:
+    {
+        "success": true,
+        "jobs": [{"index": 0, "platform": "facebook", "job_id": "..."}, ...]
+    }
+    """
+    try:
+        data = request.get_json()
+        posts = (data or {}).get('posts', [])
+        
+        if not posts:
+            return jsonify({'success': False, 'error': 'posts is required'}), 400
+        
+        jobs = []
+        for index, post in enumerate(posts):
+            platform = post.get('platform', '')
+            try:
+                payload = {k: v for k, v in post.items() if k != 'platform'}
+                jobs.append({'index': index, 'platform': platform, 'job_id': job_queue.submit(platform, payload)})
+            except ValueError as e:
+                jobs.append({'index': index, 'platform': platform, 'error': str(e)})
+        
+        return jsonify({
+            'success': True,
+            'queued': len([j for j in jobs if 'job_id' in j]),
+            'jobs': jobs
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error queueing batch: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============================================================================
+# Scheduled Posts
+# ============================================================================
+
+scheduler = PostScheduler(SCHEDULED_POSTS, job_queue.submit)
+
+
+@app.route('/tools/schedule_post', methods=['POST'])
+def schedule_post():
+    """
+    Schedule a Facebook or Instagram post for later
+    
+    Request JSON:
+    {
+        "platform": "facebook",
+        "run_at": "2026-03-01T09:00:00",
+        "message": "...",
+        "dry_run": false
+    }
+    
+    The post may be moved later than run_at to keep bursts within platform limits.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        platform = data.get('platform', '')
+        run_at = data.get('run_at')
+        
+        if platform not in job_queue.handlers:
+            return jsonify({'success': False, 'error': f'Unsupported platform: {platform}'}), 400
+        
+        if not run_at:
+            return jsonify({'success': False, 'error': 'run_at is required'}), 400
+        
+        payload = {k: v for k, v in data.items() if k not in ('platform', 'run_at', 'async')}
+        entry = scheduler.schedule(platform, payload, datetime.fromisoformat(run_at))
+        
+        return jsonify({'success': True, 'scheduled': entry})
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid run_at: {e}'}), 400
+    except Exception as e:
+        logger.error(f"Error scheduling post: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/tools/list_scheduled', methods=['GET'])
+def list_scheduled():
+    """
+    List scheduled posts
+    
+    Query Parameters:
+    - status: pending (default), dispatched, cancelled or all
+    - platform: Filter by platform
+    """
+    try:
+        status = request.args.get('status', 'pending')
+        platform = request.args.get('platform')
+        
+        posts = scheduler.list(status=None if status == 'all' else status, platform=platform)
         
         return jsonify({
             'success': True,
@@ -355,7 +646,32 @@ def list_posts():
         })
         
     except Exception as e:
-        logger.error(f"Error listing posts: {e}")
+        logger.error(f"Error listing scheduled posts: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/tools/cancel_scheduled', methods=['POST'])
+def cancel_scheduled():
+    """
+    Cancel a scheduled post
+    
+    Request JSON:
+    {"schedule_id": "a1b2c3d4e5f6"}
+    """
+    try:
+        data = request.get_json() or {}
+        schedule_id = data.get('schedule_id')
+        
+        if not schedule_id:
+            return jsonify({'success': False, 'error': 'schedule_id is required'}), 400
+        
+        if not scheduler.cancel(schedule_id):
+            return jsonify({'success': False, 'error': f'No pending post with schedule_id {schedule_id}'}), 404
+        
+        return jsonify({'success': True, 'schedule_id': schedule_id, 'status': 'cancelled'})
+        
+    except Exception as e:
+        logger.error(f"Error cancelling scheduled post: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -370,14 +686,24 @@ if __name__ == '__main__':
     print(f"\nFacebook Page ID: {SOCIAL_CONFIG.get('facebook_page_id', 'Not configured')}")
     print(f"Instagram Account: {SOCIAL_CONFIG.get('instagram_account_id', 'Not configured')}")
     print(f"Dry Run Mode: {SOCIAL_CONFIG.get('dry_run', True)}")
+    print(f"Scheduled Posts Pending: {len(scheduler.list())}")
     print("\nAvailable Tools:")
     print("  POST /tools/post_to_facebook  - Post to Facebook page")
     print("  POST /tools/post_to_instagram - Post to Instagram account")
     print("  GET  /tools/generate_summary  - Generate weekly summary")
     print("  GET  /tools/list_posts        - List recent posts")
+    print("  POST /tools/upload_media      - Upload local media (cached)")
+    print("  POST /tools/post_batch        - Queue many posts as jobs")
+    print("  GET  /tools/job_status        - Status of a queued post")
+    print("  POST /tools/schedule_post     - Schedule a post for later")
+    print("  GET  /tools/list_scheduled    - List scheduled posts")
+    print("  POST /tools/cancel_scheduled  - Cancel a scheduled post")
     print("  GET  /health                  - Health check")
     print("\nStarting server on http://localhost:8083")
     print("="*60 + "\n")
     
+    # Fire scheduled posts in the background
+    scheduler.start()
+    
     # Run the server
     app.run(host='0.0.0.0', port=8083, debug=False)
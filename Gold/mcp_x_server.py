@@ -6,16 +6,21 @@ Uses X API v2 or browser automation for posting
 """
 
 import os
-import json
 import logging
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
+from http_pool import get_session
+from post_log_store import PostLogStore
+from post_analytics import PostAnalytics, window_from_args
+from post_job_queue import PostJobQueue
+from post_scheduler import PostScheduler
+
 # Load environment variables
 load_dotenv()
 
@@ -40,64 +45,58 @@ X_CONFIG = {
     'username': os.getenv('X_USERNAME', ''),
     'use_browser_automation': os.getenv('X_USE_BROWSER', 'false').lower() == 'true',
     'dry_run': os.getenv('X_DRY_RUN', 'true').lower() == 'true',
+    'job_workers': int(os.getenv('X_JOB_WORKERS', '2')),
 }
 
 # Posts storage (for summary generation)
-X_POSTS_LOG = Path('Posts_Log_X.json')
+X_POSTS_LOG = Path('Posts_Log_X.jsonl')
+LEGACY_X_POSTS_LOG = Path('Posts_Log_X.json')
+SCHEDULED_POSTS = Path('Scheduled_Posts_X.json')
 BRIEFINGS_DIR = Path('Briefings')
 
-# Create directories
-BRIEFINGS_DIR.mkdir(exist_ok=True)
+# Append-only post log (imports legacy Posts_Log_X.json on first use)
+post_store = PostLogStore(X_POSTS_LOG, legacy_path=LEGACY_X_POSTS_LOG)
+
+# Per-day aggregates, updated on every logged post
+post_analytics = PostAnalytics(post_store, default_platform='x')
 
 
 def log_post(content, result):
-    """Log post to JSON file for summary generation"""
-    posts = []
-    if X_POSTS_LOG.exists():
-        try:
-            with open(X_POSTS_LOG, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
-        except:
-            posts = []
-    
-    posts.append({
+    """Log post to the post log store for summary generation"""
+    post_store.append({
         'timestamp': datetime.now().isoformat(),
+        'platform': 'x',
         'content': content,
         'result': result
     })
-    
-    with open(X_POSTS_LOG, 'w', encoding='utf-8') as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
-
-
-def generate_summary_data():
-    """Generate summary from posts log"""
-    posts = []
-    if X_POSTS_LOG.exists():
-        try:
-            with open(X_POSTS_LOG, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
-        except:
-            posts = []
-    
-    # Filter last 7 days
-    week_ago = datetime.now() - timedelta(days=7)
-    recent_posts = [
-        p for p in posts 
-        if datetime.fromisoformat(p['timestamp']) > week_ago
-    ]
-    
-    # Count stats
-    total = len(recent_posts)
-    successful = len([p for p in recent_posts if p['result'].get('success')])
+
+
+def generate_summary_data(days=7, start=None, end=None):
+    """
+    Generate summary from post aggregates
+
+    Args:
+        days: Trailing window length (default: 7)
+        start: First day of a custom window (date)
+        end: Last day of a custom window (date, default: today)
+    """
+    key = ('summary', days, start, end, datetime.now().date())
+    return post_analytics.cached(key, lambda: _build_summary(days, start, end))
+
+
+def _build_summary(days, start, end):
+    """Build a summary from the daily buckets (uncached)"""
+    stats = post_analytics.window(days=days, start=start, end=end)
     
     return {
-        'period': f"{(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')} to {datetime.now().strftime('%Y-%m-%d')}",
-        'total_posts': total,
-        'successful_posts': successful,
-        'failed_posts': total - successful,
-        'success_rate': f"{(successful/total*100) if total > 0 else 0:.1f}%",
-        'posts': recent_posts
+        'period': f"{stats['start']} to {stats['end']}",
+        'total_posts': stats['total_posts'],
+        'successful_posts': stats['successful_posts'],
+        'failed_posts': stats['failed_posts'],
+        'success_rate': stats['success_rate'],
+        'engagement': stats['engagement'],
+        'by_day': stats['by_day'],
+        'posts': post_analytics.posts_in_window(stats)
     }
 
 
@@ -119,44 +118,25 @@ def health_check():
     })
 
 
-@app.route('/tools/post_tweet', methods=['POST'])
-def post_tweet():
-    """
-    Post a tweet to X (Twitter)
-    
-    Request JSON:
-    {
-        "text": "Tweet content here",
-        "image_path": "path/to/image.jpg",  # Optional
-        "dry_run": true  # Optional
-    }
-    
-    Response:
-    {
-        "success": true,
-        "tweet_id": "1234567890",
-        "message": "Posted successfully"
-    }
-    """
+def execute_post_tweet(data):
+    """Post a tweet to X (Twitter); returns (result, http_status)"""
     try:
-        data = request.get_json()
-        
         if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
+            return {'success': False, 'error': 'No data provided'}, 400
         
         text = data.get('text', '')
         image_path = data.get('image_path')
         dry_run = data.get('dry_run', X_CONFIG.get('dry_run', True))
         
         if not text:
-            return jsonify({'success': False, 'error': 'text is required'}), 400
+            return {'success': False, 'error': 'text is required'}, 400
         
         # Check tweet length (X limit is 280 characters)
         if len(text) > 280:
-            return jsonify({
+            return {
                 'success': False, 
                 'error': f'Tweet too long ({len(text)}/280 characters). Please shorten.'
-            }), 400
+            }, 400
         
         # Dry run mode
         if dry_run:
@@ -168,7 +148,7 @@ def post_tweet():
                 'character_count': len(text)
             }
             log_post({'text': text, 'image_path': image_path}, result)
-            return jsonify(result)
+            return result, 200
         
         # Real posting - Check if API is configured
         if X_CONFIG.get('access_token') and X_CONFIG.get('access_token_secret'):
@@ -187,10 +167,10 @@ def post_tweet():
                 
                 # Check if we have proper credentials
                 if not api_secret or api_secret == 'your_x_api_secret_here':
-                    return jsonify({
+                    return {
                         'success': False,
                         'error': 'X_API_SECRET not configured. Please get it from https://developer.twitter.com/en/portal/dashboard'
-                    })
+                    }, 200
                 
                 # Create OAuth1 session
                 oauth = OAuth1Session(
@@ -221,10 +201,10 @@ def post_tweet():
                             'character_count': len(text)
                         }
                         log_post({'text': text, 'image_path': image_path}, result)
-                        return jsonify(result)
+                        return result, 200
                     else:
                         error_msg = f'Unexpected response: {api_result}'
-                        return jsonify({'success': False, 'error': error_msg})
+                        return {'success': False, 'error': error_msg}, 200
                 else:
                     try:
                         api_result = response.json()
@@ -235,19 +215,18 @@ def post_tweet():
                             error_msg = f'HTTP {response.status_code}: {api_result}'
                     except:
                         error_msg = f'HTTP {response.status_code}: {response.text}'
-                    return jsonify({'success': False, 'error': error_msg})
+                    return {'success': False, 'error': error_msg}, 200
                     
             except ImportError:
-                return jsonify({
+                return {
                     'success': False,
                     'error': 'requests-oauthlib not installed. Run: pip install requests-oauthlib'
-                })
+                }, 200
             except Exception as e:
-                return jsonify({'success': False, 'error': f'X API Error: {str(e)}'})
+                return {'success': False, 'error': f'X API Error: {str(e)}'}, 200
         
         elif X_CONFIG.get('bearer_token'):
             # Use Bearer token (only works for read operations usually)
-            import requests
 
             url = "https://api.twitter.com/2/tweets"
 
@@ -261,7 +240,7 @@ def post_tweet():
             }
 
             try:
-                response = requests.post(url, json=payload, headers=headers, timeout=30)
+                response = get_session().post(url, json=payload, headers=headers, timeout=30)
                 api_result = response.json()
                 
                 logger.info(f"X API Response Status: {response.status_code}")
@@ -276,34 +255,61 @@ def post_tweet():
                         'character_count': len(text)
                     }
                     log_post({'text': text, 'image_path': image_path}, result)
-                    return jsonify(result)
+                    return result, 200
                 else:
                     errors = api_result.get('errors', [])
                     if errors:
                         error_msg = errors[0].get('message', str(errors))
                     else:
                         error_msg = f'HTTP {response.status_code}: {api_result}'
-                    return jsonify({'success': False, 'error': error_msg})
+                    return {'success': False, 'error': error_msg}, 200
 
             except Exception as e:
-                return jsonify({'success': False, 'error': f'X API Error: {str(e)}'})
+                return {'success': False, 'error': f'X API Error: {str(e)}'}, 200
         
         elif X_CONFIG.get('use_browser_automation'):
             # Browser automation (requires login credentials)
-            return jsonify({
+            return {
                 'success': False, 
                 'error': 'Browser automation not yet implemented. Please use X API.'
-            }), 400
+            }, 400
         
         else:
-            return jsonify({
+            return {
                 'success': False, 
                 'error': 'X API not configured. Set X_API_KEY and X_API_SECRET in .env'
-            }), 400
+            }, 400
         
     except Exception as e:
         logger.error(f"Error posting tweet: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return {'success': False, 'error': str(e)}, 500
+
+
+@app.route('/tools/post_tweet', methods=['POST'])
+def post_tweet():
+    """
+    Post a tweet to X (Twitter)
+    
+    Request JSON:
+    {
+        "text": "Tweet content here",
+        "image_path": "path/to/image.jpg",  # Optional
+        "dry_run": true,  # Optional
+        "async": true  # Optional - queue as a job and return job_id
+    }
+    
+    Response:
+    {
+        "success": true,
+        "tweet_id": "1234567890",
+        "message": "Posted successfully"
+    }
+    """
+    data = request.get_json()
+    if data and data.get('async'):
+        return queue_post('x', data)
+    result, status = execute_post_tweet(data)
+    return jsonify(result), status
 
 
 @app.route('/tools/get_recent_posts', methods=['GET'])
@@ -325,13 +331,8 @@ def get_recent_posts():
         limit = int(request.args.get('limit', 10))
         limit = min(limit, 100)  # Max 100
         
-        posts = []
-        if X_POSTS_LOG.exists():
-            with open(X_POSTS_LOG, 'r', encoding='utf-8') as f:
-                posts = json.load(f)
-        
         # Get most recent
-        recent = posts[-limit:] if len(posts) > limit else posts
+        recent = post_store.tail(limit)
         
         return jsonify({
             'success': True,
@@ -347,7 +348,11 @@ def get_recent_posts():
 @app.route('/tools/generate_x_summary', methods=['GET'])
 def generate_x_summary():
     """
-    Generate weekly summary of X activity
+    Generate summary of X activity
+    
+    Query Parameters:
+    - days: Trailing window in days (default: 7)
+    - start, end: Custom window as YYYY-MM-DD (inclusive)
     
     Response:
     {
@@ -361,9 +366,10 @@ def generate_x_summary():
     }
     """
     try:
-        summary = generate_summary_data()
+        summary = generate_summary_data(**window_from_args(request.args))
         
         # Save to Briefings folder
+        BRIEFINGS_DIR.mkdir(exist_ok=True)
         summary_file = BRIEFINGS_DIR / 'x_weekly.md'
         summary_content = f"""# X (Twitter) Weekly Summary
 
@@ -400,17 +406,190 @@ def generate_x_summary():
         with open(summary_file, 'w', encoding='utf-8') as f:
             f.write(summary_content)
         
-        return jsonify({
+        # ETag lets the weekly briefing revalidate instead of re-downloading
+        response = jsonify({
             'success': True,
             'summary': summary,
             'saved_to': str(summary_file)
         })
+        response.add_etag()
+        return response.make_conditional(request)
         
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# ============================================================================
+# Job Queue (async posting)
+# ============================================================================
+
+job_queue = PostJobQueue({'x': execute_post_tweet}, workers=X_CONFIG['job_workers'])
+
+
+def queue_post(platform, data):
+    """Queue a post on the job queue and return its job id (HTTP 202)"""
+    payload = {k: v for k, v in data.items() if k not in ('async', 'platform')}
+    job_id = job_queue.submit(platform, payload)
+    return jsonify({'success': True, 'queued': True, 'job_id': job_id, 'platform': platform}), 202
+
+
+@app.route('/tools/job_status', methods=['GET'])
+def job_status():
+    """
+    Get status of a queued tweet
+    
+    Query Parameters:
+    - job_id: Job id returned by an async post_tweet or post_batch
+      (omit for overall queue status)
+    """
+    try:
+        job_id = request.args.get('job_id')
+        
+        if not job_id:
+            return jsonify({'success': True, 'queue': job_queue.get_status()})
+        
+        job = job_queue.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': f'Unknown job_id: {job_id}'}), 404
+        
+        return jsonify({'success': True, 'job': job})
+        
+    except Exception as e:
+        logger.error(f"Error getting job status: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/tools/post_batch', methods=['POST'])
+def post_batch():
+    """
+    Queue many tweets at once
+    
+    Request JSON:
+    {
+        "posts": [{"text": "...", "dry_run": false}, ...]
+    }
+    
+    Response:
+    {
+        "success": true,
+        "jobs": [{"index": 0, "platform": "x", "job_id": "..."}, ...]
+    }
+    """
+    try:
+        data = request.get_json()
+        posts = (data or {}).get('posts', [])
+        
+        if not posts:
+            return jsonify({'success': False, 'error': 'posts is required'}), 400
+        
+        jobs = []
+        for index, post in enumerate(posts):
+            payload = {k: v for k, v in post.items() if k != 'platform'}
+            jobs.append({'index': index, 'platform': 'x', 'job_id': job_queue.submit('x', payload)})
+        
+        return jsonify({'success': True, 'queued': len(jobs), 'jobs': jobs}), 202
+        
+    except Exception as e:
+        logger.error(f"Error queueing batch: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============================================================================
+# Scheduled Posts
+# ============================================================================
+
+scheduler = PostScheduler(SCHEDULED_POSTS, job_queue.submit)
+
+
+@app.route('/tools/schedule_post', methods=['POST'])
+def schedule_post():
+    """
+    Schedule a tweet for later
+    
+    Request JSON:
+    {
+        "run_at": "2026-03-01T09:00:00",
+        "text": "...",
+        "dry_run": false
+    }
+    
+    The post may be moved later than run_at to keep bursts within platform limits.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        run_at = data.get('run_at')
+        
+        if not run_at:
+            return jsonify({'success': False, 'error': 'run_at is required'}), 400
+        
+        payload = {k: v for k, v in data.items() if k not in ('platform', 'run_at', 'async')}
+        entry = scheduler.schedule('x', payload, datetime.fromisoformat(run_at))
+        
+        return jsonify({'success': True, 'scheduled': entry})
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid run_at: {e}'}), 400
+    except Exception as e:
+        logger.error(f"Error scheduling post: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/tools/list_scheduled', methods=['GET'])
+def list_scheduled():
+    """
+    List scheduled posts
+    
+    Query Parameters:
+    - status: pending (default), dispatched, cancelled or all
+    - platform: Filter by platform
+    """
+    try:
+        status = request.args.get('status', 'pending')
+        platform = request.args.get('platform')
+        
+        posts = scheduler.list(status=None if status == 'all' else status, platform=platform)
+        
+        return jsonify({
+            'success': True,
+            'count': len(posts),
+            'posts': posts
+        })
+        
+    except Exception as e:
+        logger.error(f"Error listing scheduled posts: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/tools/cancel_scheduled', methods=['POST'])
+def cancel_scheduled():
+    """
+    Cancel a scheduled post
+    
+    Request JSON:
+    {"schedule_id": "a1b2c3d4e5f6"}
+    """
+    try:
+        data = request.get_json() or {}
+        schedule_id = data.get('schedule_id')
+        
+        if not schedule_id:
+            return jsonify({'success': False, 'error': 'schedule_id is required'}), 400
+        
+        if not scheduler.cancel(schedule_id):
+            return jsonify({'success': False, 'error': f'No pending post with schedule_id {schedule_id}'}), 404
+        
+        return jsonify({'success': True, 'schedule_id': schedule_id, 'status': 'cancelled'})
+        
+    except Exception as e:
+        logger.error(f"Error cancelling scheduled post: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # ============================================================================
 # Main Entry Point
 # ============================================================================
@@ -423,13 +602,22 @@ if __name__ == '__main__':
     print(f"API Configured: {bool(X_CONFIG.get('api_key'))}")
     print(f"Browser Automation: {X_CONFIG.get('use_browser_automation', False)}")
     print(f"Dry Run Mode: {X_CONFIG.get('dry_run', True)}")
+    print(f"Scheduled Posts Pending: {len(scheduler.list())}")
     print("\nAvailable Tools:")
     print("  POST /tools/post_tweet        - Post a tweet")
     print("  GET  /tools/get_recent_posts  - Get recent posts")
     print("  GET  /tools/generate_x_summary - Generate weekly summary")
+    print("  POST /tools/post_batch        - Queue many tweets as jobs")
+    print("  GET  /tools/job_status        - Status of a queued tweet")
+    print("  POST /tools/schedule_post     - Schedule a post for later")
+    print("  GET  /tools/list_scheduled    - List scheduled posts")
+    print("  POST /tools/cancel_scheduled  - Cancel a scheduled post")
     print("  GET  /health                  - Health check")
     print("\nStarting server on http://localhost:8084")
     print("="*60 + "\n")
     
+    # Fire scheduled posts in the background
+    scheduler.start()
+    
     # Run the server
     app.run(host='0.0.0.0', port=8084, debug=False)
@@ -0,0 +1,335 @@
+"""
+Media Pipeline - Cached, resumable media uploads for the Social MCP server
+
+Uploads local media through the Graph API Resumable Upload API:
+- Files are identified by SHA-256 content hash; already-uploaded files reuse
+  their media handle from the local cache instead of uploading again
+- Images are resized/re-encoded (optional Pillow dependency) before upload
+- Uploads are streamed in fixed-size chunks; after a failure (or a restart)
+  the upload resumes from the offset the server reports. The session is only
+  dropped when Graph says it is invalid or expired, not on network errors.
+- The returned handle publishes a Page video (fbuploader_video_file_chunk)
+- Every upload reports bytes, duration and throughput
+
+The HTTP session is injectable, so the pipeline can run against a local
+stub of the Graph API instead of graph.facebook.com.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import mimetypes
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('media_pipeline')
+
+# Configuration
+GRAPH_API_URL = os.getenv('GRAPH_API_URL', 'https://graph.facebook.com/v18.0')
+CHUNK_SIZE = 4 * 1024 * 1024  # 4 MB per upload request
+MAX_IMAGE_DIMENSION = 1440  # Instagram's maximum feed width
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'}
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.m4v', '.avi', '.wmv', '.mkv', '.webm'}
+MEDIA_CACHE_FILE = Path('Media_Cache.json')
+PREPARED_DIR = Path('Media_Prepared')
+INVALID_SESSION_CODES = {100, 803}  # Graph: unknown object / upload session id
+
+
+class UploadSessionError(RuntimeError):
+    """Graph rejected the upload session itself (invalid or expired); it cannot be resumed"""
+
+
+def _check_error(resp, result: Dict[str, Any], default: str):
+    """Raise for a Graph error payload; UploadSessionError when the session is gone"""
+    error = result.get('error')
+    if error is None:
+        return
+    message = error.get('message', default) if isinstance(error, dict) else str(error)
+    code = error.get('code') if isinstance(error, dict) else None
+    if getattr(resp, 'status_code', None) == 404 or code in INVALID_SESSION_CODES:
+        raise UploadSessionError(message)
+    raise RuntimeError(message)
+
+
+def file_sha256(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash a file without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def prepare_image(path: Path, out_dir: Path, digest: str, max_dimension: int = MAX_IMAGE_DIMENSION) -> Path:
+    """
+    Resize and re-encode an image as JPEG if it is too large
+
+    Returns the original path for non-images, images that already fit, or
+    when Pillow is not installed.
+    """
+    if path.suffix.lower() not in IMAGE_EXTENSIONS:
+        return path
+
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.debug("Pillow not installed - uploading image as-is")
+        return path
+
+    with Image.open(path) as image:
+        if max(image.size) <= max_dimension and image.format == 'JPEG':
+            return path
+
+        out_dir.mkdir(exist_ok=True)
+        out_path = out_dir / f"{digest[:16]}.jpg"
+        if out_path.exists():
+            return out_path
+
+        image.thumbnail((max_dimension, max_dimension))
+        image.convert('RGB').save(out_path, 'JPEG', quality=90)
+
+    logger.info(f"Prepared {path.name} -> {out_path.name}")
+    return out_path
+
+
+class MediaCache:
+    """
+    Content-hash -> uploaded media record, persisted as JSON
+
+    Also remembers in-flight upload sessions so an interrupted upload can
+    resume after a restart.
+    """
+
+    def __init__(self, cache_file: Path = MEDIA_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self._lock = threading.Lock()
+        self._data = {'media': {}, 'sessions': {}}
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._data.update(json.load(f))
+            except Exception as e:
+                logger.error(f"Could not load media cache {self.cache_file}: {e}")
+
+    def _save(self):
+        """Persist the cache atomically (caller holds the lock)"""
+        tmp_path = self.cache_file.with_suffix(self.cache_file.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp_path, self.cache_file)
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._data['media'].get(digest)
+
+    def put(self, digest: str, record: Dict[str, Any]):
+        with self._lock:
+            self._data['media'][digest] = record
+            self._data['sessions'].pop(digest, None)
+            self._save()
+
+    def get_session(self, digest: str) -> Optional[str]:
+        with self._lock:
+            return self._data['sessions'].get(digest)
+
+    def set_session(self, digest: str, session_id: str):
+        with self._lock:
+            self._data['sessions'][digest] = session_id
+            self._save()
+
+    def clear_session(self, digest: str):
+        with self._lock:
+            if self._data['sessions'].pop(digest, None) is not None:
+                self._save()
+
+
+class GraphResumableUploader:
+    """
+    Client for the Graph API Resumable Upload API
+
+    Flow:
+        POST /{app_id}/uploads?file_length=..&file_type=..  -> {"id": "upload:..."}
+        POST /{upload_session_id}  (header file_offset, body = chunk)
+             -> {"file_offset": N} while incomplete, {"h": "<handle>"} when done
+        GET  /{upload_session_id}  -> {"id": ..., "file_offset": N}  (resume point)
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        access_token: str,
+        base_url: str = GRAPH_API_URL,
+        session=None,
+        chunk_size: int = CHUNK_SIZE,
+        max_retries: int = 3
+    ):
+        self.app_id = app_id
+        self.access_token = access_token
+        self.base_url = base_url.rstrip('/')
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+
+    def start_session(self, path: Path, size: int) -> str:
+        """Open an upload session and return its id"""
+        resp = self.session.post(
+            f"{self.base_url}/{self.app_id}/uploads",
+            params={
+                'file_name': path.name,
+                'file_length': size,
+                'file_type': mimetypes.guess_type(path.name)[0] or 'application/octet-stream',
+                'access_token': self.access_token
+            },
+            timeout=30
+        )
+        result = resp.json()
+        if 'id' not in result:
+            raise RuntimeError(result.get('error', {}).get('message', 'Failed to start upload session'))
+        return result['id']
+
+    def get_offset(self, session_id: str) -> int:
+        """Ask the server how many bytes of the session it already has"""
+        resp = self.session.get(
+            f"{self.base_url}/{session_id}",
+            headers={'Authorization': f'OAuth {self.access_token}'},
+            timeout=30
+        )
+        result = resp.json()
+        _check_error(resp, result, 'Upload session not found')
+        return int(result.get('file_offset', 0))
+
+    def upload(self, path: Path, session_id: str) -> str:
+        """
+        Upload a file in chunks, resuming from the server offset
+
+        Returns:
+            The uploaded file handle
+        """
+        offset = self.get_offset(session_id)
+        failures = 0
+
+        with open(path, 'rb') as f:
+            while True:
+                f.seek(offset)
+                chunk = f.read(self.chunk_size)
+
+                try:
+                    resp = self.session.post(
+                        f"{self.base_url}/{session_id}",
+                        headers={'Authorization': f'OAuth {self.access_token}', 'file_offset': str(offset)},
+                        data=chunk,
+                        timeout=60
+                    )
+                    result = resp.json()
+                    _check_error(resp, result, 'Upload chunk rejected')
+                except UploadSessionError:
+                    raise
+                except Exception as e:
+                    failures += 1
+                    if failures > self.max_retries:
+                        raise
+                    logger.warning(f"Chunk at offset {offset} failed ({e}), resuming")
+                    time.sleep(min(2 ** failures, 30) * 0.1)
+                    offset = self.get_offset(session_id)
+                    continue
+
+                if 'h' in result:
+                    return result['h']
+
+                offset = int(result.get('file_offset', offset + len(chunk)))
+
+
+class MediaPipeline:
+    """
+    Hash -> cache lookup -> prepare -> resumable upload
+
+    Usage:
+        pipeline = MediaPipeline(GraphResumableUploader(app_id, token))
+        record = pipeline.upload(Path('photo.png'))
+        record['media_id'], record['reused'], record['throughput_mbps']
+    """
+
+    def __init__(
+        self,
+        uploader: GraphResumableUploader,
+        cache: Optional[MediaCache] = None,
+        prepared_dir: Path = PREPARED_DIR
+    ):
+        self.uploader = uploader
+        self.cache = cache or MediaCache()
+        self.prepared_dir = prepared_dir
+        self._lock = threading.Lock()
+        self._stats = {'uploads': 0, 'reused': 0, 'bytes': 0, 'seconds': 0.0}
+
+    def upload(self, path: Path) -> Dict[str, Any]:
+        """Upload a local file (or reuse a previous upload of the same content)"""
+        path = Path(path)
+        digest = file_sha256(path)
+
+        cached = self.cache.get(digest)
+        if cached:
+            with self._lock:
+                self._stats['reused'] += 1
+            logger.info(f"Reusing uploaded media for {path.name}: {cached['media_id']}")
+            return {**cached, 'reused': True}
+
+        prepared = prepare_image(path, self.prepared_dir, digest)
+        size = prepared.stat().st_size
+
+        started = time.time()
+        handle = None
+        session_id = self.cache.get_session(digest)
+        if session_id:
+            logger.info(f"Resuming upload session {session_id} for {path.name}")
+            try:
+                handle = self.uploader.upload(prepared, session_id)
+            except UploadSessionError as e:
+                # Expired or unknown session - start over rather than failing every later upload.
+                # Other errors (network) keep the session so the next call resumes it.
+                logger.warning(f"Upload session {session_id} is no longer valid ({e}), starting a new one")
+                self.cache.clear_session(digest)
+
+        if handle is None:
+            session_id = self.uploader.start_session(prepared, size)
+            self.cache.set_session(digest, session_id)
+            try:
+                handle = self.uploader.upload(prepared, session_id)
+            except UploadSessionError:
+                self.cache.clear_session(digest)
+                raise
+
+        seconds = max(time.time() - started, 1e-6)
+
+        record = {
+            'media_id': handle,
+            'sha256': digest,
+            'file_name': path.name,
+            'bytes': size,
+            'seconds': round(seconds, 3),
+            'throughput_mbps': round(size / seconds / (1024 * 1024), 2),
+            'uploaded_at': datetime.now().isoformat()
+        }
+        self.cache.put(digest, record)
+
+        with self._lock:
+            self._stats['uploads'] += 1
+            self._stats['bytes'] += size
+            self._stats['seconds'] += seconds
+
+        logger.info(f"Uploaded {path.name}: {size} bytes at {record['throughput_mbps']} MB/s")
+        return {**record, 'reused': False}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get upload statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['throughput_mbps'] = round(stats['bytes'] / stats['seconds'] / (1024 * 1024), 2) if stats['seconds'] else 0
+        stats['seconds'] = round(stats['seconds'], 3)
+        return stats
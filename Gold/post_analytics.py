@@ -0,0 +1,185 @@
+"""
+Post Analytics - Incremental per-day aggregates for social media summaries
+
+Keeps running per-day, per-platform counters on top of a PostLogStore:
+- Bootstrapped once from the log, then updated on every append
+- Window queries (7/30/90 days, custom date ranges) are answered from the
+  daily buckets without re-reading or re-parsing posts
+- Summary responses are cached until the next post is logged
+"""
+
+import threading
+from datetime import datetime, date, timedelta
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from post_log_store import PostLogStore
+
+# Engagement counters picked up from a post result when the API reports them
+ENGAGEMENT_FIELDS = ('likes', 'comments', 'shares', 'retweets', 'replies', 'impressions', 'reach')
+
+
+def window_from_args(args) -> Dict[str, Any]:
+    """
+    Read window parameters from request query args
+
+    Supports ?days=30 or ?start=2026-02-01&end=2026-02-28 (dates inclusive).
+    """
+    start = args.get('start')
+    end = args.get('end')
+    return {
+        'days': int(args.get('days', 7)),
+        'start': date.fromisoformat(start) if start else None,
+        'end': date.fromisoformat(end) if end else None
+    }
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {
+        'posts': 0,
+        'successful': 0,
+        'failed': 0,
+        'engagement': {field: 0 for field in ENGAGEMENT_FIELDS}
+    }
+
+
+class PostAnalytics:
+    """
+    Per-day / per-platform post aggregates
+
+    Buckets are keyed by ('YYYY-MM-DD', platform). The day is taken from the
+    ISO timestamp prefix, so no timestamp parsing happens on the hot path.
+
+    Usage:
+        analytics = PostAnalytics(post_store, default_platform='x')
+        stats = analytics.window(days=30)
+        stats = analytics.window(start=date(2026, 2, 1), end=date(2026, 2, 28), platform='facebook')
+        summary = analytics.cached(('summary', 7), lambda: build_summary(7))
+    """
+
+    def __init__(self, store: PostLogStore, default_platform: Optional[str] = None):
+        self.store = store
+        self.default_platform = default_platform
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._cache: Dict[Any, Any] = {}
+        self._version = 0
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        """
+        Build buckets from the full log on first use (caller holds the lock)
+
+        The listener is registered together with the bootstrap read, so a post
+        logged meanwhile is counted exactly once.
+        """
+        if self._loaded:
+            return
+        for post in self.store.subscribe(self.record):
+            self._add(post)
+        self._loaded = True
+
+    def _add(self, post: Dict[str, Any]):
+        """Fold one post into its daily bucket (caller holds the lock)"""
+        day = post.get('timestamp', '')[:10]
+        platform = post.get('platform') or self.default_platform or 'unknown'
+        bucket = self._buckets.setdefault((day, platform), _empty_bucket())
+
+        result = post.get('result') or {}
+        bucket['posts'] += 1
+        if result.get('success'):
+            bucket['successful'] += 1
+        else:
+            bucket['failed'] += 1
+
+        engagement = result.get('engagement') or result
+        for field in ENGAGEMENT_FIELDS:
+            value = engagement.get(field)
+            if isinstance(value, (int, float)):
+                bucket['engagement'][field] += value
+
+    def record(self, post: Dict[str, Any]):
+        """Add a newly logged post and invalidate cached summaries"""
+        with self._lock:
+            if self._loaded:
+                self._add(post)
+            self._version += 1
+            self._cache.clear()
+
+    def window(
+        self,
+        days: int = 7,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        platform: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Aggregate stats for a date window
+
+        Args:
+            days: Trailing window length in days, counting the end day (used when start is not given)
+            start: First day of the window (inclusive)
+            end: Last day of the window (inclusive, default: today)
+            platform: Only count this platform
+
+        Returns:
+            Dict with totals, per-platform and per-day breakdowns
+        """
+        end = end or datetime.now().date()
+        start = start or (end - timedelta(days=days - 1))
+        start_key, end_key = start.isoformat(), end.isoformat()
+
+        totals = _empty_bucket()
+        by_platform: Dict[str, Dict[str, Any]] = {}
+        by_day: Dict[str, int] = {}
+
+        with self._lock:
+            self._ensure_loaded()
+            for (day, bucket_platform), bucket in self._buckets.items():
+                if not (start_key <= day <= end_key):
+                    continue
+                if platform and bucket_platform != platform:
+                    continue
+
+                for target in (totals, by_platform.setdefault(bucket_platform, _empty_bucket())):
+                    target['posts'] += bucket['posts']
+                    target['successful'] += bucket['successful']
+                    target['failed'] += bucket['failed']
+                    for field, value in bucket['engagement'].items():
+                        target['engagement'][field] += value
+
+                by_day[day] = by_day.get(day, 0) + bucket['posts']
+
+        total = totals['posts']
+        return {
+            'start': start_key,
+            'end': end_key,
+            'total_posts': total,
+            'successful_posts': totals['successful'],
+            'failed_posts': totals['failed'],
+            'success_rate': f"{(totals['successful']/total*100) if total > 0 else 0:.1f}%",
+            'engagement': totals['engagement'],
+            'by_platform': by_platform,
+            'by_day': dict(sorted(by_day.items()))
+        }
+
+    def posts_in_window(self, stats: Dict[str, Any], platform: Optional[str] = None):
+        """Read the posts covered by a window() result from the store"""
+        start = datetime.fromisoformat(stats['start'])
+        end = datetime.combine(date.fromisoformat(stats['end']), datetime.max.time())
+        return self.store.read_range(start=start, end=end, platform=platform)
+
+    def cached(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Return a cached value for key, building it if no post was logged since"""
+        with self._lock:
+            self._ensure_loaded()  # from here on every logged post invalidates the cache
+            if key in self._cache:
+                return self._cache[key]
+            version = self._version
+
+        value = build()
+
+        with self._lock:
+            # Don't cache a value built while a new post was being logged
+            if self._version == version:
+                self._cache[key] = value
+        return value
@@ -5,11 +5,14 @@ Run this after moving files to /Approved/ folder
 
 import requests
 import shutil
+import time
 from pathlib import Path
 
 MCP_URL = "http://localhost:8083"
 APPROVED = Path("Approved")
 COMPLETED = Path("Completed")
+POLL_INTERVAL = 2  # seconds between job status checks
+JOB_TIMEOUT = 600  # seconds to wait for the whole batch
 
 print("="*60)
 print("Posting Approved Content")
@@ -29,6 +32,10 @@ if not files:
 
 print(f"Found {len(files)} file(s) to process\n")
 
+# Build one batch of posts from the approval files
+batch = []
+batch_files = []
+
 for file in files:
     print(f"Processing: {file.name}")
     
@@ -46,38 +53,79 @@ for file in files:
         
         message = match.group(1)
         
-        # Determine platform and post
+        # Determine platform
         if "FACEBOOK" in file.name:
-            print("  Posting to Facebook...")
-            resp = requests.post(
-                f"{MCP_URL}/tools/post_to_facebook",
-                json={
-                    "page_id": "110326951910826",
-                    "message": message,
-                    "dry_run": False  # REAL POST
-                },
-                timeout=30
-            )
-            result = resp.json()
+            print("  Queueing for Facebook...")
+            batch.append({
+                "platform": "facebook",
+                "page_id": "110326951910826",
+                "message": message,
+                "dry_run": False  # REAL POST
+            })
             
         elif "INSTAGRAM" in file.name:
-            print("  Posting to Instagram...")
-            resp = requests.post(
-                f"{MCP_URL}/tools/post_to_instagram",
-                json={
-                    "account_id": "17841457182813798",
-                    "caption": message,
-                    "image_url": "https://img.freepik.com/free-photo/waterfall-chae-son-national-park-lampang-thailand_554837-639.jpg",
-                    "dry_run": False  # REAL POST
-                },
-                timeout=30
-            )
-            result = resp.json()
+            print("  Queueing for Instagram...")
+            batch.append({
+                "platform": "instagram",
+                "account_id": "17841457182813798",
+                "caption": message,
+                "image_url": "https://img.freepik.com/free-photo/waterfall-chae-son-national-park-lampang-thailand_554837-639.jpg",
+                "dry_run": False  # REAL POST
+            })
         
         else:
             print(f"  [SKIP] Unknown platform")
             continue
         
+        batch_files.append(file)
+    
+    except Exception as e:
+        print(f"  [ERROR] {e}")
+
+if not batch:
+    print("\nNothing to post.")
+    exit(0)
+
+# Submit all posts at once; the server posts them on its worker pool
+try:
+    resp = requests.post(f"{MCP_URL}/tools/post_batch", json={"posts": batch}, timeout=30)
+    jobs = resp.json().get('jobs', [])
+except Exception as e:
+    print(f"\n[ERROR] Could not submit batch: {e}")
+    exit(1)
+
+print(f"\nSubmitted {len(jobs)} post(s), waiting for results...\n")
+
+pending = {job['index']: job['job_id'] for job in jobs if job.get('job_id')}
+unknown = {}  # jobs the server no longer knows about (pruned, or the server restarted)
+for job in jobs:
+    if job.get('error'):
+        print(f"{batch_files[job['index']].name}: [FAILED] {job['error']}")
+
+deadline = time.time() + JOB_TIMEOUT
+while pending and time.time() < deadline:
+    for index, job_id in list(pending.items()):
+        try:
+            resp = requests.get(f"{MCP_URL}/tools/job_status", params={"job_id": job_id}, timeout=10)
+            status = resp.json() if resp.status_code == 200 else None
+        except Exception as e:
+            print(f"  [ERROR] Status check failed for {job_id}: {e}")
+            continue
+        
+        if status is None:
+            # Polling again would only run into the timeout
+            unknown[index] = pending.pop(index)
+            continue
+        
+        job = status.get('job', {})
+        if job.get('status') not in ('completed', 'failed'):
+            continue
+        
+        del pending[index]
+        file = batch_files[index]
+        result = job.get('result', {})
+        print(f"{file.name}:")
+        
         # Check result
         if result.get('success'):
             print(f"  [OK] Posted successfully!")
@@ -89,8 +137,13 @@ for file in files:
         else:
             print(f"  [FAILED] {result.get('error')}")
     
-    except Exception as e:
-        print(f"  [ERROR] {e}")
+    if pending:
+        time.sleep(POLL_INTERVAL)
+
+for index, job_id in pending.items():
+    print(f"{batch_files[index].name}: [TIMEOUT] Job {job_id} still running on server")
+for index, job_id in unknown.items():
+    print(f"{batch_files[index].name}: [UNKNOWN] Server has no status for job {job_id}; check before re-posting")
 
 print("\n" + "="*60)
 print("Done!")
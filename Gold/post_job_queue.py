@@ -0,0 +1,245 @@
+"""
+Post Job Queue - Asynchronous dispatch for social media posting
+
+Lets the Social (Meta) and X MCP servers accept a post, return a job id
+immediately and perform the upstream API calls on a worker pool:
+- Bounded worker pool fed by a FIFO queue
+- Per-platform rate limits (minimum spacing between upstream calls); a job
+  that has to wait for its slot is set aside until then, so the workers keep
+  serving the other platforms meanwhile
+- Job status tracking for /tools/job_status and /tools/post_batch
+
+Job Format:
+{
+    "job_id": "a1b2c3d4e5f6",
+    "platform": "facebook",
+    "status": "queued" | "running" | "completed" | "failed",
+    "created_at": "...", "started_at": "...", "finished_at": "...",
+    "result": {...},
+    "status_code": 200
+}
+"""
+
+import time
+import uuid
+import heapq
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Tuple, List
+
+logger = logging.getLogger('post_job_queue')
+
+# Minimum seconds between upstream calls per platform
+DEFAULT_RATE_LIMITS = {
+    'facebook': 2.0,
+    'instagram': 5.0,
+    'x': 3.0,
+}
+
+# Finished jobs kept for status lookups
+MAX_FINISHED_JOBS = 1000
+
+# A handler posts one payload and returns (result, http_status)
+PostHandler = Callable[[Dict[str, Any]], Tuple[Dict[str, Any], int]]
+
+
+class RateLimiter:
+    """
+    Per-key minimum-interval rate limiter
+
+    Each reserve() claims the next free slot for its key and returns how long
+    until that slot, so calls for the same platform are spaced out while other
+    platforms proceed independently. acquire() sleeps until the slot; the job
+    queue instead sets the job aside and lets the worker take other work.
+    """
+
+    def __init__(self, intervals: Dict[str, float]):
+        self.intervals = intervals
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str) -> float:
+        """Reserve the next slot for key and return seconds to wait for it"""
+        interval = self.intervals.get(key, 0.0)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(key, now))
+            self._next_slot[key] = slot + interval
+            return slot - now
+
+    def acquire(self, key: str):
+        """Block until key may make its next call"""
+        wait = self.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class PostJobQueue:
+    """
+    Worker pool executing post jobs
+
+    Usage:
+        jobs = PostJobQueue({'facebook': execute_facebook_post}, workers=4)
+        job_id = jobs.submit('facebook', {'message': 'Hello'})
+        jobs.get(job_id)  # -> {'status': 'completed', 'result': {...}, ...}
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, PostHandler],
+        workers: int = 4,
+        rate_limits: Optional[Dict[str, float]] = None
+    ):
+        self.handlers = handlers
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate_limits if rate_limits is not None else DEFAULT_RATE_LIMITS)
+        # (ready_at, sequence, job_id): FIFO for new jobs, later for jobs waiting on a rate slot
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+        self._started = False
+        self._stopping = False
+
+    def _start(self):
+        """Start worker threads on first submit (caller holds the lock)"""
+        if self._started:
+            return
+        self._stopping = False
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True, name=f'post-worker-{i + 1}')
+            thread.start()
+            self._threads.append(thread)
+        self._started = True
+
+    def submit(self, platform: str, payload: Dict[str, Any]) -> str:
+        """
+        Queue a post
+
+        Args:
+            platform: Handler name (facebook, instagram, x)
+            payload: Request payload passed to the handler
+
+        Returns:
+            Job id
+        """
+        if platform not in self.handlers:
+            raise ValueError(f"Unsupported platform: {platform}")
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'job_id': job_id,
+            'platform': platform,
+            'status': 'queued',
+            'created_at': datetime.now().isoformat(),
+            'payload': payload,
+        }
+
+        with self._lock:
+            self._start()
+            self._jobs[job_id] = job
+            self._prune()
+            self._push(0.0, job_id)
+
+        logger.info(f"Queued {platform} post job {job_id}")
+        return job_id
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS (caller holds the lock)"""
+        finished = [jid for jid, job in self._jobs.items() if job['status'] in ('completed', 'failed')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _push(self, ready_at: float, job_id: str):
+        """Queue a job to run at ready_at (monotonic; 0 = now) (caller holds the lock)"""
+        self._sequence += 1
+        heapq.heappush(self._queue, (ready_at, self._sequence, job_id))
+        self._ready.notify()
+
+    def _next_job(self) -> Optional[str]:
+        """Wait for the next job that may run now; None once shut down and drained"""
+        with self._ready:
+            while True:
+                if self._queue:
+                    wait = self._queue[0][0] - time.monotonic()
+                    if wait <= 0:
+                        return heapq.heappop(self._queue)[2]
+                elif self._stopping:
+                    return None
+                else:
+                    wait = None
+                self._ready.wait(wait)
+
+    def _worker(self):
+        """Worker loop: execute queued jobs until shutdown"""
+        while True:
+            job_id = self._next_job()
+            if job_id is None:
+                break
+
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                # Dry runs never reach the upstream API. A job whose rate slot is
+                # still ahead is set aside, so this worker can serve other platforms.
+                if not job['payload'].get('dry_run') and not job.get('slot_reserved'):
+                    job['slot_reserved'] = True
+                    wait = self.rate_limiter.reserve(job['platform'])
+                    if wait > 0:
+                        self._push(time.monotonic() + wait, job_id)
+                        continue
+                job['status'] = 'running'
+                job['started_at'] = datetime.now().isoformat()
+
+            try:
+                result, status_code = self.handlers[job['platform']](job['payload'])
+            except Exception as e:
+                logger.error(f"Post job {job_id} crashed: {e}")
+                result, status_code = {'success': False, 'error': str(e)}, 500
+
+            with self._lock:
+                job['result'] = result
+                job['status_code'] = status_code
+                job['status'] = 'completed' if result.get('success') else 'failed'
+                job['finished_at'] = datetime.now().isoformat()
+
+            logger.info(f"Post job {job_id} {job['status']}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job status (without the original payload)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: v for k, v in job.items() if k not in ('payload', 'slot_reserved')}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get queue status"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {
+            'workers': self.workers,
+            'queued': len(self._queue),
+            'jobs': counts,
+            'rate_limits': self.rate_limiter.intervals,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop workers after the jobs already queued"""
+        with self._lock:
+            threads = list(self._threads)
+            self._stopping = True
+            self._ready.notify_all()
+        if wait:
+            for thread in threads:
+                thread.join()
+        with self._lock:
+            self._threads = []
+            self._started = False
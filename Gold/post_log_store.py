@@ -0,0 +1,256 @@
+"""
+Post Log Store - Append-only storage for social media post logs
+
+Shared by the Social (Meta) and X MCP servers:
+- O(1) appends to a JSON Lines file, serialized with a lock across Flask threads
+- In-memory time index (timestamp -> byte offset) for range and tail queries
+- One-time import of the legacy JSON array logs (Posts_Log.json, Posts_Log_X.json)
+
+Each line of the log is one post record:
+{"timestamp": "2026-02-24T13:38:50.937465", "platform": "x", "content": {...}, "result": {...}}
+"""
+
+import json
+import logging
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, List
+
+logger = logging.getLogger('post_log_store')
+
+
+class PostLogStore:
+    """
+    Append-only post log backed by a JSON Lines file
+
+    Writes never rewrite history: every append is a single write of one line
+    at the end of the file. Reads go through a sorted index of timestamps and
+    byte offsets, so range queries only touch the lines they return.
+
+    Usage:
+        store = PostLogStore(Path('Posts_Log.jsonl'), legacy_path=Path('Posts_Log.json'))
+        store.append({'timestamp': ..., 'platform': 'facebook', 'content': {...}, 'result': {...}})
+        recent = store.read_range(start=datetime.now() - timedelta(days=7))
+        last_20 = store.tail(20, platform='facebook')
+    """
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._handle = None
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+        # Parallel lists kept sorted by timestamp (ISO strings sort chronologically)
+        self._timestamps: List[str] = []
+        self._offsets: List[int] = []
+        self._platforms: List[Optional[str]] = []
+
+    # ------------------------------------------------------------------
+    # Index management
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        """Build the time index on first use (caller holds the lock)"""
+        if self._loaded:
+            return
+
+        if not self.path.exists() and self.legacy_path and self.legacy_path.exists():
+            self._import_legacy()
+
+        entries = []
+        if self.path.exists():
+            with open(self.path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        try:
+                            record = json.loads(line)
+                            entries.append((record.get('timestamp', ''), offset, record.get('platform')))
+                        except json.JSONDecodeError:
+                            logger.warning(f"Skipping corrupt line at offset {offset} in {self.path}")
+                    offset += len(line)
+
+        entries.sort(key=lambda e: e[0])
+        self._timestamps = [e[0] for e in entries]
+        self._offsets = [e[1] for e in entries]
+        self._platforms = [e[2] for e in entries]
+        self._loaded = True
+
+    def _import_legacy(self):
+        """Convert a legacy JSON array log into JSON Lines (legacy file is left untouched)"""
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                posts = json.load(f)
+        except Exception as e:
+            logger.error(f"Could not import legacy post log {self.legacy_path}: {e}")
+            return
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for post in posts:
+                f.write(json.dumps(post, ensure_ascii=False) + '\n')
+
+        logger.info(f"Imported {len(posts)} posts from {self.legacy_path} into {self.path}")
+
+    def _index_record(self, timestamp: str, offset: int, platform: Optional[str]):
+        """Insert a record into the index (caller holds the lock)"""
+        if not self._timestamps or timestamp >= self._timestamps[-1]:
+            self._timestamps.append(timestamp)
+            self._offsets.append(offset)
+            self._platforms.append(platform)
+        else:
+            # Out-of-order timestamp (clock change) - keep the index sorted
+            pos = bisect_right(self._timestamps, timestamp)
+            self._timestamps.insert(pos, timestamp)
+            self._offsets.insert(pos, offset)
+            self._platforms.insert(pos, platform)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append one post record
+
+        Args:
+            record: Post record; 'timestamp' is filled in when missing
+
+        Returns:
+            The stored record
+        """
+        if 'timestamp' not in record:
+            record = {'timestamp': datetime.now().isoformat(), **record}
+
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+        with self._lock:
+            self._ensure_loaded()
+
+            if self._handle is None:
+                self._handle = open(self.path, 'ab')
+            self._handle.seek(0, 2)
+            offset = self._handle.tell()
+            self._handle.write(line)
+            self._handle.flush()
+
+            self._index_record(record['timestamp'], offset, record.get('platform'))
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                logger.error(f"Post log listener failed: {e}")
+
+        return record
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Register a callback invoked with each record after it is appended"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> List[Dict[str, Any]]:
+        """
+        Register a listener and return every record logged so far
+
+        Done under one lock, so each record is either in the returned list or
+        passed to the callback later - never both, never neither.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._handle is not None:
+                self._handle.flush()
+            records = self._read_offsets(list(self._offsets))
+            self._listeners.append(callback)
+        return records
+
+    def close(self):
+        """Close the append handle"""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _read_offsets(self, offsets: List[int]) -> List[Dict[str, Any]]:
+        """Read records at the given byte offsets"""
+        if not offsets:
+            return []
+
+        records = []
+        with open(self.path, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+    def read_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        platform: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get posts with start < timestamp <= end, oldest first
+
+        Args:
+            start: Exclusive lower bound (default: beginning of log)
+            end: Inclusive upper bound (default: end of log)
+            platform: Only return posts for this platform
+
+        Returns:
+            List of post records
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._handle is not None:
+                self._handle.flush()
+
+            lo = bisect_right(self._timestamps, start.isoformat()) if start else 0
+            hi = bisect_right(self._timestamps, end.isoformat()) if end else len(self._timestamps)
+
+            offsets = [
+                self._offsets[i] for i in range(lo, hi)
+                if platform is None or self._platforms[i] == platform
+            ]
+
+            return self._read_offsets(offsets)
+
+    def tail(self, limit: int, platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent posts, oldest first
+
+        Args:
+            limit: Maximum number of posts
+            platform: Only return posts for this platform
+
+        Returns:
+            List of post records
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._handle is not None:
+                self._handle.flush()
+
+            offsets = []
+            i = len(self._offsets) - 1
+            while i >= 0 and len(offsets) < limit:
+                if platform is None or self._platforms[i] == platform:
+                    offsets.append(self._offsets[i])
+                i -= 1
+            offsets.reverse()
+
+            return self._read_offsets(offsets)
+
+    def count(self) -> int:
+        """Get total number of logged posts"""
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._timestamps)
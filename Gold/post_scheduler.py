@@ -0,0 +1,266 @@
+"""
+Post Scheduler - Calendar engine for future social media posts
+
+Runs inside the Social (Meta) and X MCP servers:
+- Future posts kept in a time-ordered heap
+- A single timer thread sleeps until the next post is due (no polling)
+- Bursts are spread so posts for one platform are at least `spacing` apart
+- Pending posts are persisted to disk and reloaded after a restart
+- Dispatched and cancelled posts are kept in a short in-memory history only
+
+Scheduled Post Format:
+{
+    "schedule_id": "a1b2c3d4e5f6",
+    "platform": "facebook",
+    "run_at": "2026-03-01T09:00:00",
+    "requested_at": "2026-03-01T09:00:00",
+    "payload": {...},
+    "status": "pending" | "dispatched" | "cancelled",
+    "job_id": "..."  # set once dispatched
+}
+"""
+
+import os
+import json
+import uuid
+import heapq
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Any, Optional, List
+
+logger = logging.getLogger('post_scheduler')
+
+# Minimum seconds between scheduled posts on one platform
+DEFAULT_SPACING = {
+    'facebook': 60,
+    'instagram': 120,
+    'x': 60,
+}
+
+# Dispatched / cancelled posts kept in memory for list(status='all')
+HISTORY_LIMIT = 200
+
+# Dispatch callback: (platform, payload) -> job id
+Dispatcher = Callable[[str, Dict[str, Any]], str]
+
+
+def local_time(value: datetime) -> datetime:
+    """Naive local time for a run_at that may carry a UTC offset"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+class PostScheduler:
+    """
+    Time-ordered scheduler for future posts
+
+    Usage:
+        scheduler = PostScheduler(Path('Scheduled_Posts.json'), job_queue.submit)
+        scheduler.start()
+        entry = scheduler.schedule('facebook', {'message': 'Hi'}, datetime(2026, 3, 1, 9))
+        scheduler.cancel(entry['schedule_id'])
+    """
+
+    def __init__(
+        self,
+        store_path: Path,
+        dispatch: Dispatcher,
+        spacing: Optional[Dict[str, float]] = None
+    ):
+        self.store_path = Path(store_path)
+        self.dispatch = dispatch
+        self.spacing = spacing if spacing is not None else DEFAULT_SPACING
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []  # (run_at epoch, schedule_id)
+        self._entries: Dict[str, Dict[str, Any]] = {}  # pending posts only
+        self._history: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Reload pending posts from disk"""
+        if not self.store_path.exists():
+            return
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.error(f"Could not load scheduled posts from {self.store_path}: {e}")
+            return
+
+        for entry in entries:
+            if entry.get('status') == 'pending':
+                entry['run_at'] = local_time(datetime.fromisoformat(entry['run_at'])).isoformat()
+                self._entries[entry['schedule_id']] = entry
+                heapq.heappush(self._heap, (datetime.fromisoformat(entry['run_at']).timestamp(), entry['schedule_id']))
+
+        logger.info(f"Loaded {len(self._heap)} scheduled posts from {self.store_path}")
+
+    def _save(self):
+        """Persist pending posts atomically (caller holds the condition lock)"""
+        pending = list(self._entries.values())
+        pending.sort(key=lambda e: e['run_at'])
+
+        tmp_path = self.store_path.with_suffix(self.store_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(pending, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.store_path)
+
+    def _retire(self, entry: Dict[str, Any]):
+        """Move a dispatched or cancelled post to the bounded history (caller holds the lock)"""
+        self._entries.pop(entry['schedule_id'], None)
+        self._history[entry['schedule_id']] = entry
+        while len(self._history) > HISTORY_LIMIT:
+            self._history.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _free_slot(self, platform: str, run_at: datetime) -> datetime:
+        """Shift run_at forward until it is `spacing` away from other pending posts"""
+        spacing = timedelta(seconds=self.spacing.get(platform, 0))
+        if not spacing:
+            return run_at
+
+        taken = sorted(
+            datetime.fromisoformat(e['run_at']) for e in self._entries.values()
+            if e['platform'] == platform
+        )
+        for other in taken:
+            if other - spacing < run_at < other + spacing:
+                run_at = other + spacing
+        return run_at
+
+    def schedule(self, platform: str, payload: Dict[str, Any], run_at: datetime) -> Dict[str, Any]:
+        """
+        Schedule a post
+
+        Args:
+            platform: Platform passed to the dispatcher (facebook, instagram, x)
+            payload: Post payload
+            run_at: Requested posting time (may be moved later to spread bursts);
+                a time with a UTC offset is converted to local time
+
+        Returns:
+            The scheduled post entry
+        """
+        run_at = local_time(run_at)
+        with self._cond:
+            slot = self._free_slot(platform, run_at)
+            entry = {
+                'schedule_id': uuid.uuid4().hex[:12],
+                'platform': platform,
+                'run_at': slot.isoformat(),
+                'requested_at': run_at.isoformat(),
+                'payload': payload,
+                'status': 'pending',
+                'created_at': datetime.now().isoformat(),
+            }
+            self._entries[entry['schedule_id']] = entry
+            heapq.heappush(self._heap, (slot.timestamp(), entry['schedule_id']))
+            self._save()
+            self._cond.notify()
+
+        logger.info(f"Scheduled {platform} post {entry['schedule_id']} for {entry['run_at']}")
+        return dict(entry)
+
+    def cancel(self, schedule_id: str) -> bool:
+        """Cancel a pending post; returns False if it is unknown or already dispatched"""
+        with self._cond:
+            entry = self._entries.get(schedule_id)
+            if not entry or entry['status'] != 'pending':
+                return False
+            # Heap entry is skipped lazily when it comes due
+            entry['status'] = 'cancelled'
+            entry['cancelled_at'] = datetime.now().isoformat()
+            self._retire(entry)
+            self._save()
+            self._cond.notify()
+
+        logger.info(f"Cancelled scheduled post {schedule_id}")
+        return True
+
+    def list(self, status: Optional[str] = 'pending', platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List scheduled posts ordered by run time (status=None for all, including recent history)"""
+        with self._cond:
+            entries = [
+                dict(e) for e in list(self._entries.values()) + list(self._history.values())
+                if (status is None or e['status'] == status)
+                and (platform is None or e['platform'] == platform)
+            ]
+        return sorted(entries, key=lambda e: e['run_at'])
+
+    # ------------------------------------------------------------------
+    # Timer thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the timer thread"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, daemon=True, name='post-scheduler')
+            self._thread.start()
+
+    def stop(self):
+        """Stop the timer thread (pending posts stay on disk)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+
+    def _run(self):
+        """Sleep until the next post is due, then dispatch everything due"""
+        while True:
+            due = []
+            with self._cond:
+                while not self._stopped:
+                    # Drop cancelled heads so we never sleep for a cancelled post
+                    while self._heap and self._heap[0][1] not in self._entries:
+                        heapq.heappop(self._heap)
+
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    delay = self._heap[0][0] - datetime.now().timestamp()
+                    if delay > 0:
+                        self._cond.wait(timeout=delay)
+                        continue
+                    break
+
+                if self._stopped:
+                    return
+
+                now = datetime.now().timestamp()
+                while self._heap and self._heap[0][0] <= now:
+                    _, schedule_id = heapq.heappop(self._heap)
+                    entry = self._entries.get(schedule_id)
+                    if entry is not None:
+                        entry['status'] = 'dispatched'
+                        entry['dispatched_at'] = datetime.now().isoformat()
+                        self._retire(entry)
+                        due.append(entry)
+                self._save()
+
+            for entry in due:
+                try:
+                    entry['job_id'] = self.dispatch(entry['platform'], entry['payload'])
+                    logger.info(f"Dispatched scheduled post {entry['schedule_id']} as job {entry['job_id']}")
+                except Exception as e:
+                    entry['error'] = str(e)
+                    logger.error(f"Failed to dispatch scheduled post {entry['schedule_id']}: {e}")
@@ -0,0 +1,332 @@
+"""
+Ralph Executors - run the agent for one loop iteration
+
+Replaces the buffered `subprocess.run(..., capture_output=True)` call of the
+Ralph Wiggum loop:
+- Output is read line by line as the agent writes it (and echoed through
+  on_output), instead of after the process exits
+- A stop check (the loop's check_stop_signal) runs as text arrives, so
+  an iteration ends as soon as TASK_COMPLETE shows up rather than when the
+  agent finally exits. It sees each new piece of output plus the tail of
+  the previous one, not the whole buffer again.
+- The agent command is pluggable: any argv list with a {prompt}
+  placeholder, or without one to receive the prompt on stdin. Local stubs
+  can stand in for the claude CLI in tests.
+- SessionExecutor keeps one agent process alive for all iterations
+  (stream-json protocol: one JSON user message per line on stdin, events
+  on stdout, a "result" event ends each turn), so continuations reuse the
+  session instead of starting a new process each time
+
+Both executors return a result dict:
+    {'output', 'stderr', 'returncode', 'completed', 'timed_out', 'error', 'seconds'}
+
+Usage:
+    executor = StreamingExecutor(['python', 'stub_agent.py', '{prompt}'])
+    result = executor.run(prompt, stop_check=loop.check_stop_signal)
+"""
+
+import os
+import json
+import time
+import queue
+import shlex
+import threading
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+# Configuration
+DEFAULT_AGENT_COMMAND = ['claude', '--prompt', '{prompt}', '--output-format', 'text']
+DEFAULT_SESSION_COMMAND = [
+    'claude', '-p', '--input-format', 'stream-json', '--output-format', 'stream-json', '--verbose'
+]
+AGENT_COMMAND_ENV = 'RALPH_AGENT_CMD'  # overrides the agent command, e.g. "python stub.py {prompt}"
+ITERATION_TIMEOUT = 300.0  # seconds per iteration
+STOP_GRACE = 5.0  # seconds between terminate and kill
+STOP_CHECK_OVERLAP = 64  # chars of earlier output the stop check sees with each new piece
+
+_EOF = object()
+
+
+def parse_agent_command(command) -> List[str]:
+    """Accept an argv list or a shell-style string"""
+    if isinstance(command, str):
+        return shlex.split(command, posix=os.name != 'nt')
+    return list(command)
+
+
+def agent_command_from_env(default: List[str] = DEFAULT_AGENT_COMMAND) -> List[str]:
+    """The agent command from RALPH_AGENT_CMD, or the default"""
+    value = os.environ.get(AGENT_COMMAND_ENV)
+    return parse_agent_command(value) if value else list(default)
+
+
+def _result(**values) -> Dict[str, Any]:
+    result = {'output': '', 'stderr': '', 'returncode': None, 'completed': False,
+              'timed_out': False, 'error': None, 'seconds': 0.0}
+    result.update(values)
+    return result
+
+
+def _pump(stream, lines: 'queue.Queue'):
+    """Copy a pipe into a queue line by line (on its own thread: pipes cannot be polled on Windows)"""
+    try:
+        for line in iter(stream.readline, ''):
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    finally:
+        lines.put(_EOF)
+
+
+def _collect(stream, chunks: List[str]):
+    try:
+        for line in iter(stream.readline, ''):
+            chunks.append(line)
+    except (OSError, ValueError):
+        pass
+
+
+def _terminate(process: subprocess.Popen):
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=STOP_GRACE)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait(timeout=STOP_GRACE)
+
+
+class StreamingExecutor:
+    """Runs one agent process per iteration and streams its output"""
+
+    def __init__(
+        self,
+        command=None,
+        timeout: float = ITERATION_TIMEOUT,
+        on_output: Optional[Callable[[str], None]] = None,
+        cwd: Optional[str] = None
+    ):
+        self.command = parse_agent_command(command) if command else agent_command_from_env()
+        self.timeout = timeout
+        self.on_output = on_output
+        self.cwd = cwd
+
+    def _argv(self, prompt: str):
+        """Substitute {prompt}; without a placeholder the prompt goes to stdin"""
+        if any('{prompt}' in arg for arg in self.command):
+            return [arg.replace('{prompt}', prompt) for arg in self.command], None
+        return list(self.command), prompt
+
+    def run(self, prompt: str, stop_check: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """
+        Run the agent on one prompt
+
+        Returns as soon as stop_check(new output plus the tail of the previous
+        output) is true (the agent is then stopped), the agent exits, or the
+        timeout passes.
+        """
+        started = time.monotonic()
+        argv, stdin_text = self._argv(prompt)
+        try:
+            process = subprocess.Popen(
+                argv, cwd=self.cwd,
+                stdin=subprocess.PIPE if stdin_text is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, encoding='utf-8', errors='replace', bufsize=1
+            )
+        except FileNotFoundError:
+            return _result(error=f"{argv[0]} command not found. Make sure it is installed.")
+
+        lines: 'queue.Queue' = queue.Queue()
+        stderr: List[str] = []
+        threading.Thread(target=_pump, args=(process.stdout, lines), daemon=True).start()
+        stderr_thread = threading.Thread(target=_collect, args=(process.stderr, stderr), daemon=True)
+        stderr_thread.start()
+        if stdin_text is not None:
+            try:
+                process.stdin.write(stdin_text)
+                process.stdin.close()
+            except OSError:
+                pass  # agent exited without reading the prompt; its exit code tells why
+
+        output: List[str] = []
+        tail = ''
+        completed = timed_out = False
+        deadline = started + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                timed_out = True
+                break
+            if line is _EOF:
+                break
+            output.append(line)
+            if self.on_output:
+                self.on_output(line)
+            if stop_check:
+                window = tail + output[-1]
+                if stop_check(window):
+                    completed = True
+                    break
+                tail = window[-STOP_CHECK_OVERLAP:]
+
+        _terminate(process)
+        stderr_thread.join(timeout=1)
+        text = ''.join(output)
+        return _result(
+            output=text,
+            stderr=''.join(stderr),
+            returncode=process.returncode,
+            completed=completed,
+            timed_out=timed_out,
+            error=f"timed out after {self.timeout:.0f}s" if timed_out else None,
+            seconds=time.monotonic() - started
+        )
+
+    def close(self):
+        """Nothing to release: every run has its own process"""
+
+
+class SessionExecutor:
+    """
+    Keeps one agent process for the whole loop (stream-json protocol)
+
+    The process is started on the first run and restarted (with a fresh
+    session) if it exits between iterations.
+    """
+
+    def __init__(
+        self,
+        command=None,
+        timeout: float = ITERATION_TIMEOUT,
+        on_output: Optional[Callable[[str], None]] = None,
+        cwd: Optional[str] = None
+    ):
+        self.command = parse_agent_command(command) if command else list(DEFAULT_SESSION_COMMAND)
+        self.timeout = timeout
+        self.on_output = on_output
+        self.cwd = cwd
+        self.process: Optional[subprocess.Popen] = None
+        self.session_id: Optional[str] = None
+        self.turns = 0
+        self.restarts = 0
+        self._lines: Optional['queue.Queue'] = None
+        self._stderr: List[str] = []
+
+    def _start(self):
+        if self.process is not None:
+            self.restarts += 1
+        self.process = subprocess.Popen(
+            self.command, cwd=self.cwd,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=1
+        )
+        self._lines = queue.Queue()
+        self._stderr = []
+        self.session_id = None
+        threading.Thread(target=_pump, args=(self.process.stdout, self._lines), daemon=True).start()
+        threading.Thread(target=_collect, args=(self.process.stderr, self._stderr), daemon=True).start()
+
+    @staticmethod
+    def _event_text(event: Dict[str, Any]) -> str:
+        """Text content of an assistant message event"""
+        if event.get('type') != 'assistant':
+            return ''
+        content = event.get('message', {}).get('content', [])
+        if isinstance(content, str):
+            return content
+        return ''.join(block.get('text', '') for block in content
+                       if isinstance(block, dict) and block.get('type') == 'text')
+
+    def run(self, prompt: str, stop_check: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """Send one user turn and read events until its result (or stop_check/timeout)"""
+        started = time.monotonic()
+        try:
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            message = {'type': 'user', 'message': {'role': 'user', 'content': prompt}}
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except FileNotFoundError:
+            return _result(error=f"{self.command[0]} command not found. Make sure it is installed.")
+        except OSError as e:
+            return _result(error=f"agent session closed: {e}", returncode=self.process.poll())
+
+        output: List[str] = []
+        tail = ''
+        completed = timed_out = ended = False
+        deadline = started + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                timed_out = True
+                break
+            if line is _EOF:
+                break
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # not an event (banner or stray print)
+            if not isinstance(event, dict):
+                continue
+            self.session_id = event.get('session_id', self.session_id)
+            if event.get('type') == 'result':
+                ended = True
+                if not output and event.get('result'):
+                    output.append(str(event['result']))
+                break
+            text = self._event_text(event)
+            if not text:
+                continue
+            output.append(text if text.endswith('\n') else text + '\n')
+            if self.on_output:
+                self.on_output(text)
+            if stop_check:
+                window = tail + output[-1]
+                if stop_check(window):
+                    completed = True
+                    break
+                tail = window[-STOP_CHECK_OVERLAP:]
+
+        self.turns += 1
+        if timed_out or (completed and not ended):
+            # The turn is still running; its remaining events would leak into the next one
+            self.close()
+        error = None
+        if timed_out:
+            error = f"timed out after {self.timeout:.0f}s"
+        elif not ended and not completed:
+            error = "agent session exited"
+        return _result(
+            output=''.join(output),
+            stderr=''.join(self._stderr),
+            returncode=self.process.poll() if self.process else None,
+            completed=completed,
+            timed_out=timed_out,
+            error=error,
+            seconds=time.monotonic() - started
+        )
+
+    def close(self):
+        """End the session: close stdin so the agent can exit, then terminate it"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            _terminate(self.process)
@@ -0,0 +1,363 @@
+"""
+Ralph Multi-Task Orchestrator
+
+Runs several Ralph Wiggum loops at once, fed from Needs_Action:
+- Task files in Needs_Action are pulled into a priority work queue
+  ("**Priority:** High" / "priority: high" metadata; oldest file first
+  within a priority)
+- Up to N loops run concurrently, each in its own workspace
+  (Ralph_Tasks/<task_id>/ralph_state.json and Ralph_Context/), so tasks
+  never share state files or prompt/output names
+- Every task gets an iteration budget: "**Max Iterations:** 5" in the task
+  file, capped by the orchestrator's per-task maximum. A task that runs
+  out of budget is moved to Pending_Approval (with a note) for a human to
+  look at, instead of staying in Needs_Action.
+- A new task file that reuses a finished task's name is queued again and
+  starts from a fresh state
+- The report shows per-task outcome, iterations and duration, and the
+  throughput in tasks completed per hour
+
+Usage:
+    python ralph_multi_orchestrator.py                         # drain Needs_Action with 2 loops
+    python ralph_multi_orchestrator.py --concurrency 4 --max-iterations 10
+    python ralph_multi_orchestrator.py --watch                 # keep pulling new tasks
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from vault_index import parse_metadata
+from ralph_executor import StreamingExecutor, SessionExecutor, ITERATION_TIMEOUT
+from ralph_orchestrator import RalphWiggumLoop, STATE_FILE, setup_logging, logger
+
+# Configuration
+NEEDS_ACTION_DIR = Path("Needs_Action")
+PENDING_APPROVAL_DIR = Path("Pending_Approval")
+WORKSPACE_ROOT = Path("Ralph_Tasks")
+REPORT_FILE = WORKSPACE_ROOT / "orchestrator_report.json"
+MAX_CONCURRENT = 2  # loops running at the same time
+TASK_MAX_ITERATIONS = 10  # per-task iteration budget (task files may ask for fewer)
+POLL_INTERVAL = 5.0  # seconds between Needs_Action scans in watch mode
+
+PRIORITIES = {'critical': 0, 'urgent': 0, 'high': 1, 'medium': 2, 'normal': 2, 'low': 3}
+DEFAULT_PRIORITY = 2
+HEADER_BYTES = 4096  # metadata is read from the start of the task file
+
+
+def task_id_for(path: Path) -> str:
+    """Filesystem-safe workspace name for a task file"""
+    slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', path.stem).strip('_.')
+    return slug[:80] or 'task'
+
+
+def read_task_metadata(path: Path) -> Dict[str, Any]:
+    """Priority and iteration budget from the task file's front matter / **Key:** fields"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            header = f.read(HEADER_BYTES)
+    except OSError:
+        header = ''
+    _, _, fields = parse_metadata(header)
+    priority = PRIORITIES.get(fields.get('priority', '').strip().lower(), DEFAULT_PRIORITY)
+    try:
+        budget = int(fields.get('max_iterations', ''))
+    except ValueError:
+        budget = None
+    return {'priority': priority, 'max_iterations': budget}
+
+
+class TaskQueue:
+    """Priority queue of task files; each version of a file (name, mtime) is queued at most once"""
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def scan(self, folder: Path) -> int:
+        """Queue task files not seen before (or changed since); returns how many were added"""
+        if not folder.exists():
+            return 0
+        added = 0
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith('.md'):
+                    continue
+                path = Path(entry.path)
+                mtime = entry.stat().st_mtime
+                with self._lock:
+                    if (path.name, mtime) in self._seen:
+                        continue
+                    self._seen.add((path.name, mtime))
+                    meta = read_task_metadata(path)
+                    heapq.heappush(self._heap, (meta['priority'], mtime, path.name, path, meta))
+                added += 1
+        return added
+
+    def pop(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._heap:
+                return None
+            priority, mtime, _, path, meta = heapq.heappop(self._heap)
+        return {'path': path, 'priority': priority, 'max_iterations': meta['max_iterations'], 'mtime': mtime}
+
+    def forget(self, task: Dict[str, Any]):
+        """Let the next scan queue this version of the task file again"""
+        with self._lock:
+            self._seen.discard((task['path'].name, task['mtime']))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+
+class MultiTaskOrchestrator:
+    """Runs queued tasks in concurrent Ralph loops with namespaced workspaces"""
+
+    def __init__(
+        self,
+        needs_action: Path = NEEDS_ACTION_DIR,
+        workspace_root: Path = WORKSPACE_ROOT,
+        pending_approval: Path = PENDING_APPROVAL_DIR,
+        concurrency: int = MAX_CONCURRENT,
+        max_iterations: int = TASK_MAX_ITERATIONS,
+        executor_factory: Callable[[], Any] = StreamingExecutor,
+        poll_interval: float = POLL_INTERVAL,
+        iteration_delay: float = 0.0
+    ):
+        self.needs_action = Path(needs_action)
+        self.workspace_root = Path(workspace_root)
+        self.pending_approval = Path(pending_approval)
+        self.concurrency = max(1, concurrency)
+        self.max_iterations = max_iterations
+        self.executor_factory = executor_factory
+        self.poll_interval = poll_interval
+        self.iteration_delay = iteration_delay
+        self.queue = TaskQueue()
+        self.results: List[Dict[str, Any]] = []
+        self.running: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.concurrency)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def budget_for(self, task: Dict[str, Any]) -> int:
+        """Per-task iteration budget: the task's own request, capped by the orchestrator maximum"""
+        requested = task.get('max_iterations')
+        return min(requested, self.max_iterations) if requested and requested > 0 else self.max_iterations
+
+    @staticmethod
+    def _clear_stale_state(workspace: Path, path: Path):
+        """Drop a finished task's state when the task file is newer (a new task reusing the name)"""
+        state_file = workspace / STATE_FILE.name
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            saved = datetime.fromisoformat(state.get('last_saved', ''))
+        except (OSError, ValueError):
+            return
+        if state.get('status') in ('completed', 'max_iterations') and \
+                datetime.fromtimestamp(path.stat().st_mtime) > saved:
+            state_file.unlink()
+
+    def _park(self, path: Path, entry: Dict[str, Any]) -> Optional[Path]:
+        """Move a task that used its budget to Pending_Approval, noting why"""
+        self.pending_approval.mkdir(parents=True, exist_ok=True)
+        target = self.pending_approval / path.name
+        if target.exists():
+            target = self.pending_approval / f"{path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{path.suffix}"
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(f"\n**Ralph:** stopped after {entry['iterations']}/{entry['budget']} iterations "
+                        f"without completing ({datetime.now().strftime('%Y-%m-%d %H:%M')}); needs review\n")
+            path.rename(target)
+        except OSError as e:
+            logger.warning(f"[{entry['task_id']}] could not move task to {self.pending_approval}: {e}")
+            return None
+        logger.warning(f"[{entry['task_id']}] iteration budget used; moved to {target}")
+        return target
+
+    def _run_task(self, task: Dict[str, Any], entry: Dict[str, Any]):
+        path = task['path']
+        task_id = entry['task_id']
+        budget = entry['budget']
+        started = time.monotonic()
+        try:
+            self._clear_stale_state(self.workspace_root / task_id, path)
+            loop = RalphWiggumLoop(
+                task_file=str(path),
+                max_iterations=budget,
+                executor=self.executor_factory(),
+                iteration_delay=self.iteration_delay,
+                workspace=self.workspace_root / task_id,
+                task_id=task_id
+            )
+            state = loop.run()
+            entry.update(status=state.get('status'), iterations=state.get('iterations'),
+                         errors=len(state.get('errors', [])))
+            if entry['status'] == 'max_iterations' and path.exists():
+                moved = self._park(path, entry)
+                if moved:
+                    entry['moved_to'] = str(moved)
+        except Exception as e:
+            logger.error(f"[{task_id}] loop failed: {e}")
+            entry.update(status='error', iterations=None, errors=1, error=str(e))
+        finally:
+            entry['seconds'] = round(time.monotonic() - started, 2)
+            with self._lock:
+                self.running.pop(task_id, None)
+                self.results.append(entry)
+            self._slots.release()
+
+    def run(self, watch: bool = False) -> Dict[str, Any]:
+        """
+        Pull tasks and run them, at most `concurrency` at a time
+
+        Without watch, returns once Needs_Action (as first scanned) is drained;
+        with watch, keeps scanning for new task files until stop().
+        """
+        setup_logging()
+        self.started_at = time.monotonic()
+        self._stop.clear()
+        self.queue.scan(self.needs_action)
+        logger.info(f"Multi-task orchestrator: {len(self.queue)} task(s) queued, concurrency {self.concurrency}")
+
+        while not self._stop.is_set():
+            task = self.queue.pop()
+            if task is None:
+                if watch:
+                    if self._stop.wait(self.poll_interval):
+                        break
+                    self.queue.scan(self.needs_action)
+                    continue
+                break
+            if not task['path'].exists():
+                continue  # finished or moved since it was queued
+            task_id = task_id_for(task['path'])
+            with self._lock:
+                busy = task_id in self.running
+            if busy:
+                # Edited while its loop is still running: one loop per workspace, so look
+                # again on a later scan, once the earlier run has finished (or moved the file)
+                self.queue.forget(task)
+                continue
+            # Wait for a free slot (polling, so stop() is noticed)
+            while not self._slots.acquire(timeout=0.5):
+                if self._stop.is_set():
+                    break
+            else:
+                entry = {'task_id': task_id, 'file': task['path'].name, 'priority': task['priority'],
+                         'budget': self.budget_for(task), 'started_at': datetime.now().isoformat()}
+                with self._lock:
+                    self.running[task_id] = entry
+                thread = threading.Thread(target=self._run_task, args=(task, entry),
+                                          name=f'ralph-{task_id}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+        return self.join()
+
+    def stop(self):
+        """Stop taking new tasks; running loops finish their current task"""
+        self._stop.set()
+
+    def join(self) -> Dict[str, Any]:
+        """Wait for the running loops, then write and return the report"""
+        for thread in self._threads:
+            thread.join()
+        self.ended_at = time.monotonic()
+        report = self.report()
+        self.save_report(report)
+        return report
+
+    def report(self) -> Dict[str, Any]:
+        """Outcome of every task and throughput in tasks completed per hour"""
+        end = self.ended_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        with self._lock:
+            results = list(self.results)
+            running = list(self.running.values())
+        counts: Dict[str, int] = {}
+        for entry in results:
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        completed = counts.get('completed', 0)
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'concurrency': self.concurrency,
+            'elapsed_seconds': round(elapsed, 2),
+            'tasks_finished': len(results),
+            'by_status': counts,
+            'tasks_per_hour': round(completed / (elapsed / 3600), 2) if elapsed > 0 else 0.0,
+            'iterations': sum(entry.get('iterations') or 0 for entry in results),
+            'queued': len(self.queue),
+            'running': running,
+            'tasks': results
+        }
+
+    def save_report(self, report: Dict[str, Any]):
+        self.workspace_root.mkdir(parents=True, exist_ok=True)
+        with open(self.workspace_root / REPORT_FILE.name, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def print_report(report: Dict[str, Any]):
+        print("\n" + "=" * 70)
+        print("Ralph Multi-Task Orchestrator - Report")
+        print("=" * 70)
+        print(f"{'Task':<40} {'Status':<15} {'Iter':>5} {'Time':>8}")
+        print("-" * 70)
+        for entry in report['tasks']:
+            iterations = f"{entry.get('iterations') or 0}/{entry['budget']}"
+            print(f"{entry['task_id'][:40]:<40} {entry['status']:<15} {iterations:>5} {entry['seconds']:>7.1f}s")
+        print("-" * 70)
+        print(f"Finished: {report['tasks_finished']}  {report['by_status']}")
+        print(f"Elapsed: {report['elapsed_seconds']:.1f}s with {report['concurrency']} concurrent loop(s)")
+        print(f"Throughput: {report['tasks_per_hour']:.1f} tasks completed per hour")
+        print("=" * 70)
+
+
+def main():
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(description='Run Ralph Wiggum loops for many tasks at once')
+    parser.add_argument('--needs-action', default=str(NEEDS_ACTION_DIR), help='Folder to pull task files from')
+    parser.add_argument('--concurrency', '-c', type=int, default=MAX_CONCURRENT, help='Loops running at once')
+    parser.add_argument('--max-iterations', '-m', type=int, default=TASK_MAX_ITERATIONS,
+                        help='Iteration budget per task (task files may ask for fewer)')
+    parser.add_argument('--watch', action='store_true', help='Keep pulling new task files until Ctrl+C')
+    parser.add_argument('--agent-cmd', help='Agent command ({prompt} placeholder or prompt on stdin)')
+    parser.add_argument('--session', action='store_true', help='One agent session per task instead of one process per iteration')
+    parser.add_argument('--timeout', type=float, default=ITERATION_TIMEOUT, help='Seconds per iteration')
+    args = parser.parse_args()
+
+    executor_class = SessionExecutor if args.session else StreamingExecutor
+    orchestrator = MultiTaskOrchestrator(
+        needs_action=Path(args.needs_action),
+        concurrency=args.concurrency,
+        max_iterations=args.max_iterations,
+        executor_factory=lambda: executor_class(args.agent_cmd, timeout=args.timeout)
+    )
+    try:
+        report = orchestrator.run(watch=args.watch)
+    except KeyboardInterrupt:
+        print("\nStopping: waiting for running tasks to finish their loop...")
+        orchestrator.stop()
+        report = orchestrator.join()
+    orchestrator.print_report(report)
+    sys.exit(0 if report['by_status'].get('completed', 0) == report['tasks_finished'] else 1)
+
+
+if __name__ == '__main__':
+    main()
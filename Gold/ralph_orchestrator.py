@@ -9,18 +9,22 @@ Reference: https://github.com/anthropics/claude-code/tree/main/.claude/plugins/r
 Usage:
     python ralph_orchestrator.py --task "Process complex invoice"
     python ralph_orchestrator.py --task-file "Needs_Action/invoice_001.md"
+    python ralph_orchestrator.py --task "..." --session          # one agent session for all iterations
+    python ralph_orchestrator.py --task "..." --agent-cmd "python stub_agent.py {prompt}"
 """
 
 import os
 import sys
 import json
-import subprocess
+import time
 import argparse
 import logging
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from ralph_executor import StreamingExecutor, SessionExecutor, ITERATION_TIMEOUT
+
 # Configuration
 MAX_ITERATIONS = 20
 STATE_FILE = Path("ralph_state.json")
@@ -28,19 +32,23 @@ TASK_FILE = Path("ralph_task.md")
 DONE_DIR = Path("Done")
 LOG_FILE = Path("ralph_loop.log")
 CONTEXT_DIR = Path("Ralph_Context")
+ITERATION_DELAY = 0.0  # seconds between iterations (output is streamed, so no settling time is needed)
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('ralph_orchestrator')
 
 
+def setup_logging():
+    """Log to ralph_loop.log and the console (on first use, so importing this module has no side effects)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+
+
 class RalphWiggumLoop:
     """
     Ralph Wiggum Autonomous Loop with Stop Hook Pattern
@@ -53,10 +61,30 @@ class RalphWiggumLoop:
     - Error occurs
     """
     
-    def __init__(self, task: str = None, task_file: str = None, max_iterations: int = 20):
+    def __init__(
+        self,
+        task: str = None,
+        task_file: str = None,
+        max_iterations: int = 20,
+        executor=None,
+        iteration_delay: float = ITERATION_DELAY,
+        workspace: Optional[Path] = None,
+        task_id: Optional[str] = None
+    ):
         self.task = task
         self.task_file = Path(task_file) if task_file else None
         self.max_iterations = max_iterations
+        self.executor = executor or StreamingExecutor()
+        self.iteration_delay = iteration_delay
+        self.last_result: Dict[str, Any] = {}
+        self.loop_started = time.time()  # a Done/ copy older than this belongs to an earlier task
+        
+        # A workspace gives the loop its own state file and context folder, so
+        # several loops can run at once (see ralph_multi_orchestrator.py)
+        self.workspace = Path(workspace) if workspace else None
+        self.state_file = self.workspace / STATE_FILE.name if self.workspace else STATE_FILE
+        self.context_dir = self.workspace / CONTEXT_DIR.name if self.workspace else CONTEXT_DIR
+        self.logger = logger.getChild(task_id) if task_id else logger
         self.state = {
             'task': task or f"Process {task_file}" if task_file else "Unknown task",
             'started_at': datetime.now().isoformat(),
@@ -68,36 +96,37 @@ class RalphWiggumLoop:
             'max_iterations': max_iterations
         }
         self.output_history: List[str] = []
+        setup_logging()
         
         # Create directories
         DONE_DIR.mkdir(exist_ok=True)
-        CONTEXT_DIR.mkdir(exist_ok=True)
+        self.context_dir.mkdir(parents=True, exist_ok=True)
         
-        logger.info("="*70)
-        logger.info("Ralph Wiggum Autonomous Loop Started")
-        logger.info("="*70)
-        logger.info(f"Task: {self.state['task']}")
-        logger.info(f"Max Iterations: {MAX_ITERATIONS}")
-        logger.info(f"State File: {STATE_FILE}")
-        logger.info("="*70)
+        self.logger.info("="*70)
+        self.logger.info("Ralph Wiggum Autonomous Loop Started")
+        self.logger.info("="*70)
+        self.logger.info(f"Task: {self.state['task']}")
+        self.logger.info(f"Max Iterations: {self.max_iterations}")
+        self.logger.info(f"State File: {self.state_file}")
+        self.logger.info("="*70)
     
     def save_state(self):
         """Save current state to file"""
         self.state['last_saved'] = datetime.now().isoformat()
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+        with open(self.state_file, 'w', encoding='utf-8') as f:
             json.dump(self.state, f, indent=2, ensure_ascii=False)
-        logger.debug(f"State saved to {STATE_FILE}")
+        self.logger.debug(f"State saved to {self.state_file}")
     
     def load_state(self) -> bool:
         """Load existing state if available"""
-        if STATE_FILE.exists():
+        if self.state_file.exists():
             try:
-                with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
                     self.state = json.load(f)
-                logger.info(f"Loaded existing state from {STATE_FILE}")
+                self.logger.info(f"Loaded existing state from {self.state_file}")
                 return True
             except Exception as e:
-                logger.warning(f"Could not load state: {e}")
+                self.logger.warning(f"Could not load state: {e}")
         return False
     
     def create_task_file(self):
@@ -113,29 +142,48 @@ class RalphWiggumLoop:
                 f.write("- [ ] Task started\n")
                 f.write("\n## Notes\n\n")
                 f.write("*Add notes here*\n")
-            logger.info(f"Created task file: {self.task_file}")
+            self.logger.info(f"Created task file: {self.task_file}")
     
-    def check_task_complete(self, output: str) -> bool:
+    def check_stop_signal(self, output: str) -> bool:
         """
-        Check if task is complete using stop hook pattern
+        Check for an explicit completion signal
         
-        Looks for:
-        1. TASK_COMPLETE marker in output
-        2. Task file moved to /Done directory
-        3. Explicit completion signal
+        Safe to run on partial output while the agent is still writing:
+        only the TASK_COMPLETE marker or the task file in /Done count.
+        A Done/ file left by an earlier task with the same name does not:
+        the task file must have moved, or the Done copy be written by this loop.
         """
         # Check for TASK_COMPLETE marker
         if 'TASK_COMPLETE' in output:
-            logger.info("✓ Found TASK_COMPLETE marker in output")
+            self.logger.info("✓ Found TASK_COMPLETE marker in output")
             return True
         
-        # Check if task file moved to Done
-        if self.task_file and self.task_file.exists():
+        # Check if task file moved (or was copied) to Done during this loop
+        if self.task_file:
             done_path = DONE_DIR / self.task_file.name
-            if done_path.exists():
-                logger.info(f"✓ Task file moved to {DONE_DIR}")
+            try:
+                written = done_path.stat().st_mtime
+            except OSError:
+                written = None
+            if written is not None and (not self.task_file.exists() or written >= self.loop_started):
+                self.logger.info(f"✓ Task file moved to {DONE_DIR}")
                 return True
         
+        return False
+    
+    def check_task_complete(self, output: str) -> bool:
+        """
+        Check if task is complete using stop hook pattern
+        
+        Looks for:
+        1. TASK_COMPLETE marker in output
+        2. Task file moved to /Done directory
+        3. Completion phrases (only once the agent has exited: a phrase like
+           "task completed" mid-answer may be followed by more work)
+        """
+        if self.check_stop_signal(output):
+            return True
+        
         # Check for completion phrases
         completion_phrases = [
             'task is complete',
@@ -148,7 +196,7 @@ class RalphWiggumLoop:
         output_lower = output.lower()
         for phrase in completion_phrases:
             if phrase in output_lower:
-                logger.info(f"✓ Found completion phrase: '{phrase}'")
+                self.logger.info(f"✓ Found completion phrase: '{phrase}'")
                 return True
         
         return False
@@ -197,7 +245,7 @@ Begin execution now. Output TASK_COMPLETE when finished.
 # Ralph Wiggum Autonomous Loop - Continue Task
 
 **Task:** {self.state['task']}
-**Iteration:** {iteration} of {MAX_ITERATIONS}
+**Iteration:** {iteration} of {self.max_iterations}
 
 **Instructions:**
 1. Continue from where you left off
@@ -218,64 +266,47 @@ Continue now. Output TASK_COMPLETE when finished.
     
     def run_claude(self, prompt: str) -> str:
         """
-        Run Claude Code with the given prompt
+        Run the agent with the given prompt
         
-        Returns the output from Claude
+        Output is streamed and checked for an explicit completion signal as
+        it arrives; the iteration ends early once the agent signals it.
+        Returns the output from the agent
         """
-        logger.info(f"Running Claude Code (iteration {self.state['iterations']})...")
+        self.logger.info(f"Running agent (iteration {self.state['iterations']})...")
+        
+        # Save prompt to context file
+        context_file = self.context_dir / f"prompt_{self.state['iterations']:03d}.md"
+        with open(context_file, 'w', encoding='utf-8') as f:
+            f.write(prompt)
         
         try:
-            # Save prompt to context file
-            context_file = CONTEXT_DIR / f"prompt_{self.state['iterations']:03d}.md"
-            with open(context_file, 'w', encoding='utf-8') as f:
-                f.write(prompt)
-            
-            # Run claude-code command
-            # Note: Adjust command based on how claude-code is installed
-            cmd = [
-                'claude',
-                '--prompt', prompt,
-                '--output-format', 'text'
-            ]
-            
-            logger.debug(f"Command: {' '.join(cmd)}")
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout per iteration
-            )
-            
-            output = result.stdout
-            if result.stderr:
-                logger.warning(f"Stderr: {result.stderr}")
-            
-            # Save output to context file
-            output_file = CONTEXT_DIR / f"output_{self.state['iterations']:03d}.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output)
-            
-            logger.info(f"Claude output: {len(output)} chars")
-            return output
-            
-        except subprocess.TimeoutExpired:
-            error_msg = f"Iteration {self.state['iterations']} timed out after 300s"
-            logger.error(error_msg)
-            self.state['errors'].append(error_msg)
-            return f"ERROR: {error_msg}"
-            
-        except FileNotFoundError:
-            error_msg = "claude command not found. Make sure claude-code is installed."
-            logger.error(error_msg)
-            self.state['errors'].append(error_msg)
-            return f"ERROR: {error_msg}"
-            
+            result = self.executor.run(prompt, stop_check=self.check_stop_signal)
         except Exception as e:
-            error_msg = f"Iteration {self.state['iterations']} error: {str(e)}"
-            logger.error(error_msg)
+            result = {'output': '', 'stderr': '', 'completed': False, 'error': str(e), 'seconds': 0.0}
+        self.last_result = result
+        
+        if result['stderr']:
+            self.logger.warning(f"Stderr: {result['stderr']}")
+        
+        if result['error'] and not result['output']:
+            error_msg = f"Iteration {self.state['iterations']} error: {result['error']}"
+            self.logger.error(error_msg)
             self.state['errors'].append(error_msg)
             return f"ERROR: {error_msg}"
+        if result['error']:
+            # Partial output (e.g. timed out mid-answer) is still worth continuing from
+            self.state['errors'].append(f"Iteration {self.state['iterations']}: {result['error']}")
+        
+        output = result['output']
+        
+        # Save output to context file
+        output_file = self.context_dir / f"output_{self.state['iterations']:03d}.md"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(output)
+        
+        stopped = " (stopped early: task complete)" if result['completed'] else ""
+        self.logger.info(f"Agent output: {len(output)} chars in {result['seconds']:.1f}s{stopped}")
+        return output
     
     def run(self) -> Dict[str, Any]:
         """
@@ -283,7 +314,13 @@ Continue now. Output TASK_COMPLETE when finished.
         
         Returns final state dictionary
         """
-        logger.info("Starting Ralph Wiggum autonomous loop...")
+        try:
+            return self._run_iterations()
+        finally:
+            self.executor.close()
+    
+    def _run_iterations(self) -> Dict[str, Any]:
+        self.logger.info("Starting Ralph Wiggum autonomous loop...")
         
         # Load existing state or start fresh
         if not self.load_state():
@@ -296,9 +333,9 @@ Continue now. Output TASK_COMPLETE when finished.
             self.state['iterations'] += 1
             iteration = self.state['iterations']
             
-            logger.info("="*60)
-            logger.info(f"ITERATION {iteration} / {self.max_iterations}")
-            logger.info("="*60)
+            self.logger.info("="*60)
+            self.logger.info(f"ITERATION {iteration} / {self.max_iterations}")
+            self.logger.info("="*60)
             
             # Generate prompt
             prompt = self.get_continuation_prompt()
@@ -310,11 +347,11 @@ Continue now. Output TASK_COMPLETE when finished.
             self.output_history.append(output)
             self.state['last_output'] = output[-1000:]  # Last 1000 chars
             
-            # Check for completion
-            if self.check_task_complete(output):
-                logger.info("="*60)
-                logger.info("✅ TASK COMPLETE!")
-                logger.info("="*60)
+            # Check for completion (already detected while streaming if the agent was stopped early)
+            if self.last_result.get('completed') or self.check_task_complete(output):
+                self.logger.info("="*60)
+                self.logger.info("✅ TASK COMPLETE!")
+                self.logger.info("="*60)
                 self.state['status'] = 'completed'
                 self.state['completed_at'] = datetime.now().isoformat()
                 self.save_state()
@@ -322,29 +359,31 @@ Continue now. Output TASK_COMPLETE when finished.
                 # Move task file to Done if exists
                 if self.task_file and self.task_file.exists():
                     done_path = DONE_DIR / self.task_file.name
+                    if done_path.exists():
+                        # Keep the record of an earlier task that used the same name
+                        done_path = DONE_DIR / f"{self.task_file.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{self.task_file.suffix}"
                     try:
                         self.task_file.rename(done_path)
-                        logger.info(f"Task file moved to: {done_path}")
+                        self.logger.info(f"Task file moved to: {done_path}")
                     except Exception as e:
-                        logger.warning(f"Could not move task file: {e}")
+                        self.logger.warning(f"Could not move task file: {e}")
                 
                 return self.state
             
             # Check for errors
             if output.startswith('ERROR:'):
-                logger.warning(f"Error in iteration {iteration}: {output}")
+                self.logger.warning(f"Error in iteration {iteration}: {output}")
             
             # Save state
             self.save_state()
             
-            # Small delay between iterations
-            import time
-            time.sleep(2)
+            if self.iteration_delay:
+                time.sleep(self.iteration_delay)
         
         # Max iterations reached
-        logger.warning("="*60)
-        logger.warning(f"⚠️ MAX ITERATIONS ({MAX_ITERATIONS}) REACHED")
-        logger.warning("="*60)
+        self.logger.warning("="*60)
+        self.logger.warning(f"⚠️ MAX ITERATIONS ({self.max_iterations}) REACHED")
+        self.logger.warning("="*60)
         self.state['status'] = 'max_iterations'
         self.state['ended_at'] = datetime.now().isoformat()
         self.save_state()
@@ -405,6 +444,25 @@ Examples:
         help='Maximum iterations (default: 20)'
     )
     
+    parser.add_argument(
+        '--agent-cmd',
+        help='Agent command; {prompt} is replaced by the prompt, otherwise it is sent on stdin '
+             '(default: $RALPH_AGENT_CMD or the claude CLI)'
+    )
+    
+    parser.add_argument(
+        '--session',
+        action='store_true',
+        help='Keep one agent session (stream-json) across iterations instead of one process each'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=ITERATION_TIMEOUT,
+        help=f'Seconds per iteration (default: {ITERATION_TIMEOUT:.0f})'
+    )
+    
     parser.add_argument(
         '--resume', '-r',
         action='store_true',
@@ -419,7 +477,10 @@ Examples:
         sys.exit(1)
     
     # Create and run loop with custom max iterations
-    loop = RalphWiggumLoop(task=args.task, task_file=args.task_file, max_iterations=args.max_iterations)
+    executor_class = SessionExecutor if args.session else StreamingExecutor
+    executor = executor_class(args.agent_cmd, timeout=args.timeout, on_output=lambda text: print(text, end='', flush=True))
+    loop = RalphWiggumLoop(task=args.task, task_file=args.task_file, max_iterations=args.max_iterations,
+                           executor=executor)
     
     try:
         final_state = loop.run()
@@ -31,7 +31,8 @@ class ReasoningLoop:
             print(f"Directory {self.needs_action_dir} does not exist")
             return []
 
-        files = list(self.needs_action_dir.glob("*"))
+        # Only files are requests; subfolders such as Attachments hold supporting data
+        files = [f for f in self.needs_action_dir.glob("*") if f.is_file()]
         return files
 
     def read_file_content(self, file_path):
@@ -150,15 +151,15 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         return len(approval_files) > 0
 
     def process_approved_requests(self):
-        """Process requests after approval is given"""
+        """Process requests after approval is given; returns the number of requests processed"""
         if not self.has_approval():
             print("No approval found. Waiting for approval...")
-            return False
+            return 0
 
         request_files = self.scan_needs_action()
         if not request_files:
             print("No requests to process.")
-            return True
+            return 0
 
         print(f"Processing {len(request_files)} approved requests...")
 
@@ -185,7 +186,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             print(f"Removed approval file: {approval_file.name}")
 
         print("All approved requests processed.")
-        return True
+        return len(request_files)
 
     def requires_human_approval(self, content):
         """Determine if content requires human approval before sending outgoing message"""
@@ -264,30 +265,37 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 
                 print(f"Updated plan with human approval requirement: {latest_plan}")
 
+    def run_once(self):
+        """Run one reasoning pass; returns the number of requests processed in it"""
+        # Scan for new requests
+        request_files = self.scan_needs_action()
+        processed = 0
+
+        if request_files:
+            print(f"Found {len(request_files)} requests in Needs_Action")
+
+            # Generate a plan for each request file
+            for request_file in request_files:
+                self.generate_plan(request_file)
+
+            # Check for approval and process if approved
+            if self.has_approval():
+                print("Approval detected. Processing requests...")
+                processed = self.process_approved_requests()
+            else:
+                print("Requests found. Plans created and waiting for approval.")
+        else:
+            print("No requests in Needs_Action. Waiting...")
+
+        return processed
+
     def run_reasoning_loop(self):
         """Run the main reasoning loop"""
         print("Starting Reasoning Loop...")
 
         while True:
             try:
-                # Scan for new requests
-                request_files = self.scan_needs_action()
-
-                if request_files:
-                    print(f"Found {len(request_files)} requests in Needs_Action")
-
-                    # Generate a plan for each request file
-                    for request_file in request_files:
-                        self.generate_plan(request_file)
-
-                    # Check for approval and process if approved
-                    if self.has_approval():
-                        print("Approval detected. Processing requests...")
-                        self.process_approved_requests()
-                    else:
-                        print("Requests found. Plans created and waiting for approval.")
-                else:
-                    print("No requests in Needs_Action. Waiting...")
+                self.run_once()
 
                 # Wait before next iteration
                 time.sleep(10)  # Check every 10 seconds
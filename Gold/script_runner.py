@@ -0,0 +1,71 @@
+"""
+Script Runner for the Gold tier test files
+
+Lets every test_*.py file run as a plain script (`python test_x.py`) as
+well as under pytest:
+- Tests taking `tmp_path` / `monkeypatch` get a temporary directory and a
+  pytest MonkeyPatch (pytest is only imported when a test asks for it)
+- A failed assert is reported as [FAILED], any other exception as [ERROR],
+  and pytest.skip() as [SKIPPED]; one test never stops the run
+- Ends with a "Results: n/m tests passed" line
+
+Usage:
+    if __name__ == '__main__':
+        run_tests("Post Job Queue - Test Suite", [test_a, test_b])
+"""
+
+import inspect
+import tempfile
+import traceback
+from pathlib import Path
+from contextlib import ExitStack
+from typing import Callable, List
+
+try:
+    from pytest import skip as _skip
+    SkipTest = _skip.Exception
+except ImportError:
+    class SkipTest(Exception):
+        """Stand-in so the except clause below works without pytest"""
+
+
+def call_with_fixtures(test: Callable):
+    """Run a test function, supplying the tmp_path / monkeypatch arguments it takes"""
+    params = inspect.signature(test).parameters
+    with ExitStack() as stack:
+        kwargs = {}
+        if 'tmp_path' in params:
+            kwargs['tmp_path'] = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        if 'monkeypatch' in params:
+            import pytest
+            kwargs['monkeypatch'] = stack.enter_context(pytest.MonkeyPatch.context())
+        return test(**kwargs)
+
+
+def run_tests(title: str, tests: List[Callable]) -> bool:
+    """Run tests in order and print a report; returns True when none failed"""
+    passed = skipped = 0
+
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+
+    for test in tests:
+        try:
+            call_with_fixtures(test)
+            print(f"  [OK] {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAILED] {test.__name__}: {e}")
+        except SkipTest as e:
+            print(f"  [SKIPPED] {test.__name__}: {e}")
+            skipped += 1
+        except Exception as e:
+            frame = traceback.extract_tb(e.__traceback__)[-1]
+            print(f"  [ERROR] {test.__name__}: {type(e).__name__}: {e} ({Path(frame.filename).name}:{frame.lineno})")
+
+    print("\n" + "="*60)
+    summary = f"Results: {passed}/{len(tests)} tests passed"
+    print(f"{summary}, {skipped} skipped" if skipped else summary)
+    print("="*60)
+    return passed + skipped == len(tests)
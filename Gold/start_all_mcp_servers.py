@@ -1,14 +1,16 @@
 """
 MCP Servers Startup Script
 Starts all 5 MCP servers: Email, Browser, Odoo, Social (Meta), and X (Twitter)
+
+Servers start in parallel and are reported ready once /health answers;
+crashed servers are restarted with backoff (see mcp_process_supervisor.py).
 """
 
-import subprocess
-import sys
-import time
-from threading import Thread
+import argparse
 from pathlib import Path
 
+from mcp_process_supervisor import MCPProcessSupervisor, READY_TIMEOUT
+
 # Server configurations
 SERVERS = [
     {
@@ -44,65 +46,36 @@ SERVERS = [
 ]
 
 
-def start_server(server_config):
-    """Start a single MCP server"""
-    name = server_config['name']
-    file = server_config['file']
-    port = server_config['port']
-    desc = server_config['description']
-    
-    print("\n" + "=" * 60)
-    print(f"Starting {name} on port {port}...")
-    print(f"Description: {desc}")
-    print("=" * 60)
-    
-    try:
-        subprocess.run([sys.executable, file], timeout=3600)
-    except KeyboardInterrupt:
-        print(f"\n{name} stopped.")
-    except Exception as e:
-        print(f"\n{name} error: {e}")
+def main():
+    """Start all MCP servers under the process supervisor"""
+    parser = argparse.ArgumentParser(description='Start the Gold tier MCP servers')
+    parser.add_argument('--only', nargs='+', metavar='PORT', type=int,
+                        help='Start only the servers on these ports')
+    parser.add_argument('--ready-timeout', type=float, default=READY_TIMEOUT,
+                        help='Seconds to wait for each server to answer /health')
+    args = parser.parse_args()
 
+    servers = [s for s in SERVERS if not args.only or s['port'] in args.only]
 
-def main():
-    """Start all MCP servers"""
     print("\n" + "=" * 70)
     print(" " * 15 + "MCP Servers - All-in-One Startup")
     print("=" * 70)
     print(f"\nProject Directory: {Path('.').absolute()}")
-    print(f"\nServers to start: {len(SERVERS)}")
+    print(f"\nServers to start: {len(servers)}")
     
-    for i, server in enumerate(SERVERS, 1):
-        print(f"  {i}. {server['name']:25} -> Port {server['port']}")
+    for i, server in enumerate(servers, 1):
+        print(f"  {i}. {server['name']:25} -> Port {server['port']}  ({server['description']})")
     
     print("\n" + "=" * 70)
-    print("\nNote: Each server runs in a separate window.")
-    print("      Press Ctrl+C in each window to stop individual servers.")
+    print("\nNote: Output of all servers is shown here and in mcp_servers.log.")
+    print("      Crashed servers are restarted automatically.")
+    print("      Press Ctrl+C to stop all servers.")
     print("=" * 70 + "\n")
     
-    # Start each server in a separate thread
-    threads = []
-    
-    for server in SERVERS:
-        thread = Thread(
-            target=start_server,
-            args=(server,),
-            daemon=True,
-            name=server['name']
-        )
-        thread.start()
-        threads.append(thread)
-        time.sleep(1)  # Stagger startup
-    
-    # Keep main thread alive
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n\n" + "=" * 70)
-        print("Shutting down all MCP servers...")
-        print("=" * 70)
-        print("All servers stopped.")
+    supervisor = MCPProcessSupervisor(servers, cwd=str(Path(__file__).parent), ready_timeout=args.ready_timeout)
+    supervisor.start()
+    supervisor.print_report()
+    supervisor.run_forever()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+"""
+Startup Profile
+
+Measures how long each Gold tier entry point takes to import, and which
+modules that time goes to:
+- Every entry point is imported in a fresh interpreter with
+  `python -X importtime` (best of several runs), from an empty working
+  directory so import-time side effects (created folders, log files) show up
+- The per-module report lists the slowest imports by cumulative time
+- Each entry point has a startup budget and a list of heavy modules it must
+  not import before they are needed; test_startup_budget.py enforces both
+
+Usage:
+    python startup_profile.py                    # all entry points
+    python startup_profile.py mcp_email_server   # one entry point
+    python startup_profile.py --top 25 --runs 5
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+GOLD_DIR = Path(__file__).resolve().parent
+
+# Configuration
+PROFILE_RUNS = 3
+REPORT_TOP = 15
+
+# budget:   seconds the entry point may take to import (generous: CI machines are slow)
+# requires: third-party packages it cannot be imported without
+# forbid:   heavy modules that must only be imported when first used
+ENTRY_POINTS = {
+    'gold_tier_complete': {
+        'budget': 0.5,
+        'forbid': ['Skills.weekly_ceo_briefing', 'ralph_orchestrator', 'audit_logger',
+                   'error_recovery', 'requests', 'numpy']
+    },
+    'mcp_email_server': {
+        'budget': 0.5,
+        'forbid': ['googleapiclient', 'google_auth_oauthlib', 'google.auth']
+    },
+    'mcp_browser_server': {
+        'budget': 0.5,
+        'forbid': ['playwright']
+    },
+    'mcp_odoo_server': {
+        'budget': 2.0,
+        'requires': ['flask', 'flask_cors', 'dotenv', 'requests']
+    },
+    'mcp_social_server': {
+        'budget': 2.0,
+        'requires': ['flask', 'flask_cors', 'dotenv', 'requests']
+    },
+    'mcp_x_server': {
+        'budget': 2.0,
+        'requires': ['flask', 'flask_cors', 'dotenv', 'requests'],
+        'forbid': ['requests_oauthlib']
+    },
+    'ralph_orchestrator': {
+        'budget': 0.3
+    },
+    'ralph_multi_orchestrator': {
+        'budget': 0.3
+    },
+    'mcp_host': {
+        'budget': 0.5,
+        'forbid': ['mcp_email_server', 'mcp_odoo_server', 'mcp_social_server', 'mcp_x_server']
+    },
+    'Skills.weekly_ceo_briefing': {
+        'budget': 1.5,
+        'requires': ['requests']
+    }
+}
+
+
+def missing_requirements(entry: str) -> List[str]:
+    """Third-party packages the entry point needs that are not installed"""
+    return [name for name in ENTRY_POINTS.get(entry, {}).get('requires', [])
+            if importlib.util.find_spec(name) is None]
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `python -X importtime` output into {name, depth, self_ms, cumulative_ms} rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        field = parts[2]
+        name = field.strip()
+        rows.append({
+            'name': name,
+            'depth': (len(field) - len(field.lstrip()) - 1) // 2,
+            'self_ms': int(parts[0]) / 1000,
+            'cumulative_ms': int(parts[1]) / 1000
+        })
+    return rows
+
+
+def entry_imports(rows: List[Dict[str, Any]], entry: str) -> List[Dict[str, Any]]:
+    """
+    Rows belonging to the entry point's import, ending with the entry itself
+
+    Interpreter startup (site, .pth files) is reported before it and excluded.
+    """
+    end = next((i for i in range(len(rows) - 1, -1, -1)
+                if rows[i]['name'] == entry and rows[i]['depth'] == 0), None)
+    if end is None:
+        return []
+    start = end
+    while start > 0 and rows[start - 1]['depth'] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def profile_import(
+    entry: str,
+    runs: int = PROFILE_RUNS,
+    cwd: Optional[str] = None,
+    python: str = sys.executable
+) -> Dict[str, Any]:
+    """
+    Import an entry point in fresh interpreters and report the fastest run
+
+    Returns:
+        {'entry', 'seconds', 'imports': [rows...], 'loaded': set of module names,
+         'created': files/folders the import left in the working directory}
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(GOLD_DIR), os.environ.get('PYTHONPATH')])),
+               PYTHONDONTWRITEBYTECODE='1', PYTHONIOENCODING='utf-8')
+    best = None
+    with tempfile.TemporaryDirectory() if cwd is None else nullcontext(cwd) as workdir:
+        for _ in range(max(1, runs)):
+            result = subprocess.run(
+                [python, '-X', 'importtime', '-c', f'import {entry}'],
+                cwd=workdir, env=env, capture_output=True, text=True, encoding='utf-8', errors='replace'
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"import {entry} failed: {result.stderr.strip().splitlines()[-1:]}")
+            rows = entry_imports(parse_importtime(result.stderr), entry)
+            seconds = rows[-1]['cumulative_ms'] / 1000 if rows else 0.0
+            if best is None or seconds < best['seconds']:
+                best = {'entry': entry, 'seconds': seconds, 'imports': rows}
+        best['created'] = sorted(os.listdir(workdir)) if cwd is None else []
+    best['loaded'] = {row['name'] for row in best['imports']}
+    return best
+
+
+def forbidden_imports(profile: Dict[str, Any]) -> List[str]:
+    """Heavy modules from the entry point's forbid list that were imported anyway"""
+    forbid = ENTRY_POINTS.get(profile['entry'], {}).get('forbid', [])
+    return [name for name in forbid
+            if any(loaded == name or loaded.startswith(name + '.') for loaded in profile['loaded'])]
+
+
+def print_profile(profile: Dict[str, Any], top: int = REPORT_TOP):
+    entry = profile['entry']
+    budget = ENTRY_POINTS.get(entry, {}).get('budget')
+    verdict = '' if budget is None else ('  OK' if profile['seconds'] <= budget else '  OVER BUDGET')
+    limit = f" (budget {budget:.2f}s)" if budget is not None else ''
+    print(f"\n{entry}: {profile['seconds']:.3f}s{limit}{verdict}")
+
+    slowest = sorted((row for row in profile['imports'] if row['name'] != entry),
+                     key=lambda row: row['cumulative_ms'], reverse=True)[:top]
+    print(f"  {'Module':<45} {'Cumulative':>11} {'Self':>9}")
+    for row in slowest:
+        name = '  ' * min(row['depth'], 4) + row['name']
+        print(f"  {name:<45} {row['cumulative_ms']:>9.1f}ms {row['self_ms']:>7.1f}ms")
+
+    heavy = forbidden_imports(profile)
+    if heavy:
+        print(f"  Imported too early: {', '.join(heavy)}")
+    if profile['created']:
+        print(f"  Created at import: {', '.join(profile['created'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the import time of the Gold tier entry points')
+    parser.add_argument('entries', nargs='*', help='Entry point modules (default: all)')
+    parser.add_argument('--top', type=int, default=REPORT_TOP, help='Slowest imports to list per entry point')
+    parser.add_argument('--runs', type=int, default=PROFILE_RUNS, help='Runs per entry point (fastest is kept)')
+    args = parser.parse_args()
+
+    summary = []
+    for entry in args.entries or list(ENTRY_POINTS):
+        missing = missing_requirements(entry)
+        if missing:
+            print(f"\n{entry}: skipped (not installed: {', '.join(missing)})")
+            continue
+        try:
+            profile = profile_import(entry, runs=args.runs)
+        except RuntimeError as e:
+            print(f"\n{entry}: {e}")
+            continue
+        print_profile(profile, top=args.top)
+        summary.append(profile)
+
+    print("\n" + "=" * 60)
+    print(f"{'Entry point':<32} {'Import':>8} {'Budget':>8}")
+    print("-" * 60)
+    for profile in summary:
+        budget = ENTRY_POINTS.get(profile['entry'], {}).get('budget')
+        print(f"{profile['entry']:<32} {profile['seconds']:>7.3f}s {budget if budget is not None else '-':>7}s")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
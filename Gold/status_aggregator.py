@@ -0,0 +1,185 @@
+"""
+Status Aggregator
+
+Cached health/status snapshot for the Gold tier:
+- All MCP server /health probes run concurrently with a short deadline, so
+  dead servers cost one timeout in total instead of one each
+- Extra status sources (audit summary, recovery status) are gathered in the
+  same parallel pass
+- The snapshot is cached with a TTL; reads return the cached snapshot
+  immediately and a stale snapshot triggers a background refresh
+  (stale-while-revalidate). Only the very first read waits for a probe.
+- Optional background thread keeps the snapshot warm
+
+Usage:
+    status = StatusAggregator(sources={'recovery_status': get_recovery_status})
+    snapshot = status.get()          # sub-millisecond once warm
+    status.refresh()                 # force a new probe round
+"""
+
+import time
+import http.client
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+# Configuration
+MCP_SERVERS = {
+    'email': 8080,
+    'browser': 8081,
+    'odoo': 8082,
+    'social': 8083,
+    'x': 8084
+}
+MCP_HOST = 'localhost'
+PROBE_TIMEOUT = 1.0  # seconds per /health request (local servers answer in ms)
+STATUS_TTL = 10.0  # seconds a snapshot is served before a background refresh
+SOURCE_TIMEOUT = 5.0  # seconds to wait for the slower status sources
+
+
+def probe_health(port: int, host: str = MCP_HOST, timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+    """GET /health on one server; never raises"""
+    started = time.perf_counter()
+    result = {'port': port, 'status': 'offline', 'latency_ms': None, 'error': None}
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request('GET', '/health')
+        response = conn.getresponse()
+        response.read()
+        result['status'] = 'healthy' if response.status == 200 else 'unhealthy'
+        result['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    except (OSError, http.client.HTTPException) as e:
+        result['error'] = str(e) or e.__class__.__name__
+    finally:
+        conn.close()
+    return result
+
+
+class StatusAggregator:
+    """Concurrent probes behind a TTL cache"""
+
+    def __init__(
+        self,
+        servers: Optional[Dict[str, int]] = None,
+        sources: Optional[Dict[str, Callable[[], Any]]] = None,
+        host: str = MCP_HOST,
+        probe_timeout: float = PROBE_TIMEOUT,
+        ttl: float = STATUS_TTL,
+        source_timeout: float = SOURCE_TIMEOUT,
+        probe: Callable[..., Dict[str, Any]] = probe_health
+    ):
+        self.servers = dict(servers or MCP_SERVERS)
+        self.sources = dict(sources or {})
+        self.host = host
+        self.probe_timeout = probe_timeout
+        self.ttl = ttl
+        self.source_timeout = source_timeout
+        self.probe = probe
+        self.refreshes = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._refreshing = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.servers) + len(self.sources) or 1, thread_name_prefix='status'
+        )
+
+    def refresh(self) -> Dict[str, Any]:
+        """Probe everything now (in parallel) and replace the cached snapshot"""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            probes = {
+                name: self._executor.submit(self.probe, port, self.host, self.probe_timeout)
+                for name, port in self.servers.items()
+            }
+            sources = {name: self._executor.submit(fn) for name, fn in self.sources.items()}
+
+            wait(probes.values(), timeout=self.probe_timeout * 2)
+            servers = {}
+            for name, future in probes.items():
+                if future.done():
+                    servers[name] = future.result()
+                else:
+                    servers[name] = {'port': self.servers[name], 'status': 'offline',
+                                     'latency_ms': None, 'error': 'probe deadline exceeded'}
+
+            wait(sources.values(), timeout=self.source_timeout)
+            extra = {}
+            for name, future in sources.items():
+                if not future.done():
+                    extra[name] = {'error': 'timed out'}
+                elif future.exception():
+                    extra[name] = {'error': str(future.exception())}
+                else:
+                    extra[name] = future.result()
+
+            snapshot = {
+                'mcp_servers': servers,
+                **extra,
+                'checked_at': datetime.now().isoformat(),
+                'probe_ms': round((time.perf_counter() - started) * 1000, 1)
+            }
+            # Readers get whole snapshots: the reference is swapped, never mutated
+            self._snapshot = snapshot
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+            return snapshot
+
+    def _refresh_in_background(self):
+        if self._refreshing.is_set():
+            return
+        self._refreshing.set()
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing.clear()
+
+        threading.Thread(target=run, name='status-refresh', daemon=True).start()
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last refresh (None before the first one)"""
+        return time.monotonic() - self._refreshed_at if self._snapshot else None
+
+    def get(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Cached snapshot; stale ones are returned as-is and refreshed in the background
+
+        Args:
+            max_age: Refresh synchronously if the snapshot is older than this
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+        age = time.monotonic() - self._refreshed_at
+        if max_age is not None and age > max_age:
+            return self.refresh()
+        if age > self.ttl:
+            self._refresh_in_background()
+        return snapshot
+
+    def start(self, interval: Optional[float] = None):
+        """Keep the snapshot warm from a background thread"""
+        interval = interval or self.ttl
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Status refresh failed: {e}")
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name='status-aggregator', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
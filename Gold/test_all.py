@@ -181,19 +181,20 @@ except Exception as e:
 print("\n[TEST 6] Checking Posts Log...")
 print("-"*70)
 
-if Path('Posts_Log.json').exists():
+if Path('Posts_Log.jsonl').exists() or Path('Posts_Log.json').exists():
     try:
-        with open('Posts_Log.json', 'r', encoding='utf-8') as f:
-            posts = json.load(f)
-        print(f"  [OK] Posts_Log.json found ({len(posts)} posts)")
+        from post_log_store import PostLogStore
+        store = PostLogStore(Path('Posts_Log.jsonl'), legacy_path=Path('Posts_Log.json'))
+        posts = store.tail(3)
+        print(f"  [OK] Posts log found ({store.count()} posts)")
         
         # Show last 3 posts
-        for post in posts[-3:]:
+        for post in posts:
             print(f"    - {post.get('platform', 'N/A')}: {post.get('timestamp', 'N/A')[:10]} - {'Success' if post.get('result', {}).get('success') else 'Failed'}")
     except Exception as e:
-        print(f"  [ERROR] Could not read Posts_Log.json: {e}")
+        print(f"  [ERROR] Could not read posts log: {e}")
 else:
-    print("  [INFO] Posts_Log.json not found (will be created on first post)")
+    print("  [INFO] Posts log not found (will be created on first post)")
 
 # Test 7: Check Briefings
 print("\n[TEST 7] Checking Briefings...")
@@ -0,0 +1,133 @@
+"""
+Test Script for Briefing Trends
+Checks the weekly metrics store, week-over-week / moving-average / anomaly
+calculations and that the NumPy and pure-Python paths agree
+
+Usage:
+    python test_briefing_trends.py
+"""
+
+import math
+import tempfile
+from pathlib import Path
+from datetime import date
+
+from Skills import briefing_trends
+from Skills.briefing_trends import (
+    WeeklyMetricsStore, compute_trends, build_trend_summary, iso_week, _trends_python
+)
+from script_runner import run_tests
+
+
+def _store(tmp, weekly_values):
+    store = WeeklyMetricsStore(Path(tmp) / 'history.json')
+    for i, (tasks, revenue) in enumerate(weekly_values, start=1):
+        store.record(f"2026-W{i:02d}", {'tasks_completed': tasks, 'revenue': revenue,
+                                        'efficiency_rating': 'Good', 'system_health': 'healthy'})
+    return store
+
+
+def test_store_round_trip_and_iso_weeks():
+    """Non-numeric metrics are dropped; re-recording a week replaces it"""
+    assert iso_week(date(2026, 2, 23)) == '2026-W09'
+    assert iso_week(date(2027, 1, 1)) == '2026-W53'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp, [(5, 100.0), (7, 150.0)])
+        store.record('2026-W02', {'tasks_completed': 8, 'revenue': 120})
+        store.save()
+
+        reloaded = WeeklyMetricsStore(Path(tmp) / 'history.json')
+        assert reloaded.weeks == {
+            '2026-W01': {'tasks_completed': 5.0, 'revenue': 100.0},
+            '2026-W02': {'tasks_completed': 8.0, 'revenue': 120.0}
+        }
+
+
+def test_week_over_week_and_moving_average():
+    """WoW change/percent and the trailing 4-week average per metric"""
+    values = [[4, 100], [6, 0], [8, 50], [10, 50], [12, None]]
+    trends = compute_trends(values)
+
+    assert math.isnan(trends['wow'][0][0])
+    assert trends['wow'][1][0] == 2
+    assert trends['wow_pct'][1][0] == 50
+    assert math.isnan(trends['wow_pct'][2][1])  # previous week was zero
+    assert trends['moving_avg'][3][0] == 7
+    assert trends['moving_avg'][4][0] == 9
+    assert trends['moving_avg'][4][1] == (0 + 50 + 50) / 3  # missing week skipped
+    assert math.isnan(trends['wow'][4][1])
+
+
+def test_anomalies_need_history():
+    """A spike is flagged only once four earlier weeks form a baseline"""
+    values = [[10], [11], [9], [10], [30], [10]]
+    trends = compute_trends(values)
+    assert [row[0] for row in trends['anomaly']] == [False, False, False, False, True, False]
+
+    flat = compute_trends([[0], [0], [0], [0], [5]])
+    assert flat['anomaly'][4][0]
+    assert math.isinf(flat['zscore'][4][0])
+
+
+def test_numpy_and_python_paths_agree():
+    """Vectorized results match the reference implementation"""
+    if not briefing_trends.NUMPY_AVAILABLE:
+        print("  (NumPy not installed - reference path only)")
+        return
+    rows = [[3, 1000.0, None], [5, 1500.0, 2], [4, 900.0, 3], [8, 0.0, 2], [20, 1100.0, 2], [6, 1200.0, 9]]
+    fast = compute_trends(briefing_trends.np.array(
+        [[briefing_trends.np.nan if v is None else v for v in row] for row in rows], dtype=float))
+    slow = _trends_python(rows, briefing_trends.MOVING_AVERAGE_WEEKS, briefing_trends.ANOMALY_Z)
+    for key in ('wow', 'wow_pct', 'moving_avg', 'zscore'):
+        for fast_row, slow_row in zip(fast[key], slow[key]):
+            for a, b in zip(fast_row, slow_row):
+                assert (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-9), (key, a, b)
+    assert fast['anomaly'] == slow['anomaly']
+
+
+def test_trend_summary_for_briefing():
+    """Latest-week figures and a bounded history come from the store alone"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp, [(10, 100), (11, 100), (9, 100), (10, 100), (10, 100), (10, 400)] + [(10, 100)] * 6)
+        summary = build_trend_summary(store, metrics=['tasks_completed', 'revenue'], history_weeks=8)
+
+        assert len(summary['history']) == 8
+        assert summary['weeks'][-1] == '2026-W12'
+        latest = summary['latest']['revenue']
+        assert (latest['value'], latest['previous'], latest['wow']) == (100, 100, 0)
+        flagged = [week['week'] for week in summary['history'] if 'revenue' in week['anomalies']]
+        assert flagged == ['2026-W06']  # the spike; the drop back is within the inflated baseline
+
+        assert build_trend_summary(WeeklyMetricsStore(Path(tmp) / 'none.json'))['weeks'] == []
+
+
+def test_offline_sources_are_not_recorded_as_zero():
+    """Revenue and social counts from unreachable servers are left out of the history"""
+    from Skills.weekly_ceo_briefing import WeeklyCEOBriefing
+
+    metrics = {'tasks_completed': 8, 'revenue': 0, 'receivables': 0, 'social_posts': 0, 'efficiency_score': 45}
+    recorded = WeeklyCEOBriefing.recordable_metrics(
+        metrics, {'odoo_status': 'disconnected'}, {'meta_status': 'connected', 'x_status': 'unavailable'}
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        store = WeeklyMetricsStore(Path(tmp) / 'history.json')
+        store.record('2026-W10', recorded)
+        assert store.weeks['2026-W10'] == {'tasks_completed': 8, 'efficiency_score': 45}
+
+    online = WeeklyCEOBriefing.recordable_metrics(
+        metrics, {'odoo_status': 'connected'}, {'meta_status': 'connected', 'x_status': 'connected'}
+    )
+    assert online == metrics
+
+
+if __name__ == '__main__':
+    tests = [
+        test_store_round_trip_and_iso_weeks,
+        test_week_over_week_and_moving_average,
+        test_anomalies_need_history,
+        test_numpy_and_python_paths_agree,
+        test_trend_summary_for_briefing,
+        test_offline_sources_are_not_recorded_as_zero
+    ]
+    run_tests("Briefing Trends - Test Suite", tests)
@@ -0,0 +1,96 @@
+"""
+Test Script for the Gmail MIME Walker
+Parses hand-built Gmail message resources with nested multiparts,
+HTML-only bodies, non-UTF-8 charsets and attachments
+
+Usage:
+    python test_gmail_mime.py
+"""
+
+import os
+import base64
+import tempfile
+from pathlib import Path
+
+from gmail_mime import MimeWalker, AttachmentSpooler, html_to_text, iter_base64_chunks
+from script_runner import run_tests
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _part(mime_type, raw=None, filename='', charset=None, attachment_id=None):
+    headers = [{'name': 'Content-Type', 'value': mime_type + (f'; charset="{charset}"' if charset else '')}]
+    body = {'size': len(raw or b'')}
+    if attachment_id:
+        body['attachmentId'] = attachment_id
+    elif raw is not None:
+        body['data'] = _b64(raw)
+    return {'mimeType': mime_type, 'filename': filename, 'headers': headers, 'body': body}
+
+
+def test_nested_multipart_with_attachments():
+    """Plain text inside mixed/alternative is found; attachments are spooled once"""
+    pdf = os.urandom(200_000)
+    stored = {'att-1': _b64(pdf)}
+    message = {
+        'id': 'm1',
+        'payload': {
+            'mimeType': 'multipart/mixed',
+            'parts': [
+                {'mimeType': 'multipart/alternative', 'parts': [
+                    _part('text/plain', 'Rechnung über 100 €'.encode('iso-8859-15'), charset='iso-8859-15'),
+                    _part('text/html', b'<p>ignored</p>'),
+                ]},
+                _part('application/pdf', pdf, filename='invoice.pdf', attachment_id='att-1'),
+                _part('application/pdf', pdf, filename='invoice copy.pdf', attachment_id='att-1'),
+            ]
+        }
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        walker = MimeWalker(lambda msg_id, att_id: stored[att_id], AttachmentSpooler(Path(tmp)))
+        parsed = walker.parse(message)
+
+        assert parsed['body'] == 'Rechnung über 100 €'
+        assert parsed['body_format'] == 'text'
+        first, second = parsed['attachments']
+        assert Path(first['path']).read_bytes() == pdf
+        assert not first['deduplicated']
+        assert second['deduplicated'] and second['path'] == first['path']
+        assert len(list(Path(tmp).iterdir())) == 1
+
+
+def test_html_only_and_size_limit():
+    """HTML-only mail becomes text; oversized attachments are skipped"""
+    html = b'<html><head><style>p{}</style></head><body><p>Hello&nbsp;<b>team</b></p><div>Line 2</div></body></html>'
+    message = {
+        'id': 'm2',
+        'payload': {
+            'mimeType': 'multipart/mixed',
+            'parts': [
+                _part('text/html', html, charset='utf-8'),
+                _part('application/zip', b'x' * 2048, filename='big.zip'),
+            ]
+        }
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parsed = MimeWalker(spooler=AttachmentSpooler(Path(tmp), max_bytes=1024)).parse(message)
+        assert parsed['body_format'] == 'html'
+        assert parsed['body'] == 'Hello\xa0team\n\nLine 2'
+        assert 'skipped' in parsed['attachments'][0]
+        assert not list(Path(tmp).iterdir())
+
+
+def test_chunked_decode_matches_whole_decode():
+    """Slice-wise base64 decoding equals a single decode"""
+    raw = os.urandom(100_003)
+    assert b''.join(iter_base64_chunks(_b64(raw), chunk_size=1000)) == raw
+    assert html_to_text('<p>a</p><p>b</p>') == 'a\n\nb'
+
+
+if __name__ == '__main__':
+    tests = [test_nested_multipart_with_attachments, test_html_only_and_size_limit, test_chunked_decode_matches_whole_decode]
+    run_tests("Gmail MIME Walker - Test Suite", tests)
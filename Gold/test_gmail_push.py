@@ -0,0 +1,95 @@
+"""
+Test Script for Gmail Push Ingestion
+Sends Pub/Sub-style notifications to the local webhook and checks that the
+ingestion loop syncs immediately and polls adaptively otherwise
+
+Usage:
+    python test_gmail_push.py
+"""
+
+import json
+import time
+import base64
+import threading
+import urllib.request
+import urllib.error
+
+from gmail_push import PushNotificationServer, PushIngestionLoop, AdaptivePollInterval, decode_notification
+from script_runner import run_tests
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _pubsub_envelope(history_id):
+    data = json.dumps({'emailAddress': 'me@example.com', 'historyId': history_id}).encode()
+    return {'message': {'data': base64.b64encode(data).decode(), 'messageId': '1'}, 'subscription': 'sub'}
+
+
+def test_decode_notification():
+    """Both the Pub/Sub envelope and a bare body are accepted"""
+    assert decode_notification(_pubsub_envelope(42))['history_id'] == '42'
+    assert decode_notification({'historyId': 7})['history_id'] == '7'
+    try:
+        decode_notification({'foo': 'bar'})
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_adaptive_interval():
+    """Busy periods shrink the interval, idle periods grow it back"""
+    poll = AdaptivePollInterval(minimum=30, maximum=300)
+    assert poll.current == 300
+    assert poll.update(5) == 150
+    assert poll.update(2) == 75
+    assert poll.update(1) == 37.5
+    assert poll.update(1) == 30
+    assert poll.update(0) == 45
+    for _ in range(10):
+        poll.update(0)
+    assert poll.current == 300
+
+
+def test_push_triggers_immediate_sync():
+    """A notification wakes the loop long before the poll interval"""
+    synced = []
+    loop = PushIngestionLoop(lambda: synced.append(time.time()) or 1,
+                             poll=AdaptivePollInterval(minimum=60, maximum=60))
+    server = PushNotificationServer(loop.notify, port=0, token='secret')
+    server.start()
+    worker = threading.Thread(target=loop.run, daemon=True)
+    worker.start()
+
+    try:
+        url = f"http://localhost:{server.port}/gmail/push"
+        assert _post(url + '?token=wrong', _pubsub_envelope(1)) == 403
+
+        sent = time.time()
+        assert _post(url + '?token=secret', _pubsub_envelope(2)) == 204
+        deadline = time.time() + 5
+        while not synced and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert synced, "no sync after notification"
+        assert synced[0] - sent < 1.0
+        assert loop.push_syncs == 1
+        assert loop.last_notification['history_id'] == '2'
+        assert server.received == 1 and server.rejected == 1
+    finally:
+        loop.stop()
+        worker.join(timeout=5)
+        server.stop()
+
+
+if __name__ == '__main__':
+    tests = [test_decode_notification, test_adaptive_interval, test_push_triggers_immediate_sync]
+    run_tests("Gmail Push Ingestion - Test Suite", tests)
@@ -0,0 +1,174 @@
+"""
+Test Script for Gmail Incremental Sync
+Runs the history-based sync against an in-memory fake Gmail service
+
+Usage:
+    python test_gmail_sync.py
+"""
+
+import tempfile
+from pathlib import Path
+
+from gmail_sync import GmailIncrementalSync, MAX_MESSAGE_RETRIES
+from script_runner import run_tests
+
+
+class _Request:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class HistoryExpired(Exception):
+    class resp:
+        status = 404
+
+
+class FakeGmail:
+    """Minimal users().messages()/history()/getProfile() stand-in"""
+
+    def __init__(self, page_size=3):
+        self.page_size = page_size
+        self.mailbox = []  # (history_id, id, labels), oldest first
+        self.history_id = 100
+        self.expired = False
+
+    def deliver(self, msg_id, labels=('INBOX', 'UNREAD')):
+        self.history_id += 1
+        self.mailbox.append((self.history_id, msg_id, list(labels)))
+
+    def users(self):
+        return self
+
+    def getProfile(self, userId):
+        return _Request(lambda: {'historyId': str(self.history_id)})
+
+    def messages(self):
+        return self
+
+    def history(self):
+        return _History(self)
+
+    def list(self, userId, q=None, maxResults=100, pageToken=None):
+        def run():
+            unread = [m for m in reversed(self.mailbox) if 'UNREAD' in m[2]]
+            start = int(pageToken or 0)
+            page = unread[start:start + self.page_size]
+            result = {'messages': [{'id': m[1]} for m in page]}
+            if start + self.page_size < len(unread):
+                result['nextPageToken'] = str(start + self.page_size)
+            return result
+        return _Request(run)
+
+
+class _History:
+    def __init__(self, gmail):
+        self.gmail = gmail
+
+    def list(self, userId, startHistoryId, historyTypes=None, maxResults=100, pageToken=None):
+        gmail = self.gmail
+
+        def run():
+            if gmail.expired:
+                raise HistoryExpired()
+            added = [m for m in gmail.mailbox if m[0] > int(startHistoryId)]
+            start = int(pageToken or 0)
+            page = added[start:start + gmail.page_size]
+            result = {
+                'historyId': str(gmail.history_id),
+                'history': [{'messagesAdded': [{'message': {'id': m[1], 'labelIds': m[2]}}]} for m in page]
+            }
+            if start + gmail.page_size < len(added):
+                result['nextPageToken'] = str(start + gmail.page_size)
+            return result
+        return _Request(run)
+
+
+def _drain(sync):
+    ids = sync.fetch_new_ids()
+    for msg_id in ids:
+        sync.mark_seen(msg_id)
+    sync.save()
+    return ids
+
+
+def test_full_then_incremental():
+    """First run lists all pages; later runs only return new messages"""
+    with tempfile.TemporaryDirectory() as tmp:
+        gmail = FakeGmail()
+        for i in range(7):
+            gmail.deliver(f'm{i}')
+
+        sync = GmailIncrementalSync(gmail, state_file=Path(tmp) / 'state.json')
+        assert _drain(sync) == [f'm{i}' for i in range(7)]
+
+        assert _drain(sync) == []
+        gmail.deliver('m7')
+        gmail.deliver('sent1', labels=('SENT',))
+        gmail.deliver('read1', labels=('INBOX',))  # read on another device: a full sync would not list it
+        assert _drain(sync) == ['m7']
+
+        # A restarted watcher continues from the persisted checkpoint
+        gmail.deliver('m8')
+        restarted = GmailIncrementalSync(gmail, state_file=Path(tmp) / 'state.json')
+        assert _drain(restarted) == ['m8']
+
+
+def test_expired_history_resyncs_without_duplicates():
+    """An expired checkpoint falls back to a full sync, skipping seen messages"""
+    with tempfile.TemporaryDirectory() as tmp:
+        gmail = FakeGmail()
+        gmail.deliver('a')
+        sync = GmailIncrementalSync(gmail, state_file=Path(tmp) / 'state.json')
+        assert _drain(sync) == ['a']
+
+        gmail.deliver('b')
+        gmail.expired = True
+        assert _drain(sync) == ['b']
+
+
+def test_failed_messages_are_retried():
+    """Keeping the checkpoint re-lists messages that were not marked seen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        gmail = FakeGmail()
+        sync = GmailIncrementalSync(gmail, state_file=Path(tmp) / 'state.json')
+        _drain(sync)
+
+        gmail.deliver('ok')
+        gmail.deliver('flaky')
+        ids = sync.fetch_new_ids()
+        sync.mark_seen('ok')
+        sync.save(advance_checkpoint=False)
+        assert ids == ['ok', 'flaky']
+        assert sync.fetch_new_ids() == ['flaky']
+
+
+def test_message_that_keeps_failing_is_skipped():
+    """After MAX_MESSAGE_RETRIES failures a message no longer holds the checkpoint back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        gmail = FakeGmail()
+        sync = GmailIncrementalSync(gmail, state_file=Path(tmp) / 'state.json')
+        _drain(sync)
+        checkpoint = sync.state['history_id']
+        gmail.deliver('broken')
+
+        for attempt in range(1, MAX_MESSAGE_RETRIES + 1):
+            assert sync.fetch_new_ids() == ['broken']
+            gave_up = sync.record_failure('broken')
+            assert gave_up == (attempt == MAX_MESSAGE_RETRIES)
+            sync.save(advance_checkpoint=gave_up)
+            # Failure counts survive a restart
+            sync = GmailIncrementalSync(gmail, state_file=Path(tmp) / 'state.json')
+
+        assert sync.state['history_id'] != checkpoint
+        assert sync.state['failures'] == {}
+        gmail.deliver('next')
+        assert sync.fetch_new_ids() == ['next']
+
+
+if __name__ == '__main__':
+    tests = [test_full_then_incremental, test_expired_history_resyncs_without_duplicates, test_failed_messages_are_retried,
+             test_message_that_keeps_failing_is_skipped]
+    run_tests("Gmail Incremental Sync - Test Suite", tests)
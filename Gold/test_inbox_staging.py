@@ -0,0 +1,136 @@
+"""
+Test Script for the Inbox Staging Pipeline
+Checks write-completion detection, batched moves, duplicate handling,
+event throughput and the startup reconciliation scan without needing watchdog
+
+Usage:
+    python test_inbox_staging.py
+"""
+
+import os
+import time
+import tempfile
+from pathlib import Path
+
+from inbox_staging import InboxStagingPipeline
+from ingestion_ledger import IngestionLedger
+from script_runner import run_tests
+
+
+def _pipeline(tmp, **kwargs):
+    inbox = Path(tmp) / 'Inbox'
+    dest = Path(tmp) / 'Needs_Action'
+    inbox.mkdir()
+    dest.mkdir()
+    ledger = IngestionLedger(Path(tmp) / 'ledger.db')
+    pipeline = InboxStagingPipeline(
+        str(inbox), str(dest), duplicates_dir=str(Path(tmp) / 'Duplicates'), ledger=ledger,
+        log_file=str(Path(tmp) / 'watcher_log.txt'), **kwargs
+    )
+    return pipeline, inbox, dest
+
+
+def test_file_still_being_written_is_not_moved():
+    """A growing file waits until its size stops changing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline, inbox, dest = _pipeline(tmp, stable_seconds=0.2)
+        path = inbox / 'large.bin'
+        with open(path, 'wb') as f:
+            f.write(b'x' * 1000)
+            f.flush()
+            pipeline.enqueue(str(path))
+            assert pipeline.flush() == 0
+
+            time.sleep(0.25)
+            f.write(b'y' * 1000)
+            f.flush()
+            os.utime(path)
+            assert pipeline.flush() == 0  # changed since the last look
+
+        time.sleep(0.25)
+        assert pipeline.flush() == 1
+        assert (dest / 'large.bin').stat().st_size == 2000
+        pipeline.ledger.close()
+
+
+def test_close_event_and_duplicates():
+    """Closed files move at once; identical content goes to Duplicates"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline, inbox, dest = _pipeline(tmp, stable_seconds=60)
+        for name in ('a.txt', 'b.txt'):
+            (inbox / name).write_text('same invoice')
+            pipeline.enqueue(str(inbox / name), closed=True)
+
+        assert pipeline.flush() == 1
+        assert pipeline.duplicates == 1
+        assert len(list(dest.iterdir())) == 1
+        assert len(list((Path(tmp) / 'Duplicates').iterdir())) == 1
+        log = (Path(tmp) / 'watcher_log.txt').read_text()
+        assert 'FILE_MOVED' in log and 'DUPLICATE_SKIPPED' in log
+        pipeline.ledger.close()
+
+
+def test_burst_of_files():
+    """Thousands of events are staged quickly and moved in batches"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline, inbox, dest = _pipeline(tmp, stable_seconds=0.0, max_batch=500)
+        count = 2000
+        for i in range(count):
+            (inbox / f'f{i}.txt').write_text(f'file {i}')
+
+        start = time.perf_counter()
+        for i in range(count):
+            pipeline.enqueue(str(inbox / f'f{i}.txt'))
+            pipeline.enqueue(str(inbox / f'f{i}.txt'))  # duplicate events coalesce
+        enqueue_rate = 2 * count / (time.perf_counter() - start)
+        assert len(pipeline.queue) == count
+
+        pipeline.flush()  # first look records size/mtime
+        start = time.perf_counter()
+        moved = pipeline.flush()
+        elapsed = time.perf_counter() - start
+
+        assert moved == count
+        assert len(list(dest.iterdir())) == count
+        assert enqueue_rate > 10000
+        print(f"  {enqueue_rate:,.0f} events/s staged, {count / elapsed:,.0f} files/s moved")
+        pipeline.ledger.close()
+
+
+def test_reconcile_moves_preexisting_files_once():
+    """Files left in the inbox are moved at startup, even if events race the scan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline, inbox, dest = _pipeline(tmp, stable_seconds=5, workers=4)
+        old = time.time() - 60
+        for i in range(300):
+            path = inbox / f'old{i}.txt'
+            path.write_text(f'left behind {i}')
+            os.utime(path, (old, old))
+        fresh = inbox / 'fresh.txt'
+        fresh.write_text('still arriving')
+
+        # A live event for a file the scan also finds
+        pipeline.enqueue(str(inbox / 'old0.txt'), closed=True)
+        pipeline.start()
+        # old0 may already be gone if the staging thread got to it first
+        assert pipeline.reconcile() in (300, 301)
+        pipeline.stop()
+
+        assert pipeline.moved == 300
+        assert pipeline.failed == 0
+        assert [p.name for p in inbox.iterdir()] == ['fresh.txt']  # not settled yet
+
+        pipeline.flush(force=True)
+        assert not list(inbox.iterdir())
+        assert len(list(dest.iterdir())) == 301
+        pipeline.ledger.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        test_file_still_being_written_is_not_moved,
+        test_close_event_and_duplicates,
+        test_burst_of_files,
+        test_reconcile_moves_preexisting_files_once
+    ]
+    run_tests("Inbox Staging Pipeline - Test Suite", tests)
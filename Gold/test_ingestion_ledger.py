@@ -0,0 +1,104 @@
+"""
+Test Script for the Ingestion Ledger
+Checks claims, expiry, Bloom filter behaviour and sharing between connections
+
+Usage:
+    python test_ingestion_ledger.py
+"""
+
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+from ingestion_ledger import IngestionLedger, BloomFilter, content_key
+from script_runner import run_tests
+
+
+def test_claim_once_and_release():
+    """Only the first claim succeeds; release allows a retry"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = IngestionLedger(Path(tmp) / 'ledger.db')
+        assert ledger.claim('gmail', 'm1')
+        assert not ledger.claim('gmail', 'm1')
+        assert ledger.claim('whatsapp', 'm1')
+        assert ledger.seen('gmail', 'm1')
+
+        ledger.release('gmail', 'm1')
+        assert not ledger.seen('gmail', 'm1')
+        assert ledger.claim('gmail', 'm1')
+        ledger.close()
+
+
+def test_expired_entries_can_be_claimed_and_pruned():
+    """Entries older than the TTL are no longer duplicates"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = IngestionLedger(Path(tmp) / 'ledger.db', ttl_days=0.5 / 86400)
+        assert ledger.claim('inbox', content_key(b'invoice'))
+        time.sleep(0.6)
+        assert not ledger.seen('inbox', content_key(b'invoice'))
+        assert ledger.claim('inbox', content_key(b'invoice'))
+        time.sleep(0.6)
+        assert ledger.prune() == 1
+        assert ledger.count() == 0
+        ledger.close()
+
+
+def test_persistence_and_concurrent_claims():
+    """A second connection sees existing claims; racing threads claim exactly once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'ledger.db'
+        first = IngestionLedger(path)
+        first.claim('gmail', 'persisted')
+        second = IngestionLedger(path)
+        assert not second.claim('gmail', 'persisted')
+
+        wins = []
+        def worker(ledger):
+            for i in range(200):
+                if ledger.claim('race', str(i)):
+                    wins.append(i)
+        threads = [threading.Thread(target=worker, args=(l,)) for l in (first, second, first, second)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(wins) == list(range(200))
+        first.close()
+        second.close()
+
+
+def test_bloom_filter_skips_database_for_new_keys():
+    """Unknown keys are rejected by the Bloom filter at about the configured rate"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"k{i}")
+    assert all(f"k{i}" in bloom for i in range(1000))
+    false_positives = sum(f"x{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = IngestionLedger(Path(tmp) / 'ledger.db')
+        for i in range(100):
+            ledger.seen('gmail', f'new{i}')
+        assert ledger.bloom_hits >= 95
+
+        # claim(): new keys go straight to the insert, duplicates never write
+        lookups = ledger.db_lookups
+        for i in range(100):
+            assert ledger.claim('gmail', f'new{i}')
+        assert ledger.db_writes == 100 and ledger.db_lookups - lookups <= 5
+        for i in range(100):
+            assert not ledger.claim('gmail', f'new{i}')
+        assert ledger.db_writes == 100
+        ledger.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        test_claim_once_and_release,
+        test_expired_entries_can_be_claimed_and_pruned,
+        test_persistence_and_concurrent_claims,
+        test_bloom_filter_skips_database_for_new_keys
+    ]
+    run_tests("Ingestion Ledger - Test Suite", tests)
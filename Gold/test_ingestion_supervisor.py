@@ -0,0 +1,150 @@
+"""
+Test Script for the Ingestion Supervisor
+Runs fake watchers on the supervisor and checks scheduling, wake-ups,
+restart policies, metrics and shutdown
+
+Usage:
+    python test_ingestion_supervisor.py
+"""
+
+import time
+import asyncio
+import threading
+
+from ingestion_supervisor import IngestionSupervisor, SupervisedTask, RestartPolicy
+from script_runner import run_tests
+
+
+async def _run_for(supervisor, seconds, during=None):
+    runner = asyncio.create_task(supervisor.run())
+    await asyncio.sleep(0.05)
+    if during:
+        await during()
+    await asyncio.sleep(seconds)
+    supervisor.stop()
+    await asyncio.wait_for(runner, timeout=5)
+
+
+def test_periodic_steps_run_off_the_event_loop():
+    """Blocking steps run on the shared pool and metrics add up"""
+    threads = set()
+
+    def step():
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        return 2
+
+    supervisor = IngestionSupervisor(status_file=None)
+    supervisor.add(SupervisedTask('fake', step=step, interval=0.05))
+    asyncio.run(_run_for(supervisor, 0.3))
+
+    metrics = supervisor.get_status()['watchers']['fake']
+    assert metrics['runs'] >= 3
+    assert metrics['items'] == metrics['runs'] * 2
+    assert metrics['state'] == 'stopped'
+    assert all(name.startswith('ingest') for name in threads)
+
+
+def test_notify_wakes_task_early():
+    """notify() triggers a step long before the interval"""
+    runs = []
+    supervisor = IngestionSupervisor(status_file=None)
+    supervisor.add(SupervisedTask('push', step=lambda: runs.append(time.time()), interval=60))
+
+    async def wake():
+        await asyncio.sleep(0.05)
+        threading.Thread(target=supervisor.notify, args=('push',)).start()
+
+    asyncio.run(_run_for(supervisor, 0.2, during=wake))
+    assert len(runs) == 2
+
+
+def test_restart_policy_gives_up():
+    """A failing task is restarted with backoff, re-running setup, then marked failed"""
+    setups = []
+
+    def broken():
+        raise ConnectionError("api down")
+
+    supervisor = IngestionSupervisor(status_file=None)
+    supervisor.add(SupervisedTask(
+        'flaky', step=broken, setup=lambda: setups.append(1), interval=1,
+        policy=RestartPolicy(max_restarts=2, backoff=0.01, give_up=True)
+    ))
+    asyncio.run(_run_for(supervisor, 0.3))
+
+    metrics = supervisor.get_status()['watchers']['flaky']
+    assert metrics['state'] == 'failed'
+    assert metrics['restarts'] == 2
+    assert metrics['errors'] == 3
+    assert len(setups) == 3
+    assert 'api down' in metrics['last_error']
+
+
+def test_recovers_after_restart_limit():
+    """Past the restart limit a task keeps retrying at max_backoff and recovers once the outage ends"""
+    calls = []
+
+    def outage():
+        calls.append(1)
+        if len(calls) <= 5:
+            raise ConnectionError("network down")
+        return 1
+
+    policy = RestartPolicy(max_restarts=2, backoff=0.01, max_backoff=0.03)
+    supervisor = IngestionSupervisor(status_file=None)
+    supervisor.add(SupervisedTask('gmail', step=outage, interval=0.05, policy=policy))
+    asyncio.run(_run_for(supervisor, 0.4))
+
+    metrics = supervisor.get_status()['watchers']['gmail']
+    assert metrics['restarts'] == 5 and metrics['errors'] == 5
+    assert metrics['runs'] >= 2 and metrics['items'] == metrics['runs']
+    assert metrics['state'] == 'stopped'
+
+    delays = RestartPolicy(max_restarts=3, backoff=2, max_backoff=120)
+    assert [delays.next_delay() for _ in range(5)] == [2, 4, 8, 120, 120]
+
+
+def test_coroutine_task_cancelled_on_shutdown():
+    """Long-running coroutines are cancelled and torn down on stop()"""
+    events = []
+
+    async def forever():
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            events.append('cancelled')
+
+    supervisor = IngestionSupervisor(status_file=None, shutdown_grace=0.1)
+    supervisor.add(SupervisedTask('browser', coroutine=forever, teardown=lambda: events.append('teardown')))
+    asyncio.run(_run_for(supervisor, 0.05))
+    assert events == ['cancelled', 'teardown']
+
+
+def test_coroutine_that_returns_is_restarted():
+    """A coroutine watcher that gives up on its own is treated as a failure"""
+    starts = []
+
+    async def gives_up():
+        starts.append(1)
+
+    supervisor = IngestionSupervisor(status_file=None)
+    supervisor.add(SupervisedTask('whatsapp', coroutine=gives_up, policy=RestartPolicy(max_restarts=2, backoff=0.01, give_up=True)))
+    asyncio.run(_run_for(supervisor, 0.2))
+
+    metrics = supervisor.get_status()['watchers']['whatsapp']
+    assert len(starts) == 3
+    assert metrics['state'] == 'failed' and metrics['restarts'] == 2
+    assert 'exited unexpectedly' in metrics['last_error']
+
+
+if __name__ == '__main__':
+    tests = [
+        test_periodic_steps_run_off_the_event_loop,
+        test_notify_wakes_task_early,
+        test_restart_policy_gives_up,
+        test_recovers_after_restart_limit,
+        test_coroutine_task_cancelled_on_shutdown,
+        test_coroutine_that_returns_is_restarted
+    ]
+    run_tests("Ingestion Supervisor - Test Suite", tests)
@@ -0,0 +1,162 @@
+"""
+Test Script for the MCP Host
+Serves the email and browser servers plus small stand-in WSGI apps from one
+process and checks routing, shared metrics, background workers and shutdown
+
+Usage:
+    python test_mcp_host.py
+"""
+
+import sys
+import json
+import socket
+import http.client
+from pathlib import Path
+
+from mcp_host import MCPHost, PathDispatcher, HostMetrics, instrument_wsgi
+from script_runner import run_tests
+
+FAKE_APP = '''
+import json
+
+class Worker:
+    def __init__(self):
+        self.running = False
+    def start(self):
+        self.running = True
+    def stop(self):
+        self.running = False
+
+worker = Worker()
+
+def app(environ, start_response):
+    path = environ['PATH_INFO']
+    status = '200 OK' if path in ('/health', '/tools/echo') else '404 Not Found'
+    if path == '/tools/fail':
+        status = '500 Internal Server Error'
+    body = json.dumps({'app': NAME, 'path': path, 'script_name': environ.get('SCRIPT_NAME', '')}).encode()
+    start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+    return [body]
+'''
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def _get(port, path):
+    conn = http.client.HTTPConnection('localhost', port, timeout=5)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        conn.close()
+
+
+def _apps(tmp):
+    for name in ('fake_odoo', 'fake_social'):
+        (Path(tmp) / f'{name}.py').write_text(f"NAME = {name!r}\n" + FAKE_APP)
+    if str(tmp) not in sys.path:
+        sys.path.insert(0, str(tmp))
+    return {
+        'email': {'module': 'mcp_email_server', 'kind': 'http', 'port': _free_port(),
+                  'factory': 'create_mcp_email_server', 'handler': 'MCPRequestHandler'},
+        'browser': {'module': 'mcp_browser_server', 'kind': 'http', 'port': _free_port(),
+                    'factory': 'create_mcp_browser_server', 'handler': 'MCPBrowserRequestHandler'},
+        'odoo': {'module': 'fake_odoo', 'kind': 'wsgi', 'port': _free_port(), 'app': 'app'},
+        'social': {'module': 'fake_social', 'kind': 'wsgi', 'port': _free_port(), 'app': 'app',
+                   'background': ['worker']},
+        'missing': {'module': 'no_such_mcp_module', 'kind': 'wsgi', 'port': _free_port()}
+    }
+
+
+def test_every_app_on_its_own_port(tmp_path, monkeypatch):
+    """Each app answers on its usual port; the admin port reports health and shared metrics"""
+    monkeypatch.chdir(tmp_path)  # the email and browser servers create their folders in the working directory
+    apps = _apps(tmp_path)
+    admin = _free_port()
+    host = MCPHost(apps, admin_port=admin)
+    host.start()
+    try:
+        assert host.modules['social'].worker.running
+        assert _get(apps['email']['port'], '/health')[1]['server'] == 'MCP Email Server'
+        assert _get(apps['browser']['port'], '/health')[1]['server'] == 'MCP Browser Server'
+        assert _get(apps['odoo']['port'], '/tools/echo') == (200, {'app': 'fake_odoo', 'path': '/tools/echo', 'script_name': ''})
+        assert _get(apps['social']['port'], '/tools/fail')[0] == 500
+        assert _get(apps['email']['port'], '/nope')[0] == 404
+
+        status, health = _get(admin, '/health')
+        assert status == 200 and health['status'] == 'degraded'
+        assert health['apps']['odoo'] == 'running'
+        assert health['apps']['missing'].startswith('import failed')
+
+        metrics = _get(admin, '/metrics')[1]['apps']
+        assert metrics['email']['requests'] == 2 and metrics['email']['status'] == {'200': 1, '404': 1}
+        assert metrics['browser']['requests'] == 1
+        assert metrics['social']['errors'] == 1
+    finally:
+        host.stop()
+    assert not host.modules['social'].worker.running
+    try:
+        _get(apps['odoo']['port'], '/health')
+        assert False, "server still listening after stop()"
+    except OSError:
+        pass
+
+
+def test_single_port_mounts_wsgi_apps(tmp_path, monkeypatch):
+    """Flask-style apps share one port under /<name>; http.server apps keep their ports"""
+    monkeypatch.chdir(tmp_path)
+    apps = _apps(tmp_path)
+    del apps['missing']
+    port = _free_port()
+    host = MCPHost(apps, single_port=port)
+    host.start()
+    try:
+        status, body = _get(port, '/odoo/tools/echo')
+        assert status == 200
+        assert body == {'app': 'fake_odoo', 'path': '/tools/echo', 'script_name': '/odoo'}
+        assert _get(port, '/social/health')[1]['app'] == 'fake_social'
+        assert _get(port, '/health')[1]['status'] == 'healthy'
+        assert _get(port, '/socialx')[0] == 404  # prefix must end at a path segment
+        assert _get(apps['email']['port'], '/health')[0] == 200
+        assert set(_get(port, '/metrics')[1]['apps']) == {'odoo', 'social', 'email'}
+    finally:
+        host.stop()
+
+
+def test_dispatcher_and_metrics_without_servers():
+    """PathDispatcher routing and HostMetrics aggregation as plain WSGI calls"""
+    metrics = HostMetrics()
+    calls = []
+
+    def app(environ, start_response):
+        calls.append((environ['SCRIPT_NAME'], environ['PATH_INFO']))
+        start_response('201 Created', [])
+        return [b'']
+
+    def fallback(environ, start_response):
+        start_response('404 Not Found', [])
+        return [b'']
+
+    dispatcher = PathDispatcher({'x': instrument_wsgi('x', app, metrics)}, fallback)
+    statuses = []
+    for path in ('/x', '/x/tools/post_tweet', '/xyz'):
+        dispatcher({'PATH_INFO': path, 'SCRIPT_NAME': ''}, lambda status, headers, exc=None: statuses.append(status))
+
+    assert calls == [('/x', '/'), ('/x', '/tools/post_tweet')]
+    assert statuses == ['201 Created', '201 Created', '404 Not Found']
+    snapshot = metrics.snapshot()['apps']['x']
+    assert snapshot['requests'] == 2 and snapshot['errors'] == 0 and snapshot['status'] == {'201': 2}
+
+
+if __name__ == '__main__':
+    tests = [
+        test_every_app_on_its_own_port,
+        test_single_port_mounts_wsgi_apps,
+        test_dispatcher_and_metrics_without_servers
+    ]
+    run_tests("MCP Host - Test Suite", tests)
@@ -0,0 +1,129 @@
+"""
+Test Script for the MCP Process Supervisor
+Launches small stand-in servers and checks readiness gating, log
+prefixes, crash restarts and shutdown
+
+Usage:
+    python test_mcp_process_supervisor.py
+"""
+
+import os
+import time
+import socket
+import tempfile
+from pathlib import Path
+
+from ingestion_supervisor import RestartPolicy
+from mcp_process_supervisor import MCPProcessSupervisor
+from script_runner import run_tests
+
+FAKE_SERVER = '''
+import os, sys, time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+port, delay, crash_marker = int(sys.argv[1]), float(sys.argv[2]), sys.argv[3]
+if crash_marker != '-' and not os.path.exists(crash_marker):
+    open(crash_marker, 'w').close()
+    print("crashing on first start")
+    sys.exit(3)
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'ok')
+    def log_message(self, *args):
+        pass
+
+time.sleep(delay)
+print(f"listening on {port}")
+HTTPServer(("localhost", port), Handler).serve_forever()
+'''
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def _config(tmp, name, delay=0.0, crash_once=False):
+    port = _free_port()
+    marker = str(Path(tmp) / f'{name}.crashed') if crash_once else '-'
+    return {'name': name, 'file': 'fake_server.py', 'port': port, 'args': [str(port), str(delay), marker]}
+
+
+def _supervisor(tmp, servers, **kwargs):
+    (Path(tmp) / 'fake_server.py').write_text(FAKE_SERVER)
+    return MCPProcessSupervisor(
+        servers, cwd=tmp, log_file=str(Path(tmp) / 'mcp_servers.log'), echo=False,
+        policy_factory=lambda: RestartPolicy(max_restarts=3, backoff=0.1), **kwargs
+    )
+
+
+def test_parallel_start_waits_for_health():
+    """Servers start together; startup time reflects each one's own delay"""
+    with tempfile.TemporaryDirectory() as tmp:
+        servers = [_config(tmp, f'srv{i}', delay=0.5) for i in range(3)] + [_config(tmp, 'quick')]
+        supervisor = _supervisor(tmp, servers)
+        start = time.monotonic()
+        report = supervisor.start()
+        elapsed = time.monotonic() - start
+        try:
+            assert all(seconds is not None for seconds in report.values())
+            assert elapsed < 1.5 + 1.0  # parallel: about one slow start, not three
+            assert report['quick'] < report['srv0']
+            assert all(info['state'] == 'ready' for info in supervisor.status().values())
+        finally:
+            supervisor.stop()
+
+        log = (Path(tmp) / 'mcp_servers.log').read_text()
+        assert '[srv0 ] listening on' in log
+        assert '[quick] ready on port' in log
+        assert all(info['pid'] is None for info in supervisor.status().values())
+
+
+def test_crashed_server_is_restarted():
+    """A server that exits is relaunched after the backoff delay and becomes ready"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = _config(tmp, 'flaky', crash_once=True)
+        supervisor = _supervisor(tmp, [config], ready_timeout=5)
+        supervisor.start()
+        try:
+            deadline = time.time() + 10
+            while supervisor.status()['flaky']['state'] != 'ready' and time.time() < deadline:
+                time.sleep(0.1)
+            info = supervisor.status()['flaky']
+            assert info['state'] == 'ready'
+            assert info['restarts'] == 1
+            assert info['last_exit_code'] == 3
+        finally:
+            supervisor.stop()
+        log = (Path(tmp) / 'mcp_servers.log').read_text()
+        assert 'crashing on first start' in log and 'restarting in' in log
+
+
+def test_unready_server_is_reported():
+    """A server that never answers /health is reported without blocking the others"""
+    with tempfile.TemporaryDirectory() as tmp:
+        slow = _config(tmp, 'slow', delay=30)
+        fast = _config(tmp, 'fast')
+        supervisor = _supervisor(tmp, [slow, fast], ready_timeout=1)
+        start = time.monotonic()
+        report = supervisor.start()
+        try:
+            assert time.monotonic() - start < 3
+            assert report['slow'] is None
+            assert report['fast'] is not None
+            assert supervisor.status()['slow']['state'] == 'unready'
+        finally:
+            supervisor.stop()
+
+
+if __name__ == '__main__':
+    tests = [
+        test_parallel_start_waits_for_health,
+        test_crashed_server_is_restarted,
+        test_unready_server_is_reported
+    ]
+    run_tests("MCP Process Supervisor - Test Suite", tests)
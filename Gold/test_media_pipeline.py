@@ -0,0 +1,151 @@
+"""
+Test Script for the Media Pipeline
+Runs chunked, resumable uploads against a local stub of the Graph API
+
+Usage:
+    python test_media_pipeline.py
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from media_pipeline import MediaPipeline, MediaCache, GraphResumableUploader, file_sha256
+from script_runner import run_tests
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+
+    def json(self):
+        return self.payload
+
+
+class FakeGraphAPI:
+    """In-process stand-in for the Graph API Resumable Upload endpoints"""
+
+    def __init__(self, fail_chunks=0):
+        self.sessions = {}
+        self.fail_chunks = fail_chunks
+        self.chunk_posts = 0
+
+    def post(self, url, params=None, headers=None, data=None, timeout=None):
+        if url.endswith('/uploads'):
+            session_id = f"upload:{len(self.sessions) + 1}"
+            self.sessions[session_id] = {'length': int(params['file_length']), 'data': b''}
+            return FakeResponse({'id': session_id})
+
+        session = self.sessions.get(url.rsplit('/', 1)[1])
+        if session is None:
+            return FakeResponse({'error': {'message': 'Invalid upload session', 'code': 100}})
+        self.chunk_posts += 1
+        if self.fail_chunks:
+            self.fail_chunks -= 1
+            # Simulate a dropped connection after half the chunk arrived
+            session['data'] += data[:len(data) // 2]
+            raise ConnectionError('connection reset')
+
+        assert int(headers['file_offset']) == len(session['data'])
+        session['data'] += data
+        if len(session['data']) >= session['length']:
+            return FakeResponse({'h': f"handle-{len(session['data'])}"})
+        return FakeResponse({'file_offset': len(session['data'])})
+
+    def get(self, url, headers=None, timeout=None):
+        session = self.sessions.get(url.rsplit('/', 1)[1])
+        if session is None:
+            return FakeResponse({'error': {'message': 'Invalid upload session', 'code': 100}})
+        return FakeResponse({'id': 'x', 'file_offset': len(session['data'])})
+
+
+def _pipeline(tmp, api):
+    uploader = GraphResumableUploader('app123', 'token', base_url='http://stub', session=api, chunk_size=1024)
+    return MediaPipeline(uploader, MediaCache(Path(tmp) / 'Media_Cache.json'), prepared_dir=Path(tmp) / 'prepared')
+
+
+def test_chunked_upload_and_reuse():
+    """Large files upload in chunks; identical content reuses the handle"""
+    with tempfile.TemporaryDirectory() as tmp:
+        media = Path(tmp) / 'clip.mp4'
+        media.write_bytes(os.urandom(5000))
+        api = FakeGraphAPI()
+        pipeline = _pipeline(tmp, api)
+
+        first = pipeline.upload(media)
+        assert first['media_id'] == 'handle-5000'
+        assert not first['reused']
+        assert api.chunk_posts == 5
+        assert first['throughput_mbps'] >= 0
+
+        copy = Path(tmp) / 'copy.mp4'
+        copy.write_bytes(media.read_bytes())
+        second = _pipeline(tmp, api).upload(copy)
+        assert second['reused']
+        assert second['media_id'] == first['media_id']
+        assert api.chunk_posts == 5
+
+
+def test_resume_after_failure():
+    """A failed chunk resumes from the offset the server reports"""
+    with tempfile.TemporaryDirectory() as tmp:
+        media = Path(tmp) / 'clip.mp4'
+        payload = os.urandom(3000)
+        media.write_bytes(payload)
+        api = FakeGraphAPI(fail_chunks=1)
+
+        record = _pipeline(tmp, api).upload(media)
+        assert record['media_id'] == 'handle-3000'
+        assert list(api.sessions.values())[0]['data'] == payload
+        assert record['sha256'] == file_sha256(media)
+
+
+def test_network_failure_keeps_session():
+    """An upload that keeps hitting connection resets resumes on the next call instead of restarting"""
+    with tempfile.TemporaryDirectory() as tmp:
+        media = Path(tmp) / 'clip.mp4'
+        payload = os.urandom(2000)
+        media.write_bytes(payload)
+        digest = file_sha256(media)
+
+        api = FakeGraphAPI(fail_chunks=10)
+        pipeline = _pipeline(tmp, api)
+        try:
+            pipeline.upload(media)
+            assert False, "upload should fail"
+        except ConnectionError:
+            pass
+        assert pipeline.cache.get_session(digest) == 'upload:1'
+        received = len(api.sessions['upload:1']['data'])
+        assert received > 0
+
+        api.fail_chunks = 0
+        record = _pipeline(tmp, api).upload(media)
+        assert record['media_id'] == 'handle-2000'
+        assert list(api.sessions) == ['upload:1']  # resumed, not re-uploaded from scratch
+        assert api.sessions['upload:1']['data'] == payload
+
+
+def test_stale_session_is_replaced():
+    """A session Graph no longer knows is dropped and the upload starts a new one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        media = Path(tmp) / 'clip.mp4'
+        media.write_bytes(os.urandom(2000))
+        digest = file_sha256(media)
+
+        cache = MediaCache(Path(tmp) / 'Media_Cache.json')
+        cache.set_session(digest, 'upload:expired')
+        record = _pipeline(tmp, FakeGraphAPI()).upload(media)
+        assert record['media_id'] == 'handle-2000'
+        assert MediaCache(Path(tmp) / 'Media_Cache.json').get_session(digest) is None
+
+
+if __name__ == '__main__':
+    tests = [
+        test_chunked_upload_and_reuse,
+        test_resume_after_failure,
+        test_network_failure_keeps_session,
+        test_stale_session_is_replaced
+    ]
+    run_tests("Media Pipeline - Test Suite", tests)
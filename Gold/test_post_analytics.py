@@ -0,0 +1,103 @@
+"""
+Test Script for Post Analytics
+Tests incremental per-day aggregates, window queries and summary caching
+
+Usage:
+    python test_post_analytics.py
+"""
+
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from post_log_store import PostLogStore
+from post_analytics import PostAnalytics
+from script_runner import run_tests
+
+
+def _post(platform, timestamp, success=True, **result):
+    return {
+        'timestamp': timestamp.isoformat(),
+        'platform': platform,
+        'content': {'message': 'test'},
+        'result': {'success': success, **result}
+    }
+
+
+def test_windows():
+    """Trailing and custom windows are answered from daily buckets"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PostLogStore(Path(tmp) / 'Posts_Log.jsonl')
+        now = datetime.now()
+        store.append(_post('facebook', now - timedelta(days=60)))
+        store.append(_post('instagram', now - timedelta(days=20), success=False))
+        store.append(_post('facebook', now - timedelta(days=2), likes=4))
+
+        analytics = PostAnalytics(store)
+        assert analytics.window(days=7)['total_posts'] == 1
+        assert analytics.window(days=30)['failed_posts'] == 1
+        assert analytics.window(days=90)['total_posts'] == 3
+        assert analytics.window(days=90)['engagement']['likes'] == 4
+
+        custom = analytics.window(
+            start=(now - timedelta(days=61)).date(),
+            end=(now - timedelta(days=19)).date(),
+            platform='facebook'
+        )
+        assert custom['total_posts'] == 1
+
+        # days=N covers N calendar days including today
+        store.append(_post('x', now - timedelta(days=7)))
+        store.append(_post('x', now - timedelta(days=6)))
+        week = analytics.window(days=7, platform='x')
+        assert week['total_posts'] == 1
+        assert week['start'] == (now - timedelta(days=6)).date().isoformat()
+        store.close()
+
+
+def test_incremental_updates_and_cache():
+    """New posts update aggregates and invalidate cached summaries"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PostLogStore(Path(tmp) / 'Posts_Log_X.jsonl')
+        analytics = PostAnalytics(store, default_platform='x')
+        builds = []
+
+        def build():
+            builds.append(1)
+            return analytics.window(days=7)['total_posts']
+
+        assert analytics.cached('summary', build) == 0
+        assert analytics.cached('summary', build) == 0
+        assert len(builds) == 1
+
+        store.append({'content': {'text': 'hi'}, 'result': {'success': True}})
+        assert analytics.cached('summary', build) == 1
+        assert len(builds) == 2
+        assert 'x' in analytics.window(days=7)['by_platform']
+        store.close()
+
+
+def test_posts_logged_during_bootstrap_counted_once():
+    """Posts appended while the aggregates bootstrap from the log are not double counted"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PostLogStore(Path(tmp) / 'Posts_Log.jsonl')
+        for _ in range(200):
+            store.append(_post('facebook', datetime.now()))
+
+        analytics = PostAnalytics(store)
+        writers = [threading.Thread(target=lambda: [store.append(_post('facebook', datetime.now())) for _ in range(100)])
+                   for _ in range(4)]
+        for writer in writers:
+            writer.start()
+        analytics.window(days=1)
+        for writer in writers:
+            writer.join()
+
+        assert analytics.window(days=1)['total_posts'] == store.count() == 600
+        store.close()
+
+
+if __name__ == '__main__':
+    tests = [test_windows, test_incremental_updates_and_cache, test_posts_logged_during_bootstrap_counted_once]
+    run_tests("Post Analytics - Test Suite", tests)
@@ -0,0 +1,106 @@
+"""
+Test Script for the Post Job Queue
+Tests async dispatch, job status tracking and per-platform rate limits
+
+Usage:
+    python test_post_job_queue.py
+"""
+
+import time
+import threading
+
+from post_job_queue import PostJobQueue, RateLimiter
+from script_runner import run_tests
+
+
+def _wait_for(jobs, job_ids, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(jobs.get(j)['status'] in ('completed', 'failed') for j in job_ids):
+            return
+        time.sleep(0.01)
+    raise AssertionError('jobs did not finish in time')
+
+
+def test_submit_returns_immediately():
+    """submit() returns a job id before the slow handler finishes"""
+    release = threading.Event()
+
+    def slow_post(payload):
+        release.wait(5)
+        return {'success': True, 'post_id': payload['message']}, 200
+
+    jobs = PostJobQueue({'facebook': slow_post}, workers=2, rate_limits={})
+    start = time.time()
+    job_id = jobs.submit('facebook', {'message': 'hello'})
+    assert time.time() - start < 0.5
+    assert jobs.get(job_id)['status'] in ('queued', 'running')
+
+    release.set()
+    _wait_for(jobs, [job_id])
+    job = jobs.get(job_id)
+    assert job['status'] == 'completed'
+    assert job['result']['post_id'] == 'hello'
+    assert 'payload' not in job
+    jobs.shutdown()
+
+
+def test_failures_and_crashes():
+    """Handler errors and exceptions mark jobs failed"""
+    def failing(payload):
+        if payload.get('crash'):
+            raise RuntimeError('boom')
+        return {'success': False, 'error': 'rejected'}, 200
+
+    jobs = PostJobQueue({'x': failing}, workers=1, rate_limits={})
+    rejected = jobs.submit('x', {'text': 'a'})
+    crashed = jobs.submit('x', {'text': 'b', 'crash': True})
+    _wait_for(jobs, [rejected, crashed])
+
+    assert jobs.get(rejected)['status'] == 'failed'
+    assert jobs.get(crashed)['status_code'] == 500
+    assert jobs.get_status()['jobs'] == {'failed': 2}
+    jobs.shutdown()
+
+
+def test_rate_limited_platform_does_not_hold_workers():
+    """A burst waiting on one platform's rate limit leaves the workers free for the others"""
+    calls = []
+
+    def post(payload):
+        calls.append((payload['platform'], time.monotonic()))
+        return {'success': True}, 200
+
+    jobs = PostJobQueue({'instagram': post, 'facebook': post}, workers=2,
+                        rate_limits={'instagram': 0.5, 'facebook': 0.0})
+    start = time.monotonic()
+    slow = [jobs.submit('instagram', {'platform': 'instagram'}) for _ in range(4)]
+    fast = jobs.submit('facebook', {'platform': 'facebook'})
+    _wait_for(jobs, [fast], timeout=1.0)
+    assert time.monotonic() - start < 0.3
+    assert jobs.get(slow[-1])['status'] == 'queued' and 'slot_reserved' not in jobs.get(slow[-1])
+
+    _wait_for(jobs, slow)
+    times = [t for platform, t in calls if platform == 'instagram']
+    assert all(later - earlier >= 0.45 for earlier, later in zip(times, times[1:]))
+    jobs.shutdown()
+
+
+def test_rate_limiter_spacing():
+    """Calls for one platform are spaced by the configured interval"""
+    limiter = RateLimiter({'instagram': 0.5})
+    waits = [limiter.reserve('instagram') for _ in range(3)]
+    assert waits[0] == 0
+    assert 0.45 < waits[1] <= 0.5
+    assert 0.95 < waits[2] <= 1.0
+    assert limiter.reserve('facebook') == 0
+
+
+if __name__ == '__main__':
+    tests = [
+        test_submit_returns_immediately,
+        test_failures_and_crashes,
+        test_rate_limited_platform_does_not_hold_workers,
+        test_rate_limiter_spacing
+    ]
+    run_tests("Post Job Queue - Test Suite", tests)
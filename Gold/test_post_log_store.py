@@ -0,0 +1,98 @@
+"""
+Test Script for the Post Log Store
+Tests append-only JSONL storage, the time index and legacy import
+
+Usage:
+    python test_post_log_store.py
+"""
+
+import json
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from post_log_store import PostLogStore
+from script_runner import run_tests
+
+
+def _post(platform, timestamp, success=True):
+    return {
+        'timestamp': timestamp.isoformat(),
+        'platform': platform,
+        'content': {'message': f'{platform} post'},
+        'result': {'success': success}
+    }
+
+
+def test_append_and_tail():
+    """Appends are returned by tail() in chronological order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PostLogStore(Path(tmp) / 'Posts_Log.jsonl')
+        now = datetime.now()
+        for i in range(5):
+            store.append(_post('facebook' if i % 2 else 'instagram', now + timedelta(seconds=i)))
+
+        assert store.count() == 5
+        assert [p['timestamp'] for p in store.tail(2)] == [
+            (now + timedelta(seconds=3)).isoformat(),
+            (now + timedelta(seconds=4)).isoformat(),
+        ]
+        assert len(store.tail(10, platform='facebook')) == 2
+        store.close()
+
+
+def test_read_range():
+    """Range queries only return posts inside the window"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PostLogStore(Path(tmp) / 'Posts_Log.jsonl')
+        now = datetime.now()
+        for days in (30, 10, 6, 1):
+            store.append(_post('facebook', now - timedelta(days=days)))
+
+        recent = store.read_range(start=now - timedelta(days=7))
+        assert len(recent) == 2
+        assert len(store.read_range(start=now - timedelta(days=31), end=now - timedelta(days=9))) == 2
+        store.close()
+
+
+def test_legacy_import():
+    """A legacy JSON array log is imported once and left in place"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / 'Posts_Log.json'
+        now = datetime.now()
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump([_post('facebook', now - timedelta(days=1)), _post('instagram', now)], f)
+
+        store = PostLogStore(Path(tmp) / 'Posts_Log.jsonl', legacy_path=legacy)
+        assert store.count() == 2
+        store.append(_post('facebook', now + timedelta(seconds=1)))
+        store.close()
+
+        reopened = PostLogStore(Path(tmp) / 'Posts_Log.jsonl', legacy_path=legacy)
+        assert reopened.count() == 3
+        assert legacy.exists()
+
+
+def test_concurrent_appends():
+    """Concurrent appends from many threads never lose entries"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PostLogStore(Path(tmp) / 'Posts_Log.jsonl')
+
+        def worker():
+            for _ in range(50):
+                store.append({'platform': 'facebook', 'content': {}, 'result': {'success': True}})
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        store.close()
+
+        assert PostLogStore(Path(tmp) / 'Posts_Log.jsonl').count() == 400
+
+
+if __name__ == '__main__':
+    tests = [test_append_and_tail, test_read_range, test_legacy_import, test_concurrent_appends]
+    run_tests("Post Log Store - Test Suite", tests)
@@ -0,0 +1,99 @@
+"""
+Test Script for the Post Scheduler
+Tests on-time dispatch, burst spreading, cancellation and restart recovery
+
+Usage:
+    python test_post_scheduler.py
+"""
+
+import json
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+import post_scheduler
+from post_scheduler import PostScheduler
+from script_runner import run_tests
+
+
+class RecordingDispatcher:
+    """Stand-in for PostJobQueue.submit that records dispatch times"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, platform, payload):
+        self.calls.append((time.time(), platform, payload))
+        return f'job-{len(self.calls)}'
+
+
+def test_fires_on_time():
+    """Posts are dispatched when due, in run_at order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dispatch = RecordingDispatcher()
+        scheduler = PostScheduler(Path(tmp) / 'Scheduled_Posts.json', dispatch, spacing={})
+        scheduler.start()
+
+        now = datetime.now()
+        scheduler.schedule('facebook', {'message': 'second'}, now + timedelta(seconds=0.4))
+        scheduler.schedule('x', {'text': 'first'}, now + timedelta(seconds=0.2))
+        time.sleep(0.8)
+        scheduler.stop()
+
+        assert [c[2] for c in dispatch.calls] == [{'text': 'first'}, {'message': 'second'}]
+        assert scheduler.list() == []
+        assert all(e['job_id'] for e in scheduler.list(status='dispatched'))
+
+
+def test_spreads_bursts():
+    """Posts requested at the same time are spaced per platform"""
+    with tempfile.TemporaryDirectory() as tmp:
+        scheduler = PostScheduler(Path(tmp) / 'Scheduled_Posts.json', RecordingDispatcher(), spacing={'instagram': 120})
+        run_at = datetime.now() + timedelta(hours=1)
+
+        slots = [datetime.fromisoformat(scheduler.schedule('instagram', {}, run_at)['run_at']) for _ in range(3)]
+        other = datetime.fromisoformat(scheduler.schedule('facebook', {}, run_at)['run_at'])
+
+        assert slots == [run_at, run_at + timedelta(seconds=120), run_at + timedelta(seconds=240)]
+        assert other == run_at
+
+        # A run_at with a UTC offset is compared (and stored) as local time
+        aware = scheduler.schedule('instagram', {}, run_at.astimezone(timezone.utc))
+        assert datetime.fromisoformat(aware['run_at']) == run_at + timedelta(seconds=360)
+
+
+def test_cancel_and_restart():
+    """Cancelled posts never fire; pending posts survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp) / 'Scheduled_Posts.json'
+        scheduler = PostScheduler(store, RecordingDispatcher(), spacing={})
+        later = datetime.now() + timedelta(days=1)
+        keep = scheduler.schedule('facebook', {'message': 'keep'}, later)
+        drop = scheduler.schedule('facebook', {'message': 'drop'}, later)
+
+        assert scheduler.cancel(drop['schedule_id'])
+        assert not scheduler.cancel(drop['schedule_id'])
+
+        reloaded = PostScheduler(store, RecordingDispatcher(), spacing={})
+        assert [e['schedule_id'] for e in reloaded.list()] == [keep['schedule_id']]
+
+
+def test_finished_posts_are_pruned():
+    """Only pending posts are persisted; finished ones live in a bounded history"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp) / 'Scheduled_Posts.json'
+        scheduler = PostScheduler(store, RecordingDispatcher(), spacing={})
+        later = datetime.now() + timedelta(days=1)
+        for _ in range(post_scheduler.HISTORY_LIMIT + 5):
+            scheduler.cancel(scheduler.schedule('x', {}, later)['schedule_id'])
+        keep = scheduler.schedule('x', {}, later)
+
+        assert [e['schedule_id'] for e in json.loads(store.read_text())] == [keep['schedule_id']]
+        assert len(scheduler.list(status='cancelled')) == post_scheduler.HISTORY_LIMIT
+        assert len(scheduler._entries) == 1
+
+
+if __name__ == '__main__':
+    tests = [test_fires_on_time, test_spreads_bursts, test_cancel_and_restart, test_finished_posts_are_pruned]
+    run_tests("Post Scheduler - Test Suite", tests)
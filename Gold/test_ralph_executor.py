@@ -0,0 +1,171 @@
+"""
+Test Script for the Ralph Executors
+Runs small stub agents in place of the claude CLI and checks streaming,
+early stop on completion, timeouts, the long-lived session and the loop
+
+Usage:
+    python test_ralph_executor.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from ralph_executor import StreamingExecutor, SessionExecutor, STOP_CHECK_OVERLAP
+from script_runner import run_tests
+
+# Prints progress, says TASK_COMPLETE, then keeps running (as a chatty agent would)
+SLOW_AGENT = '''
+import sys, time
+prompt = sys.argv[1] if len(sys.argv) > 1 else sys.stdin.read()
+print("working on: " + prompt.strip(), flush=True)
+time.sleep(0.2)
+print("step done", flush=True)
+if "finish" in prompt:
+    print("TASK_COMPLETE", flush=True)
+time.sleep(float(sys.argv[2]) if len(sys.argv) > 2 else 30)
+print("too late", flush=True)
+'''
+
+# Says "task completed" early, then keeps working and exits without the marker
+CHATTY_AGENT = '''
+import sys
+print("The first task completed; moving on to the invoices", flush=True)
+for i in range(200):
+    print(f"invoice {i} " + "x" * 100, flush=True)
+print("All steps completed.", flush=True)
+'''
+
+# stream-json session: remembers the turn count, finishes on turn 2
+SESSION_AGENT = '''
+import sys, json, os
+turn = 0
+for line in sys.stdin:
+    turn += 1
+    prompt = json.loads(line)["message"]["content"].strip().splitlines()[0]
+    text = f"turn {turn} pid {os.getpid()}: {prompt}"
+    if turn == 2:
+        text += "\\nTASK_COMPLETE"
+    print(json.dumps({"type": "system", "session_id": "s-1"}), flush=True)
+    print(json.dumps({"type": "assistant", "session_id": "s-1",
+                      "message": {"content": [{"type": "text", "text": text}]}}), flush=True)
+    print(json.dumps({"type": "result", "session_id": "s-1", "result": text}), flush=True)
+'''
+
+
+def _agent(tmp, name, source):
+    path = Path(tmp) / name
+    path.write_text(source)
+    return str(path)
+
+
+def test_streaming_stops_on_completion():
+    """The agent is stopped as soon as TASK_COMPLETE is streamed, not when it exits"""
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = _agent(tmp, 'agent.py', SLOW_AGENT)
+        seen = []
+        executor = StreamingExecutor([sys.executable, agent, '{prompt}'], timeout=20, on_output=seen.append)
+        result = executor.run('finish the job', stop_check=lambda text: 'TASK_COMPLETE' in text)
+
+        assert result['completed'] and not result['timed_out']
+        assert result['seconds'] < 5
+        assert 'too late' not in result['output']
+        assert seen[0] == 'working on: finish the job\n'
+
+
+def test_prompt_on_stdin_and_timeout():
+    """Without {prompt} the prompt is piped to stdin; a hung agent is cut off at the timeout"""
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = _agent(tmp, 'agent.py', SLOW_AGENT)
+        executor = StreamingExecutor([sys.executable, agent], timeout=1)
+        result = executor.run('keep going')
+
+        assert result['timed_out'] and not result['completed']
+        assert result['error'] == 'timed out after 1s'
+        assert result['output'] == 'working on: keep going\nstep done\n'
+
+        missing = StreamingExecutor(['no-such-agent-binary', '{prompt}']).run('x')
+        assert 'not found' in missing['error']
+
+
+def test_session_is_reused_between_iterations():
+    """One process serves every turn and keeps its state; close() ends it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = _agent(tmp, 'session.py', SESSION_AGENT)
+        executor = SessionExecutor([sys.executable, agent], timeout=10)
+        first = executor.run('plan it', stop_check=lambda text: 'TASK_COMPLETE' in text)
+        second = executor.run('do it', stop_check=lambda text: 'TASK_COMPLETE' in text)
+        try:
+            pid = executor.process.pid
+            assert first['output'].strip() == f'turn 1 pid {pid}: plan it'
+            assert not first['completed'] and first['error'] is None
+            assert second['output'].startswith(f'turn 2 pid {pid}: do it')
+            assert second['completed']
+            assert executor.session_id == 's-1' and executor.restarts == 0
+        finally:
+            executor.close()
+        assert executor.process.poll() is not None
+
+
+def test_phrases_only_count_after_exit():
+    """A completion phrase mid-answer does not stop the agent; the stop check sees bounded windows"""
+    import ralph_orchestrator
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = _agent(tmp, 'chatty.py', CHATTY_AGENT)
+        os.chdir(tmp)
+        try:
+            loop = ralph_orchestrator.RalphWiggumLoop(task='Send the invoices', max_iterations=3)
+            windows = []
+
+            def stop_check(text):
+                windows.append(len(text))
+                return loop.check_stop_signal(text)
+
+            result = StreamingExecutor([sys.executable, agent, '{prompt}'], timeout=20).run('go', stop_check=stop_check)
+            assert not result['completed'] and result['returncode'] == 0
+            assert result['output'].endswith('All steps completed.\n')
+            assert max(windows) <= STOP_CHECK_OVERLAP + 120  # never the whole buffer
+            assert loop.check_task_complete(result['output'])  # the phrase still counts once it exited
+        finally:
+            os.chdir(cwd)
+
+
+def test_loop_finishes_with_stub_agent():
+    """RalphWiggumLoop runs its iterations through a pluggable executor"""
+    import ralph_orchestrator
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = _agent(tmp, 'session.py', SESSION_AGENT)
+        os.chdir(tmp)
+        try:
+            loop = ralph_orchestrator.RalphWiggumLoop(
+                task='Send the weekly report', max_iterations=5,
+                executor=SessionExecutor([sys.executable, agent], timeout=10)
+            )
+            start = time.monotonic()
+            state = loop.run()
+            elapsed = time.monotonic() - start
+
+            assert state['status'] == 'completed'
+            assert state['iterations'] == 2
+            assert elapsed < 5  # no fixed sleep between iterations
+            assert Path('Ralph_Context/output_002.md').read_text(encoding='utf-8').startswith('turn 2')
+            assert loop.executor.process.poll() is not None  # session closed when the loop ends
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    tests = [
+        test_streaming_stops_on_completion,
+        test_prompt_on_stdin_and_timeout,
+        test_session_is_reused_between_iterations,
+        test_phrases_only_count_after_exit,
+        test_loop_finishes_with_stub_agent
+    ]
+    run_tests("Ralph Executors - Test Suite", tests)
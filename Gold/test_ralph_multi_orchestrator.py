@@ -0,0 +1,202 @@
+"""
+Test Script for the Ralph Multi-Task Orchestrator
+Checks priority ordering, the concurrency limit, per-task iteration budgets,
+namespaced workspaces and the throughput report
+
+Usage:
+    python test_ralph_multi_orchestrator.py
+"""
+
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+from ralph_multi_orchestrator import MultiTaskOrchestrator, TaskQueue, task_id_for
+from script_runner import run_tests
+
+
+class FakeExecutor:
+    """Stand-in agent: takes a while, then finishes unless the task says 'never'"""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+
+    def run(self, prompt, stop_check=None):
+        with FakeExecutor.lock:
+            FakeExecutor.active += 1
+            FakeExecutor.peak = max(FakeExecutor.peak, FakeExecutor.active)
+        time.sleep(self.delay)
+        with FakeExecutor.lock:
+            FakeExecutor.active -= 1
+        output = "still working\n" if 'never' in prompt else "all done\nTASK_COMPLETE\n"
+        completed = bool(stop_check and stop_check(output))
+        return {'output': output, 'stderr': '', 'returncode': 0, 'completed': completed,
+                'timed_out': False, 'error': None, 'seconds': self.delay}
+
+    def close(self):
+        pass
+
+
+def _task(folder, name, priority=None, budget=None, age=0):
+    lines = [f"# Task {name}", ""]
+    if priority:
+        lines.append(f"**Priority:** {priority}  ")
+    if budget:
+        lines.append(f"**Max Iterations:** {budget}")
+    path = folder / f"{name}.md"
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_queue_orders_by_priority_then_age():
+    """High priority first, oldest first within a priority; files are queued once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        _task(folder, 'normal_new')
+        _task(folder, 'normal_old', age=100)
+        _task(folder, 'urgent', priority='Urgent')
+        _task(folder, 'low', priority='low', age=500)
+        _task(folder, 'high', priority='High')
+        (folder / 'notes.txt').write_text('not a task')
+
+        queue = TaskQueue()
+        assert queue.scan(folder) == 5
+        assert queue.scan(folder) == 0
+        order = []
+        while (task := queue.pop()) is not None:
+            order.append(task['path'].stem)
+        assert order == ['urgent', 'high', 'normal_old', 'normal_new', 'low']
+
+        # A new task reusing a finished task's name is picked up again
+        (folder / 'urgent.md').unlink()
+        _task(folder, 'urgent', age=-10)
+        assert queue.scan(folder) == 1
+        assert queue.pop()['path'].stem == 'urgent'
+        assert task_id_for(Path('email_Re: invoice #42 (final).md')) == 'email_Re_invoice_42_final'
+
+
+def test_concurrent_loops_respect_limit_and_budgets():
+    """N loops run at once, each in its own workspace, within its iteration budget"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            needs_action = Path('Needs_Action')
+            needs_action.mkdir()
+            for i in range(5):
+                _task(needs_action, f'invoice_{i}')
+            _task(needs_action, 'never_finishes', budget=2)
+
+            FakeExecutor.active = FakeExecutor.peak = 0
+            orchestrator = MultiTaskOrchestrator(
+                needs_action=needs_action, concurrency=3, max_iterations=4,
+                executor_factory=lambda: FakeExecutor(0.3)
+            )
+            start = time.monotonic()
+            report = orchestrator.run()
+            elapsed = time.monotonic() - start
+
+            assert FakeExecutor.peak == 3
+            assert elapsed < 1.5  # 6 tasks, 3 at a time: about two rounds plus the 2-iteration task
+            assert report['by_status'] == {'completed': 5, 'max_iterations': 1}
+            assert report['tasks_per_hour'] > 0
+            assert report['iterations'] == 5 + 2
+
+            stuck = next(t for t in report['tasks'] if t['task_id'] == 'never_finishes')
+            assert (stuck['iterations'], stuck['budget']) == (2, 2)
+
+            # Namespaced state and context; finished task files moved to Done
+            for i in range(5):
+                workspace = Path('Ralph_Tasks') / f'invoice_{i}'
+                assert (workspace / 'ralph_state.json').exists()
+                assert (workspace / 'Ralph_Context' / 'output_001.md').read_text(encoding='utf-8').startswith('all done')
+                assert (Path('Done') / f'invoice_{i}.md').exists()
+            assert not Path('ralph_state.json').exists()
+            assert (Path('Ralph_Tasks') / 'orchestrator_report.json').exists()
+
+            # The task that used its budget is handed to a human, not left in Needs_Action
+            assert list(needs_action.iterdir()) == []
+            parked = Path('Pending_Approval') / 'never_finishes.md'
+            assert stuck['moved_to'] == str(parked)
+            assert 'stopped after 2/2 iterations' in parked.read_text(encoding='utf-8')
+
+            # A new task reusing a finished task's name starts from a fresh state
+            _task(needs_action, 'invoice_0', age=-10)
+            again = MultiTaskOrchestrator(needs_action=needs_action, executor_factory=lambda: FakeExecutor(0.01)).run()
+            assert again['tasks'][0]['status'] == 'completed'
+            assert again['iterations'] == 1
+            assert len(list(Path('Done').glob('invoice_0*.md'))) == 2  # the earlier record is kept
+        finally:
+            os.chdir(cwd)
+
+
+def test_reused_name_is_not_done_already():
+    """A Done/ file from an earlier task with the same name does not complete the new one"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            needs_action = Path('Needs_Action')
+            needs_action.mkdir()
+            Path('Done').mkdir()
+            earlier = _task(Path('Done'), 'never_done_before', age=3600)
+            _task(needs_action, 'never_done_before', budget=2)
+
+            report = MultiTaskOrchestrator(
+                needs_action=needs_action, executor_factory=lambda: FakeExecutor(0.01)
+            ).run()
+            task = report['tasks'][0]
+            assert (task['status'], task['iterations']) == ('max_iterations', 2)
+            assert (Path('Pending_Approval') / 'never_done_before.md').exists()
+            assert earlier.read_text(encoding='utf-8') == "# Task never_done_before\n\n"
+        finally:
+            os.chdir(cwd)
+
+
+def test_edited_running_task_is_not_dispatched_twice():
+    """In watch mode, editing a task file while its loop runs does not start a second loop"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            needs_action = Path('Needs_Action')
+            needs_action.mkdir()
+            path = _task(needs_action, 'report', age=60)
+
+            FakeExecutor.active = FakeExecutor.peak = 0
+            orchestrator = MultiTaskOrchestrator(
+                needs_action=needs_action, poll_interval=0.05,
+                executor_factory=lambda: FakeExecutor(0.5)
+            )
+            runner = threading.Thread(target=orchestrator.run, kwargs={'watch': True})
+            runner.start()
+            time.sleep(0.15)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("- [ ] one more step\n")  # new mtime: the scan sees a new version
+            time.sleep(0.8)
+            orchestrator.stop()
+            runner.join()
+
+            assert FakeExecutor.peak == 1
+            assert [t['status'] for t in orchestrator.results] == ['completed']
+            assert (Path('Done') / 'report.md').exists()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    tests = [
+        test_queue_orders_by_priority_then_age,
+        test_concurrent_loops_respect_limit_and_budgets,
+        test_reused_name_is_not_done_already,
+        test_edited_running_task_is_not_dispatched_twice
+    ]
+    run_tests("Ralph Multi-Task Orchestrator - Test Suite", tests)
@@ -0,0 +1,96 @@
+"""
+Test Script for Startup Budgets
+Imports every entry point in a fresh interpreter and checks its import time
+against the budget in startup_profile.py, that heavy dependencies are not
+imported before they are needed, and that importing creates no files
+
+Usage:
+    python test_startup_budget.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+from startup_profile import (
+    ENTRY_POINTS, GOLD_DIR, profile_import, parse_importtime, entry_imports,
+    forbidden_imports, missing_requirements
+)
+from script_runner import run_tests
+
+
+def test_entry_points_within_budget():
+    """Each installed entry point imports within budget, without heavy modules or side effects"""
+    checked = 0
+    flask_entries = [entry for entry, config in ENTRY_POINTS.items() if 'flask' in config.get('requires', [])]
+    flask_checked = 0
+    for entry, config in ENTRY_POINTS.items():
+        missing = missing_requirements(entry)
+        if missing:
+            print(f"  (skipping {entry}: {', '.join(missing)} not installed)")
+            continue
+        profile = profile_import(entry)
+        print(f"  {entry}: {profile['seconds']:.3f}s of {config['budget']}s")
+        assert profile['seconds'] <= config['budget'], f"{entry} took {profile['seconds']:.3f}s"
+        assert not forbidden_imports(profile), f"{entry} imported {forbidden_imports(profile)}"
+        assert not profile['created'], f"{entry} created {profile['created']} at import"
+        checked += 1
+        flask_checked += entry in flask_entries
+    assert checked >= 3  # the stdlib-only entry points always run
+    # The Flask servers are the ones most likely to regress; skipping all of them is a failure
+    assert flask_checked, f"none of {flask_entries} could be checked: install requirements.txt"
+
+
+def test_gold_tier_loads_features_on_first_use():
+    """Constructing the master skill reports features without importing them"""
+    script = (
+        "import sys, json, gold_tier_complete as g\n"
+        "gold = g.GoldTierComplete()\n"
+        "before = [m for m in g.FEATURE_MODULES.values() if m in sys.modules]\n"
+        "summary = gold.get_recovery_status()\n"
+        "after = [m for m in g.FEATURE_MODULES.values() if m in sys.modules]\n"
+        "print(json.dumps({'features': gold.status['features'], 'before': before, 'after': after,"
+        " 'breakers': sorted(summary['circuit_breakers'])}))\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=str(GOLD_DIR), PYTHONIOENCODING='utf-8')
+        result = subprocess.run([sys.executable, '-c', script], cwd=tmp, env=env,
+                                capture_output=True, text=True, encoding='utf-8')
+        assert result.returncode == 0, result.stderr
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        assert os.listdir(tmp) == []  # no Logs/ or Offline_Queue/ until something is written
+
+    assert report['features']['error_recovery'] and report['features']['ralph_wiggum']
+    assert report['before'] == []
+    assert report['after'] == ['error_recovery']
+    assert 'odoo' in report['breakers']
+
+
+def test_parse_importtime():
+    """importtime lines become rows; interpreter startup is separated from the entry point"""
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |   encodings.utf_8",
+        "import time:       500 |        600 | site",
+        "import time:       200 |        200 |     http.client",
+        "import time:       300 |        500 |   status_aggregator",
+        "import time:      1000 |       1500 | gold_tier_complete",
+    ])
+    rows = parse_importtime(stderr)
+    assert [row['depth'] for row in rows] == [1, 0, 2, 1, 0]
+    assert rows[2] == {'name': 'http.client', 'depth': 2, 'self_ms': 0.2, 'cumulative_ms': 0.2}
+
+    own = entry_imports(rows, 'gold_tier_complete')
+    assert [row['name'] for row in own] == ['http.client', 'status_aggregator', 'gold_tier_complete']
+    assert entry_imports(rows, 'missing_module') == []
+
+
+if __name__ == '__main__':
+    tests = [
+        test_entry_points_within_budget,
+        test_gold_tier_loads_features_on_first_use,
+        test_parse_importtime
+    ]
+    run_tests("Startup Budgets - Test Suite", tests)
@@ -0,0 +1,107 @@
+"""
+Test Script for the Status Aggregator
+Checks parallel probing, deadlines, TTL caching with background refresh
+and the real /health probe against a local server
+
+Usage:
+    python test_status_aggregator.py
+"""
+
+import time
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from status_aggregator import StatusAggregator, probe_health
+from script_runner import run_tests
+
+
+def _slow_probe(delay):
+    calls = []
+
+    def probe(port, host, timeout):
+        calls.append(port)
+        time.sleep(delay if port != 9004 else timeout * 3)  # 9004 never answers in time
+        return {'port': port, 'status': 'healthy', 'latency_ms': delay * 1000, 'error': None}
+    probe.calls = calls
+    return probe
+
+
+SERVERS = {f's{i}': 9000 + i for i in range(5)}
+
+
+def test_probes_run_concurrently_with_deadline():
+    """Five slow servers cost one probe; a hung one is reported offline at the deadline"""
+    probe = _slow_probe(0.2)
+    status = StatusAggregator(servers=SERVERS, probe_timeout=0.3, probe=probe)
+    start = time.perf_counter()
+    snapshot = status.refresh()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.8  # sequential would be 0.8s + the hung server
+    assert snapshot['mcp_servers']['s0']['status'] == 'healthy'
+    assert snapshot['mcp_servers']['s4']['status'] == 'offline'
+    assert snapshot['mcp_servers']['s4']['error'] == 'probe deadline exceeded'
+    status.stop()
+
+
+def test_cached_reads_are_fast_and_refresh_in_background():
+    """Warm reads take microseconds; a stale snapshot is served while it refreshes"""
+    probe = _slow_probe(0.05)
+    sources = {'recovery_status': lambda: {'circuit_breakers': {}}, 'broken': lambda: 1 / 0}
+    status = StatusAggregator(servers=SERVERS, sources=sources, probe_timeout=0.2, ttl=0.3, probe=probe)
+
+    first = status.get()
+    assert first['recovery_status'] == {'circuit_breakers': {}}
+    assert 'division' in first['broken']['error']
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        assert status.get() is first
+    per_read = (time.perf_counter() - start) / 1000
+    assert per_read < 0.001
+    print(f"  cached read: {per_read * 1e6:.1f} us")
+
+    time.sleep(0.35)
+    assert status.get() is first  # stale snapshot returned immediately
+    deadline = time.time() + 2
+    while status.refreshes < 2 and time.time() < deadline:
+        time.sleep(0.02)
+    assert status.refreshes == 2
+    assert status.get() is not first
+    assert status.get(max_age=0)['checked_at'] >= first['checked_at']
+    status.stop()
+
+
+def test_probe_health_against_real_server():
+    """probe_health reports healthy, unhealthy and offline servers"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == '/health' else 404)
+            self.end_headers()
+            self.wfile.write(b'{"status": "healthy"}')
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    result = probe_health(port, host='127.0.0.1')
+    assert result['status'] == 'healthy'
+    assert result['latency_ms'] is not None
+    server.shutdown()
+    server.server_close()
+
+    offline = probe_health(port, host='127.0.0.1', timeout=0.5)
+    assert offline['status'] == 'offline'
+    assert offline['error']
+
+
+if __name__ == '__main__':
+    tests = [
+        test_probes_run_concurrently_with_deadline,
+        test_cached_reads_are_fast_and_refresh_in_background,
+        test_probe_health_against_real_server
+    ]
+    run_tests("Status Aggregator - Test Suite", tests)
@@ -0,0 +1,182 @@
+"""
+Test Script for the Step Graph Executor
+Checks dependency ordering, concurrency of independent steps, timeouts,
+error propagation, the critical-path report and the step-result cache
+
+Usage:
+    python test_step_graph.py
+"""
+
+import time
+import tempfile
+from pathlib import Path
+
+from Skills.step_graph import StepGraph, StepCache, directory_fingerprint
+from script_runner import run_tests
+
+
+def _sleeper(seconds, value):
+    def action(**kwargs):
+        time.sleep(seconds)
+        return {'value': value, 'inputs': sorted(kwargs)}
+    return action
+
+
+def _briefing_shaped_steps(delay=0.2):
+    """Four independent fetches followed by dependent analysis steps"""
+    return [
+        {'name': 'goals', 'action': _sleeper(delay, 1), 'depends_on': []},
+        {'name': 'tasks', 'action': _sleeper(delay, 2), 'depends_on': []},
+        {'name': 'odoo', 'action': _sleeper(delay, 3), 'depends_on': []},
+        {'name': 'social', 'action': _sleeper(delay, 4), 'depends_on': []},
+        {'name': 'bottlenecks', 'action': _sleeper(0.01, 5), 'depends_on': ['tasks', 'odoo']},
+        {'name': 'metrics', 'action': _sleeper(0.01, 6), 'depends_on': ['tasks', 'social', 'odoo']},
+        {'name': 'document', 'action': _sleeper(0.01, 7),
+         'depends_on': ['goals', 'bottlenecks', 'metrics']},
+    ]
+
+
+def test_independent_steps_run_concurrently():
+    """Four 0.2s fetches finish in about 0.2s, not 0.8s"""
+    graph = StepGraph(_briefing_shaped_steps(), max_workers=4)
+    results = graph.run()
+
+    assert list(results) == ['goals', 'tasks', 'odoo', 'social', 'bottlenecks', 'metrics', 'document']
+    assert results['document']['inputs'] == ['bottlenecks', 'goals', 'metrics']
+    assert graph.elapsed < 0.5
+    report = graph.timing_report()
+    assert report['speedup'] > 2
+    assert report['critical_path'][-1] == 'document'
+    assert len(report['critical_path']) == 3
+    print(graph.format_report())
+
+
+def test_dependents_start_after_dependencies():
+    """No step starts before everything it depends on has finished"""
+    graph = StepGraph(_briefing_shaped_steps(delay=0.05), max_workers=2)
+    graph.run()
+    for name, step in graph.steps.items():
+        for dep in step['depends_on']:
+            assert graph.timings[dep]['end'] <= graph.timings[name]['start'] + 1e-6
+
+
+def test_timeout_and_errors_are_recorded():
+    """Slow or failing steps record an error and downstream steps still run"""
+    def broken(**kwargs):
+        raise RuntimeError("odoo down")
+
+    steps = [
+        {'name': 'slow', 'action': _sleeper(2, 'late'), 'timeout': 0.1},
+        {'name': 'broken', 'action': broken},
+        {'name': 'summary', 'action': lambda **kw: kw, 'depends_on': ['slow', 'broken']},
+    ]
+    graph = StepGraph(steps)
+    start = time.perf_counter()
+    results = graph.run()
+
+    assert time.perf_counter() - start < 1
+    assert 'Timed out' in results['slow']['error']
+    assert results['broken'] == {'error': 'odoo down'}
+    assert results['summary']['broken'] == {'error': 'odoo down'}
+    assert graph.timings['slow']['status'] == 'timeout'
+
+
+def test_cycles_and_unknown_dependencies():
+    """Cycles are rejected up front; unknown dependencies are reported and skipped"""
+    try:
+        StepGraph([
+            {'name': 'a', 'action': dict, 'depends_on': ['b']},
+            {'name': 'b', 'action': dict, 'depends_on': ['a']},
+        ])
+        assert False, "cycle not detected"
+    except ValueError as e:
+        assert 'cycle' in str(e)
+
+    graph = StepGraph([{'name': 'a', 'action': lambda **kw: sorted(kw), 'depends_on': ['missing']}])
+    assert graph.missing == {'a': ['missing']}
+    assert graph.run() == {'a': []}
+
+
+def test_cache_recomputes_only_affected_steps():
+    """Unchanged inputs are reused; a changed input reruns the step and its dependents"""
+    with tempfile.TemporaryDirectory() as tmp:
+        completed = Path(tmp) / 'Completed'
+        completed.mkdir()
+        (completed / 'task1.md').write_text('done')
+        calls = []
+
+        def counted(name, value=None):
+            def action(**kwargs):
+                calls.append(name)
+                return value if value is not None else {'inputs': {k: kwargs[k] for k in sorted(kwargs)}}
+            return action
+
+        def steps():
+            return [
+                {'name': 'tasks', 'action': counted('tasks', {'count': len(list(completed.iterdir()))}),
+                 'cache_key': lambda: directory_fingerprint(completed)},
+                {'name': 'goals', 'action': counted('goals', {'goals': 3}), 'cache_key': lambda: 'v1'},
+                {'name': 'odoo', 'action': counted('odoo', {'revenue': 100})},  # always fetched
+                {'name': 'metrics', 'action': counted('metrics'), 'depends_on': ['tasks', 'odoo'],
+                 'cache_key': lambda: ''},
+                {'name': 'document', 'action': counted('document'), 'depends_on': ['goals', 'metrics'],
+                 'cache_key': lambda: '', 'cache_valid': lambda result: (Path(tmp) / 'doc.md').exists()},
+            ]
+
+        cache_file = Path(tmp) / 'cache.json'
+        StepGraph(steps(), cache=StepCache(cache_file)).run()
+        (Path(tmp) / 'doc.md').write_text('briefing')
+        assert sorted(calls) == ['document', 'goals', 'metrics', 'odoo', 'tasks']
+
+        calls.clear()
+        graph = StepGraph(steps(), cache=StepCache(cache_file))
+        results = graph.run()
+        assert calls == ['odoo']
+        assert graph.timing_report()['cache_hits'] == 4
+        assert results['metrics'] == {'inputs': {'odoo': {'revenue': 100}, 'tasks': {'count': 1}}}
+
+        # A new completed task reruns tasks and everything downstream of it, not goals
+        (completed / 'task2.md').write_text('done')
+        calls.clear()
+        StepGraph(steps(), cache=StepCache(cache_file)).run()
+        assert sorted(calls) == ['document', 'metrics', 'odoo', 'tasks']
+
+        # force=True recomputes everything; an invalid cached result is recomputed
+        calls.clear()
+        StepGraph(steps(), cache=StepCache(cache_file, force=True)).run()
+        assert len(calls) == 5
+        (Path(tmp) / 'doc.md').unlink()
+        calls.clear()
+        StepGraph(steps(), cache=StepCache(cache_file)).run()
+        assert sorted(calls) == ['document', 'odoo']
+
+
+def test_failed_steps_are_not_cached():
+    """Errors are retried on the next run instead of being served from the cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        attempts = []
+
+        def flaky(**kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("offline")
+            return {'ok': True}
+
+        cache_file = Path(tmp) / 'cache.json'
+        for _ in range(3):
+            results = StepGraph([{'name': 'fetch', 'action': flaky, 'cache_key': lambda: 'k'}],
+                                cache=StepCache(cache_file)).run()
+        assert len(attempts) == 2
+        assert results['fetch'] == {'ok': True}
+
+
+if __name__ == '__main__':
+    tests = [
+        test_independent_steps_run_concurrently,
+        test_dependents_start_after_dependencies,
+        test_timeout_and_errors_are_recorded,
+        test_cycles_and_unknown_dependencies,
+        test_cache_recomputes_only_affected_steps,
+        test_failed_steps_are_not_cached
+    ]
+    run_tests("Step Graph Executor - Test Suite", tests)
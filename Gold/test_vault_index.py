@@ -0,0 +1,149 @@
+"""
+Test Script for the Vault Index
+Checks metadata parsing, incremental sync, event-style updates and
+time-range queries
+
+Usage:
+    python test_vault_index.py
+"""
+
+import os
+import time
+import tempfile
+from pathlib import Path
+
+from vault_index import VaultIndex, parse_metadata
+from script_runner import run_tests
+
+
+def _vault(tmp):
+    root = Path(tmp)
+    for folder in ('Completed', 'Needs_Action', 'Pending_Approval'):
+        (root / folder).mkdir()
+    index = VaultIndex(root=tmp, path=root / 'index.db', folders=['Completed', 'Needs_Action', 'Pending_Approval'])
+    return index, root
+
+
+def test_parse_front_matter_and_inline_fields():
+    """Front matter wins over inline fields; bold markdown labels are understood"""
+    category, status, fields = parse_metadata(
+        "---\ncategory: Finance\ntype: invoice\n---\n# Task\n\n**Category:** Ops  \n**Priority:** High\n"
+    )
+    assert category == 'Finance'
+    assert status is None
+    assert fields['priority'] == 'High'
+    assert fields['type'] == 'invoice'
+
+    category, status, _ = parse_metadata("# Plan\nCategory: Sales\n- **Status:** done\n")
+    assert (category, status) == ('Sales', 'done')
+
+
+def test_sync_only_reads_changed_files():
+    """A second sync opens nothing; a change re-reads one file and bumps the version"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index, root = _vault(tmp)
+        for i in range(50):
+            (root / 'Completed' / f'task{i}.md').write_text(f"# Task {i}\nCategory: {'Sales' if i % 2 else 'Ops'}\n")
+        assert index.sync() == {'added': 50, 'updated': 0, 'removed': 0}
+        assert index.parsed == 50
+        version = index.version('Completed')
+
+        assert index.sync() == {'added': 0, 'updated': 0, 'removed': 0}
+        assert index.parsed == 50
+        assert index.version('Completed') == version
+
+        (root / 'Completed' / 'task0.md').write_text("# Task 0\nCategory: Finance\n")
+        (root / 'Completed' / 'task1.md').unlink()
+        assert index.sync(['Completed']) == {'added': 0, 'updated': 1, 'removed': 1}
+        assert index.parsed == 51
+        assert index.version('Completed') > version
+        assert index.category_counts('Completed') == {'Finance': 1, 'Ops': 24, 'Sales': 24}
+        index.close()
+
+
+def test_event_updates_and_time_range_queries():
+    """Created/moved/deleted events keep counts current without a scan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index, root = _vault(tmp)
+        now = time.time()
+        old = root / 'Completed' / 'old.md'
+        old.write_text("Category: Ops\n")
+        os.utime(old, (now - 10 * 86400, now - 10 * 86400))
+        recent = root / 'Completed' / 'recent.md'
+        recent.write_text("Category: Sales\n")
+        index.update_file(str(old))
+        index.update_file(str(recent))
+
+        week = index.files('Completed', since=now - 7 * 86400, suffix='.md')
+        assert [row['name'] for row in week] == ['recent.md']
+        assert week[0]['category'] == 'Sales'
+        assert index.count('Completed', until=now - 7 * 86400) == 1
+
+        pending = root / 'Pending_Approval' / 'EMAIL_1.md'
+        pending.write_text("**Status:** pending\n")
+        index.update_file(str(pending))
+        assert index.count('Pending_Approval') == 1
+
+        moved = root / 'Completed' / 'EMAIL_1.md'
+        pending.rename(moved)
+        index.move_file(str(pending), str(moved))
+        assert index.count('Pending_Approval') == 0
+        assert index.files('Completed', since=now - 60)[-1]['status'] == 'pending'
+
+        moved.unlink()
+        index.remove_file(str(moved))
+        index.update_file(str(root / 'elsewhere.md'))  # outside the vault folders: ignored
+        assert index.count('Completed') == 2
+        index.close()
+
+
+class FakeObserver:
+    """Stand-in for the watchdog observer: records scheduled folders"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule(self, handler, path, recursive=False):
+        self.scheduled.append(os.path.basename(path))
+
+    def is_alive(self):
+        return True
+
+
+def test_heartbeat_skips_sync():
+    """ensure_fresh() trusts a live watcher, only for folders it actually watches"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'Needs_Action').mkdir()
+        index = VaultIndex(root=tmp, path=root / 'index.db', folders=['Needs_Action', 'Plans'])
+        index.heartbeat()
+        assert not index.is_watched('Needs_Action')  # no watcher running
+
+        index._observer = FakeObserver()
+        index.heartbeat()
+        assert index._observer.scheduled == ['Needs_Action']
+        assert not index.is_watched('Plans')  # did not exist, so nothing watches it
+
+        (root / 'Needs_Action' / 'a.md').write_text('x')
+        assert index.ensure_fresh(['Needs_Action'])['added'] == 0
+        assert index.ensure_fresh(['Needs_Action'], max_age=0)['added'] == 1
+        assert index.count('Needs_Action') == 1
+
+        # A folder created later is synced and scheduled on the next heartbeat
+        (root / 'Plans').mkdir()
+        (root / 'Plans' / 'plan.md').write_text('x')
+        index.heartbeat()
+        assert index._observer.scheduled == ['Needs_Action', 'Plans']
+        assert index.is_watched('Plans') and index.count('Plans') == 1
+        index._observer = None
+        index.close()
+
+
+if __name__ == '__main__':
+    tests = [
+        test_parse_front_matter_and_inline_fields,
+        test_sync_only_reads_changed_files,
+        test_event_updates_and_time_range_queries,
+        test_heartbeat_skips_sync
+    ]
+    run_tests("Vault Index - Test Suite", tests)
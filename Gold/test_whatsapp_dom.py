@@ -0,0 +1,107 @@
+"""
+Test Script for the WhatsApp seen-message ledger
+Checks per-chat de-duplication, persistence across restarts and pruning
+
+Usage:
+    python test_whatsapp_dom.py
+"""
+
+import os
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from ingestion_ledger import IngestionLedger
+from whatsapp_dom import SeenMessageLedger, OBSERVER_JS, MESSAGE_BINDING, UNREAD_BINDING
+from script_runner import run_tests
+
+
+def _message(chat_id, n):
+    return {'id': f'false_{chat_id}_{n}', 'chat_id': chat_id, 'chat': chat_id, 'text': f'msg {n}'}
+
+
+def test_filter_new_per_chat():
+    """Re-rendered messages are dropped; each chat is tracked separately"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = SeenMessageLedger(Path(tmp) / 'seen.json')
+        first = ledger.filter_new([_message('a', 1), _message('a', 2), _message('b', 1)])
+        assert len(first) == 3
+        assert ledger.filter_new([_message('a', 2), _message('a', 3)]) == [_message('a', 3)]
+        assert ledger.last_seen('a') == 'false_a_3'
+
+
+def test_unseen_until_marked():
+    """filter_unseen does not mark; a message stays unseen until mark_seen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = SeenMessageLedger(Path(tmp) / 'seen.json')
+        batch = [_message('a', 1), _message('a', 1), _message('a', 2)]
+        assert ledger.filter_unseen(batch) == [_message('a', 1), _message('a', 2)]
+        ledger.mark_seen(_message('a', 1))
+        assert ledger.filter_unseen(batch) == [_message('a', 2)]
+
+
+def test_failed_save_is_retried():
+    """A message whose file could not be written is not marked seen; the rest of the batch still runs"""
+    whatsapp_watcher = pytest.importorskip('whatsapp_watcher', reason='Playwright not installed')
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        original = whatsapp_watcher.get_ledger
+        whatsapp_watcher.get_ledger = lambda: IngestionLedger(Path(tmp) / 'ledger.db')
+        try:
+            watcher = whatsapp_watcher.WhatsAppWatcher(data_dir='data', needs_action_dir='Needs_Action')
+            batch = [{'id': 'm1', 'chat': 'Acme', 'text': 'urgent: invoice'},
+                     {'id': 'm2', 'chat': 'Acme', 'text': 'payment sent'}]
+            real_save = watcher.save_message
+
+            async def flaky_save(chat, text, message_id=None):
+                if message_id == 'm1':
+                    raise OSError('disk full')
+                await real_save(chat, text, message_id)
+
+            watcher.save_message = flaky_save
+            asyncio.run(watcher.on_dom_messages(batch))
+            assert watcher.ledger.filter_unseen(batch) == [batch[0]]
+
+            watcher.save_message = real_save
+            asyncio.run(watcher.on_dom_messages(batch))
+            assert watcher.ledger.filter_unseen(batch) == []
+            saved = sorted(p.read_text(encoding='utf-8') for p in Path('Needs_Action').glob('whatsapp_*.md'))
+            assert len(saved) == 2 and 'urgent: invoice' in ''.join(saved)
+        finally:
+            whatsapp_watcher.get_ledger = original
+            os.chdir(cwd)
+
+
+def test_ledger_persists_and_prunes():
+    """Saved ids survive a restart; only the newest max_per_chat are kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'seen.json'
+        ledger = SeenMessageLedger(path, max_per_chat=3)
+        ledger.filter_new([_message('a', n) for n in range(5)])
+        ledger.save()
+
+        restarted = SeenMessageLedger(path, max_per_chat=3)
+        assert restarted.chats['a'] == ['false_a_2', 'false_a_3', 'false_a_4']
+        assert restarted.filter_new([_message('a', 4)]) == []
+        assert not restarted.dirty
+
+
+def test_observer_uses_bindings():
+    """The observer script calls the exposed Python bindings"""
+    assert f'window.{MESSAGE_BINDING}(batch)' in OBSERVER_JS
+    assert f'window.{UNREAD_BINDING}()' in OBSERVER_JS
+
+
+if __name__ == '__main__':
+    tests = [
+        test_filter_new_per_chat,
+        test_unseen_until_marked,
+        test_failed_save_is_retried,
+        test_ledger_persists_and_prunes,
+        test_observer_uses_bindings
+    ]
+    run_tests("WhatsApp Seen Ledger - Test Suite", tests)
@@ -0,0 +1,107 @@
+"""
+Test Script and Benchmark for bulk WhatsApp message extraction
+Loads a saved static WhatsApp Web chat (fixtures/whatsapp_chat.html) in
+Chromium and compares per-element inner_text() calls with a single
+EXTRACT_CHAT_JS evaluate() call
+
+Requires Playwright with Chromium installed (playwright install chromium);
+the checks are reported as skipped otherwise.
+
+Usage:
+    python test_whatsapp_extract.py
+"""
+
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from whatsapp_dom import EXTRACT_CHAT_JS, SeenMessageLedger
+from script_runner import run_tests
+
+try:
+    from playwright.async_api import async_playwright, Error as PlaywrightError
+except ImportError:
+    async_playwright = None
+
+FIXTURE = Path(__file__).parent / "fixtures" / "whatsapp_chat.html"
+
+
+async def _with_fixture_page(fn):
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch()
+        except PlaywrightError as e:
+            # The package is installed but `playwright install chromium` was not run
+            pytest.skip(f"Chromium not installed: {str(e).splitlines()[0]}")
+        page = await browser.new_page()
+        await page.set_content(FIXTURE.read_text(encoding='utf-8'))
+        try:
+            return await fn(page)
+        finally:
+            await browser.close()
+
+
+async def _per_element(page):
+    """The old approach: one round-trip per message element"""
+    texts = []
+    for element in await page.query_selector_all('#main [data-id]'):
+        texts.append(await element.inner_text())
+    return texts
+
+
+async def _bulk(page):
+    return await page.evaluate(EXTRACT_CHAT_JS)
+
+
+def test_bulk_extraction_and_diff():
+    """One evaluate returns every message; the ledger only passes new ones"""
+    if async_playwright is None:
+        pytest.skip("Playwright not installed")
+
+    messages = asyncio.run(_with_fixture_page(_bulk))
+    assert len(messages) == 300
+    first = messages[0]
+    assert first['id'] == 'false_923001234567@c.us_3EB0000000'
+    assert first['chat'] == 'Acme Client'
+    assert first['author'] == 'Alice Khan'
+    assert first['timestamp'] == '09:00, 2/24/2026'
+    assert first['text'] and '09:00' not in first['text']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = SeenMessageLedger(Path(tmp) / 'seen.json')
+        assert len(ledger.filter_new(messages[:250])) == 250
+        assert len(ledger.filter_new(messages)) == 50
+
+
+def benchmark(rounds=5):
+    """Time per-element extraction against the single evaluate call"""
+    async def run(page):
+        results = {}
+        for name, fn in (('per-element', _per_element), ('bulk', _bulk)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                await fn(page)
+            results[name] = (time.perf_counter() - start) / rounds
+        return results
+
+    results = asyncio.run(_with_fixture_page(run))
+    print(f"  Per-element inner_text: {results['per-element'] * 1000:.1f} ms per chat")
+    print(f"  Single evaluate:        {results['bulk'] * 1000:.1f} ms per chat")
+    print(f"  Speedup:                {results['per-element'] / results['bulk']:.1f}x")
+
+
+if __name__ == '__main__':
+    tests = [test_bulk_extraction_and_diff]
+    run_tests("WhatsApp Bulk Extraction - Test Suite", tests)
+
+    print("\nBenchmark (300-message chat fixture):")
+    if async_playwright is None:
+        print("  Playwright not installed - benchmark skipped")
+    else:
+        try:
+            benchmark()
+        except pytest.skip.Exception as e:
+            print(f"  {e} - benchmark skipped")
@@ -0,0 +1,438 @@
+"""
+Vault Index
+
+Persistent index of the task folders (Completed, Done, Plans, Needs_Action,
+Pending_Approval, Approved) so reports never walk large folders:
+- SQLite table with one row per file: path, folder, mtime, size, category,
+  status and front-matter / "**Key:** value" fields
+- Kept current from file system events (watchdog) while the ingestion
+  supervisor runs; sync() reconciles with a stat-only scandir pass and
+  re-reads only files whose size or mtime changed
+- Only the head of a file is read when parsing metadata
+- Time-range queries on mtime and per-folder counts served from the table
+- A per-folder version number changes on every update, for cache keys
+
+Usage:
+    index = get_vault_index()
+    index.ensure_fresh(['Completed'])
+    tasks = index.files('Completed', since=time.time() - 7 * 86400)
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger('vault_index')
+
+# Configuration
+VAULT_INDEX_DB = Path("Vault_Index.db")
+INDEXED_FOLDERS = ['Completed', 'Done', 'Plans', 'Needs_Action', 'Pending_Approval', 'Approved']
+HEAD_BYTES = 8192  # metadata sits at the top of task files
+WATCH_FRESHNESS = 120  # seconds; a watcher heartbeat older than this triggers a sync
+
+FIELD_RE = re.compile(r'^[\-\* \t]*\**([A-Za-z][A-Za-z _]{0,40}?)\**:\**\s*(.+?)\s*$', re.MULTILINE)
+
+
+def parse_metadata(text: str) -> Tuple[Optional[str], Optional[str], Dict[str, str]]:
+    """
+    Category, status and fields from the start of a markdown file
+
+    Reads YAML-style front matter (simple "key: value" lines between ---
+    markers) and "Key: value" / "**Key:** value" lines in the body; front
+    matter wins when both define a field.
+    """
+    fields: Dict[str, str] = {}
+    body = text
+    if text.startswith('---'):
+        end = text.find('\n---', 3)
+        if end != -1:
+            for line in text[3:end].splitlines():
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    value = value.strip().strip('"\'')
+                    if key.strip() and value:
+                        fields[key.strip().lower()] = value
+            body = text[end + 4:]
+
+    for match in FIELD_RE.finditer(body):
+        key = match.group(1).strip().lower().replace(' ', '_')
+        fields.setdefault(key, match.group(2).strip('* '))
+
+    return fields.get('category'), fields.get('status'), fields
+
+
+class VaultIndex:
+    """
+    File metadata for the vault folders, backed by SQLite
+
+    Safe to share between threads; several processes may open the same
+    database (WAL mode).
+    """
+
+    def __init__(
+        self,
+        root: str = ".",
+        path: Path = VAULT_INDEX_DB,
+        folders: Iterable[str] = INDEXED_FOLDERS
+    ):
+        self.root = os.path.abspath(root)
+        self.path = Path(path)
+        self.folders = list(folders)
+        self.parsed = 0  # files opened to read metadata
+        self._lock = threading.Lock()
+        self._observer = None
+        self._handler = None
+        self._watched: List[str] = []  # folders the observer has scheduled
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                name TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                category TEXT,
+                status TEXT,
+                fields TEXT
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_folder_mtime ON files (folder, mtime)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS folders (
+                folder TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                synced_at REAL,
+                watched_at REAL
+            )
+        """)
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _locate(self, path: str) -> Optional[Tuple[str, str]]:
+        """(folder, relative path) for a file directly inside an indexed folder"""
+        rel = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+        parts = rel.split('/')
+        if len(parts) != 2 or parts[0] not in self.folders:
+            return None
+        return parts[0], rel
+
+    def _bump(self, folder: str):
+        self._conn.execute(
+            "INSERT INTO folders (folder, version) VALUES (?, 1) "
+            "ON CONFLICT (folder) DO UPDATE SET version = version + 1",
+            (folder,)
+        )
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _read_row(self, folder: str, rel: str, stat: os.stat_result) -> tuple:
+        category = status = None
+        fields: Dict[str, str] = {}
+        if rel.endswith('.md'):
+            try:
+                with open(os.path.join(self.root, rel), 'r', encoding='utf-8', errors='replace') as f:
+                    category, status, fields = parse_metadata(f.read(HEAD_BYTES))
+                self.parsed += 1
+            except OSError as e:
+                logger.warning(f"Could not read {rel}: {e}")
+        return (rel, folder, rel.split('/', 1)[1], stat.st_mtime, stat.st_size,
+                category, status, json.dumps(fields) if fields else None)
+
+    def _upsert(self, rows: List[tuple]):
+        self._conn.executemany(
+            """INSERT INTO files (path, folder, name, mtime, size, category, status, fields)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (path) DO UPDATE SET
+               mtime = excluded.mtime, size = excluded.size, category = excluded.category,
+               status = excluded.status, fields = excluded.fields""",
+            rows
+        )
+
+    def update_file(self, path: str) -> bool:
+        """Index (or re-index) one file if it changed; returns True when the row changed"""
+        located = self._locate(path)
+        if not located:
+            return False
+        folder, rel = located
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return self.remove_file(path)
+        if not os.path.isfile(path):
+            return False
+
+        with self._lock:
+            row = self._conn.execute("SELECT mtime, size FROM files WHERE path = ?", (rel,)).fetchone()
+            if row and row == (stat.st_mtime, stat.st_size):
+                return False
+        new_row = self._read_row(folder, rel, stat)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._upsert([new_row])
+            self._bump(folder)
+            self._conn.execute("COMMIT")
+        return True
+
+    def remove_file(self, path: str) -> bool:
+        located = self._locate(path)
+        if not located:
+            return False
+        folder, rel = located
+        with self._lock:
+            self._conn.execute("BEGIN")
+            cursor = self._conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+            if cursor.rowcount:
+                self._bump(folder)
+            self._conn.execute("COMMIT")
+        return cursor.rowcount > 0
+
+    def move_file(self, src: str, dest: str):
+        """A rename inside or between folders (either side may be outside the vault)"""
+        self.remove_file(src)
+        self.update_file(dest)
+
+    def sync(self, folders: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Reconcile folders with the disk using one scandir pass each
+
+        Only new or changed files (by size/mtime) are opened; rows for
+        files that disappeared are deleted.
+        """
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        for folder in folders or self.folders:
+            folder = str(folder)
+            with self._lock:
+                known = {
+                    name: (mtime, size)
+                    for name, mtime, size in self._conn.execute(
+                        "SELECT name, mtime, size FROM files WHERE folder = ?", (folder,)
+                    )
+                }
+
+            rows = []
+            seen = set()
+            try:
+                with os.scandir(os.path.join(self.root, folder)) as entries:
+                    for entry in entries:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        seen.add(entry.name)
+                        previous = known.get(entry.name)
+                        if previous == (stat.st_mtime, stat.st_size):
+                            continue
+                        counts['updated' if previous else 'added'] += 1
+                        rows.append(self._read_row(folder, f"{folder}/{entry.name}", stat))
+            except FileNotFoundError:
+                pass
+
+            gone = [(f"{folder}/{name}",) for name in known if name not in seen]
+            counts['removed'] += len(gone)
+            with self._lock:
+                self._conn.execute("BEGIN")
+                if rows:
+                    self._upsert(rows)
+                if gone:
+                    self._conn.executemany("DELETE FROM files WHERE path = ?", gone)
+                if rows or gone:
+                    self._bump(folder)
+                self._conn.execute(
+                    "INSERT INTO folders (folder, synced_at) VALUES (?, ?) "
+                    "ON CONFLICT (folder) DO UPDATE SET synced_at = excluded.synced_at",
+                    (folder, time.time())
+                )
+                self._conn.execute("COMMIT")
+        return counts
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+
+    def heartbeat(self):
+        """
+        Record that a live watcher is keeping the index current
+
+        Only folders the observer actually watches are marked; folders created
+        since start_watching() are synced and scheduled first.
+        """
+        if self._observer:
+            self._schedule_new_folders()
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO folders (folder, watched_at) VALUES (?, ?) "
+                "ON CONFLICT (folder) DO UPDATE SET watched_at = excluded.watched_at",
+                [(folder, now) for folder in self._watched]
+            )
+
+    def is_watched(self, folder: str, max_age: float = WATCH_FRESHNESS) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT watched_at FROM folders WHERE folder = ?", (folder,)).fetchone()
+        return bool(row and row[0] and time.time() - row[0] < max_age)
+
+    def ensure_fresh(self, folders: Iterable[str], max_age: float = WATCH_FRESHNESS) -> Dict[str, int]:
+        """Sync only the folders no live watcher is maintaining"""
+        stale = [str(folder) for folder in folders if not self.is_watched(str(folder), max_age)]
+        return self.sync(stale) if stale else {'added': 0, 'updated': 0, 'removed': 0}
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _range(folder: str, since: Optional[float], until: Optional[float], suffix: Optional[str]):
+        clauses, params = ["folder = ?"], [str(folder)]
+        if since is not None:
+            clauses.append("mtime > ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("mtime <= ?")
+            params.append(until)
+        if suffix:
+            clauses.append("name LIKE ?")
+            params.append(f"%{suffix}")
+        return " AND ".join(clauses), params
+
+    def files(
+        self,
+        folder: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        suffix: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Rows for folder with mtime in (since, until], oldest first"""
+        where, params = self._range(folder, since, until, suffix)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path, name, mtime, size, category, status, fields FROM files WHERE {where} ORDER BY mtime",
+                params
+            ).fetchall()
+        return [
+            {
+                'path': path, 'name': name, 'mtime': mtime, 'size': size,
+                'category': category, 'status': status, 'fields': json.loads(fields) if fields else {}
+            }
+            for path, name, mtime, size, category, status, fields in rows
+        ]
+
+    def count(self, folder: str, since: Optional[float] = None, until: Optional[float] = None,
+              suffix: Optional[str] = None) -> int:
+        where, params = self._range(folder, since, until, suffix)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM files WHERE {where}", params).fetchone()[0]
+
+    def category_counts(self, folder: str, since: Optional[float] = None, until: Optional[float] = None,
+                        suffix: Optional[str] = None) -> Dict[str, int]:
+        where, params = self._range(folder, since, until, suffix)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT COALESCE(category, 'Uncategorized'), COUNT(*) FROM files WHERE {where} GROUP BY 1",
+                params
+            ).fetchall()
+        return dict(rows)
+
+    def version(self, folder: str) -> int:
+        """Changes whenever a file in folder is added, changed or removed"""
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM folders WHERE folder = ?", (str(folder),)).fetchone()
+        return row[0] if row else 0
+
+    # ------------------------------------------------------------------
+    # File system events
+    # ------------------------------------------------------------------
+
+    def start_watching(self):
+        """Keep the index current from watchdog events (after an initial sync)"""
+        if not WATCHDOG_AVAILABLE:
+            raise ImportError("watchdog is required to watch the vault folders")
+        self.sync()
+        self._observer = Observer()
+        self._handler = VaultIndexHandler(self)
+        self._watched = []
+        self._schedule_new_folders()
+        self._observer.start()
+        self.heartbeat()
+
+    def _schedule_new_folders(self):
+        """Watch indexed folders that exist but are not scheduled yet"""
+        for folder in self.folders:
+            directory = os.path.join(self.root, folder)
+            if folder not in self._watched and os.path.isdir(directory):
+                self._observer.schedule(self._handler, path=directory, recursive=False)
+                self._watched.append(folder)
+                if self._observer.is_alive():
+                    self.sync([folder])  # pick up files written before it was watched
+
+    def is_watching(self) -> bool:
+        return bool(self._observer and self._observer.is_alive())
+
+    def stop_watching(self):
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        self._watched = []
+
+    def close(self):
+        self.stop_watching()
+        with self._lock:
+            self._conn.close()
+
+
+class VaultIndexHandler(FileSystemEventHandler):
+    """Applies watchdog events to a VaultIndex"""
+
+    def __init__(self, index: VaultIndex):
+        self.index = index
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.index.update_file(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.index.update_file(event.src_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.index.remove_file(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.index.move_file(event.src_path, event.dest_path)
+
+
+_index: Optional[VaultIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vault_index(path: Path = VAULT_INDEX_DB) -> VaultIndex:
+    """Process-wide vault index"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VaultIndex(path=path)
+        return _index
@@ -1,10 +1,11 @@
 import os
-import shutil
 import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from datetime import datetime
 
+from inbox_staging import InboxStagingPipeline, STABLE_SECONDS
+
 
 class BaseWatcher:
     """Base class for file system watchers"""
@@ -26,33 +27,38 @@ class BaseWatcher:
 class InboxWatcher(BaseWatcher):
     """Watches the Inbox folder and moves new files to Needs_Action"""
     
-    def __init__(self, watch_dir="Inbox", dest_dir="Needs_Action"):
+    def __init__(self, watch_dir="Inbox", dest_dir="Needs_Action", duplicates_dir="Duplicates", ledger=None,
+                 stable_seconds=STABLE_SECONDS):
         super().__init__(watch_dir, dest_dir)
         self.setup_directories()
+        # Events only stage paths; the pipeline moves files once they are completely written
+        self.pipeline = InboxStagingPipeline(
+            watch_dir, dest_dir, duplicates_dir=duplicates_dir, ledger=ledger, stable_seconds=stable_seconds
+        )
         
-    def process_file(self, file_path):
-        """Move the file to the Needs_Action directory"""
-        filename = os.path.basename(file_path)
-        dest_path = os.path.join(self.dest_dir, filename)
-        
-        # Handle duplicate filenames by adding timestamp
-        if os.path.exists(dest_path):
-            name, ext = os.path.splitext(filename)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dest_path = os.path.join(self.dest_dir, f"{name}_{timestamp}{ext}")
-        
-        shutil.move(file_path, dest_path)
-        print(f"[{datetime.now()}] Moved {filename} from {self.watch_dir} to {self.dest_dir}")
+    def enqueue(self, file_path, closed=False):
+        """Stage a file for moving once it is completely written"""
+        self.pipeline.enqueue(file_path, closed=closed)
         
-        # Log the action
-        self.log_action(file_path, dest_path)
+    def process_file(self, file_path):
+        """Move the file to the Needs_Action directory immediately"""
+        dest_path = self.pipeline.process_file(file_path)
+        self.pipeline.flush_log()
+        return dest_path
+    
+    def start(self):
+        self.pipeline.start()
+    
+    def reconcile(self):
+        """Move files dropped into the inbox while the watcher was not running"""
+        return self.pipeline.reconcile()
+    
+    def stop(self):
+        self.pipeline.stop()
         
-    def log_action(self, source_path, dest_path):
+    def log_action(self, source_path, dest_path, action="FILE_MOVED"):
         """Log the file movement action"""
-        log_entry = f"[{datetime.now()}] FILE_MOVED: {source_path} -> {dest_path}\n"
-        
-        with open("watcher_log.txt", "a") as log_file:
-            log_file.write(log_entry)
+        self.pipeline.log_action(source_path, dest_path, action)
 
 
 class InboxHandler(FileSystemEventHandler):
@@ -64,14 +70,23 @@ class InboxHandler(FileSystemEventHandler):
     def on_created(self, event):
         """Handle file creation events"""
         if not event.is_directory:
-            print(f"[{datetime.now()}] New file detected: {event.src_path}")
-            self.watcher.process_file(event.src_path)
+            self.watcher.enqueue(event.src_path)
+            
+    def on_modified(self, event):
+        """A file still being written; staging waits until it stops changing"""
+        if not event.is_directory:
+            self.watcher.enqueue(event.src_path)
+            
+    def on_closed(self, event):
+        """Close-after-write (inotify): the file is complete"""
+        if not event.is_directory:
+            self.watcher.enqueue(event.src_path, closed=True)
             
     def on_moved(self, event):
         """Handle file move events"""
         if not event.is_directory:
-            print(f"[{datetime.now()}] File moved into inbox: {event.src_path}")
-            self.watcher.process_file(event.src_path)
+            # A rename into the inbox is atomic, so the file is already complete
+            self.watcher.enqueue(event.dest_path, closed=True)
 
 
 def main():
@@ -86,7 +101,10 @@ def main():
     print(f"Monitoring: {watcher.watch_dir}")
     print(f"Moving files to: {watcher.dest_dir}")
     
+    watcher.start()
     observer.start()
+    # After the observer is running, so nothing dropped during the scan is missed
+    watcher.reconcile()
     
     try:
         while True:
@@ -96,6 +114,7 @@ def main():
         print(f"\n[{datetime.now()}] Stopping Inbox Watcher...")
     
     observer.join()
+    watcher.stop()
     print(f"[{datetime.now()}] Inbox Watcher stopped.")
 
 
@@ -0,0 +1,222 @@
+"""
+WhatsApp Web DOM helpers
+
+In-page scripts and bookkeeping for the event-driven WhatsApp watcher:
+- OBSERVER_JS: MutationObserver that streams newly rendered messages
+  (data-id, chat, author, timestamp, text) and unread-badge changes back to
+  Python through exposed Playwright bindings
+- UNREAD_CHATS_JS: titles of chats in #pane-side that show an unread badge
+- EXTRACT_CHAT_JS: every message of the open chat as one JSON payload, so a
+  chat costs a single evaluate() round-trip instead of one per element
+- SeenMessageLedger: last-seen message ids per chat, persisted so restarts
+  do not re-save old messages
+
+Message data-ids look like "false_<chat-jid>_<message-id>"; the chat jid is
+used as the ledger key so renamed chats keep their history.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger('whatsapp_dom')
+
+# Configuration
+SEEN_LEDGER_FILE = Path("whatsapp_data") / "seen_messages.json"
+MAX_SEEN_PER_CHAT = 500
+
+MESSAGE_BINDING = 'waOnMessages'
+UNREAD_BINDING = 'waOnUnread'
+
+# Shared extraction for one message row; installed once as window.__waExtract
+EXTRACT_HELPERS_JS = r"""
+(() => {
+  if (window.__waExtract) return;
+  const chatTitle = () => {
+    const el = document.querySelector(
+      '#main header [data-testid="conversation-info-header-chat-title"], #main header span[title]');
+    return el ? (el.getAttribute('title') || el.innerText || '').trim() : 'Unknown Chat';
+  };
+  window.__waChatTitle = chatTitle;
+  window.__waExtract = (el, chat) => {
+    const id = el.getAttribute('data-id');
+    if (!id) return null;
+    const copyable = el.querySelector('.copyable-text[data-pre-plain-text]');
+    // data-pre-plain-text looks like "[10:30, 2/24/2026] Alice: "
+    const meta = copyable ? copyable.getAttribute('data-pre-plain-text') : '';
+    const match = /^\[([^\]]*)\]\s*([^:]*):/.exec(meta || '');
+    const textEl = el.querySelector('.selectable-text') || el.querySelector('.copyable-text');
+    const text = ((textEl || el).innerText || '').trim();
+    return {
+      id: id,
+      chat_id: id.split('_')[1] || '',
+      chat: chat || chatTitle(),
+      author: match ? match[2].trim() : '',
+      timestamp: match ? match[1].trim() : '',
+      from_me: id.startsWith('true_'),
+      text: text
+    };
+  };
+})();
+"""
+
+OBSERVER_JS = EXTRACT_HELPERS_JS + r"""
+(() => {
+  if (window.__waObserver) return true;
+  const root = document.querySelector('#app') || document.body;
+  let unreadTimer = null;
+
+  const collect = (node, out) => {
+    if (node.nodeType !== 1) return;
+    if (node.hasAttribute('data-id')) out.push(node);
+    node.querySelectorAll('[data-id]').forEach(el => out.push(el));
+  };
+
+  window.__waObserver = new MutationObserver(mutations => {
+    const rows = [];
+    let sidebarChanged = false;
+    for (const mutation of mutations) {
+      if (mutation.target.closest('#pane-side')) sidebarChanged = true;
+      if (!mutation.target.closest('#main')) continue;
+      mutation.addedNodes.forEach(node => collect(node, rows));
+    }
+    if (rows.length) {
+      const chat = window.__waChatTitle();
+      const seen = new Set();
+      const batch = [];
+      for (const row of rows) {
+        const message = window.__waExtract(row, chat);
+        if (message && message.text && !seen.has(message.id)) {
+          seen.add(message.id);
+          batch.push(message);
+        }
+      }
+      if (batch.length) window.""" + MESSAGE_BINDING + r"""(batch);
+    }
+    if (sidebarChanged && !unreadTimer) {
+      // Coalesce sidebar churn into one notification
+      unreadTimer = setTimeout(() => { unreadTimer = null; window.""" + UNREAD_BINDING + r"""(); }, 250);
+    }
+  });
+  window.__waObserver.observe(root, {childList: true, subtree: true});
+  return true;
+})()
+"""
+
+EXTRACT_CHAT_JS = EXTRACT_HELPERS_JS + r"""
+(() => {
+  const chat = window.__waChatTitle();
+  const seen = new Set();
+  const messages = [];
+  document.querySelectorAll('#main [data-id]').forEach(row => {
+    const message = window.__waExtract(row, chat);
+    if (message && message.text && !seen.has(message.id)) {
+      seen.add(message.id);
+      messages.push(message);
+    }
+  });
+  return messages;
+})()
+"""
+
+UNREAD_CHATS_JS = r"""
+() => {
+  const chats = [];
+  document.querySelectorAll('#pane-side [role="listitem"], #pane-side [role="row"]').forEach(row => {
+    const badge = row.querySelector('[aria-label*="unread" i], [data-testid="icon-unread-count"]');
+    if (!badge) return;
+    const title = row.querySelector('span[title]');
+    if (title) chats.push(title.getAttribute('title'));
+  });
+  return chats;
+}
+"""
+
+
+class SeenMessageLedger:
+    """
+    Last-seen message ids per chat
+
+    Usage:
+        ledger = SeenMessageLedger()
+        for message in ledger.filter_unseen(messages):
+            handle(message)
+            ledger.mark_seen(message)  # only once it was handled
+        ledger.save()
+    """
+
+    def __init__(self, path: Path = SEEN_LEDGER_FILE, max_per_chat: int = MAX_SEEN_PER_CHAT):
+        self.path = Path(path)
+        self.max_per_chat = max_per_chat
+        self.chats: Dict[str, List[str]] = {}
+        self._index: Dict[str, set] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.chats = json.load(f)
+            except Exception as e:
+                logger.error(f"Could not load WhatsApp seen ledger: {e}")
+        self._index = {chat: set(ids) for chat, ids in self.chats.items()}
+
+    def save(self):
+        """Persist atomically if anything changed"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.chats, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    @staticmethod
+    def chat_key(message: Dict) -> str:
+        return message.get('chat_id') or message.get('chat') or 'unknown'
+
+    def is_seen(self, chat: str, msg_id: str) -> bool:
+        return msg_id in self._index.get(chat, ())
+
+    def mark(self, chat: str, ids: Iterable[str]):
+        seen = self._index.setdefault(chat, set())
+        history = self.chats.setdefault(chat, [])
+        for msg_id in ids:
+            if msg_id not in seen:
+                seen.add(msg_id)
+                history.append(msg_id)
+                self.dirty = True
+        if len(history) > self.max_per_chat:
+            dropped = history[:-self.max_per_chat]
+            del history[:-self.max_per_chat]
+            seen.difference_update(dropped)
+
+    def last_seen(self, chat: str) -> Optional[str]:
+        history = self.chats.get(chat)
+        return history[-1] if history else None
+
+    def filter_unseen(self, messages: Iterable[Dict]) -> List[Dict]:
+        """Return messages whose id is not in the ledger (once each), without marking them"""
+        new = []
+        batch = set()
+        for message in messages:
+            key = (self.chat_key(message), message['id'])
+            if key not in batch and not self.is_seen(*key):
+                batch.add(key)
+                new.append(message)
+        return new
+
+    def mark_seen(self, message: Dict):
+        """Record a handled message so it is not handed out again"""
+        self.mark(self.chat_key(message), [message['id']])
+
+    def filter_new(self, messages: Iterable[Dict]) -> List[Dict]:
+        """Return messages whose id is not in the ledger and mark them seen"""
+        new = self.filter_unseen(messages)
+        for message in new:
+            self.mark_seen(message)
+        return new
@@ -11,15 +11,27 @@ from pathlib import Path
 from playwright.async_api import async_playwright
 import re
 
+from ingestion_ledger import get_ledger, content_key
+from whatsapp_dom import (
+    OBSERVER_JS, EXTRACT_CHAT_JS, UNREAD_CHATS_JS, MESSAGE_BINDING, UNREAD_BINDING, SeenMessageLedger
+)
+
+# Safety net for missed sidebar mutations in observer mode (seconds)
+UNREAD_FALLBACK_INTERVAL = 60
+
 
 class WhatsAppWatcher:
     """Watches WhatsApp Web for specific keywords and saves messages as .md files"""
     
-    def __init__(self, data_dir="whatsapp_data", needs_action_dir="Needs_Action"):
+    def __init__(self, data_dir="whatsapp_data", needs_action_dir="Needs_Action", mode="observer"):
         self.data_dir = Path(data_dir)
         self.needs_action_dir = Path(needs_action_dir)
         self.browser_context = None
         self.page = None
+        self.mode = mode  # 'observer' (event-driven) or 'poll' (click every chat)
+        self.ledger = SeenMessageLedger(self.data_dir / "seen_messages.json")
+        self.ingestion_ledger = get_ledger()
+        self._unread_event = None
         
         # Create directories if they don't exist
         self.data_dir.mkdir(exist_ok=True)
@@ -106,48 +118,15 @@ class WhatsAppWatcher:
                             await chat_element.click()
                             
                             # Wait for messages to load in the chat window
-                            await self.page.wait_for_selector('#main .copyable-text, #main .message', timeout=3000)
-                            
-                            # Get all message elements
-                            message_elements = await self.page.query_selector_all('#main .copyable-text, #main .message, #main [data-id]')
+                            await self.page.wait_for_selector('#main [data-id]', timeout=3000)
                             
-                            for msg_element in message_elements:
-                                try:
-                                    # Get the message text
-                                    message_text = ""
-                                    
-                                    # Try different ways to extract the message text
-                                    try:
-                                        message_text = await msg_element.inner_text()
-                                    except:
-                                        pass
-                                    
-                                    # If innerText didn't work, try getting text from child elements
-                                    if not message_text.strip():
-                                        try:
-                                            spans = await msg_element.query_selector_all('span')
-                                            texts = []
-                                            for span in spans:
-                                                try:
-                                                    text = await span.inner_text()
-                                                    if text.strip():
-                                                        texts.append(text.strip())
-                                                except:
-                                                    continue
-                                            message_text = ' '.join(texts)
-                                        except:
-                                            pass
-                                    
-                                    # Check if message contains any of our keywords
-                                    if message_text and self.contains_keywords(message_text):
-                                        # Save the message
-                                        await self.save_message(chat_name, message_text)
-                                except Exception as e:
-                                    # Skip problematic messages
-                                    continue
+                            # One round-trip for the whole chat, then diff against the seen ledger
+                            messages = await self.extract_chat_messages()
+                            await self.ingest_messages(messages, chat_name)
                         
                         except Exception as e:
                             # Skip problematic chats
+                            print(f"Error reading chat '{chat_name}': {e}")
                             continue
                 
                 except Exception as e:
@@ -160,6 +139,77 @@ class WhatsAppWatcher:
                 print(f"Error monitoring messages: {e}")
                 await asyncio.sleep(5)
     
+    async def watch_with_observer(self):
+        """Event-driven monitoring: the page pushes newly rendered messages to Python"""
+        print("Monitoring WhatsApp for keywords (event-driven)...")
+        
+        try:
+            await self.page.wait_for_selector('#app, .app-wrapper-web, div[role="grid"]', timeout=15000)
+        except:
+            print("Could not find expected WhatsApp elements. The UI might have changed.")
+            return
+        
+        self._unread_event = asyncio.Event()
+        await self.page.expose_function(MESSAGE_BINDING, self.on_dom_messages)
+        await self.page.expose_function(UNREAD_BINDING, self._unread_event.set)
+        
+        # Start with one pass over chats that are already unread
+        self._unread_event.set()
+        
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._unread_event.wait(), timeout=UNREAD_FALLBACK_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._unread_event.clear()
+                
+                # No-op while installed; re-installs after WhatsApp reloads the page
+                await self.page.evaluate(OBSERVER_JS)
+                
+                # Catch anything in the open chat rendered before the observer was installed
+                await self.on_dom_messages(await self.extract_chat_messages())
+                
+                # Opening a chat renders its messages, which the observer streams back
+                for chat_name in await self.page.evaluate(UNREAD_CHATS_JS):
+                    await self.open_chat(chat_name)
+            except Exception as e:
+                print(f"Error monitoring messages: {e}")
+                await asyncio.sleep(5)
+    
+    async def extract_chat_messages(self):
+        """All messages of the open chat (id, author, timestamp, text) in one evaluate call"""
+        return await self.page.evaluate(EXTRACT_CHAT_JS)
+    
+    async def open_chat(self, chat_name):
+        """Click a chat in the sidebar by its title"""
+        try:
+            await self.page.click(f'#pane-side span[title={json.dumps(chat_name)}]', timeout=3000)
+            await self.page.wait_for_selector('#main [data-id]', timeout=3000)
+        except Exception as e:
+            print(f"Could not open chat '{chat_name}': {e}")
+    
+    async def on_dom_messages(self, messages):
+        """Handle a batch of rendered messages from the page observer"""
+        await self.ingest_messages(messages)
+    
+    async def ingest_messages(self, messages, chat_name=None):
+        """
+        Save new keyword messages; a message is marked seen only once it was handled
+        
+        A failed save leaves the message unseen (retried the next time it is
+        rendered) and does not stop the rest of the batch.
+        """
+        for message in self.ledger.filter_unseen(messages):
+            try:
+                if self.contains_keywords(message['text']):
+                    await self.save_message(chat_name or message['chat'], message['text'], message['id'])
+            except Exception as e:
+                print(f"Could not save WhatsApp message {message['id']}: {e}")
+                continue
+            self.ledger.mark_seen(message)
+        self.ledger.save()
+    
     def contains_keywords(self, text):
         """Check if text contains any of the monitored keywords"""
         text_lower = text.lower()
@@ -193,8 +243,11 @@ class WhatsAppWatcher:
         except:
             return "Unknown Chat"
     
-    async def save_message(self, chat_name, message_text):
+    async def save_message(self, chat_name, message_text, message_id=None):
         """Save the message as a markdown file in Needs_Action folder"""
+        # Messages without a data-id are keyed by content
+        key = message_id or content_key(f"{chat_name}\n{message_text}")
+        
         # Create a safe filename from the chat name
         safe_chat_name = "".join(c for c in chat_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
         if not safe_chat_name:
@@ -204,6 +257,14 @@ class WhatsAppWatcher:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"whatsapp_{safe_chat_name}_{timestamp}.md"
         filepath = self.needs_action_dir / filename
+        counter = 1
+        while filepath.exists():
+            # Several messages from one chat within a second must not overwrite each other
+            counter += 1
+            filepath = self.needs_action_dir / f"whatsapp_{safe_chat_name}_{timestamp}_{counter}.md"
+        
+        if not self.ingestion_ledger.claim('whatsapp', key, target=str(filepath)):
+            return
         
         # Create markdown content
         md_content = f"""# WhatsApp Message from {chat_name}
@@ -225,9 +286,13 @@ class WhatsAppWatcher:
 *This message was automatically saved by the WhatsApp Watcher*
 """
         
-        # Write the markdown file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        # Write the markdown file; a failed write must not leave the message marked as ingested
+        try:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(md_content)
+        except Exception:
+            self.ingestion_ledger.release('whatsapp', key)
+            raise
 
         print(f"Saved WhatsApp message from '{chat_name}' to {filepath}")
 
@@ -283,14 +348,17 @@ Action Required: Review the full message in {self.needs_action_dir}
         """Run the WhatsApp watcher"""
         print("Initializing WhatsApp Watcher...")
         
-        # Initialize the browser
+        # Initialize the browser; raising lets a supervisor restart the watcher
         if not await self.initialize_browser():
-            print("Failed to initialize browser. Please log in to WhatsApp Web first.")
-            return
+            await self.close()
+            raise RuntimeError("Failed to initialize browser. Please log in to WhatsApp Web first.")
         
         try:
             # Start monitoring for messages
-            await self.wait_for_messages()
+            if self.mode == "observer":
+                await self.watch_with_observer()
+            else:
+                await self.wait_for_messages()
         except KeyboardInterrupt:
             print("\nStopping WhatsApp Watcher...")
         finally:
@@ -330,6 +398,8 @@ def main():
         asyncio.run(run_watcher())
     except KeyboardInterrupt:
         print("\nWhatsApp Watcher stopped by user.")
+    except RuntimeError as e:
+        print(e)
 
 
 if __name__ == "__main__":